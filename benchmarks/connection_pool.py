@@ -0,0 +1,137 @@
+"""
+Load test of AsyncZep's connection pool against a local stand-in server.
+
+A minimal HTTP/1.1 keep-alive server runs in a separate process and answers every request with a fixed user after
+a configurable delay, standing in for API latency. The script then runs the given number of coroutines, each issuing
+requests through one shared AsyncZep, first with httpx's default pool limits and then with the tuned defaults, and
+reports throughput, latency percentiles, errors and the number of connections the server accepted.
+Run with `python benchmarks/connection_pool.py`.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import statistics
+import time
+import typing
+
+import httpx
+
+from zep_cloud.client import AsyncZep
+
+USER = json.dumps({"user_id": "u1", "uuid": "uuid-1", "created_at": "2024-01-01T00:00:00Z"}).encode()
+
+
+class StandInServer:
+    """Serves the stand-in API from a separate process, so its work does not compete with the client's."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self._connections = multiprocessing.Value("i", 0)
+        self._port = multiprocessing.Value("i", 0)
+        self._ready = multiprocessing.Event()
+        self._process = multiprocessing.Process(target=self._run, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self._port.value
+
+    @property
+    def connections(self) -> int:
+        return self._connections.value
+
+    def __enter__(self) -> "StandInServer":
+        self._process.start()
+        self._ready.wait()
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self._process.terminate()
+        self._process.join()
+
+    def _run(self) -> None:
+        async def serve() -> None:
+            server = await asyncio.start_server(self._handle, "127.0.0.1", 0, backlog=4096)
+            self._port.value = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await server.serve_forever()
+
+        asyncio.run(serve())
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        with self._connections.get_lock():
+            self._connections.value += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                await asyncio.sleep(self.delay)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\ncontent-length: "
+                    + str(len(USER)).encode()
+                    + b"\r\n\r\n"
+                    + USER
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def load(client: AsyncZep, concurrency: int, requests: int) -> typing.Tuple[float, typing.List[float], int]:
+    latencies: typing.List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in range(requests):
+            start = time.perf_counter()
+            try:
+                await client.user.get("u1")
+            except httpx.HTTPError:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies, errors
+
+
+def percentile(values: typing.List[float], q: float) -> float:
+    return statistics.quantiles(values, n=100)[int(q) - 1] * 1000 if len(values) > 1 else float("nan")
+
+
+async def run(concurrency: int, requests: int, delay: float) -> None:
+    print(f"{concurrency} coroutines x {requests} requests, {delay * 1000:.0f} ms server latency")
+    print(f"{'pool':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} {'conns':>6}")
+    configurations: typing.Dict[str, typing.Callable[[str], AsyncZep]] = {
+        # httpx's default limits, as used by AsyncZep before the pool options existed
+        "httpx": lambda url: AsyncZep(api_key="bench", base_url=url, httpx_client=httpx.AsyncClient(timeout=60)),
+        "tuned": lambda url: AsyncZep(api_key="bench", base_url=url),
+    }
+    for name, make_client in configurations.items():
+        with StandInServer(delay) as server:
+            client = make_client(f"http://127.0.0.1:{server.port}/api/v2")
+            elapsed, latencies, errors = await load(client, concurrency, requests)
+            await client._client_wrapper.httpx_client.httpx_client.aclose()
+            print(
+                f"{name:>8} {len(latencies) / elapsed:>8.0f} {percentile(latencies, 50):>8.1f} "
+                f"{percentile(latencies, 99):>8.1f} {errors:>7} {server.connections:>6}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=4, help="requests per coroutine")
+    parser.add_argument("--delay", type=float, default=0.05, help="server latency in seconds")
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.concurrency, arguments.requests, arguments.delay))
@@ -0,0 +1,76 @@
+"""
+Measures how hedging changes search latency against a backend with a slow tail.
+
+An AsyncZep client sends concurrent graph.search calls to an httpx.MockTransport whose latency is usually fast but
+occasionally slow, first without hedging and then with the default HedgingPolicy. The script reports p50, p99 and
+p99.9 latency, the extra requests hedging sent and the hedge win rate. Run with `python benchmarks/hedging.py`.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import typing
+
+import httpx
+
+from zep_cloud.client import AsyncZep
+from zep_cloud.core.hedging import HedgingPolicy
+
+
+def percentile(samples: typing.List[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+def make_client(
+    hedging: typing.Optional[HedgingPolicy], fast: float, slow: float, slow_rate: float, rng: random.Random
+) -> AsyncZep:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(slow if rng.random() < slow_rate else fast * (0.5 + rng.random()))
+        return httpx.Response(200, json={"edges": []})
+
+    return AsyncZep(
+        api_key="bench",
+        base_url="https://api.test/api/v2",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        hedging=hedging,
+    )
+
+
+async def measure(client: AsyncZep, requests: int, concurrency: int) -> typing.List[float]:
+    latencies: typing.List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await client.graph.search(query="q", user_id="u1")
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+async def run(requests: int, concurrency: int, fast: float, slow: float, slow_rate: float) -> None:
+    print(f"{'hedging':>8} {'p50 ms':>8} {'p99 ms':>8} {'p99.9 ms':>9} {'extra load':>11} {'win rate':>9}")
+    for hedging in (None, HedgingPolicy()):
+        client = make_client(hedging, fast, slow, slow_rate, random.Random(0))
+        latencies = await measure(client, requests, concurrency)
+        stats = client.hedging_stats()
+        print(
+            f"{'on' if hedging else 'off':>8} {percentile(latencies, 50) * 1e3:>8.1f} "
+            f"{percentile(latencies, 99) * 1e3:>8.1f} {percentile(latencies, 99.9) * 1e3:>9.1f} "
+            f"{(stats.extra_load or 0) * 100:>10.1f}% {(stats.win_rate or 0) * 100:>8.0f}%"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--fast", type=float, default=0.02, help="typical latency in seconds")
+    parser.add_argument("--slow", type=float, default=0.5, help="latency of the slow tail in seconds")
+    parser.add_argument("--slow-rate", type=float, default=0.02, help="fraction of slow requests")
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.requests, arguments.concurrency, arguments.fast, arguments.slow, arguments.slow_rate))
@@ -0,0 +1,105 @@
+"""
+Compares ingestion throughput with preprocessing on threads and on a process pool.
+
+Each document is chunked into overlapping windows and every chunk gets metadata computed from a few rounds of
+hashing, standing in for client-side preprocessing that holds the GIL. Episodes are sent to a stand-in API, a mock
+transport that answers add_batch after a fixed delay, so the numbers measure the client rather than the network.
+The script reports documents and episodes per second, and the seconds and throughput of every stage, for a thread
+pool, a process pool, and a process pool returning request bodies through shared memory.
+Run with `python benchmarks/ingest.py`.
+"""
+
+import argparse
+import asyncio
+import functools
+import hashlib
+import os
+import random
+import typing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+import httpx
+
+from zep_cloud import EpisodeData
+from zep_cloud.client import AsyncZep
+from zep_cloud.local.ingest import IngestResult, ingest
+
+WORDS = "the a user said flight hotel booking window seat meeting project deadline report review weekend".split()
+
+
+def make_documents(count: int, words: int) -> typing.List[str]:
+    rng = random.Random(0)
+    return [" ".join(rng.choice(WORDS) for _ in range(words)) for _ in range(count)]
+
+
+def chunk(document: str, *, size: int, rounds: int) -> typing.List[EpisodeData]:
+    words = document.split()
+    episodes = []
+    for start in range(0, len(words), size // 2):
+        text = " ".join(words[start : start + size])
+        digest = text.encode()
+        for _ in range(rounds):
+            digest = hashlib.sha256(digest).digest()
+        metadata = {"fingerprint": digest.hex()[:16], "words": len(text.split()), "offset": start}
+        episodes.append(EpisodeData(data=text, type="text", source_description="benchmark", metadata=metadata))
+    return episodes
+
+
+def make_client(delay: float) -> AsyncZep:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json=[])
+
+    return AsyncZep(
+        api_key="test",
+        base_url="https://api.test/api/v2",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+def report(label: str, result: IngestResult) -> None:
+    print(
+        f"\n{label}: {result.documents / result.seconds:,.0f} documents/s, "
+        f"{result.episodes_per_second:,.0f} episodes/s, {result.seconds:.2f}s"
+    )
+    for name, stage in result.stages.items():
+        rate = stage.items_per_second or 0.0
+        print(
+            f"  {name:>10} {stage.items:>7} items {stage.seconds:>8.2f}s {rate:>10,.0f}/s {stage.bytes / 1e6:>8.1f} MB"
+        )
+
+
+async def run(arguments: argparse.Namespace) -> None:
+    documents = make_documents(arguments.documents, arguments.words)
+    preprocess = functools.partial(chunk, size=arguments.chunk_words, rounds=arguments.rounds)
+    setups: typing.List[typing.Tuple[str, typing.Callable[[], Executor], bool]] = [
+        ("threads", lambda: ThreadPoolExecutor(arguments.processes), False),
+        ("processes", lambda: ProcessPoolExecutor(arguments.processes), False),
+        ("processes + shared memory", lambda: ProcessPoolExecutor(arguments.processes), True),
+    ]
+    for label, executor_factory, shared in setups:
+        with executor_factory() as executor:
+            result = await ingest(
+                make_client(arguments.delay),
+                documents,
+                preprocess,
+                graph_id="benchmark",
+                executor=executor,
+                chunk_size=arguments.chunk_size,
+                concurrency=arguments.concurrency,
+                shared_memory=shared,
+            )
+        report(label, result)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=2000, help="words per document")
+    parser.add_argument("--chunk-words", type=int, default=200, help="words per episode, windows overlap by half")
+    parser.add_argument("--rounds", type=int, default=2000, help="hashing rounds per episode")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--chunk-size", type=int, default=8, help="documents per worker task")
+    parser.add_argument("--concurrency", type=int, default=16, help="add_batch requests in flight")
+    parser.add_argument("--delay", type=float, default=0.005, help="stand-in API latency in seconds")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,117 @@
+"""
+Compares the JSON codecs available to HttpClient on search and batch-ingest payloads.
+
+For each installed codec the script times encoding a graph.add_batch request body and decoding a graph.search
+response on their own, then the same calls end to end through a Zep client backed by an httpx.MockTransport, which
+includes jsonable_encoder and model validation. Run with `python benchmarks/json_codecs.py`.
+"""
+
+import argparse
+import time
+import typing
+
+import httpx
+
+from zep_cloud import EntityEdge, EntityNode, EpisodeData
+from zep_cloud.client import Zep
+from zep_cloud.core.json_codec import JsonCodec, get_json_codec
+from zep_cloud.core.jsonable_encoder import jsonable_encoder
+
+
+def search_response(size: int) -> bytes:
+    edges = [
+        EntityEdge(
+            uuid_=f"edge-{i}",
+            name="LIKES",
+            fact=f"Person {i} likes place {i % 17}, according to a conversation held on a Tuesday",
+            source_node_uuid=f"node-{i}",
+            target_node_uuid=f"node-{i % 17}",
+            created_at="2024-01-01T00:00:00Z",
+            episodes=[f"ep-{i}", f"ep-{i + 1}"],
+            attributes={"since": 2000 + i, "confidence": 0.87},
+            score=1.0 / (i + 1),
+        ).dict()
+        for i in range(size)
+    ]
+    nodes = [
+        EntityNode(
+            uuid_=f"node-{i}",
+            name=f"Node {i}",
+            summary="A person who likes places. " * 8,
+            created_at="2024-01-01T00:00:00Z",
+            labels=["Entity", "Person"],
+        ).dict()
+        for i in range(size)
+    ]
+    return JsonCodec().dumps({"context": None, "edges": edges, "nodes": nodes})
+
+
+def batch_episodes(size: int) -> typing.List[EpisodeData]:
+    return [
+        EpisodeData(
+            data=f"User {i} said they are planning a trip to Lisbon in May and prefer window seats. " * 20,
+            type="text",
+            created_at="2024-01-01T00:00:00Z",
+            source_description="chat",
+            metadata={"index": i, "tags": ["travel", "preferences"]},
+        )
+        for i in range(size)
+    ]
+
+
+def best_of(fn: typing.Callable[[], typing.Any], repeat: int, number: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1e6
+
+
+def make_client(codec: JsonCodec, response: bytes) -> Zep:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/graph/search"):
+            return httpx.Response(200, content=response)
+        return httpx.Response(200, content=b"[]")
+
+    return Zep(
+        api_key="bench",
+        base_url="https://api.test/api/v2",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        json_codec=codec,
+    )
+
+
+def run(results: int, episodes: int, repeat: int, number: int) -> None:
+    response = search_response(results)
+    batch = batch_episodes(episodes)
+    body = jsonable_encoder({"episodes": batch, "graph_id": "g1"})
+    codecs = []
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            codecs.append(get_json_codec(name))  # type: ignore[arg-type]
+        except ImportError:
+            print(f"{name} is not installed, skipping")
+
+    print(
+        f"search response {len(response) / 1024:.0f} KiB, batch request {len(JsonCodec().dumps(body)) / 1024:.0f} KiB"
+    )
+    print(f"{'codec':>8} {'encode us':>10} {'decode us':>10} {'add_batch us':>13} {'search us':>10}")
+    for codec in codecs:
+        client = make_client(codec, response)
+        encode = best_of(lambda: codec.dumps(body), repeat, number)
+        decode = best_of(lambda: codec.loads(response), repeat, number)
+        ingest = best_of(lambda: client.graph.add_batch(episodes=batch, graph_id="g1"), repeat, number)
+        search = best_of(lambda: client.graph.search(query="trips", graph_id="g1"), repeat, number)
+        print(f"{codec.name:>8} {encode:>10.0f} {decode:>10.0f} {ingest:>13.0f} {search:>10.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--results", type=int, default=50, help="edges and nodes in the search response")
+    parser.add_argument("--episodes", type=int, default=20, help="episodes in the add_batch request")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    arguments = parser.parse_args()
+    run(arguments.results, arguments.episodes, arguments.repeat, arguments.number)
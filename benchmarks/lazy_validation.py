@@ -0,0 +1,77 @@
+"""
+Compares eager parse_obj_as against parse_lazy for GraphSearchResults payloads of 50, 500 and 5000 edges.
+
+Reports the time to parse the response, to read the first five edges, and to touch every edge, so the benefit of
+lazy validation for the common "look at the top results" pattern and its overhead when everything is read are both
+visible. Run with `python benchmarks/lazy_validation.py`.
+"""
+
+import argparse
+import json
+import time
+import typing
+
+from zep_cloud import EntityEdge, GraphSearchResults
+from zep_cloud.core.pydantic_utilities import parse_obj_as
+from zep_cloud.local import materialize, parse_lazy
+
+
+def payload(size: int) -> bytes:
+    edges = [
+        EntityEdge(
+            uuid_=f"edge-{i}",
+            name="LIKES",
+            fact=f"Person {i} likes place {i % 97}",
+            source_node_uuid=f"node-{i}",
+            target_node_uuid=f"node-{i % 97}",
+            created_at="2024-01-01T00:00:00Z",
+            valid_at="2024-01-02T00:00:00Z",
+            episodes=[f"ep-{i}"],
+            attributes={"since": 2000 + i % 20},
+            score=1.0 / (i + 1),
+        ).dict()
+        for i in range(size)
+    ]
+    return json.dumps({"context": None, "edges": edges}).encode()
+
+
+def measure(fn: typing.Callable[[], typing.Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(sizes: typing.Sequence[int], repeat: int) -> None:
+    print(f"{'edges':>6} {'mode':>6} {'parse ms':>10} {'top 5 ms':>10} {'all ms':>10}")
+    for size in sizes:
+        data = payload(size)
+
+        def eager(touch: typing.Optional[int]) -> None:
+            results = parse_obj_as(GraphSearchResults, json.loads(data))
+            for edge in (results.edges or [])[:touch]:
+                edge.fact
+
+        def lazy(touch: typing.Optional[int]) -> None:
+            results = parse_lazy(GraphSearchResults, json.loads(data))
+            for edge in (results.edges or [])[:touch]:
+                edge.fact
+
+        for mode, fn in (("eager", eager), ("lazy", lazy)):
+            print(
+                f"{size:>6} {mode:>6} {measure(lambda: fn(0), repeat):>10.2f} "
+                f"{measure(lambda: fn(5), repeat):>10.2f} {measure(lambda: fn(None), repeat):>10.2f}"
+            )
+        assert materialize(parse_lazy(GraphSearchResults, json.loads(data))) == parse_obj_as(
+            GraphSearchResults, json.loads(data)
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+    run(arguments.sizes, arguments.repeat)
@@ -0,0 +1,86 @@
+"""
+Measures request body compression on graph.add_batch and thread.add_messages_batch payloads.
+
+For gzip and zstd at a few levels the script reports the compressed size, the time to compress, and the time to
+compress and upload the body at the given uplink bandwidths, against sending it uncompressed. Bodies are built from
+seeded random sentences so they compress like chat text rather than like a repeated string. Run with
+`python benchmarks/request_compression.py`.
+"""
+
+import argparse
+import random
+import time
+import typing
+
+from zep_cloud import EpisodeData, Message
+from zep_cloud.core.compression import RequestCompression
+from zep_cloud.core.json_codec import get_json_codec
+from zep_cloud.core.jsonable_encoder import jsonable_encoder
+
+WORDS = (
+    "the a user said they want to book flight hotel Lisbon May window seat prefers vegetarian meals budget "
+    "around hundred euros night meeting colleague Tuesday project deadline report review coffee morning "
+    "allergic peanuts birthday sister gift ideas running shoes marathon training plan weekend"
+).split()
+
+
+def sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize() + "."
+
+
+def payloads(size: int) -> typing.Dict[str, bytes]:
+    rng = random.Random(0)
+    codec = get_json_codec()
+    episodes = [
+        EpisodeData(
+            data=" ".join(sentence(rng) for _ in range(10)),
+            type="text",
+            created_at="2024-01-01T00:00:00Z",
+            source_description="chat",
+            metadata={"index": i},
+        )
+        for i in range(size)
+    ]
+    messages = [Message(content=sentence(rng), role="user" if i % 2 else "assistant", name="Jane") for i in range(size)]
+    return {
+        "add_batch": codec.dumps(jsonable_encoder({"episodes": episodes, "graph_id": "g1"})),
+        "add_messages_batch": codec.dumps(jsonable_encoder({"messages": messages})),
+    }
+
+
+def best_of(fn: typing.Callable[[], typing.Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(size: int, bandwidths: typing.List[float], repeat: int) -> None:
+    settings: typing.List[RequestCompression] = [RequestCompression(algorithm="gzip", level=level) for level in (1, 6)]
+    try:
+        settings += [RequestCompression(algorithm="zstd", level=level) for level in (1, 3, 9)]
+    except ImportError:
+        print("zstandard is not installed, skipping zstd")
+
+    for name, body in payloads(size).items():
+        print(f"\n{name}: {len(body) / 1024:.0f} KiB uncompressed")
+        header = " ".join(f"{f'{mbit:g} Mbit/s ms':>14}" for mbit in bandwidths)
+        print(f"{'encoding':>10} {'KiB':>7} {'ratio':>6} {'compress ms':>12} {header}")
+        rows = [("identity", len(body), 0.0)]
+        for compression in settings:
+            seconds = best_of(lambda: compression.compress(body), repeat)
+            rows.append((f"{compression.algorithm}-{compression.level}", len(compression.compress(body)), seconds))
+        for label, length, seconds in rows:
+            uploads = " ".join(f"{(seconds + length * 8 / (mbit * 1e6)) * 1e3:>14.1f}" for mbit in bandwidths)
+            print(f"{label:>10} {length / 1024:>7.0f} {len(body) / length:>6.1f} {seconds * 1e3:>12.2f} {uploads}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=500, help="episodes and messages per batch")
+    parser.add_argument("--bandwidth", type=float, nargs="+", default=[10.0, 100.0, 1000.0], help="uplink Mbit/s")
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+    run(arguments.size, arguments.bandwidth, arguments.repeat)
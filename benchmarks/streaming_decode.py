@@ -0,0 +1,83 @@
+"""
+Compares the eager decoding of graph.edge.get_by_graph_id with stream_page for large edge pages.
+
+The response is served in 64 KiB chunks from an httpx.MockTransport, so the numbers measure decoding and validation
+rather than the network. For each page size the script reports the time to the first edge, the total time and the
+peak memory traced by tracemalloc while reading the page. Run with `python benchmarks/streaming_decode.py`.
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+import typing
+
+import httpx
+
+from zep_cloud import EntityEdge
+from zep_cloud.client import Zep
+from zep_cloud.local import stream_page
+
+CHUNK_SIZE = 64 * 1024
+
+
+def make_client(size: int) -> Zep:
+    body = json.dumps(
+        [
+            EntityEdge(
+                uuid_=f"edge-{i:08d}",
+                name="LIKES",
+                fact=f"Person {i} likes place {i % 97}",
+                source_node_uuid=f"node-{i}",
+                target_node_uuid=f"node-{i % 97}",
+                created_at="2024-01-01T00:00:00Z",
+                episodes=[f"ep-{i}"],
+                attributes={"since": 2000 + i % 20},
+            ).dict()
+            for i in range(size)
+        ]
+    ).encode()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=iter([body[i : i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE)]))
+
+    return Zep(
+        api_key="bench",
+        base_url="https://api.test/api/v2",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+
+def measure(items: typing.Callable[[], typing.Iterable[typing.Any]]) -> typing.Tuple[float, float, float]:
+    # Timing and memory are measured in separate passes, since tracemalloc slows allocation-heavy code severalfold
+    start = time.perf_counter()
+    first = None
+    for _ in items():
+        if first is None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    tracemalloc.start()
+    for _ in items():
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (first or total) * 1000, total * 1000, peak / 2**20
+
+
+def run(sizes: typing.Sequence[int]) -> None:
+    print(f"{'edges':>7} {'mode':>7} {'first ms':>10} {'total ms':>10} {'peak MiB':>10}")
+    for size in sizes:
+        client = make_client(size)
+        modes = {
+            "eager": lambda: client.graph.edge.get_by_graph_id("g1", limit=size),
+            "stream": lambda: stream_page(client, "edges", graph_id="g1", limit=size),
+        }
+        for mode, items in modes.items():
+            first, total, peak = measure(items)
+            print(f"{size:>7} {mode:>7} {first:>10.1f} {total:>10.1f} {peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    run(parser.parse_args().sizes)
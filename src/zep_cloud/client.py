@@ -1,27 +1,85 @@
+import functools
 import os
+import time
 import typing
 
 import httpx
 from .base_client import AsyncBaseClient, BaseClient
+from .core.compression import CompressionAlgorithm, RequestCompression, accept_encoding_header, resolve_compression
+from .core.deadline import attempt_timeout
+from .core.hedging import Hedger, HedgingPolicy, HedgingStats, resolve_hedging
+from .core.json_codec import JsonCodec, JsonCodecName, get_json_codec
+from .core.routing import EndpointHealth, EndpointRouter, resolve_router
 from .environment import ZepEnvironment
+from .external_clients.connection import (
+    DEFAULT_WARMUP_CONNECTIONS,
+    ConnectionOptions,
+    PoolWarmup,
+    awarm_connections,
+    resolve_httpx_client,
+    warm_connections,
+)
+from .external_clients.fanout import (
+    DEFAULT_FANOUT_WORKERS,
+    CallResult,
+    FanOut,
+    is_fatal_error,
+    resolve_concurrency,
+    stream_calls,
+)
 from .external_clients.graph import AsyncGraphClient, GraphClient
+from .external_clients.thread import AsyncThreadClient, ThreadClient
 from .external_clients.user import AsyncUserClient, UserClient
 
+T = typing.TypeVar("T")
+
 
 class Zep(BaseClient):
     def __init__(
-            self,
-            *,
-            base_url: typing.Optional[str] = None,
-            environment: ZepEnvironment = ZepEnvironment.DEFAULT,
-            api_key: typing.Optional[str] = os.getenv("ZEP_API_KEY"),
-            timeout: typing.Optional[float] = None,
-            follow_redirects: typing.Optional[bool] = None,
-            httpx_client: typing.Optional[httpx.Client] = None
+        self,
+        *,
+        base_url: typing.Optional[str] = None,
+        environment: ZepEnvironment = ZepEnvironment.DEFAULT,
+        api_key: typing.Optional[str] = os.getenv("ZEP_API_KEY"),
+        timeout: typing.Optional[float] = None,
+        follow_redirects: typing.Optional[bool] = None,
+        httpx_client: typing.Optional[httpx.Client] = None,
+        json_codec: typing.Union[JsonCodecName, JsonCodec] = "auto",
+        max_connections: typing.Optional[int] = None,
+        max_keepalive_connections: typing.Optional[int] = None,
+        keepalive_expiry: typing.Optional[float] = None,
+        http2: typing.Optional[bool] = None,
+        connect_timeout: typing.Optional[float] = None,
+        read_timeout: typing.Optional[float] = None,
+        write_timeout: typing.Optional[float] = None,
+        pool_timeout: typing.Optional[float] = None,
+        compression: typing.Union[bool, CompressionAlgorithm, RequestCompression, None] = None,
+        accept_encoding: typing.Union[str, typing.Sequence[str], None] = None,
+        hedging: typing.Union[bool, HedgingPolicy, None] = None,
+        base_urls: typing.Union[typing.Sequence[str], EndpointRouter, None] = None,
+        fanout_workers: int = DEFAULT_FANOUT_WORKERS,
     ):
         env_api_url = os.getenv("ZEP_API_URL")
         if env_api_url:
             base_url = f"{env_api_url}/api/v2"
+            if "," in env_api_url and base_urls is None:
+                base_urls = [f"{url.strip()}/api/v2" for url in env_api_url.split(",")]
+        router = resolve_router(base_urls)
+        if router is not None:
+            base_url = router.base_urls[0]
+        options = ConnectionOptions(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            write_timeout=write_timeout,
+            pool_timeout=pool_timeout,
+        )
+        httpx_client, timeouts = resolve_httpx_client(
+            httpx.Client, httpx_client, options, timeout=timeout, follow_redirects=follow_redirects
+        )
         super().__init__(
             base_url=base_url,
             environment=environment,
@@ -30,23 +88,143 @@ class Zep(BaseClient):
             follow_redirects=follow_redirects,
             httpx_client=httpx_client
         )
+        self._client_wrapper.httpx_client.json_codec = get_json_codec(json_codec)
+        self._client_wrapper.httpx_client.compressor.compression = resolve_compression(compression)
+        self._client_wrapper.httpx_client.accept_encoding = accept_encoding_header(accept_encoding)
+        self._client_wrapper.httpx_client.hedger = Hedger(resolve_hedging(hedging))
+        self._client_wrapper.httpx_client.router = router
+        self._client_wrapper.httpx_client.timeouts = timeouts
         self.user = UserClient(client_wrapper=self._client_wrapper)
         self.graph = GraphClient(client_wrapper=self._client_wrapper)
+        self.thread = ThreadClient(client_wrapper=self._client_wrapper)
+        self._fanout = FanOut(fanout_workers)
+
+    def hedging_stats(self) -> HedgingStats:
+        """Counters of the hedged requests sent with hedging enabled, including the hedge win rate."""
+        return self._client_wrapper.httpx_client.hedger.stats()
+
+    def endpoint_health(self) -> typing.List[EndpointHealth]:
+        """The health of each base URL when the client routes across several, and an empty list otherwise."""
+        router = self._client_wrapper.httpx_client.router
+        return router.health() if router is not None else []
+
+    def warmup(self, connections: int = DEFAULT_WARMUP_CONNECTIONS, *, validate: bool = True) -> PoolWarmup:
+        """
+        Opens `connections` pooled connections to the API ahead of the first requests, so that they do not pay for DNS
+        resolution and the TCP and TLS handshakes. With several base URLs, each gets that many connections. validate
+        first calls project.get, raising its error if the API key is rejected. Connections beyond
+        max_keepalive_connections are closed again as soon as they are released.
+        """
+        started = time.perf_counter()
+        validation_seconds = None
+        if validate:
+            self.project.get()
+            validation_seconds = time.perf_counter() - started
+        router = self._client_wrapper.httpx_client.router
+        return warm_connections(
+            self._client_wrapper.httpx_client.httpx_client,
+            router.base_urls if router is not None else [self._client_wrapper.get_base_url()],
+            connections,
+            headers=self._client_wrapper.get_headers(),
+            timeout=attempt_timeout(self._client_wrapper.httpx_client.default_timeout()),
+            started=started,
+            validation_seconds=validation_seconds,
+        )
+
+    def parallel(
+        self, calls: typing.Iterable[typing.Callable[[], T]], *, concurrency: typing.Optional[int] = None
+    ) -> typing.List[CallResult[T]]:
+        """
+        Runs independent SDK calls on the client's shared thread pool and returns their results in order, each holding
+        the call's value or the exception it raised. A deadline set around parallel bounds every call.
+
+        Parameters
+        ----------
+        calls : typing.Iterable[typing.Callable[[], T]]
+            Functions taking no arguments, such as functools.partial(client.graph.search, query=q, user_id=u).
+
+        concurrency : typing.Optional[int]
+            The most calls of this fan-out in flight at once, below the pool size set with fanout_workers.
+
+        Examples
+        --------
+        results = client.parallel(
+            functools.partial(client.graph.node.get, uuid_) for uuid_ in node_uuids
+        )
+        nodes = [result.value for result in results if result.ok]
+        """
+        return self._fanout.run(calls, concurrency)
+
+    def map(
+        self,
+        fn: typing.Callable[..., T],
+        *iterables: typing.Iterable[typing.Any],
+        concurrency: typing.Optional[int] = None,
+    ) -> typing.List[CallResult[T]]:
+        """Calls fn with the items of iterables, like the built-in map, through parallel."""
+        return self._fanout.run((functools.partial(fn, *args) for args in zip(*iterables)), concurrency)
+
+    def close(self) -> None:
+        """
+        Releases the client's resources: the thread pools of parallel and of hedged requests, and the connections of
+        its httpx client, including one passed as httpx_client. The client cannot be used afterwards.
+        """
+        self._fanout.close()
+        self._client_wrapper.httpx_client.hedger.close()
+        self._client_wrapper.httpx_client.httpx_client.close()
+
+    def __enter__(self) -> "Zep":
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self.close()
+
 
 class AsyncZep(AsyncBaseClient):
     def __init__(
-            self,
-            *,
-            base_url: typing.Optional[str] = None,
-            environment: ZepEnvironment = ZepEnvironment.DEFAULT,
-            api_key: typing.Optional[str] = os.getenv("ZEP_API_KEY"),
-            timeout: typing.Optional[float] = None,
-            follow_redirects: typing.Optional[bool] = None,
-            httpx_client: typing.Optional[httpx.AsyncClient] = None
+        self,
+        *,
+        base_url: typing.Optional[str] = None,
+        environment: ZepEnvironment = ZepEnvironment.DEFAULT,
+        api_key: typing.Optional[str] = os.getenv("ZEP_API_KEY"),
+        timeout: typing.Optional[float] = None,
+        follow_redirects: typing.Optional[bool] = None,
+        httpx_client: typing.Optional[httpx.AsyncClient] = None,
+        json_codec: typing.Union[JsonCodecName, JsonCodec] = "auto",
+        max_connections: typing.Optional[int] = None,
+        max_keepalive_connections: typing.Optional[int] = None,
+        keepalive_expiry: typing.Optional[float] = None,
+        http2: typing.Optional[bool] = None,
+        connect_timeout: typing.Optional[float] = None,
+        read_timeout: typing.Optional[float] = None,
+        write_timeout: typing.Optional[float] = None,
+        pool_timeout: typing.Optional[float] = None,
+        compression: typing.Union[bool, CompressionAlgorithm, RequestCompression, None] = None,
+        accept_encoding: typing.Union[str, typing.Sequence[str], None] = None,
+        hedging: typing.Union[bool, HedgingPolicy, None] = None,
+        base_urls: typing.Union[typing.Sequence[str], EndpointRouter, None] = None,
     ):
         env_api_url = os.getenv("ZEP_API_URL")
         if env_api_url:
             base_url = f"{env_api_url}/api/v2"
+            if "," in env_api_url and base_urls is None:
+                base_urls = [f"{url.strip()}/api/v2" for url in env_api_url.split(",")]
+        router = resolve_router(base_urls)
+        if router is not None:
+            base_url = router.base_urls[0]
+        options = ConnectionOptions(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            write_timeout=write_timeout,
+            pool_timeout=pool_timeout,
+        )
+        httpx_client, timeouts = resolve_httpx_client(
+            httpx.AsyncClient, httpx_client, options, timeout=timeout, follow_redirects=follow_redirects
+        )
         super().__init__(
             base_url=base_url,
             environment=environment,
@@ -55,5 +233,131 @@ class AsyncZep(AsyncBaseClient):
             follow_redirects=follow_redirects,
             httpx_client=httpx_client
         )
+        self._client_wrapper.httpx_client.json_codec = get_json_codec(json_codec)
+        self._client_wrapper.httpx_client.compressor.compression = resolve_compression(compression)
+        self._client_wrapper.httpx_client.accept_encoding = accept_encoding_header(accept_encoding)
+        self._client_wrapper.httpx_client.hedger = Hedger(resolve_hedging(hedging))
+        self._client_wrapper.httpx_client.router = router
+        self._client_wrapper.httpx_client.timeouts = timeouts
         self.user = AsyncUserClient(client_wrapper=self._client_wrapper)
         self.graph = AsyncGraphClient(client_wrapper=self._client_wrapper)
+        self.thread = AsyncThreadClient(client_wrapper=self._client_wrapper)
+
+    def hedging_stats(self) -> HedgingStats:
+        """Counters of the hedged requests sent with hedging enabled, including the hedge win rate."""
+        return self._client_wrapper.httpx_client.hedger.stats()
+
+    def endpoint_health(self) -> typing.List[EndpointHealth]:
+        """The health of each base URL when the client routes across several, and an empty list otherwise."""
+        router = self._client_wrapper.httpx_client.router
+        return router.health() if router is not None else []
+
+    async def warmup(self, connections: int = DEFAULT_WARMUP_CONNECTIONS, *, validate: bool = True) -> PoolWarmup:
+        """
+        Opens `connections` pooled connections to the API ahead of the first requests, so that they do not pay for DNS
+        resolution and the TCP and TLS handshakes. With several base URLs, each gets that many connections. validate
+        first calls project.get, raising its error if the API key is rejected. Connections beyond
+        max_keepalive_connections are closed again as soon as they are released.
+        """
+        started = time.perf_counter()
+        validation_seconds = None
+        if validate:
+            await self.project.get()
+            validation_seconds = time.perf_counter() - started
+        router = self._client_wrapper.httpx_client.router
+        return await awarm_connections(
+            self._client_wrapper.httpx_client.httpx_client,
+            router.base_urls if router is not None else [self._client_wrapper.get_base_url()],
+            connections,
+            headers=self._client_wrapper.get_headers(),
+            timeout=attempt_timeout(self._client_wrapper.httpx_client.default_timeout()),
+            started=started,
+            validation_seconds=validation_seconds,
+        )
+
+    async def gather(
+        self,
+        calls: typing.Iterable[typing.Callable[[], typing.Awaitable[T]]],
+        *,
+        concurrency: typing.Optional[int] = None,
+        retries: int = 0,
+        cancel_on: typing.Optional[typing.Callable[[Exception], bool]] = is_fatal_error,
+    ) -> typing.List[CallResult[T]]:
+        """
+        Runs independent SDK calls concurrently on the running event loop and returns their results in order, each
+        holding the call's value or the exception it raised.
+
+        Parameters
+        ----------
+        calls : typing.Iterable[typing.Callable[[], typing.Awaitable[T]]]
+            Functions taking no arguments and returning an awaitable, such as
+            functools.partial(client.graph.search, query=q, user_id=u).
+
+        concurrency : typing.Optional[int]
+            The most calls in flight at once; 32 by default, and never more than the connection pool's limit.
+
+        retries : int
+            How many times a call failing with a transport error or a retryable status is retried, on top of the
+            retries of its requests.
+
+        cancel_on : typing.Optional[typing.Callable[[Exception], bool]]
+            Errors for which the calls in flight are cancelled and the error raised; by default a rejected API key or
+            a passed deadline. None keeps every error in the results.
+
+        Examples
+        --------
+        results = await client.gather(
+            functools.partial(client.graph.node.get, uuid_) for uuid_ in node_uuids
+        )
+        nodes = [result.value for result in results if result.ok]
+        """
+        return [
+            result
+            async for result in stream_calls(
+                calls,
+                concurrency=resolve_concurrency(concurrency, self._client_wrapper.httpx_client.httpx_client),
+                retries=retries,
+                cancel_on=cancel_on,
+            )
+        ]
+
+    def map(
+        self,
+        fn: typing.Callable[..., typing.Awaitable[T]],
+        *iterables: typing.Iterable[typing.Any],
+        concurrency: typing.Optional[int] = None,
+        retries: int = 0,
+        ordered: bool = True,
+        cancel_on: typing.Optional[typing.Callable[[Exception], bool]] = is_fatal_error,
+    ) -> typing.AsyncIterator[CallResult[T]]:
+        """
+        Calls fn with the items of iterables, like the built-in map, and streams the results, in order or, with
+        ordered=False, as they complete. The iterables are consumed as calls finish, so they may be long or lazy.
+        Stopping the iteration cancels the calls in flight. The other parameters are those of gather.
+
+        Examples
+        --------
+        async for result in client.map(client.user.get, user_ids, ordered=False):
+            print(user_ids[result.index], result.ok)
+        """
+        return stream_calls(
+            (functools.partial(fn, *args) for args in zip(*iterables)),
+            concurrency=resolve_concurrency(concurrency, self._client_wrapper.httpx_client.httpx_client),
+            retries=retries,
+            ordered=ordered,
+            cancel_on=cancel_on,
+        )
+
+    async def aclose(self) -> None:
+        """
+        Releases the client's resources: the thread pool of hedged requests and the connections of its httpx client,
+        including one passed as httpx_client. The client cannot be used afterwards.
+        """
+        self._client_wrapper.httpx_client.hedger.close()
+        await self._client_wrapper.httpx_client.httpx_client.aclose()
+
+    async def __aenter__(self) -> "AsyncZep":
+        return self
+
+    async def __aexit__(self, *exc_info: typing.Any) -> None:
+        await self.aclose()
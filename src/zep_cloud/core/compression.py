@@ -0,0 +1,162 @@
+"""
+Opt-in request body compression and response Accept-Encoding preferences for HttpClient and AsyncHttpClient.
+
+Bulk ingestion requests (graph.add, graph.add_batch, thread.add_messages and thread.add_messages_batch) carry large
+text payloads that compress well. RequestCompression compresses the encoded JSON body of matching endpoints with gzip
+or zstd once it exceeds a size threshold, and sets Content-Encoding accordingly. Compression is deterministic, so a
+retried request sends the same bytes as the first attempt. A server that rejects a compressed body with 415
+Unsupported Media Type gets the request again uncompressed, and that endpoint is sent uncompressed from then on.
+
+accept_encoding_header builds the Accept-Encoding sent with every request, so large list reads can ask for zstd or
+gzip responses, or for none at all. httpx decodes the response transparently; encodings it cannot decode in this
+environment are rejected up front.
+"""
+
+import fnmatch
+import gzip
+import typing
+from dataclasses import dataclass
+
+import httpx
+from .optional import import_zstandard
+
+CompressionAlgorithm = typing.Literal["gzip", "zstd"]
+
+DEFAULT_COMPRESSION_THRESHOLD = 16 * 1024
+
+DEFAULT_COMPRESSED_ENDPOINTS: typing.Tuple[str, ...] = (
+    "POST graph",
+    "POST graph-batch",
+    "POST threads/*/messages",
+    "POST threads/*/messages-batch",
+)
+
+
+@dataclass(frozen=True)
+class RequestCompression:
+    """
+    Which request bodies to compress, and how.
+
+    Parameters
+    ----------
+    algorithm : typing.Literal["gzip", "zstd"]
+        The Content-Encoding to compress with. zstd requires the zstandard package.
+
+    threshold : int
+        Bodies smaller than this many bytes are sent uncompressed.
+
+    level : typing.Optional[int]
+        The compression level; defaults to 1 for gzip and 3 for zstd, which cost a few milliseconds per 500 KiB.
+        Higher levels save little more and can take longer than uploading the difference.
+
+    endpoints : typing.Sequence[str]
+        The endpoints to compress, as "METHOD path" or "path" glob patterns relative to the base url, e.g.
+        "POST threads/*/messages-batch". Defaults to the bulk ingestion endpoints.
+    """
+
+    algorithm: CompressionAlgorithm = "gzip"
+    threshold: int = DEFAULT_COMPRESSION_THRESHOLD
+    level: typing.Optional[int] = None
+    endpoints: typing.Sequence[str] = DEFAULT_COMPRESSED_ENDPOINTS
+
+    def __post_init__(self) -> None:
+        if self.algorithm not in ("gzip", "zstd"):
+            raise ValueError(f"Unsupported compression algorithm {self.algorithm!r}, expected gzip or zstd")
+        if self.algorithm == "zstd":
+            import_zstandard()
+
+    def applies(self, method: str, path: typing.Optional[str]) -> bool:
+        return self.endpoint(method, path) is not None
+
+    def endpoint(self, method: str, path: typing.Optional[str]) -> typing.Optional[str]:
+        """The first of endpoints that matches the request, or None."""
+        target = f"{method.upper()} {path or ''}"
+        for pattern in self.endpoints:
+            if fnmatch.fnmatchcase(target, pattern if " " in pattern else f"* {pattern}"):
+                return pattern
+        return None
+
+    def compress(self, body: bytes) -> bytes:
+        if self.algorithm == "zstd":
+            return import_zstandard().ZstdCompressor(level=self.level if self.level is not None else 3).compress(body)
+        # mtime=0 keeps the output identical across retries
+        return gzip.compress(body, compresslevel=self.level if self.level is not None else 1, mtime=0)
+
+
+def resolve_compression(
+    compression: typing.Union[bool, CompressionAlgorithm, RequestCompression, None],
+) -> typing.Optional[RequestCompression]:
+    """Accepts True for gzip with the defaults, an algorithm name, a RequestCompression, or False/None to disable."""
+    if compression is None or compression is False:
+        return None
+    if compression is True:
+        return RequestCompression()
+    if isinstance(compression, RequestCompression):
+        return compression
+    return RequestCompression(algorithm=compression)
+
+
+def accept_encoding_header(accept_encoding: typing.Union[str, typing.Sequence[str], None]) -> typing.Optional[str]:
+    """
+    Validates an Accept-Encoding preference, given as a header value or a list of encodings in order of preference,
+    and returns the header value, or None to keep httpx's default.
+    """
+    if accept_encoding is None:
+        return None
+    encodings = accept_encoding.split(",") if isinstance(accept_encoding, str) else list(accept_encoding)
+    supported = httpx._decoders.SUPPORTED_DECODERS  # type: ignore[attr-defined]
+    for encoding in encodings:
+        name = encoding.split(";")[0].strip().lower()
+        if name not in supported and name != "*":
+            raise ValueError(f"httpx cannot decode {name!r} responses here; supported: {', '.join(supported)}")
+    return ", ".join(encoding.strip() for encoding in encodings)
+
+
+class BodyCompressor:
+    """
+    Per-client compression state: the configuration plus the endpoint patterns found not to accept compressed bodies,
+    so one rejection covers every thread matched by "POST threads/*/messages".
+    """
+
+    def __init__(self, compression: typing.Optional[RequestCompression]) -> None:
+        self.compression = compression
+        self._rejected: typing.Set[str] = set()
+
+    def compress(
+        self,
+        method: str,
+        path: typing.Optional[str],
+        content: typing.Optional[typing.Any],
+        headers: typing.Mapping[str, typing.Any],
+    ) -> typing.Tuple[typing.Optional[typing.Any], typing.Dict[str, str]]:
+        """
+        Returns the body to send and the headers to add for it. Only encoded bytes bodies are compressed, and never
+        when the caller's headers already set a Content-Encoding.
+        """
+        compression = self.compression
+        if (
+            compression is None
+            or not isinstance(content, bytes)
+            or len(content) < compression.threshold
+            or any(name.lower() == "content-encoding" for name in headers)
+        ):
+            return content, {}
+        endpoint = compression.endpoint(method, path)
+        if endpoint is None or endpoint in self._rejected:
+            return content, {}
+        compressed = compression.compress(content)
+        if len(compressed) >= len(content):
+            return content, {}
+        return compressed, {"content-encoding": compression.algorithm}
+
+    def rejected(
+        self, method: str, path: typing.Optional[str], encoding_headers: typing.Mapping[str, str], status: int
+    ) -> bool:
+        """Records and reports a compressed request rejected with 415 Unsupported Media Type."""
+        if status != 415 or not encoding_headers or self.compression is None:
+            return False
+        endpoint = self.compression.endpoint(method, path)
+        if endpoint is None:
+            return False
+        self._rejected.add(endpoint)
+        return True
@@ -0,0 +1,96 @@
+"""
+End-to-end deadlines for SDK calls.
+
+RequestOptions.timeout_in_seconds bounds each HTTP attempt, so a call that retries with backoff, or a helper that
+makes many calls, can run for several times its timeout. A deadline bounds everything started inside a block instead:
+
+    with deadline(2.0):
+        results = client.graph.search(query="...", user_id="user-1", request_options={"max_retries": 3})
+
+HttpClient and AsyncHttpClient consult the deadline of the current context before every attempt. Each attempt's
+timeout is capped at the time remaining, a retry whose backoff would leave too little time for another attempt is
+skipped and the last response is returned as if retries were exhausted, and an attempt started after the deadline
+raises DeadlineExceeded. The deadline lives in a context variable, so it follows the code that makes the calls:
+pagination helpers iterated inside the block, asyncio tasks created inside it, and the thread pools of the bulk
+helpers, which run their calls in a copy of the submitting context. Nested deadlines can only shorten the budget.
+"""
+
+import contextlib
+import contextvars
+import time
+import typing
+
+import httpx
+
+# A retry is skipped unless at least this many seconds would remain for it after its backoff
+MIN_ATTEMPT_SECONDS = 0.05
+
+_deadline: contextvars.ContextVar[typing.Optional[float]] = contextvars.ContextVar("zep_deadline", default=None)
+
+
+class DeadlineExceeded(httpx.TimeoutException):
+    """Raised when a request would start after the deadline of the current context has passed."""
+
+    def __init__(self, message: str = "The deadline passed before the request could be sent") -> None:
+        super().__init__(message)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float) -> typing.Iterator[float]:
+    """
+    Bounds every request made inside the block to finish within seconds from now.
+
+    Parameters
+    ----------
+    seconds : float
+        The budget for everything inside the block. An enclosing deadline that ends sooner still applies.
+
+    Yields
+    ------
+    float
+        The deadline as a time.monotonic() value.
+    """
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        at = min(at, current)
+    token = _deadline.set(at)
+    try:
+        yield at
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> typing.Optional[float]:
+    """The seconds left before the deadline of the current context, which may be negative, or None without one."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def _cap(timeout: typing.Optional[float], left: float) -> float:
+    return left if timeout is None else min(timeout, left)
+
+
+def attempt_timeout(
+    timeout: typing.Union[float, httpx.Timeout, None],
+) -> typing.Union[float, httpx.Timeout, None]:
+    """Caps the timeout of one attempt, a number or per-phase httpx.Timeout, at the time remaining."""
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded()
+    if isinstance(timeout, httpx.Timeout):
+        return httpx.Timeout(
+            connect=_cap(timeout.connect, left),
+            read=_cap(timeout.read, left),
+            write=_cap(timeout.write, left),
+            pool=_cap(timeout.pool, left),
+        )
+    return _cap(timeout, left)
+
+
+def retry_allowed(delay: float) -> bool:
+    """Whether a retry after sleeping delay seconds could still run before the deadline."""
+    left = remaining()
+    return left is None or left - delay >= MIN_ATTEMPT_SECONDS
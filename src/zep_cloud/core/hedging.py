@@ -0,0 +1,278 @@
+"""
+Hedged requests for latency-critical reads.
+
+The tail latency of graph.search and thread.get_user_context is dominated by the occasional slow backend rather than
+by the typical request. With hedging enabled, a request to one of the hedged endpoints that has not completed after
+a delay, the chosen percentile of that endpoint's recent latencies, is sent a second time. The first successful
+response wins and the other attempt is cancelled: AsyncHttpClient cancels its task, HttpClient, whose attempts run on
+a small thread pool, abandons it and discards its response when it completes. An attempt that fails, with an error or
+a 5xx or 429 response, does not win: an unhealthy backend typically answers fast, and the other attempt is awaited
+instead. When both attempts fail, the primary's outcome is returned.
+
+Only idempotent reads should be hedged; the default endpoints are the search and context reads. Hedges are paid for
+from a budget that grows by max_extra_load with every hedgeable request, so they never add more than that fraction of
+extra load, plus a small burst. No request is hedged until min_samples latencies of its endpoint have been seen,
+unless initial_delay is given.
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import contextvars
+import fnmatch
+import threading
+import time
+import typing
+from dataclasses import dataclass
+
+import httpx
+
+DEFAULT_HEDGED_ENDPOINTS: typing.Tuple[str, ...] = ("POST graph/search", "GET threads/*/context")
+
+_LATENCY_SAMPLES = 512
+# The hedge delay is recomputed from the latency samples every this many requests
+_RECOMPUTE_EVERY = 16
+
+
+@dataclass(frozen=True)
+class HedgingPolicy:
+    """
+    Which requests to hedge, and when.
+
+    Parameters
+    ----------
+    endpoints : typing.Sequence[str]
+        The endpoints to hedge, as "METHOD path" or "path" glob patterns relative to the base url. Only list
+        idempotent reads.
+
+    percentile : float
+        The percentile of an endpoint's recent latencies after which a request is hedged.
+
+    max_extra_load : float
+        The largest fraction of extra requests hedging may add, e.g. 0.05 for 5%.
+
+    burst : float
+        How many hedges may be sent at once when the budget has built up.
+
+    min_samples : int
+        How many latencies of an endpoint must be seen before its requests are hedged.
+
+    initial_delay : typing.Optional[float]
+        The hedge delay, in seconds, until min_samples latencies have been seen. None disables hedging until then.
+
+    min_delay : float
+        The shortest hedge delay, in seconds.
+
+    max_workers : int
+        The size of the thread pool that runs the attempts of hedged requests in HttpClient.
+    """
+
+    endpoints: typing.Sequence[str] = DEFAULT_HEDGED_ENDPOINTS
+    percentile: float = 95.0
+    max_extra_load: float = 0.05
+    burst: float = 10.0
+    min_samples: int = 20
+    initial_delay: typing.Optional[float] = None
+    min_delay: float = 0.005
+    max_workers: int = 64
+
+    def __post_init__(self) -> None:
+        if not 0 < self.percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if not 0 <= self.max_extra_load <= 1:
+            raise ValueError("max_extra_load must be between 0 and 1")
+        if self.min_samples < 1 or self.max_workers < 2:
+            raise ValueError("min_samples must be at least 1 and max_workers at least 2")
+
+    def endpoint(self, method: str, path: typing.Optional[str]) -> typing.Optional[str]:
+        """The pattern a request matches, which groups its latencies, or None if it is not hedged."""
+        target = f"{method.upper()} {path or ''}"
+        for pattern in self.endpoints:
+            if fnmatch.fnmatchcase(target, pattern if " " in pattern else f"* {pattern}"):
+                return pattern
+        return None
+
+
+@dataclass(frozen=True)
+class HedgingStats:
+    """
+    Counters of a client's hedging. requests counts hedgeable requests, hedges the second attempts sent, and
+    hedge_wins the hedges that answered first. delays holds the current hedge delay of each endpoint.
+    """
+
+    requests: int
+    hedges: int
+    hedge_wins: int
+    skipped_budget: int
+    delays: typing.Dict[str, typing.Optional[float]]
+
+    @property
+    def win_rate(self) -> typing.Optional[float]:
+        return self.hedge_wins / self.hedges if self.hedges else None
+
+    @property
+    def extra_load(self) -> typing.Optional[float]:
+        return self.hedges / self.requests if self.requests else None
+
+
+def _succeeded(attempt: typing.Any) -> bool:
+    """Whether a finished attempt, a concurrent or asyncio future, holds a response that may win the race."""
+    if attempt.exception() is not None:
+        return False
+    status = attempt.result().status_code
+    return status < 500 and status != 429
+
+
+def resolve_hedging(hedging: typing.Union[bool, HedgingPolicy, None]) -> typing.Optional[HedgingPolicy]:
+    if hedging is None or hedging is False:
+        return None
+    if hedging is True:
+        return HedgingPolicy()
+    return hedging
+
+
+class Hedger:
+    """
+    Per-client hedging state shared by the sync and async paths: latency samples, hedge delays, the hedge budget
+    and counters. A Hedger without a policy sends every request once.
+    """
+
+    def __init__(self, policy: typing.Optional[HedgingPolicy], clock: typing.Callable[[], float] = time.monotonic):
+        self.policy = policy
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._latencies: typing.Dict[str, typing.Deque[float]] = {}
+        self._delays: typing.Dict[str, float] = {}
+        self._tokens = policy.burst if policy is not None else 0.0
+        self._counters: typing.Counter[str] = collections.Counter()
+        self._recorded: typing.Counter[str] = collections.Counter()
+        self._executor: typing.Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    def _plan(
+        self, method: str, path: typing.Optional[str]
+    ) -> typing.Tuple[typing.Optional[str], typing.Optional[float]]:
+        """The endpoint pattern of a request and its hedge delay, each None when not applicable."""
+        policy = self.policy
+        endpoint = policy.endpoint(method, path) if policy is not None else None
+        if policy is None or endpoint is None:
+            return None, None
+        with self._lock:
+            self._counters["requests"] += 1
+            self._tokens = min(policy.burst, self._tokens + policy.max_extra_load)
+            return endpoint, self._delays.get(endpoint, policy.initial_delay)
+
+    def _take(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                self._counters["skipped_budget"] += 1
+                return False
+            self._tokens -= 1
+            self._counters["hedges"] += 1
+            return True
+
+    def _record(self, endpoint: str, latency: float, hedge_won: bool) -> None:
+        policy = typing.cast(HedgingPolicy, self.policy)
+        with self._lock:
+            if hedge_won:
+                self._counters["hedge_wins"] += 1
+            samples = self._latencies.get(endpoint)
+            if samples is None:
+                samples = self._latencies[endpoint] = collections.deque(maxlen=_LATENCY_SAMPLES)
+            samples.append(latency)
+            self._recorded[endpoint] += 1
+            if len(samples) >= policy.min_samples and (
+                endpoint not in self._delays or self._recorded[endpoint] % _RECOMPUTE_EVERY == 0
+            ):
+                ordered = sorted(samples)
+                index = min(len(ordered) - 1, int(len(ordered) * policy.percentile / 100))
+                self._delays[endpoint] = max(policy.min_delay, ordered[index])
+
+    def stats(self) -> HedgingStats:
+        with self._lock:
+            c = self._counters
+            return HedgingStats(
+                requests=c["requests"],
+                hedges=c["hedges"],
+                hedge_wins=c["hedge_wins"],
+                skipped_budget=c["skipped_budget"],
+                delays={endpoint: self._delays.get(endpoint) for endpoint in self._latencies},
+            )
+
+    def _pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=typing.cast(HedgingPolicy, self.policy).max_workers, thread_name_prefix="zep-hedge"
+                )
+            return self._executor
+
+    def send(
+        self, method: str, path: typing.Optional[str], send: typing.Callable[[], httpx.Response]
+    ) -> httpx.Response:
+        """Sends a request with HttpClient, hedging it if the policy says so."""
+        endpoint, delay = self._plan(method, path)
+        if endpoint is None:
+            return send()
+        start = self._clock()
+        if delay is None:
+            response = send()
+            self._record(endpoint, self._clock() - start, False)
+            return response
+
+        pool = self._pool()
+        # Attempts run in a copy of the caller's context, so a deadline set by the caller still applies to them
+        primary = pool.submit(contextvars.copy_context().run, send)
+        attempts = [primary]
+        if not concurrent.futures.wait(attempts, timeout=delay).done and self._take():
+            attempts.append(pool.submit(contextvars.copy_context().run, send))
+        pending: typing.Set["concurrent.futures.Future[httpx.Response]"] = set(attempts)
+        winner = None
+        while winner is None:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            winner = next((future for future in attempts if future in done and _succeeded(future)), None)
+            if winner is None and not pending:
+                # Every attempt failed: return the primary's response or raise its error, as an unhedged request would
+                return primary.result()
+        for future in attempts:
+            future.cancel()
+        self._record(endpoint, self._clock() - start, winner is not primary)
+        return winner.result()
+
+    async def asend(
+        self, method: str, path: typing.Optional[str], send: typing.Callable[[], typing.Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """Async counterpart of send. The losing attempt's task is cancelled."""
+        endpoint, delay = self._plan(method, path)
+        if endpoint is None:
+            return await send()
+        start = self._clock()
+        if delay is None:
+            response = await send()
+            self._record(endpoint, self._clock() - start, False)
+            return response
+
+        primary = asyncio.ensure_future(send())
+        attempts: typing.List["asyncio.Future[httpx.Response]"] = [primary]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if not done and self._take():
+                attempts.append(asyncio.ensure_future(send()))
+            pending: typing.Set["asyncio.Future[httpx.Response]"] = set(attempts)
+            winner = None
+            while winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in attempts if task in done and _succeeded(task)), None)
+                if winner is None and not pending:
+                    return primary.result()
+        finally:
+            for task in attempts:
+                task.cancel()
+        self._record(endpoint, self._clock() - start, winner is not primary)
+        return winner.result()
+
+    def close(self) -> None:
+        """Shuts down the thread pool of HttpClient's hedged attempts, if it was started."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
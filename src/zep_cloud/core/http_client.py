@@ -2,6 +2,7 @@
 
 import asyncio
 import email.utils
+import functools
 import re
 import time
 import typing
@@ -10,12 +11,17 @@ from contextlib import asynccontextmanager, contextmanager
 from random import random
 
 import httpx
+from .compression import BodyCompressor, RequestCompression
+from .deadline import attempt_timeout, retry_allowed
 from .file import File, convert_file_dict_to_httpx_tuples
 from .force_multipart import FORCE_MULTIPART
+from .hedging import Hedger, HedgingPolicy
+from .json_codec import JsonCodec, encode_json_body, get_json_codec, use_json_codec
 from .jsonable_encoder import jsonable_encoder
 from .query_encoder import encode_query
 from .remove_none_from_dict import remove_none_from_dict
 from .request_options import RequestOptions
+from .routing import EndpointRouter, routing_key
 from httpx._types import RequestFiles
 
 INITIAL_RETRY_DELAY_SECONDS = 0.5
@@ -155,11 +161,23 @@ class HttpClient:
         base_timeout: typing.Callable[[], typing.Optional[float]],
         base_headers: typing.Callable[[], typing.Dict[str, str]],
         base_url: typing.Optional[typing.Callable[[], str]] = None,
+        json_codec: typing.Optional[JsonCodec] = None,
+        compression: typing.Optional[RequestCompression] = None,
+        accept_encoding: typing.Optional[str] = None,
+        hedging: typing.Optional[HedgingPolicy] = None,
+        router: typing.Optional[EndpointRouter] = None,
+        timeouts: typing.Optional[httpx.Timeout] = None,
     ):
         self.base_url = base_url
         self.base_timeout = base_timeout
         self.base_headers = base_headers
         self.httpx_client = httpx_client
+        self.json_codec = get_json_codec(json_codec)
+        self.compressor = BodyCompressor(compression)
+        self.accept_encoding = accept_encoding
+        self.hedger = Hedger(hedging)
+        self.router = router
+        self.timeouts = timeouts
 
     def get_base_url(self, maybe_base_url: typing.Optional[str]) -> str:
         base_url = maybe_base_url
@@ -170,6 +188,25 @@ class HttpClient:
             raise ValueError("A base_url is required to make this request, please provide one and try again.")
         return base_url
 
+    def route(
+        self,
+        base_url: typing.Optional[str],
+        path: typing.Optional[str],
+        json: typing.Optional[typing.Any],
+        failed_endpoints: typing.AbstractSet[str] = frozenset(),
+    ) -> typing.Optional[str]:
+        """The endpoint the router picks for a request, or None without a router or when base_url was given."""
+        if self.router is None or base_url is not None:
+            return None
+        return self.router.choose(routing_key(path, json), failed_endpoints)
+
+    def default_timeout(self) -> typing.Union[float, httpx.Timeout, None]:
+        """The per-phase timeouts when set, and the wrapper's timeout otherwise."""
+        return self.timeouts if self.timeouts is not None else self.base_timeout()
+
+    def default_headers(self) -> typing.Dict[str, str]:
+        return {"accept-encoding": self.accept_encoding} if self.accept_encoding is not None else {}
+
     def request(
         self,
         path: typing.Optional[str] = None,
@@ -191,13 +228,16 @@ class HttpClient:
         retries: int = 2,
         omit: typing.Optional[typing.Any] = None,
         force_multipart: typing.Optional[bool] = None,
+        failed_endpoints: typing.FrozenSet[str] = frozenset(),
     ) -> httpx.Response:
-        base_url = self.get_base_url(base_url)
+        endpoint = self.route(base_url, path, json, failed_endpoints)
+        base_url = self.get_base_url(endpoint or base_url)
         timeout = (
             request_options.get("timeout_in_seconds")
             if request_options is not None and request_options.get("timeout_in_seconds") is not None
-            else self.base_timeout()
+            else self.default_timeout()
         )
+        request_timeout: typing.Union[float, httpx.Timeout, None] = attempt_timeout(timeout)
 
         json_body, data_body = get_request_body(json=json, data=data, request_options=request_options, omit=omit)
 
@@ -210,12 +250,27 @@ class HttpClient:
         if (request_files is None or len(request_files) == 0) and force_multipart:
             request_files = FORCE_MULTIPART
 
-        response = self.httpx_client.request(
+        json_body, body_content, json_headers = encode_json_body(self.json_codec, json_body, content, request_files)
+        body_content, encoding_headers = self.compressor.compress(
+            method,
+            path,
+            body_content,
+            {
+                **(headers if headers is not None else {}),
+                **(request_options.get("additional_headers", {}) or {} if request_options is not None else {}),
+            },
+        )
+
+        send = functools.partial(
+            self.httpx_client.request,
             method=method,
             url=urllib.parse.urljoin(f"{base_url}/", path),
             headers=jsonable_encoder(
                 remove_none_from_dict(
                     {
+                        **json_headers,
+                        **encoding_headers,
+                        **self.default_headers(),
                         **self.base_headers(),
                         **(headers if headers is not None else {}),
                         **(request_options.get("additional_headers", {}) or {} if request_options is not None else {}),
@@ -241,30 +296,86 @@ class HttpClient:
             ),
             json=json_body,
             data=data_body,
-            content=content,
+            content=body_content,
             files=request_files,
-            timeout=timeout,
+            timeout=request_timeout,
         )
+        started = time.monotonic()
+        try:
+            response = self.hedger.send(method, path, send)
+        except httpx.TransportError as e:
+            if self.router is None or endpoint is None:
+                raise
+            self.router.record(endpoint, time.monotonic() - started, ok=False)
+            failed = failed_endpoints | {endpoint}
+            # A request that could not connect was never sent, so another endpoint takes it without using a retry
+            if not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)) or not self.router.has_alternative(failed):
+                raise
+            return self.request(
+                path=path,
+                method=method,
+                params=params,
+                json=json,
+                data=data,
+                content=content,
+                files=files,
+                headers=headers,
+                request_options=request_options,
+                retries=retries,
+                omit=omit,
+                force_multipart=force_multipart,
+                failed_endpoints=failed,
+            )
+        if self.router is not None and endpoint is not None:
+            self.router.record(endpoint, time.monotonic() - started, ok=response.status_code < 500)
+
+        if self.compressor.rejected(method, path, encoding_headers, response.status_code):
+            # The server does not accept compressed bodies for this endpoint; resend uncompressed without using a retry
+            return self.request(
+                path=path,
+                method=method,
+                base_url=base_url,
+                params=params,
+                json=json,
+                data=data,
+                content=content,
+                files=files,
+                headers=headers,
+                request_options=request_options,
+                retries=retries,
+                omit=omit,
+                force_multipart=force_multipart,
+            )
 
         max_retries: int = request_options.get("max_retries", 0) if request_options is not None else 0
         if _should_retry(response=response):
             if max_retries > retries:
-                time.sleep(_retry_timeout(response=response, retries=retries))
-                return self.request(
-                    path=path,
-                    method=method,
-                    base_url=base_url,
-                    params=params,
-                    json=json,
-                    content=content,
-                    files=files,
-                    headers=headers,
-                    request_options=request_options,
-                    retries=retries + 1,
-                    omit=omit,
+                failed = failed_endpoints | {endpoint} if endpoint is not None else failed_endpoints
+                retry_delay = (
+                    # Failing over to another endpoint needs none of the backoff a retry on the same one does
+                    0.0
+                    if self.router is not None and endpoint is not None and self.router.has_alternative(failed)
+                    else _retry_timeout(response=response, retries=retries)
                 )
+                # A retry that cannot finish before the deadline is skipped, returning this response instead
+                if retry_allowed(retry_delay):
+                    time.sleep(retry_delay)
+                    return self.request(
+                        path=path,
+                        method=method,
+                        base_url=base_url if endpoint is None else None,
+                        params=params,
+                        json=json,
+                        content=content,
+                        files=files,
+                        headers=headers,
+                        request_options=request_options,
+                        retries=retries + 1,
+                        omit=omit,
+                        failed_endpoints=failed,
+                    )
 
-        return response
+        return use_json_codec(response, self.json_codec)
 
     @contextmanager
     def stream(
@@ -289,12 +400,14 @@ class HttpClient:
         omit: typing.Optional[typing.Any] = None,
         force_multipart: typing.Optional[bool] = None,
     ) -> typing.Iterator[httpx.Response]:
-        base_url = self.get_base_url(base_url)
+        endpoint = self.route(base_url, path, json)
+        base_url = self.get_base_url(endpoint or base_url)
         timeout = (
             request_options.get("timeout_in_seconds")
             if request_options is not None and request_options.get("timeout_in_seconds") is not None
-            else self.base_timeout()
+            else self.default_timeout()
         )
+        request_timeout: typing.Union[float, httpx.Timeout, None] = attempt_timeout(timeout)
 
         request_files: typing.Optional[RequestFiles] = (
             convert_file_dict_to_httpx_tuples(remove_omit_from_dict(remove_none_from_dict(files), omit))
@@ -306,43 +419,67 @@ class HttpClient:
             request_files = FORCE_MULTIPART
 
         json_body, data_body = get_request_body(json=json, data=data, request_options=request_options, omit=omit)
+        json_body, body_content, json_headers = encode_json_body(self.json_codec, json_body, content, request_files)
+        body_content, encoding_headers = self.compressor.compress(
+            method,
+            path,
+            body_content,
+            {
+                **(headers if headers is not None else {}),
+                **(request_options.get("additional_headers", {}) or {} if request_options is not None else {}),
+            },
+        )
 
-        with self.httpx_client.stream(
-            method=method,
-            url=urllib.parse.urljoin(f"{base_url}/", path),
-            headers=jsonable_encoder(
-                remove_none_from_dict(
-                    {
-                        **self.base_headers(),
-                        **(headers if headers is not None else {}),
-                        **(request_options.get("additional_headers", {}) if request_options is not None else {}),
-                    }
-                )
-            ),
-            params=encode_query(
-                jsonable_encoder(
+        started = time.monotonic()
+        opened = False
+        try:
+            with self.httpx_client.stream(
+                method=method,
+                url=urllib.parse.urljoin(f"{base_url}/", path),
+                headers=jsonable_encoder(
                     remove_none_from_dict(
-                        remove_omit_from_dict(
-                            {
-                                **(params if params is not None else {}),
-                                **(
-                                    request_options.get("additional_query_parameters", {})
-                                    if request_options is not None
-                                    else {}
-                                ),
-                            },
-                            omit,
+                        {
+                            **json_headers,
+                            **encoding_headers,
+                            **self.default_headers(),
+                            **self.base_headers(),
+                            **(headers if headers is not None else {}),
+                            **(request_options.get("additional_headers", {}) if request_options is not None else {}),
+                        }
+                    )
+                ),
+                params=encode_query(
+                    jsonable_encoder(
+                        remove_none_from_dict(
+                            remove_omit_from_dict(
+                                {
+                                    **(params if params is not None else {}),
+                                    **(
+                                        request_options.get("additional_query_parameters", {})
+                                        if request_options is not None
+                                        else {}
+                                    ),
+                                },
+                                omit,
+                            )
                         )
                     )
-                )
-            ),
-            json=json_body,
-            data=data_body,
-            content=content,
-            files=request_files,
-            timeout=timeout,
-        ) as stream:
-            yield stream
+                ),
+                json=json_body,
+                data=data_body,
+                content=body_content,
+                files=request_files,
+                timeout=request_timeout,
+            ) as stream:
+                opened = True
+                if self.router is not None and endpoint is not None:
+                    self.router.record(endpoint, time.monotonic() - started, ok=stream.status_code < 500)
+                yield stream
+        except httpx.TransportError:
+            # Only a failure to open the response counts against the endpoint; the outcome of an open one is recorded above
+            if not opened and self.router is not None and endpoint is not None:
+                self.router.record(endpoint, time.monotonic() - started, ok=False)
+            raise
 
 
 class AsyncHttpClient:
@@ -353,11 +490,23 @@ class AsyncHttpClient:
         base_timeout: typing.Callable[[], typing.Optional[float]],
         base_headers: typing.Callable[[], typing.Dict[str, str]],
         base_url: typing.Optional[typing.Callable[[], str]] = None,
+        json_codec: typing.Optional[JsonCodec] = None,
+        compression: typing.Optional[RequestCompression] = None,
+        accept_encoding: typing.Optional[str] = None,
+        hedging: typing.Optional[HedgingPolicy] = None,
+        router: typing.Optional[EndpointRouter] = None,
+        timeouts: typing.Optional[httpx.Timeout] = None,
     ):
         self.base_url = base_url
         self.base_timeout = base_timeout
         self.base_headers = base_headers
         self.httpx_client = httpx_client
+        self.json_codec = get_json_codec(json_codec)
+        self.compressor = BodyCompressor(compression)
+        self.accept_encoding = accept_encoding
+        self.hedger = Hedger(hedging)
+        self.router = router
+        self.timeouts = timeouts
 
     def get_base_url(self, maybe_base_url: typing.Optional[str]) -> str:
         base_url = maybe_base_url
@@ -368,6 +517,25 @@ class AsyncHttpClient:
             raise ValueError("A base_url is required to make this request, please provide one and try again.")
         return base_url
 
+    def route(
+        self,
+        base_url: typing.Optional[str],
+        path: typing.Optional[str],
+        json: typing.Optional[typing.Any],
+        failed_endpoints: typing.AbstractSet[str] = frozenset(),
+    ) -> typing.Optional[str]:
+        """The endpoint the router picks for a request, or None without a router or when base_url was given."""
+        if self.router is None or base_url is not None:
+            return None
+        return self.router.choose(routing_key(path, json), failed_endpoints)
+
+    def default_timeout(self) -> typing.Union[float, httpx.Timeout, None]:
+        """The per-phase timeouts when set, and the wrapper's timeout otherwise."""
+        return self.timeouts if self.timeouts is not None else self.base_timeout()
+
+    def default_headers(self) -> typing.Dict[str, str]:
+        return {"accept-encoding": self.accept_encoding} if self.accept_encoding is not None else {}
+
     async def request(
         self,
         path: typing.Optional[str] = None,
@@ -389,13 +557,16 @@ class AsyncHttpClient:
         retries: int = 2,
         omit: typing.Optional[typing.Any] = None,
         force_multipart: typing.Optional[bool] = None,
+        failed_endpoints: typing.FrozenSet[str] = frozenset(),
     ) -> httpx.Response:
-        base_url = self.get_base_url(base_url)
+        endpoint = self.route(base_url, path, json, failed_endpoints)
+        base_url = self.get_base_url(endpoint or base_url)
         timeout = (
             request_options.get("timeout_in_seconds")
             if request_options is not None and request_options.get("timeout_in_seconds") is not None
-            else self.base_timeout()
+            else self.default_timeout()
         )
+        request_timeout: typing.Union[float, httpx.Timeout, None] = attempt_timeout(timeout)
 
         request_files: typing.Optional[RequestFiles] = (
             convert_file_dict_to_httpx_tuples(remove_omit_from_dict(remove_none_from_dict(files), omit))
@@ -407,14 +578,28 @@ class AsyncHttpClient:
             request_files = FORCE_MULTIPART
 
         json_body, data_body = get_request_body(json=json, data=data, request_options=request_options, omit=omit)
+        json_body, body_content, json_headers = encode_json_body(self.json_codec, json_body, content, request_files)
+        body_content, encoding_headers = self.compressor.compress(
+            method,
+            path,
+            body_content,
+            {
+                **(headers if headers is not None else {}),
+                **(request_options.get("additional_headers", {}) or {} if request_options is not None else {}),
+            },
+        )
 
         # Add the input to each of these and do None-safety checks
-        response = await self.httpx_client.request(
+        send = functools.partial(
+            self.httpx_client.request,
             method=method,
             url=urllib.parse.urljoin(f"{base_url}/", path),
             headers=jsonable_encoder(
                 remove_none_from_dict(
                     {
+                        **json_headers,
+                        **encoding_headers,
+                        **self.default_headers(),
                         **self.base_headers(),
                         **(headers if headers is not None else {}),
                         **(request_options.get("additional_headers", {}) or {} if request_options is not None else {}),
@@ -440,29 +625,85 @@ class AsyncHttpClient:
             ),
             json=json_body,
             data=data_body,
-            content=content,
+            content=body_content,
             files=request_files,
-            timeout=timeout,
+            timeout=request_timeout,
         )
+        started = time.monotonic()
+        try:
+            response = await self.hedger.asend(method, path, send)
+        except httpx.TransportError as e:
+            if self.router is None or endpoint is None:
+                raise
+            self.router.record(endpoint, time.monotonic() - started, ok=False)
+            failed = failed_endpoints | {endpoint}
+            # A request that could not connect was never sent, so another endpoint takes it without using a retry
+            if not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)) or not self.router.has_alternative(failed):
+                raise
+            return await self.request(
+                path=path,
+                method=method,
+                params=params,
+                json=json,
+                data=data,
+                content=content,
+                files=files,
+                headers=headers,
+                request_options=request_options,
+                retries=retries,
+                omit=omit,
+                force_multipart=force_multipart,
+                failed_endpoints=failed,
+            )
+        if self.router is not None and endpoint is not None:
+            self.router.record(endpoint, time.monotonic() - started, ok=response.status_code < 500)
+
+        if self.compressor.rejected(method, path, encoding_headers, response.status_code):
+            # The server does not accept compressed bodies for this endpoint; resend uncompressed without using a retry
+            return await self.request(
+                path=path,
+                method=method,
+                base_url=base_url,
+                params=params,
+                json=json,
+                data=data,
+                content=content,
+                files=files,
+                headers=headers,
+                request_options=request_options,
+                retries=retries,
+                omit=omit,
+                force_multipart=force_multipart,
+            )
 
         max_retries: int = request_options.get("max_retries", 0) if request_options is not None else 0
         if _should_retry(response=response):
             if max_retries > retries:
-                await asyncio.sleep(_retry_timeout(response=response, retries=retries))
-                return await self.request(
-                    path=path,
-                    method=method,
-                    base_url=base_url,
-                    params=params,
-                    json=json,
-                    content=content,
-                    files=files,
-                    headers=headers,
-                    request_options=request_options,
-                    retries=retries + 1,
-                    omit=omit,
+                failed = failed_endpoints | {endpoint} if endpoint is not None else failed_endpoints
+                retry_delay = (
+                    # Failing over to another endpoint needs none of the backoff a retry on the same one does
+                    0.0
+                    if self.router is not None and endpoint is not None and self.router.has_alternative(failed)
+                    else _retry_timeout(response=response, retries=retries)
                 )
-        return response
+                # A retry that cannot finish before the deadline is skipped, returning this response instead
+                if retry_allowed(retry_delay):
+                    await asyncio.sleep(retry_delay)
+                    return await self.request(
+                        path=path,
+                        method=method,
+                        base_url=base_url if endpoint is None else None,
+                        params=params,
+                        json=json,
+                        content=content,
+                        files=files,
+                        headers=headers,
+                        request_options=request_options,
+                        retries=retries + 1,
+                        omit=omit,
+                        failed_endpoints=failed,
+                    )
+        return use_json_codec(response, self.json_codec)
 
     @asynccontextmanager
     async def stream(
@@ -487,12 +728,14 @@ class AsyncHttpClient:
         omit: typing.Optional[typing.Any] = None,
         force_multipart: typing.Optional[bool] = None,
     ) -> typing.AsyncIterator[httpx.Response]:
-        base_url = self.get_base_url(base_url)
+        endpoint = self.route(base_url, path, json)
+        base_url = self.get_base_url(endpoint or base_url)
         timeout = (
             request_options.get("timeout_in_seconds")
             if request_options is not None and request_options.get("timeout_in_seconds") is not None
-            else self.base_timeout()
+            else self.default_timeout()
         )
+        request_timeout: typing.Union[float, httpx.Timeout, None] = attempt_timeout(timeout)
 
         request_files: typing.Optional[RequestFiles] = (
             convert_file_dict_to_httpx_tuples(remove_omit_from_dict(remove_none_from_dict(files), omit))
@@ -504,40 +747,64 @@ class AsyncHttpClient:
             request_files = FORCE_MULTIPART
 
         json_body, data_body = get_request_body(json=json, data=data, request_options=request_options, omit=omit)
+        json_body, body_content, json_headers = encode_json_body(self.json_codec, json_body, content, request_files)
+        body_content, encoding_headers = self.compressor.compress(
+            method,
+            path,
+            body_content,
+            {
+                **(headers if headers is not None else {}),
+                **(request_options.get("additional_headers", {}) or {} if request_options is not None else {}),
+            },
+        )
 
-        async with self.httpx_client.stream(
-            method=method,
-            url=urllib.parse.urljoin(f"{base_url}/", path),
-            headers=jsonable_encoder(
-                remove_none_from_dict(
-                    {
-                        **self.base_headers(),
-                        **(headers if headers is not None else {}),
-                        **(request_options.get("additional_headers", {}) if request_options is not None else {}),
-                    }
-                )
-            ),
-            params=encode_query(
-                jsonable_encoder(
+        started = time.monotonic()
+        opened = False
+        try:
+            async with self.httpx_client.stream(
+                method=method,
+                url=urllib.parse.urljoin(f"{base_url}/", path),
+                headers=jsonable_encoder(
                     remove_none_from_dict(
-                        remove_omit_from_dict(
-                            {
-                                **(params if params is not None else {}),
-                                **(
-                                    request_options.get("additional_query_parameters", {})
-                                    if request_options is not None
-                                    else {}
-                                ),
-                            },
-                            omit=omit,
+                        {
+                            **json_headers,
+                            **encoding_headers,
+                            **self.default_headers(),
+                            **self.base_headers(),
+                            **(headers if headers is not None else {}),
+                            **(request_options.get("additional_headers", {}) if request_options is not None else {}),
+                        }
+                    )
+                ),
+                params=encode_query(
+                    jsonable_encoder(
+                        remove_none_from_dict(
+                            remove_omit_from_dict(
+                                {
+                                    **(params if params is not None else {}),
+                                    **(
+                                        request_options.get("additional_query_parameters", {})
+                                        if request_options is not None
+                                        else {}
+                                    ),
+                                },
+                                omit=omit,
+                            )
                         )
                     )
-                )
-            ),
-            json=json_body,
-            data=data_body,
-            content=content,
-            files=request_files,
-            timeout=timeout,
-        ) as stream:
-            yield stream
+                ),
+                json=json_body,
+                data=data_body,
+                content=body_content,
+                files=request_files,
+                timeout=request_timeout,
+            ) as stream:
+                opened = True
+                if self.router is not None and endpoint is not None:
+                    self.router.record(endpoint, time.monotonic() - started, ok=stream.status_code < 500)
+                yield stream
+        except httpx.TransportError:
+            # Only a failure to open the response counts against the endpoint; the outcome of an open one is recorded above
+            if not opened and self.router is not None and endpoint is not None:
+                self.router.record(endpoint, time.monotonic() - started, ok=False)
+            raise
@@ -0,0 +1,140 @@
+"""
+Pluggable JSON encoding and decoding for HttpClient and AsyncHttpClient.
+
+Request bodies are still converted by jsonable_encoder first, so datetimes, dates, enums and models reach the codec as
+the same strings and plain values they always did; the codec only turns those values into bytes, and response bytes
+back into values. orjson and msgspec do that several times faster than the json module, so get_json_codec picks the
+first of them that is installed and falls back to the standard library otherwise.
+
+Every codec emits compact UTF-8 like httpx's own json= encoding. Values the fast codecs cannot represent, such as
+integers wider than 64 bits, fall back to the json module rather than failing, and values that are not JSON types are
+passed through jsonable_encoder.
+"""
+
+import json
+import typing
+
+import httpx
+from .jsonable_encoder import jsonable_encoder
+
+JsonCodecName = typing.Literal["auto", "orjson", "msgspec", "json"]
+
+
+class JsonCodec:
+    """Encodes values to JSON bytes and decodes JSON bytes, using the json module."""
+
+    name = "json"
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        return json.dumps(
+            obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False, default=jsonable_encoder
+        ).encode("utf-8")
+
+    def loads(self, data: typing.Union[bytes, str]) -> typing.Any:
+        return json.loads(data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+        # Datetimes and str/int subclasses such as enums go through jsonable_encoder, as they do for the json module
+        self._options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_SUBCLASS | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        try:
+            return self._orjson.dumps(obj, default=jsonable_encoder, option=self._options)
+        except self._orjson.JSONEncodeError:
+            return super().dumps(obj)
+
+    def loads(self, data: typing.Union[bytes, str]) -> typing.Any:
+        try:
+            return self._orjson.loads(data)
+        except self._orjson.JSONDecodeError:
+            # Re-raises a json.JSONDecodeError for invalid documents, and parses what orjson does not support
+            return super().loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._error = msgspec.MsgspecError
+        self._encoder = msgspec.json.Encoder(enc_hook=jsonable_encoder)
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        try:
+            return self._encoder.encode(obj)
+        except (self._error, OverflowError, TypeError):
+            return super().dumps(obj)
+
+    def loads(self, data: typing.Union[bytes, str]) -> typing.Any:
+        try:
+            return self._decoder.decode(data)
+        except self._error:
+            return super().loads(data)
+
+
+_CODECS: typing.Dict[str, typing.Type[JsonCodec]] = {"orjson": OrjsonCodec, "msgspec": MsgspecCodec, "json": JsonCodec}
+
+
+def get_json_codec(codec: typing.Union[JsonCodecName, JsonCodec, None] = "auto") -> JsonCodec:
+    """
+    Resolves a codec name to a JsonCodec. "auto" (or None) prefers orjson, then msgspec, then the json module; naming
+    a codec whose package is not installed raises ImportError. JsonCodec instances are returned unchanged.
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec is None or codec == "auto":
+        for name in ("orjson", "msgspec"):
+            try:
+                return _CODECS[name]()
+            except ImportError:
+                continue
+        return JsonCodec()
+    if codec not in _CODECS:
+        raise ValueError(f"Unknown JSON codec {codec!r}, expected one of auto, {', '.join(_CODECS)}")
+    try:
+        return _CODECS[codec]()
+    except ImportError as e:
+        raise ImportError(
+            f"The {codec} JSON codec requires the {codec} package: pip install zep-cloud[fast-json]"
+        ) from e
+
+
+def encode_json_body(
+    codec: JsonCodec,
+    json_body: typing.Optional[typing.Any],
+    content: typing.Optional[typing.Any],
+    files: typing.Optional[typing.Any],
+) -> typing.Tuple[typing.Optional[typing.Any], typing.Optional[typing.Any], typing.Dict[str, str]]:
+    """
+    Encodes a JSON request body with codec, returning the json and content arguments for httpx and the headers to
+    add. Bodies sent alongside explicit content or files are left to httpx.
+    """
+    if json_body is None or content is not None or files:
+        return json_body, content, {}
+    return None, codec.dumps(json_body), {"content-type": "application/json"}
+
+
+def use_json_codec(response: httpx.Response, codec: JsonCodec) -> httpx.Response:
+    """Makes response.json() decode the response body with codec."""
+    if type(codec) is JsonCodec:
+        return response
+
+    def decode(**kwargs: typing.Any) -> typing.Any:
+        if kwargs:
+            return httpx.Response.json(response, **kwargs)
+        return codec.loads(response.content)
+
+    response.json = decode  # type: ignore[method-assign]
+    return response
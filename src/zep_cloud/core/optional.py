@@ -0,0 +1,22 @@
+"""
+Imports of the optional dependencies installed with the SDK's extras.
+
+Optional packages are imported on first use, so the SDK imports without them and only the feature that needs one
+fails, with an ImportError naming the extra that installs it.
+"""
+
+import importlib
+import typing
+
+
+def import_optional(module: str, extra: str, feature: str) -> typing.Any:
+    """Imports module, or raises an ImportError saying that feature needs it and which extra installs it."""
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(f"{feature} requires the {module} package: pip install zep-cloud[{extra}]") from e
+
+
+def import_zstandard() -> typing.Any:
+    """The zstandard module, used for zstd request compression and zstd-compressed backups."""
+    return import_optional("zstandard", "zstd", "zstd compression")
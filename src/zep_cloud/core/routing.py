@@ -0,0 +1,283 @@
+"""
+Routing across several base URLs, such as regional endpoints or proxies, with passive health tracking.
+
+EndpointRouter keeps an exponentially weighted moving average of the latency and of the error rate of every endpoint,
+updated from the requests the client sends anyway. Each request goes to the healthy endpoint with the lowest
+latency, weighted up by its error rate. An endpoint that fails eject_after times in a row is taken out of rotation
+for a cooldown, and is then sent one request to see whether it recovered; the cooldown doubles on every failed
+recovery. An endpoint whose averages are older than probe_after seconds is likewise sent one request, so that a
+region that got faster is noticed.
+
+Transport errors and 5xx responses count as failures. HttpClient fails over to another endpoint when a request
+cannot connect, which never consumes a retry, and when a response is retryable (429, 408, 409, 5xx) and retries
+remain, without the backoff a retry on the same endpoint would wait. Requests about one user, thread, graph or task stick to the endpoint they were last routed to while it
+stays in rotation, for deployments where replicas are eventually consistent.
+"""
+
+import collections
+import re
+import threading
+import time
+import typing
+from dataclasses import dataclass
+
+DEFAULT_SMOOTHING = 0.2
+DEFAULT_EJECT_AFTER = 3
+DEFAULT_COOLDOWN = 5.0
+DEFAULT_MAX_COOLDOWN = 300.0
+DEFAULT_PROBE_AFTER = 30.0
+DEFAULT_MAX_STICKY_KEYS = 10_000
+
+# How much a 100% error rate multiplies an endpoint's latency score
+_ERROR_PENALTY = 10.0
+# A probe whose outcome was never recorded, e.g. because its request was cancelled, stops blocking others after this
+_PROBE_TIMEOUT = 60.0
+
+_KEY_PATTERNS = (
+    re.compile(r"^(users|threads|tasks)/([^/]+)"),
+    re.compile(r"^graph/[^/]+/(user|graph)/([^/]+)$"),
+)
+_KEY_PREFIXES = {"users": "user", "threads": "thread", "tasks": "task", "user": "user", "graph": "graph"}
+# graph/<name> paths that are operations rather than graph IDs
+_GRAPH_OPERATIONS = frozenset(("add-fact-triple", "clone", "create", "list-all", "patterns", "search"))
+
+
+def routing_key(path: typing.Optional[str], json: typing.Optional[typing.Any]) -> typing.Optional[str]:
+    """The user, thread, graph or task a request is about, as "user:<id>" etc., or None."""
+    if isinstance(json, typing.Mapping):
+        for field in ("user_id", "graph_id"):
+            value = json.get(field)
+            if isinstance(value, str):
+                return f"{field[:-3]}:{value}"
+    if not path:
+        return None
+    for pattern in _KEY_PATTERNS:
+        match = pattern.match(path)
+        if match is not None:
+            return f"{_KEY_PREFIXES[match.group(1)]}:{match.group(2)}"
+    if path.startswith("graph/") and path.count("/") == 1 and path[6:] not in _GRAPH_OPERATIONS:
+        return f"graph:{path[6:]}"
+    return None
+
+
+@dataclass(frozen=True)
+class EndpointHealth:
+    """The health of one endpoint as seen by an EndpointRouter. latency is in seconds and None until measured."""
+
+    base_url: str
+    healthy: bool
+    latency: typing.Optional[float]
+    error_rate: float
+    requests: int
+    failures: int
+    consecutive_failures: int
+
+
+class _Endpoint:
+    __slots__ = (
+        "base_url",
+        "latency",
+        "error_rate",
+        "requests",
+        "failures",
+        "consecutive_failures",
+        "ejected_until",
+        "cooldown",
+        "updated_at",
+        "probing",
+    )
+
+    def __init__(self, base_url: str, cooldown: float):
+        self.base_url = base_url
+        self.latency: typing.Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejected_until: typing.Optional[float] = None
+        self.cooldown = cooldown
+        self.updated_at: typing.Optional[float] = None
+        self.probing: typing.Optional[float] = None
+
+    def probe_in_flight(self, now: float) -> bool:
+        return self.probing is not None and now - self.probing < _PROBE_TIMEOUT
+
+    def score(self) -> float:
+        if self.latency is None:
+            # Unmeasured endpoints are tried first, unless they have only ever failed
+            return float("inf") if self.failures else 0.0
+        return self.latency * (1 + _ERROR_PENALTY * self.error_rate)
+
+
+class EndpointRouter:
+    """
+    Chooses a base URL for each request among several equivalent endpoints.
+
+    Parameters
+    ----------
+    base_urls : typing.Sequence[str]
+        The endpoints, in order of preference while nothing has been measured.
+
+    smoothing : float
+        The weight of the newest sample in the latency and error rate averages.
+
+    eject_after : int
+        How many consecutive failures take an endpoint out of rotation.
+
+    cooldown : float
+        How many seconds an ejected endpoint stays out of rotation at first; doubled after every failed recovery, up
+        to max_cooldown.
+
+    probe_after : typing.Optional[float]
+        Endpoints whose averages are older than this many seconds are sent one request to refresh them. None
+        disables probing.
+
+    sticky : bool
+        Whether requests about the same user, thread, graph or task go to the same endpoint.
+    """
+
+    def __init__(
+        self,
+        base_urls: typing.Sequence[str],
+        *,
+        smoothing: float = DEFAULT_SMOOTHING,
+        eject_after: int = DEFAULT_EJECT_AFTER,
+        cooldown: float = DEFAULT_COOLDOWN,
+        max_cooldown: float = DEFAULT_MAX_COOLDOWN,
+        probe_after: typing.Optional[float] = DEFAULT_PROBE_AFTER,
+        sticky: bool = True,
+        max_sticky_keys: int = DEFAULT_MAX_STICKY_KEYS,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        if not base_urls:
+            raise ValueError("At least one base URL is required")
+        if not 0 < smoothing <= 1 or eject_after < 1:
+            raise ValueError("smoothing must be in (0, 1] and eject_after at least 1")
+        self.smoothing = smoothing
+        self.eject_after = eject_after
+        self.initial_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.probe_after = probe_after
+        self.sticky = sticky
+        self.max_sticky_keys = max_sticky_keys
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._endpoints = {url: _Endpoint(url, cooldown) for url in dict.fromkeys(base_urls)}
+        self._pins: "collections.OrderedDict[str, str]" = collections.OrderedDict()
+
+    @property
+    def base_urls(self) -> typing.List[str]:
+        return list(self._endpoints)
+
+    def _available(self, endpoint: _Endpoint, now: float) -> bool:
+        if endpoint.ejected_until is None:
+            return True
+        # Once the cooldown is over, one request at a time checks whether the endpoint recovered
+        return now >= endpoint.ejected_until and not endpoint.probe_in_flight(now)
+
+    def choose(self, key: typing.Optional[str] = None, exclude: typing.AbstractSet[str] = frozenset()) -> str:
+        """
+        The base URL for a request about key, avoiding the endpoints in exclude while any other is left. With every
+        endpoint ejected, the one whose cooldown ends first is used rather than failing without trying.
+        """
+        now = self.clock()
+        with self._lock:
+            candidates = [endpoint for url, endpoint in self._endpoints.items() if url not in exclude]
+            if not candidates:
+                candidates = list(self._endpoints.values())
+            available = [endpoint for endpoint in candidates if self._available(endpoint, now)]
+            if self.sticky and key is not None:
+                pinned = self._endpoints.get(self._pins.get(key, ""))
+                if pinned is not None and pinned in available and pinned.ejected_until is None:
+                    self._pins.move_to_end(key)
+                    return pinned.base_url
+            if available:
+                stale = [
+                    endpoint
+                    for endpoint in available
+                    if endpoint.ejected_until is not None
+                    or (
+                        self.probe_after is not None
+                        and endpoint.updated_at is not None
+                        and now - endpoint.updated_at > self.probe_after
+                        and not endpoint.probe_in_flight(now)
+                    )
+                ]
+                if stale:
+                    chosen = stale[0]
+                    chosen.probing = now
+                else:
+                    chosen = min(available, key=_Endpoint.score)
+            else:
+                chosen = min(candidates, key=lambda endpoint: endpoint.ejected_until or 0.0)
+            if self.sticky and key is not None and chosen.ejected_until is None:
+                self._pins[key] = chosen.base_url
+                self._pins.move_to_end(key)
+                while len(self._pins) > self.max_sticky_keys:
+                    self._pins.popitem(last=False)
+            return chosen.base_url
+
+    def has_alternative(self, exclude: typing.AbstractSet[str]) -> bool:
+        """Whether an endpoint outside exclude is in rotation."""
+        now = self.clock()
+        with self._lock:
+            return any(
+                url not in exclude and self._available(endpoint, now) for url, endpoint in self._endpoints.items()
+            )
+
+    def record(self, base_url: str, latency: float, ok: bool) -> None:
+        """Records the outcome of a request: its latency in seconds and whether the endpoint served it."""
+        now = self.clock()
+        with self._lock:
+            endpoint = self._endpoints.get(base_url)
+            if endpoint is None:
+                return
+            endpoint.probing = None
+            endpoint.updated_at = now
+            endpoint.requests += 1
+            endpoint.error_rate += self.smoothing * ((0.0 if ok else 1.0) - endpoint.error_rate)
+            if ok:
+                endpoint.latency = (
+                    latency
+                    if endpoint.latency is None
+                    else endpoint.latency + self.smoothing * (latency - endpoint.latency)
+                )
+                endpoint.consecutive_failures = 0
+                endpoint.ejected_until = None
+                endpoint.cooldown = self.initial_cooldown
+                return
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.ejected_until is not None:
+                # A failed recovery check
+                endpoint.cooldown = min(self.max_cooldown, endpoint.cooldown * 2)
+                endpoint.ejected_until = now + endpoint.cooldown
+            elif endpoint.consecutive_failures >= self.eject_after:
+                endpoint.ejected_until = now + endpoint.cooldown
+
+    def health(self) -> typing.List[EndpointHealth]:
+        now = self.clock()
+        with self._lock:
+            return [
+                EndpointHealth(
+                    base_url=endpoint.base_url,
+                    healthy=endpoint.ejected_until is None or now >= endpoint.ejected_until,
+                    latency=endpoint.latency,
+                    error_rate=endpoint.error_rate,
+                    requests=endpoint.requests,
+                    failures=endpoint.failures,
+                    consecutive_failures=endpoint.consecutive_failures,
+                )
+                for endpoint in self._endpoints.values()
+            ]
+
+
+def resolve_router(
+    base_urls: typing.Union[typing.Sequence[str], EndpointRouter, None],
+) -> typing.Optional[EndpointRouter]:
+    """Accepts a list of base URLs, routed with the defaults, or a configured EndpointRouter."""
+    if base_urls is None or isinstance(base_urls, EndpointRouter):
+        return base_urls
+    if isinstance(base_urls, str):
+        base_urls = [base_urls]
+    return EndpointRouter(base_urls)
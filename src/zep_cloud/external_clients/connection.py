@@ -0,0 +1,281 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import time
+import typing
+import urllib.parse
+from dataclasses import dataclass
+
+import httpx
+
+# Tuned for servers that run hundreds of concurrent requests through one client. httpx's default of 100 connections
+# queues the rest, and httpcore's pool scans every connection for every queued request, so a deep queue costs more CPU
+# than the requests themselves. Keeping many idle connections alive has a similar cost, so the keep-alive pool stays
+# well below the connection limit. See benchmarks/connection_pool.py.
+DEFAULT_MAX_CONNECTIONS = 512
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 128
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+
+
+@dataclass(frozen=True)
+class ConnectionOptions:
+    """
+    Connection pool, protocol and timeout settings for the httpx client Zep and AsyncZep create.
+
+    None leaves a setting at its default: the DEFAULT_* pool limits above, read, write and pool timeouts equal to
+    timeout, and a connect timeout of at most DEFAULT_CONNECT_TIMEOUT.
+    """
+
+    max_connections: typing.Optional[int] = None
+    max_keepalive_connections: typing.Optional[int] = None
+    keepalive_expiry: typing.Optional[float] = None
+    http2: typing.Optional[bool] = None
+    connect_timeout: typing.Optional[float] = None
+    read_timeout: typing.Optional[float] = None
+    write_timeout: typing.Optional[float] = None
+    pool_timeout: typing.Optional[float] = None
+
+    @property
+    def is_default(self) -> bool:
+        return self == ConnectionOptions()
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections if self.max_connections is not None else DEFAULT_MAX_CONNECTIONS,
+            max_keepalive_connections=(
+                self.max_keepalive_connections
+                if self.max_keepalive_connections is not None
+                else DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            keepalive_expiry=self.keepalive_expiry if self.keepalive_expiry is not None else DEFAULT_KEEPALIVE_EXPIRY,
+        )
+
+    def timeouts(self, timeout: typing.Optional[float]) -> httpx.Timeout:
+        """The per-phase timeouts, with timeout as the default for each phase."""
+        default = timeout if timeout is not None else DEFAULT_TIMEOUT
+        return httpx.Timeout(
+            connect=(
+                self.connect_timeout if self.connect_timeout is not None else min(default, DEFAULT_CONNECT_TIMEOUT)
+            ),
+            read=self.read_timeout if self.read_timeout is not None else default,
+            write=self.write_timeout if self.write_timeout is not None else default,
+            pool=self.pool_timeout if self.pool_timeout is not None else default,
+        )
+
+
+@typing.overload
+def build_httpx_client(
+    client_type: typing.Type[httpx.Client],
+    options: ConnectionOptions,
+    *,
+    timeout: typing.Optional[float],
+    follow_redirects: typing.Optional[bool],
+) -> httpx.Client: ...
+
+
+@typing.overload
+def build_httpx_client(
+    client_type: typing.Type[httpx.AsyncClient],
+    options: ConnectionOptions,
+    *,
+    timeout: typing.Optional[float],
+    follow_redirects: typing.Optional[bool],
+) -> httpx.AsyncClient: ...
+
+
+def build_httpx_client(
+    client_type: typing.Any,
+    options: ConnectionOptions,
+    *,
+    timeout: typing.Optional[float],
+    follow_redirects: typing.Optional[bool],
+) -> typing.Any:
+    """
+    Builds the default httpx client of Zep or AsyncZep. http2=True requires the h2 package, installed with
+    `pip install zep-cloud[http2]`.
+    """
+    kwargs: typing.Dict[str, typing.Any] = {
+        "timeout": options.timeouts(timeout),
+        "limits": options.limits(),
+        "http2": bool(options.http2),
+    }
+    if follow_redirects is not None:
+        kwargs["follow_redirects"] = follow_redirects
+    try:
+        return client_type(**kwargs)
+    except ImportError as e:
+        if not options.http2:
+            raise
+        raise ImportError("http2=True requires the h2 package: pip install zep-cloud[http2]") from e
+
+
+def resolve_httpx_client(
+    client_type: typing.Any,
+    httpx_client: typing.Any,
+    options: ConnectionOptions,
+    *,
+    timeout: typing.Optional[float],
+    follow_redirects: typing.Optional[bool],
+) -> typing.Tuple[typing.Any, typing.Optional[httpx.Timeout]]:
+    """
+    Returns the httpx client Zep or AsyncZep should use, and the per-phase timeouts to send with each request, which
+    are None for a client passed in by the caller.
+    """
+    if httpx_client is not None:
+        if not options.is_default:
+            raise ValueError("Connection options cannot be combined with a custom httpx_client; configure it directly")
+        return httpx_client, None
+    timeouts = options.timeouts(timeout)
+    return build_httpx_client(client_type, options, timeout=timeout, follow_redirects=follow_redirects), timeouts
+
+
+# The path warm-up requests are sent to: cheap, authenticated, and answered without touching a graph
+WARMUP_PATH = "projects/info"
+DEFAULT_WARMUP_CONNECTIONS = 8
+
+
+@dataclass(frozen=True)
+class PoolWarmup:
+    """
+    The outcome of Zep.warmup or AsyncZep.warmup.
+
+    connections counts the warm-up requests that were answered, each of which opened a pooled connection, and
+    failures those that could not connect. latencies holds, for each base URL, the time in seconds each warm-up
+    request took to its response headers, which includes DNS resolution and the TCP and TLS handshakes.
+    validation_seconds is the duration of the project.get call that checked the credentials, None if skipped, and
+    seconds the duration of the whole warm-up.
+    """
+
+    connections: int
+    failures: int
+    seconds: float
+    validation_seconds: typing.Optional[float]
+    latencies: typing.Dict[str, typing.Tuple[float, ...]]
+
+    @property
+    def slowest(self) -> typing.Optional[float]:
+        return max((latency for latencies in self.latencies.values() for latency in latencies), default=None)
+
+
+def _warmup_request(
+    httpx_client: typing.Union[httpx.Client, httpx.AsyncClient],
+    base_url: str,
+    headers: typing.Dict[str, str],
+    timeout: typing.Any,
+) -> httpx.Request:
+    return httpx_client.build_request(
+        "GET", urllib.parse.urljoin(f"{base_url}/", WARMUP_PATH), headers=headers, timeout=timeout
+    )
+
+
+def _summarize(
+    outcomes: typing.Sequence[typing.Tuple[str, typing.Optional[float]]],
+    started: float,
+    validation_seconds: typing.Optional[float],
+) -> PoolWarmup:
+    latencies: typing.Dict[str, typing.List[float]] = {}
+    for base_url, latency in outcomes:
+        samples = latencies.setdefault(base_url, [])
+        if latency is not None:
+            samples.append(latency)
+    connections = sum(len(samples) for samples in latencies.values())
+    return PoolWarmup(
+        connections=connections,
+        failures=len(outcomes) - connections,
+        seconds=time.perf_counter() - started,
+        validation_seconds=validation_seconds,
+        latencies={base_url: tuple(samples) for base_url, samples in latencies.items()},
+    )
+
+
+def warm_connections(
+    httpx_client: httpx.Client,
+    base_urls: typing.Sequence[str],
+    connections: int,
+    *,
+    headers: typing.Dict[str, str],
+    timeout: typing.Any,
+    started: float,
+    validation_seconds: typing.Optional[float] = None,
+) -> PoolWarmup:
+    """
+    Opens `connections` pooled connections to each base URL by sending that many requests at once from a thread
+    pool, and keeping every response open until all of them have their headers, so that no request reuses another's
+    connection. Over HTTP/2 the requests share one connection per host instead.
+    """
+    if connections < 1:
+        raise ValueError("connections must be at least 1")
+
+    def open_one(base_url: str) -> typing.Tuple[httpx.Response, float]:
+        start = time.perf_counter()
+        request = _warmup_request(httpx_client, base_url, headers, timeout)
+        return httpx_client.send(request, stream=True), time.perf_counter() - start
+
+    targets = [base_url for base_url in base_urls for _ in range(connections)]
+    outcomes: typing.List[typing.Tuple[str, typing.Optional[float]]] = []
+    responses: typing.List[httpx.Response] = []
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="zep-warmup") as pool:
+            futures = [pool.submit(contextvars.copy_context().run, open_one, base_url) for base_url in targets]
+            for base_url, future in zip(targets, futures):
+                try:
+                    response, latency = future.result()
+                except httpx.TransportError:
+                    outcomes.append((base_url, None))
+                    continue
+                responses.append(response)
+                outcomes.append((base_url, latency))
+    finally:
+        for response in responses:
+            # Reading the body to the end is what returns a connection to the pool rather than closing it
+            try:
+                response.read()
+            except httpx.TransportError:
+                pass
+            finally:
+                response.close()
+    return _summarize(outcomes, started, validation_seconds)
+
+
+async def awarm_connections(
+    httpx_client: httpx.AsyncClient,
+    base_urls: typing.Sequence[str],
+    connections: int,
+    *,
+    headers: typing.Dict[str, str],
+    timeout: typing.Any,
+    started: float,
+    validation_seconds: typing.Optional[float] = None,
+) -> PoolWarmup:
+    """Async counterpart of warm_connections, sending the requests concurrently on the running event loop."""
+    if connections < 1:
+        raise ValueError("connections must be at least 1")
+
+    async def open_one(base_url: str) -> typing.Tuple[httpx.Response, float]:
+        start = time.perf_counter()
+        request = _warmup_request(httpx_client, base_url, headers, timeout)
+        return await httpx_client.send(request, stream=True), time.perf_counter() - start
+
+    targets = [base_url for base_url in base_urls for _ in range(connections)]
+    results = await asyncio.gather(*(open_one(base_url) for base_url in targets), return_exceptions=True)
+    outcomes: typing.List[typing.Tuple[str, typing.Optional[float]]] = []
+    responses = [result[0] for result in results if isinstance(result, tuple)]
+    try:
+        for base_url, result in zip(targets, results):
+            if isinstance(result, httpx.TransportError):
+                outcomes.append((base_url, None))
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                outcomes.append((base_url, result[1]))
+    finally:
+        for response in responses:
+            try:
+                await response.aread()
+            except httpx.TransportError:
+                pass
+            finally:
+                await response.aclose()
+    return _summarize(outcomes, started, validation_seconds)
@@ -0,0 +1,287 @@
+"""
+Fan-out of many independent SDK calls with bounded concurrency.
+
+Zep.parallel and Zep.map run sync SDK calls on a thread pool shared by everything using the client, so the
+concurrency of every fan-out together stays bounded by the pool rather than growing with the number of callers.
+All calls share the client's httpx connection pool, which is thread-safe.
+
+AsyncZep.gather and AsyncZep.map run coroutine calls on the running event loop, at most concurrency at once and never
+more than the client's connection pool can serve, so a fan-out over thousands of calls neither queues on the pool
+nor floods the API. map consumes its inputs lazily and streams results, in order or as they complete. Calls failing
+with a transport error or a retryable status are retried up to retries times, with the client's backoff. An error
+for which cancel_on returns true, by default a rejected API key or a passed deadline, cancels the calls in flight
+and is raised, since the remaining calls would fail the same way.
+
+Results are CallResults holding either the call's value or the exception it raised, so one failed call does not hide
+the results of the others. Every call runs with the caller's deadline, and a call that has not started when the
+deadline passes fails with DeadlineExceeded without being sent. When a call fails with 429 Too Many Requests, the
+calls that have not started yet wait for the Retry-After delay before they are sent.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+import time
+import typing
+from dataclasses import dataclass
+from random import random
+
+import httpx
+from ..core.api_error import ApiError
+from ..core.deadline import DeadlineExceeded, remaining, retry_allowed
+from ..core.http_client import (
+    INITIAL_RETRY_DELAY_SECONDS,
+    MAX_RETRY_DELAY_SECONDS,
+    MAX_RETRY_DELAY_SECONDS_FROM_HEADER,
+    _parse_retry_after,
+)
+
+T = typing.TypeVar("T")
+
+DEFAULT_FANOUT_WORKERS = 16
+DEFAULT_GATHER_CONCURRENCY = 32
+
+# How long pending calls wait after a 429 response without a Retry-After header
+_RATE_LIMIT_PAUSE = 1.0
+# Ordered streaming holds at most this many times concurrency results waiting for an earlier call to finish
+_ORDERED_WINDOW = 4
+
+_worker = threading.local()
+
+
+@dataclass(frozen=True)
+class CallResult(typing.Generic[T]):
+    """The outcome of one call of a fan-out: its position among the calls, and its value or the exception it raised."""
+
+    index: int
+    value: typing.Optional[T] = None
+    error: typing.Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> T:
+        """The call's return value, or raises its exception."""
+        if self.error is not None:
+            raise self.error
+        return typing.cast(T, self.value)
+
+
+def is_fatal_error(error: Exception) -> bool:
+    """The default cancel_on of AsyncZep.gather and map: a rejected API key, or a deadline that has passed."""
+    return isinstance(error, DeadlineExceeded) or (isinstance(error, ApiError) and error.status_code in (401, 403))
+
+
+def _retry_after(error: Exception) -> typing.Optional[float]:
+    if not isinstance(error, ApiError):
+        return None
+    return _parse_retry_after(httpx.Headers(error.headers or {}))
+
+
+def _retry_delay(error: Exception, attempt: int) -> typing.Optional[float]:
+    """How long to wait before retrying a call that failed with error, or None if it should not be retried."""
+    if isinstance(error, ApiError):
+        status = error.status_code or 0
+        if status < 500 and status not in (408, 409, 429):
+            return None
+        retry_after = _retry_after(error)
+        if retry_after is not None and retry_after <= MAX_RETRY_DELAY_SECONDS_FROM_HEADER:
+            return retry_after
+    elif not isinstance(error, httpx.TransportError) or isinstance(error, DeadlineExceeded):
+        return None
+    return min(INITIAL_RETRY_DELAY_SECONDS * pow(2.0, attempt), MAX_RETRY_DELAY_SECONDS) * (1 - 0.25 * random())
+
+
+class _RateLimitGate:
+    """Holds back the calls of a fan-out that have not started while the API asks for a pause."""
+
+    def __init__(self) -> None:
+        self.resume_at = 0.0
+
+    def observe(self, error: typing.Optional[Exception]) -> None:
+        if not isinstance(error, ApiError) or error.status_code != 429:
+            return
+        pause = _retry_after(error)
+        pause = pause if pause is not None else _RATE_LIMIT_PAUSE
+        # Waiting past the deadline is pointless: the remaining calls would fail without being sent
+        left = remaining()
+        self.resume_at = max(self.resume_at, time.monotonic() + (pause if left is None else min(pause, left)))
+
+    def delay(self) -> float:
+        return max(0.0, self.resume_at - time.monotonic())
+
+
+def _expired(index: int) -> typing.Optional[CallResult[typing.Any]]:
+    left = remaining()
+    if left is not None and left <= 0:
+        return CallResult(index, error=DeadlineExceeded("The deadline passed before the call could start"))
+    return None
+
+
+def _invoke(index: int, call: typing.Callable[[], T]) -> CallResult[T]:
+    expired = _expired(index)
+    if expired is not None:
+        return expired
+    _worker.active = True
+    try:
+        return CallResult(index, value=call())
+    except Exception as error:
+        return CallResult(index, error=error)
+    finally:
+        _worker.active = False
+
+
+class FanOut:
+    """
+    The thread pool behind Zep.parallel and Zep.map, started on first use.
+
+    Parameters
+    ----------
+    max_workers : int
+        How many calls run at once across every fan-out of the client.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_FANOUT_WORKERS):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor: typing.Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    def _pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="zep-fanout"
+                )
+            return self._executor
+
+    def run(
+        self, calls: typing.Iterable[typing.Callable[[], T]], concurrency: typing.Optional[int] = None
+    ) -> typing.List[CallResult[T]]:
+        """Runs calls on the pool, at most concurrency of them at once, and returns their results in order."""
+        calls = list(calls)
+        if concurrency is not None and concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if getattr(_worker, "active", False):
+            # A call fanning out again would wait for pool threads that may all be waiting for it
+            return [_invoke(index, call) for index, call in enumerate(calls)]
+        limit = min(concurrency or self.max_workers, self.max_workers)
+        pool = self._pool()
+        gate = _RateLimitGate()
+        results: typing.List[typing.Optional[CallResult[T]]] = [None] * len(calls)
+        running: typing.Set["concurrent.futures.Future[CallResult[T]]"] = set()
+        next_call = 0
+        while next_call < len(calls) or running:
+            while next_call < len(calls) and len(running) < limit and not gate.delay():
+                # Each call gets its own copy of the caller's context, so a deadline set by the caller applies to it
+                running.add(pool.submit(contextvars.copy_context().run, _invoke, next_call, calls[next_call]))
+                next_call += 1
+            timeout = gate.delay() if next_call < len(calls) else None
+            if not running:
+                time.sleep(typing.cast(float, timeout))
+                continue
+            done, running = concurrent.futures.wait(
+                running, timeout=timeout or None, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                result = future.result()
+                results[result.index] = result
+                gate.observe(result.error)
+        return typing.cast(typing.List[CallResult[T]], results)
+
+    def close(self) -> None:
+        """Shuts down the thread pool, if it was started, once the calls already submitted have finished."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+def resolve_concurrency(concurrency: typing.Optional[int], httpx_client: typing.Any) -> int:
+    """
+    The concurrency of an async fan-out: the one asked for, DEFAULT_GATHER_CONCURRENCY by default, capped at the
+    connection limit of httpx_client's pool when it uses httpx's default transport.
+    """
+    if concurrency is not None and concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    concurrency = concurrency or DEFAULT_GATHER_CONCURRENCY
+    pool = getattr(getattr(httpx_client, "_transport", None), "_pool", None)
+    limit = getattr(pool, "_max_connections", None)
+    return min(concurrency, limit) if isinstance(limit, int) and limit > 0 else concurrency
+
+
+async def _acall(
+    index: int, call: typing.Callable[[], typing.Awaitable[T]], retries: int, gate: _RateLimitGate
+) -> CallResult[T]:
+    attempt = 0
+    while True:
+        pause = gate.delay()
+        if pause:
+            await asyncio.sleep(pause)
+        expired = _expired(index)
+        if expired is not None:
+            return expired
+        try:
+            return CallResult(index, value=await call())
+        except Exception as error:
+            gate.observe(error)
+            delay = _retry_delay(error, attempt) if attempt < retries else None
+            if delay is None or not retry_allowed(delay):
+                return CallResult(index, error=error)
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def stream_calls(
+    calls: typing.Iterable[typing.Callable[[], typing.Awaitable[T]]],
+    *,
+    concurrency: int,
+    retries: int = 0,
+    ordered: bool = True,
+    cancel_on: typing.Optional[typing.Callable[[Exception], bool]] = is_fatal_error,
+) -> typing.AsyncIterator[CallResult[T]]:
+    """
+    Runs calls as tasks on the running event loop, at most concurrency at once, taking the next call only when one
+    finishes, and yields their results in order or as they complete. Closing the iterator cancels the calls in
+    flight.
+    """
+    if retries < 0:
+        raise ValueError("retries must not be negative")
+    pending = enumerate(calls)
+    gate = _RateLimitGate()
+    running: typing.Set["asyncio.Task[CallResult[T]]"] = set()
+    finished: typing.Dict[int, CallResult[T]] = {}
+    next_result = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(running) < concurrency:
+                if ordered and len(running) + len(finished) >= _ORDERED_WINDOW * concurrency:
+                    # Keep a slow early call from buffering an unbounded number of later results
+                    break
+                item = next(pending, None)
+                if item is None:
+                    exhausted = True
+                    break
+                running.add(asyncio.ensure_future(_acall(item[0], item[1], retries, gate)))
+            if not running:
+                return
+            done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for result in sorted((task.result() for task in done), key=lambda result: result.index):
+                if result.error is not None and cancel_on is not None and cancel_on(result.error):
+                    raise result.error
+                if ordered:
+                    finished[result.index] = result
+                else:
+                    yield result
+            while next_result in finished:
+                yield finished.pop(next_result)
+                next_result += 1
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
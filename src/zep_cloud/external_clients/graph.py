@@ -1,24 +1,223 @@
+import asyncio
 import typing
+from dataclasses import dataclass, field
 
 from zep_cloud import EdgeType, EntityEdgeSourceTarget
 from zep_cloud.core.client_wrapper import AsyncClientWrapper, SyncClientWrapper
+from zep_cloud.external_clients.not_found_cache import NotFoundCacheMixin
 from zep_cloud.external_clients.ontology import (
     EdgeModel,
+    OntologyDiff,
+    diff_ontology,
     edge_model_to_api_schema,
     entity_model_to_api_schema,
+    ontology_fingerprint,
 )
 from zep_cloud.graph.client import AsyncGraphClient as AsyncBaseGraphClient
 from zep_cloud.graph.client import GraphClient as BaseGraphClient
-from zep_cloud.types import EntityType
+from zep_cloud.types import EntityType, EntityTypeResponse, Graph, SuccessResponse
 
 if typing.TYPE_CHECKING:
     from zep_cloud.external_clients.ontology import EntityModel
 from zep_cloud.core.request_options import RequestOptions
 
+OMIT = typing.cast(typing.Any, ...)
 
-class GraphClient(BaseGraphClient):
+# Identifies where an ontology lives: ("user", user_id), ("graph", graph_id) or ("project", None)
+OntologyTarget = typing.Tuple[str, typing.Optional[str]]
+
+EdgeDefinitions = typing.Optional[
+    dict[
+        str,
+        typing.Union[
+            "EdgeModel",
+            typing.Tuple["EdgeModel", typing.List[EntityEdgeSourceTarget]],
+        ],
+    ]
+]
+
+
+def _build_api_types(
+    entities: dict[str, "EntityModel"], edges: EdgeDefinitions
+) -> typing.Tuple[list[EntityType], list[EdgeType]]:
+    api_entity_types: list[EntityType] = []
+    api_edge_types: list[EdgeType] = []
+
+    for name, entity in entities.items():
+        entity_dict = entity_model_to_api_schema(entity, name)
+        api_entity_types.append(EntityType(**entity_dict))
+
+    if edges:
+        for name, edge_data in edges.items():
+            # Handle both EdgeModel directly and tuple of (model, source_targets)
+            if isinstance(edge_data, tuple):
+                edge_model, source_targets = edge_data
+            else:
+                edge_model = edge_data
+                source_targets = None
+
+            edge_dict = edge_model_to_api_schema(edge_model, name)
+            if source_targets:
+                edge_dict["source_targets"] = [st.dict() for st in source_targets]
+            api_edge_types.append(EdgeType(**edge_dict))
+
+    return api_entity_types, api_edge_types
+
+
+def _listing_target(user_id: typing.Optional[str], graph_id: typing.Optional[str]) -> OntologyTarget:
+    if user_id is not None:
+        return ("user", user_id)
+    if graph_id is not None:
+        return ("graph", graph_id)
+    return ("project", None)
+
+
+def _set_targets(
+    user_ids: typing.Optional[typing.List[str]], graph_ids: typing.Optional[typing.List[str]]
+) -> typing.List[OntologyTarget]:
+    targets: typing.List[OntologyTarget] = [("user", user_id) for user_id in user_ids or []]
+    targets.extend(("graph", graph_id) for graph_id in graph_ids or [])
+    return targets or [("project", None)]
+
+
+_UNCHANGED_MESSAGE = "Ontology unchanged, skipped"
+
+DEFAULT_APPLY_BATCH_SIZE = 100
+DEFAULT_APPLY_CONCURRENCY = 8
+
+
+@dataclass(frozen=True)
+class OntologyApplyResult:
+    """Outcome of apply_ontology: the diff computed for every target and the targets that were actually updated"""
+
+    diffs: dict[OntologyTarget, OntologyDiff] = field(default_factory=dict)
+    applied: typing.Tuple[OntologyTarget, ...] = ()
+
+    @property
+    def changed(self) -> typing.List[OntologyTarget]:
+        return [target for target, diff in self.diffs.items() if diff.has_changes]
+
+    @property
+    def unchanged(self) -> typing.List[OntologyTarget]:
+        return [target for target, diff in self.diffs.items() if not diff.has_changes]
+
+
+def _batch_targets(
+    targets: typing.Sequence[OntologyTarget], batch_size: int
+) -> typing.List[typing.Tuple[typing.Optional[typing.List[str]], typing.Optional[typing.List[str]]]]:
+    """Splits targets into (user_ids, graph_ids) request batches of at most batch_size identifiers each"""
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    if list(targets) == [("project", None)]:
+        return [(None, None)]
+    batches = []
+    for start in range(0, len(targets), batch_size):
+        chunk = targets[start : start + batch_size]
+        user_ids = [typing.cast(str, identifier) for kind, identifier in chunk if kind == "user"]
+        graph_ids = [typing.cast(str, identifier) for kind, identifier in chunk if kind == "graph"]
+        batches.append((user_ids or None, graph_ids or None))
+    return batches
+
+
+def _listing_kwargs(target: OntologyTarget) -> dict[str, typing.Optional[str]]:
+    kind, identifier = target
+    return {
+        "user_id": identifier if kind == "user" else None,
+        "graph_id": identifier if kind == "graph" else None,
+    }
+
+
+class GraphClient(NotFoundCacheMixin, BaseGraphClient):
     def __init__(self, *, client_wrapper: SyncClientWrapper):
         super().__init__(client_wrapper=client_wrapper)
+        # Ontology fingerprints last reported by list_entity_types or set through this client, per target
+        self._ontology_fingerprints: dict[OntologyTarget, str] = {}
+
+    def get(self, graph_id: str, *, request_options: typing.Optional[RequestOptions] = None) -> Graph:
+        return self._cached_get(
+            graph_id, lambda: super(GraphClient, self).get(graph_id, request_options=request_options)
+        )
+
+    def create(
+        self,
+        *,
+        graph_id: str,
+        description: typing.Optional[str] = OMIT,
+        name: typing.Optional[str] = OMIT,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> Graph:
+        graph = super().create(graph_id=graph_id, description=description, name=name, request_options=request_options)
+        self._invalidate_not_found(graph_id)
+        return graph
+
+    def get_or_create(
+        self,
+        graph_id: str,
+        *,
+        description: typing.Optional[str] = OMIT,
+        name: typing.Optional[str] = OMIT,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.Tuple[Graph, bool]:
+        """
+        Returns the graph, creating it with the given name and description if it does not exist.
+
+        Parameters
+        ----------
+        graph_id : str
+
+        description : typing.Optional[str]
+            Used only when the graph is created.
+
+        name : typing.Optional[str]
+            Used only when the graph is created.
+
+        request_options : typing.Optional[RequestOptions]
+            Request-specific configuration.
+
+        Returns
+        -------
+        typing.Tuple[Graph, bool]
+            The graph and whether it was created by this call. If a concurrent create wins the race, the graph it
+            created is returned with False.
+        """
+        return self._get_or_create(
+            graph_id,
+            lambda: self.get(graph_id, request_options=request_options),
+            lambda: self.create(graph_id=graph_id, description=description, name=name, request_options=request_options),
+        )
+
+    def list_entity_types(
+        self,
+        *,
+        user_id: typing.Optional[str] = None,
+        graph_id: typing.Optional[str] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> EntityTypeResponse:
+        """
+        Returns all entity types for a project, user, or graph, and records the ontology fingerprint of the
+        result so that set_entity_types(skip_if_unchanged=True) can avoid redundant requests.
+
+        Parameters
+        ----------
+        user_id : typing.Optional[str]
+            User ID to get user-specific entity types
+
+        graph_id : typing.Optional[str]
+            Graph ID to get graph-specific entity types
+
+        request_options : typing.Optional[RequestOptions]
+            Request-specific configuration.
+
+        Returns
+        -------
+        EntityTypeResponse
+            The list of entity types.
+        """
+        res = super().list_entity_types(user_id=user_id, graph_id=graph_id, request_options=request_options)
+        self._ontology_fingerprints[_listing_target(user_id, graph_id)] = ontology_fingerprint(
+            res.entity_types, res.edge_types
+        )
+        return res
 
     def set_ontology(
         self,
@@ -133,6 +332,7 @@ class GraphClient(BaseGraphClient):
         user_ids: typing.Optional[typing.List[str]] = None,
         graph_ids: typing.Optional[typing.List[str]] = None,
         request_options: typing.Optional[RequestOptions] = None,
+        skip_if_unchanged: bool = False,
     ):
         """
         Sets the entity and edge types for a project, replacing any existing ones.
@@ -153,6 +353,10 @@ class GraphClient(BaseGraphClient):
         request_options : typing.Optional[RequestOptions]
             Request-specific configuration.
 
+        skip_if_unchanged : bool
+            When true, the request is skipped if every target's ontology fingerprint, as last reported by
+            list_entity_types or last set through this client, matches the given entities and edges.
+
         Examples
         --------
 
@@ -206,26 +410,12 @@ class GraphClient(BaseGraphClient):
             }
         )
         """
-        api_entity_types: list[EntityType] = []
-        api_edge_types: list[EdgeType] = []
-
-        for name, entity in entities.items():
-            entity_dict = entity_model_to_api_schema(entity, name)
-            api_entity_types.append(EntityType(**entity_dict))
-
-        if edges:
-            for name, edge_data in edges.items():
-                # Handle both EdgeModel directly and tuple of (model, source_targets)
-                if isinstance(edge_data, tuple):
-                    edge_model, source_targets = edge_data
-                else:
-                    edge_model = edge_data
-                    source_targets = None
-
-                edge_dict = edge_model_to_api_schema(edge_model, name)
-                if source_targets:
-                    edge_dict["source_targets"] = [st.dict() for st in source_targets]
-                api_edge_types.append(EdgeType(**edge_dict))
+        api_entity_types, api_edge_types = _build_api_types(entities, edges)
+        fingerprint = ontology_fingerprint(api_entity_types, api_edge_types)
+        targets = _set_targets(user_ids, graph_ids)
+        if skip_if_unchanged and all(self._ontology_fingerprints.get(t) == fingerprint for t in targets):
+            return SuccessResponse(message=_UNCHANGED_MESSAGE)
+
         res = self.set_entity_types_internal(
             entity_types=api_entity_types,
             edge_types=api_edge_types,
@@ -233,12 +423,171 @@ class GraphClient(BaseGraphClient):
             graph_ids=graph_ids,
             request_options=request_options,
         )
+        for target in targets:
+            self._ontology_fingerprints[target] = fingerprint
         return res
 
+    def apply_ontology(
+        self,
+        entities: dict[str, "EntityModel"],
+        edges: EdgeDefinitions = None,
+        user_ids: typing.Optional[typing.List[str]] = None,
+        graph_ids: typing.Optional[typing.List[str]] = None,
+        batch_size: int = DEFAULT_APPLY_BATCH_SIZE,
+        use_cached_fingerprints: bool = True,
+        dry_run: bool = False,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> OntologyApplyResult:
+        """
+        Applies an ontology only where it differs from what is stored server-side.
+
+        The current ontology of every target is compared against the given entities and edges. Targets that already
+        match are skipped, and the remaining ones are updated with as few set_entity_types requests as possible.
+
+        Parameters
+        ----------
+        entities : dict[str, "EntityModel"]
+            Entity type definitions.
+
+        edges : typing.Optional[dict[str, typing.Union["EdgeModel", typing.Tuple["EdgeModel", typing.List[EntityEdgeSourceTarget]]]]]
+            Edge type definitions.
+
+        user_ids : typing.Optional[typing.List[str]]
+            The user identifiers for which to apply the ontology.
 
-class AsyncGraphClient(AsyncBaseGraphClient):
+        graph_ids : typing.Optional[typing.List[str]]
+            The graph identifiers for which to apply the ontology.
+
+        batch_size : int
+            Maximum number of user and graph identifiers sent in a single set_entity_types request.
+
+        use_cached_fingerprints : bool
+            When true, targets whose fingerprint is already known to match are skipped without listing their
+            entity types. Disable when other processes may have changed the ontology since it was last observed.
+
+        dry_run : bool
+            When true, only computes the diffs and does not update any target.
+
+        request_options : typing.Optional[RequestOptions]
+            Request-specific configuration.
+
+        Returns
+        -------
+        OntologyApplyResult
+            The diff of every target and the targets that were updated.
+
+        Examples
+        --------
+        result = client.graph.apply_ontology(
+            entities={"Destination": Destination},
+            user_ids=user_ids,
+        )
+        for target in result.changed:
+            print(target, result.diffs[target])
+        """
+        api_entity_types, api_edge_types = _build_api_types(entities, edges)
+        fingerprint = ontology_fingerprint(api_entity_types, api_edge_types)
+
+        diffs: dict[OntologyTarget, OntologyDiff] = {}
+        for target in _set_targets(user_ids, graph_ids):
+            if use_cached_fingerprints and self._ontology_fingerprints.get(target) == fingerprint:
+                diffs[target] = OntologyDiff()
+                continue
+            remote = self.list_entity_types(**_listing_kwargs(target), request_options=request_options)
+            diffs[target] = diff_ontology(api_entity_types, api_edge_types, remote)
+
+        changed = [target for target, diff in diffs.items() if diff.has_changes]
+        if dry_run or not changed:
+            return OntologyApplyResult(diffs=diffs)
+
+        applied: typing.List[OntologyTarget] = []
+        for batch_user_ids, batch_graph_ids in _batch_targets(changed, batch_size):
+            self.set_entity_types_internal(
+                entity_types=api_entity_types,
+                edge_types=api_edge_types,
+                user_ids=batch_user_ids,
+                graph_ids=batch_graph_ids,
+                request_options=request_options,
+            )
+            batch_targets = _set_targets(batch_user_ids, batch_graph_ids)
+            for target in batch_targets:
+                self._ontology_fingerprints[target] = fingerprint
+            applied.extend(batch_targets)
+        return OntologyApplyResult(diffs=diffs, applied=tuple(applied))
+
+
+class AsyncGraphClient(NotFoundCacheMixin, AsyncBaseGraphClient):
     def __init__(self, *, client_wrapper: AsyncClientWrapper):
         super().__init__(client_wrapper=client_wrapper)
+        # Ontology fingerprints last reported by list_entity_types or set through this client, per target
+        self._ontology_fingerprints: dict[OntologyTarget, str] = {}
+
+    async def get(self, graph_id: str, *, request_options: typing.Optional[RequestOptions] = None) -> Graph:
+        return await self._acached_get(
+            graph_id, lambda: super(AsyncGraphClient, self).get(graph_id, request_options=request_options)
+        )
+
+    async def create(
+        self,
+        *,
+        graph_id: str,
+        description: typing.Optional[str] = OMIT,
+        name: typing.Optional[str] = OMIT,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> Graph:
+        graph = await super().create(
+            graph_id=graph_id, description=description, name=name, request_options=request_options
+        )
+        self._invalidate_not_found(graph_id)
+        return graph
+
+    async def get_or_create(
+        self,
+        graph_id: str,
+        *,
+        description: typing.Optional[str] = OMIT,
+        name: typing.Optional[str] = OMIT,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.Tuple[Graph, bool]:
+        """Async counterpart of GraphClient.get_or_create."""
+        return await self._aget_or_create(
+            graph_id,
+            lambda: self.get(graph_id, request_options=request_options),
+            lambda: self.create(graph_id=graph_id, description=description, name=name, request_options=request_options),
+        )
+
+    async def list_entity_types(
+        self,
+        *,
+        user_id: typing.Optional[str] = None,
+        graph_id: typing.Optional[str] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> EntityTypeResponse:
+        """
+        Returns all entity types for a project, user, or graph, and records the ontology fingerprint of the
+        result so that set_entity_types(skip_if_unchanged=True) can avoid redundant requests.
+
+        Parameters
+        ----------
+        user_id : typing.Optional[str]
+            User ID to get user-specific entity types
+
+        graph_id : typing.Optional[str]
+            Graph ID to get graph-specific entity types
+
+        request_options : typing.Optional[RequestOptions]
+            Request-specific configuration.
+
+        Returns
+        -------
+        EntityTypeResponse
+            The list of entity types.
+        """
+        res = await super().list_entity_types(user_id=user_id, graph_id=graph_id, request_options=request_options)
+        self._ontology_fingerprints[_listing_target(user_id, graph_id)] = ontology_fingerprint(
+            res.entity_types, res.edge_types
+        )
+        return res
 
     async def set_ontology(
         self,
@@ -353,6 +702,7 @@ class AsyncGraphClient(AsyncBaseGraphClient):
         user_ids: typing.Optional[typing.List[str]] = None,
         graph_ids: typing.Optional[typing.List[str]] = None,
         request_options: typing.Optional[RequestOptions] = None,
+        skip_if_unchanged: bool = False,
     ):
         """
         Sets the entity and edge types for a project, replacing any existing ones.
@@ -373,6 +723,10 @@ class AsyncGraphClient(AsyncBaseGraphClient):
         request_options : typing.Optional[RequestOptions]
             Request-specific configuration.
 
+        skip_if_unchanged : bool
+            When true, the request is skipped if every target's ontology fingerprint, as last reported by
+            list_entity_types or last set through this client, matches the given entities and edges.
+
         Examples
         --------
 
@@ -426,26 +780,11 @@ class AsyncGraphClient(AsyncBaseGraphClient):
             }
         )
         """
-        api_entity_types: list[EntityType] = []
-        api_edge_types: list[EdgeType] = []
-
-        for name, entity in entities.items():
-            entity_dict = entity_model_to_api_schema(entity, name)
-            api_entity_types.append(EntityType(**entity_dict))
-
-        if edges:
-            for name, edge_data in edges.items():
-                # Handle both EdgeModel directly and tuple of (model, source_targets)
-                if isinstance(edge_data, tuple):
-                    edge_model, source_targets = edge_data
-                else:
-                    edge_model = edge_data
-                    source_targets = None
-
-                edge_dict = edge_model_to_api_schema(edge_model, name)
-                if source_targets:
-                    edge_dict["source_targets"] = [st.dict() for st in source_targets]
-                api_edge_types.append(EdgeType(**edge_dict))
+        api_entity_types, api_edge_types = _build_api_types(entities, edges)
+        fingerprint = ontology_fingerprint(api_entity_types, api_edge_types)
+        targets = _set_targets(user_ids, graph_ids)
+        if skip_if_unchanged and all(self._ontology_fingerprints.get(t) == fingerprint for t in targets):
+            return SuccessResponse(message=_UNCHANGED_MESSAGE)
 
         res = await self.set_entity_types_internal(
             entity_types=api_entity_types,
@@ -454,4 +793,105 @@ class AsyncGraphClient(AsyncBaseGraphClient):
             graph_ids=graph_ids,
             request_options=request_options,
         )
+        for target in targets:
+            self._ontology_fingerprints[target] = fingerprint
         return res
+
+    async def apply_ontology(
+        self,
+        entities: dict[str, "EntityModel"],
+        edges: EdgeDefinitions = None,
+        user_ids: typing.Optional[typing.List[str]] = None,
+        graph_ids: typing.Optional[typing.List[str]] = None,
+        batch_size: int = DEFAULT_APPLY_BATCH_SIZE,
+        concurrency: int = DEFAULT_APPLY_CONCURRENCY,
+        use_cached_fingerprints: bool = True,
+        dry_run: bool = False,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> OntologyApplyResult:
+        """
+        Applies an ontology only where it differs from what is stored server-side.
+
+        The current ontology of every target is compared against the given entities and edges. Targets that already
+        match are skipped, and the remaining ones are updated with as few set_entity_types requests as possible.
+
+        Parameters
+        ----------
+        entities : dict[str, "EntityModel"]
+            Entity type definitions.
+
+        edges : typing.Optional[dict[str, typing.Union["EdgeModel", typing.Tuple["EdgeModel", typing.List[EntityEdgeSourceTarget]]]]]
+            Edge type definitions.
+
+        user_ids : typing.Optional[typing.List[str]]
+            The user identifiers for which to apply the ontology.
+
+        graph_ids : typing.Optional[typing.List[str]]
+            The graph identifiers for which to apply the ontology.
+
+        batch_size : int
+            Maximum number of user and graph identifiers sent in a single set_entity_types request.
+
+        concurrency : int
+            Maximum number of list_entity_types and set_entity_types requests in flight at once.
+
+        use_cached_fingerprints : bool
+            When true, targets whose fingerprint is already known to match are skipped without listing their
+            entity types. Disable when other processes may have changed the ontology since it was last observed.
+
+        dry_run : bool
+            When true, only computes the diffs and does not update any target.
+
+        request_options : typing.Optional[RequestOptions]
+            Request-specific configuration.
+
+        Returns
+        -------
+        OntologyApplyResult
+            The diff of every target and the targets that were updated.
+
+        Examples
+        --------
+        result = await client.graph.apply_ontology(
+            entities={"Destination": Destination},
+            user_ids=user_ids,
+        )
+        for target in result.changed:
+            print(target, result.diffs[target])
+        """
+        api_entity_types, api_edge_types = _build_api_types(entities, edges)
+        fingerprint = ontology_fingerprint(api_entity_types, api_edge_types)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def diff_target(target: OntologyTarget) -> OntologyDiff:
+            if use_cached_fingerprints and self._ontology_fingerprints.get(target) == fingerprint:
+                return OntologyDiff()
+            async with semaphore:
+                remote = await self.list_entity_types(**_listing_kwargs(target), request_options=request_options)
+            return diff_ontology(api_entity_types, api_edge_types, remote)
+
+        targets = _set_targets(user_ids, graph_ids)
+        diffs = dict(zip(targets, await asyncio.gather(*(diff_target(target) for target in targets))))
+
+        changed = [target for target, diff in diffs.items() if diff.has_changes]
+        if dry_run or not changed:
+            return OntologyApplyResult(diffs=diffs)
+
+        async def apply_batch(
+            batch_user_ids: typing.Optional[typing.List[str]], batch_graph_ids: typing.Optional[typing.List[str]]
+        ) -> typing.List[OntologyTarget]:
+            async with semaphore:
+                await self.set_entity_types_internal(
+                    entity_types=api_entity_types,
+                    edge_types=api_edge_types,
+                    user_ids=batch_user_ids,
+                    graph_ids=batch_graph_ids,
+                    request_options=request_options,
+                )
+            batch_targets = _set_targets(batch_user_ids, batch_graph_ids)
+            for target in batch_targets:
+                self._ontology_fingerprints[target] = fingerprint
+            return batch_targets
+
+        applied = await asyncio.gather(*(apply_batch(*batch) for batch in _batch_targets(changed, batch_size)))
+        return OntologyApplyResult(diffs=diffs, applied=tuple(target for batch in applied for target in batch))
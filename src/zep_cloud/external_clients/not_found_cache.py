@@ -0,0 +1,161 @@
+import collections
+import threading
+import time
+import typing
+
+from zep_cloud.core.api_error import ApiError
+from zep_cloud.errors import BadRequestError, NotFoundError
+
+T = typing.TypeVar("T")
+
+DEFAULT_NOT_FOUND_TTL = 5.0
+DEFAULT_NOT_FOUND_MAX_SIZE = 10_000
+
+
+class NotFoundCache:
+    """
+    Bounded cache of recent NotFoundErrors by resource ID.
+
+    While an entry is fresh, lookups of that ID raise NotFoundError without a round trip. Entries expire after
+    ttl seconds and the least recently recorded ones are dropped beyond max_size.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = DEFAULT_NOT_FOUND_TTL,
+        max_size: int = DEFAULT_NOT_FOUND_MAX_SIZE,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        if ttl <= 0 or max_size <= 0:
+            raise ValueError("ttl and max_size must be positive")
+        self.ttl = ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "collections.OrderedDict[str, typing.Tuple[float, NotFoundError]]" = collections.OrderedDict()
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def check(self, key: str) -> None:
+        """Raises NotFoundError if key was recorded as missing less than ttl seconds ago."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            expires_at, error = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                return
+            self.hits += 1
+        raise NotFoundError(body=error.body, headers=error.headers)
+
+    def record(self, key: str, error: NotFoundError) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (self._clock() + self.ttl, error)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def is_conflict(error: ApiError) -> bool:
+    """Whether a create failed because the resource already exists."""
+    return isinstance(error, BadRequestError) or error.status_code == 409
+
+
+class NotFoundCacheMixin:
+    """Adds an opt-in NotFoundCache to a resource client."""
+
+    not_found_cache: typing.Optional[NotFoundCache] = None
+
+    def enable_not_found_cache(
+        self, *, ttl: float = DEFAULT_NOT_FOUND_TTL, max_size: int = DEFAULT_NOT_FOUND_MAX_SIZE
+    ) -> NotFoundCache:
+        """
+        Caches NotFoundErrors of get for ttl seconds. Entries are invalidated by creating the resource through
+        this client; resources created elsewhere become visible once the entry expires.
+        """
+        self.not_found_cache = NotFoundCache(ttl=ttl, max_size=max_size)
+        return self.not_found_cache
+
+    def disable_not_found_cache(self) -> None:
+        self.not_found_cache = None
+
+    def _invalidate_not_found(self, key: str) -> None:
+        if self.not_found_cache is not None:
+            self.not_found_cache.invalidate(key)
+
+    def _cached_get(self, key: str, fetch: typing.Callable[[], T]) -> T:
+        cache = self.not_found_cache
+        if cache is None:
+            return fetch()
+        cache.check(key)
+        try:
+            return fetch()
+        except NotFoundError as e:
+            cache.record(key, e)
+            raise
+
+    async def _acached_get(self, key: str, fetch: typing.Callable[[], typing.Awaitable[T]]) -> T:
+        cache = self.not_found_cache
+        if cache is None:
+            return await fetch()
+        cache.check(key)
+        try:
+            return await fetch()
+        except NotFoundError as e:
+            cache.record(key, e)
+            raise
+
+    def _get_or_create(
+        self, key: str, get: typing.Callable[[], T], create: typing.Callable[[], T]
+    ) -> typing.Tuple[T, bool]:
+        """
+        Returns (resource, created). A create that loses a race against a concurrent create is resolved by
+        fetching the resource created by the winner.
+        """
+        try:
+            return get(), False
+        except NotFoundError:
+            pass
+        try:
+            return create(), True
+        except ApiError as e:
+            if not is_conflict(e):
+                raise
+            self._invalidate_not_found(key)
+            try:
+                return get(), False
+            except NotFoundError:
+                raise e
+
+    async def _aget_or_create(
+        self,
+        key: str,
+        get: typing.Callable[[], typing.Awaitable[T]],
+        create: typing.Callable[[], typing.Awaitable[T]],
+    ) -> typing.Tuple[T, bool]:
+        try:
+            return await get(), False
+        except NotFoundError:
+            pass
+        try:
+            return await create(), True
+        except ApiError as e:
+            if not is_conflict(e):
+                raise
+            self._invalidate_not_found(key)
+            try:
+                return await get(), False
+            except NotFoundError:
+                raise e
@@ -1,4 +1,9 @@
+import hashlib
+import json
+import threading
 import typing
+import weakref
+from dataclasses import dataclass
 from enum import Enum
 
 from pydantic import BaseModel, Field, WithJsonSchema
@@ -108,6 +113,55 @@ class EdgeModel(_BaseSchemaModel):
     pass
 
 
+_TYPE_MAPPING = {
+    "string": "Text",
+    "integer": "Int",
+    "number": "Float",
+    "boolean": "Boolean",
+}
+
+# Compiled (description, properties) per model class. Keyed weakly so that models defined at runtime, e.g. in
+# notebooks or tests, can still be garbage collected.
+_CompiledSchema = typing.Tuple[str, typing.Tuple[typing.Tuple[str, str, str], ...]]
+_compiled_schemas: "weakref.WeakKeyDictionary[type, _CompiledSchema]" = weakref.WeakKeyDictionary()
+_compiled_schemas_lock = threading.Lock()
+
+
+def _compile_model_schema(
+    model_class: typing.Union["EntityModel", "EdgeModel"],
+) -> _CompiledSchema:
+    """Returns the description and (name, type, description) property triples of a model, compiled once per class"""
+    cls = typing.cast(type, model_class)
+    compiled = _compiled_schemas.get(cls)
+    if compiled is not None:
+        return compiled
+
+    schema = model_class.model_json_schema()
+    properties: typing.List[typing.Tuple[str, str, str]] = []
+    for field_name, field_schema in schema.get("properties", {}).items():
+        if "type" not in field_schema:
+            continue
+
+        property_type = field_schema.get("type")
+        if property_type in _TYPE_MAPPING:
+            property_type = _TYPE_MAPPING[property_type]
+        else:
+            raise ValueError(f"Unsupported property type: {property_type}")
+
+        properties.append((field_name, property_type, field_schema.get("description", "")))
+
+    compiled = (model_class.__doc__.strip() if model_class.__doc__ else "", tuple(properties))
+    with _compiled_schemas_lock:
+        _compiled_schemas[cls] = compiled
+    return compiled
+
+
+def clear_schema_cache() -> None:
+    """Drops all compiled model schemas, forcing them to be regenerated on next use"""
+    with _compiled_schemas_lock:
+        _compiled_schemas.clear()
+
+
 def _model_to_api_schema_common(
     model_class: typing.Union["EntityModel", "EdgeModel"],
     name: str,
@@ -115,42 +169,23 @@ def _model_to_api_schema_common(
 ) -> dict[str, typing.Any]:
     """Common function to convert a Pydantic Model to a JSON schema for API EntityType or EdgeType"""
 
-    schema = model_class.model_json_schema()
+    description, properties = _compile_model_schema(model_class)
 
-    # Define the type with proper typings for properties as a list of dictionaries
+    # Define the type with proper typings for properties as a list of dictionaries.
+    # A fresh dict is built on every call since callers are free to mutate the result.
     result_type: dict[str, typing.Any] = {
         "name": name,
-        "description": model_class.__doc__.strip() if model_class.__doc__ else "",
-        "properties": [],
+        "description": description,
+        "properties": [
+            {"name": field_name, "type": property_type, "description": field_description}
+            for field_name, property_type, field_description in properties
+        ],
     }
 
     # Add source_targets field for edge types
     if is_edge:
         result_type["source_targets"] = []
 
-    for field_name, field_schema in schema.get("properties", {}).items():
-        if "type" not in field_schema:
-            continue
-
-        property_type = field_schema.get("type")
-        type_mapping = {
-            "string": "Text",
-            "integer": "Int",
-            "number": "Float",
-            "boolean": "Boolean",
-        }
-
-        if property_type in type_mapping:
-            property_type = type_mapping[property_type]
-        else:
-            raise ValueError(f"Unsupported property type: {property_type}")
-
-        description = field_schema.get("description", "")
-
-        result_type["properties"].append(
-            {"name": field_name, "type": property_type, "description": description}
-        )
-
     return result_type
 
 
@@ -166,3 +201,115 @@ def edge_model_to_api_schema(
 ) -> dict[str, typing.Any]:
     """Convert a Pydantic EdgeModel to a JSON schema for API EntityEdge"""
     return _model_to_api_schema_common(model_class, name, is_edge=True)
+
+
+def _get(obj: typing.Any, key: str) -> typing.Any:
+    return obj.get(key) if isinstance(obj, dict) else getattr(obj, key, None)
+
+
+def _canonical_type(api_type: typing.Any) -> dict[str, typing.Any]:
+    """
+    Reduces an EntityType or EdgeType (or its dict form) to the fields the server persists, with properties and
+    source targets sorted so that ordering differences do not change the fingerprint.
+    """
+    properties = sorted(
+        (_get(p, "name"), str(_get(p, "type")), _get(p, "description") or "")
+        for p in (_get(api_type, "properties") or [])
+    )
+    canonical: dict[str, typing.Any] = {
+        "name": _get(api_type, "name"),
+        "description": (_get(api_type, "description") or "").strip(),
+        "properties": properties,
+    }
+    source_targets = _get(api_type, "source_targets")
+    if source_targets:
+        canonical["source_targets"] = sorted(
+            (_get(st, "source") or "", _get(st, "target") or "") for st in source_targets
+        )
+    return canonical
+
+
+def _digest(value: typing.Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def api_type_fingerprint(api_type: typing.Any) -> str:
+    """Returns a content hash of a single EntityType or EdgeType, independent of property ordering"""
+    return _digest(_canonical_type(api_type))
+
+
+def ontology_fingerprint(
+    entity_types: typing.Optional[typing.Sequence[typing.Any]],
+    edge_types: typing.Optional[typing.Sequence[typing.Any]],
+) -> str:
+    """
+    Returns a content hash of a whole ontology. Two ontologies with the same fingerprint produce the same
+    set_entity_types request, regardless of the order in which types and properties were declared.
+    """
+    return _digest(
+        {
+            "entity_types": sorted((_canonical_type(t) for t in entity_types or []), key=lambda t: t["name"]),
+            "edge_types": sorted((_canonical_type(t) for t in edge_types or []), key=lambda t: t["name"]),
+        }
+    )
+
+
+@dataclass(frozen=True)
+class OntologyDiff:
+    """Names of the entity and edge types that differ between a local ontology and the one stored server-side"""
+
+    added_entity_types: typing.Tuple[str, ...] = ()
+    removed_entity_types: typing.Tuple[str, ...] = ()
+    changed_entity_types: typing.Tuple[str, ...] = ()
+    added_edge_types: typing.Tuple[str, ...] = ()
+    removed_edge_types: typing.Tuple[str, ...] = ()
+    changed_edge_types: typing.Tuple[str, ...] = ()
+
+    @property
+    def has_changes(self) -> bool:
+        return any(
+            (
+                self.added_entity_types,
+                self.removed_entity_types,
+                self.changed_entity_types,
+                self.added_edge_types,
+                self.removed_edge_types,
+                self.changed_edge_types,
+            )
+        )
+
+
+def _diff_types(
+    local: typing.Optional[typing.Sequence[typing.Any]], remote: typing.Optional[typing.Sequence[typing.Any]]
+) -> typing.Tuple[typing.Tuple[str, ...], typing.Tuple[str, ...], typing.Tuple[str, ...]]:
+    local_by_name = {c["name"]: c for c in (_canonical_type(t) for t in local or [])}
+    remote_by_name = {c["name"]: c for c in (_canonical_type(t) for t in remote or [])}
+    added = tuple(sorted(local_by_name.keys() - remote_by_name.keys()))
+    removed = tuple(sorted(remote_by_name.keys() - local_by_name.keys()))
+    changed = tuple(
+        sorted(
+            name for name in local_by_name.keys() & remote_by_name.keys() if local_by_name[name] != remote_by_name[name]
+        )
+    )
+    return added, removed, changed
+
+
+def diff_ontology(
+    entity_types: typing.Optional[typing.Sequence[typing.Any]],
+    edge_types: typing.Optional[typing.Sequence[typing.Any]],
+    remote: typing.Any,
+) -> OntologyDiff:
+    """
+    Compares local entity and edge types against an EntityTypeResponse, as returned by list_entity_types.
+    Applying the local ontology replaces the remote one, so types only present remotely are reported as removed.
+    """
+    added_entities, removed_entities, changed_entities = _diff_types(entity_types, _get(remote, "entity_types"))
+    added_edges, removed_edges, changed_edges = _diff_types(edge_types, _get(remote, "edge_types"))
+    return OntologyDiff(
+        added_entity_types=added_entities,
+        removed_entity_types=removed_entities,
+        changed_entity_types=changed_entities,
+        added_edge_types=added_edges,
+        removed_edge_types=removed_edges,
+        changed_edge_types=changed_edges,
+    )
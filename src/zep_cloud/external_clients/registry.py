@@ -0,0 +1,157 @@
+"""
+Clients shared across the event loops and forked worker processes of a server.
+
+An AsyncZep is bound to the event loop its connections were opened on, and both clients hold sockets that a forked
+child must not share with its parent. Servers that preload the application before forking workers (gunicorn or
+uvicorn with preload, Celery's prefork pool), or that run several event loops, therefore either share connections
+they must not share or build a client per task and never reuse a connection.
+
+ClientRegistry builds clients lazily from one set of options: one Zep per process, and one AsyncZep per event loop
+per process. In a forked child, the clients inherited from the parent are dropped without being closed, since their
+sockets are the parent's, and new ones are built on first use. The registry's lock is replaced in the child as well,
+since another thread of the parent may have held it at the moment of the fork. Clients of event loops that have closed
+are dropped the same way. close, which also runs at interpreter exit, closes the clients of the current process.
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+import typing
+import weakref
+
+from ..client import AsyncZep, Zep
+
+# How long close waits for an AsyncZep to be closed on an event loop running in another thread
+_CLOSE_TIMEOUT = 5.0
+
+_registries: "weakref.WeakSet[ClientRegistry]" = weakref.WeakSet()
+
+
+class ClientRegistry:
+    """
+    Builds Zep and AsyncZep clients with the given options on first use, and hands out the same client for as long
+    as it is safe to share.
+
+    Parameters
+    ----------
+    **client_options : typing.Any
+        Keyword arguments of Zep and AsyncZep, such as api_key, base_url or max_connections. httpx_client is not
+        accepted, since the registry must be able to open a new connection pool for every process and event loop.
+    """
+
+    def __init__(self, **client_options: typing.Any):
+        if "httpx_client" in client_options:
+            raise ValueError("ClientRegistry builds its own httpx clients; pass connection options instead")
+        self.client_options = client_options
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._client: typing.Optional[Zep] = None
+        self._async_clients: typing.Dict[
+            int, typing.Tuple["weakref.ReferenceType[asyncio.AbstractEventLoop]", AsyncZep]
+        ] = {}
+        _registries.add(self)
+
+    def _check_process(self) -> None:
+        """
+        Forgets the clients inherited from a parent process, in case the fork bypassed the after-fork hook. Must be
+        called with the lock held.
+        """
+        pid = os.getpid()
+        if pid != self._pid:
+            self._forget_clients(pid)
+
+    def _forget_clients(self, pid: int) -> None:
+        self._pid = pid
+        self._client = None
+        self._async_clients = {}
+
+    def _after_fork(self) -> None:
+        # Runs in the child, where only the forking thread survives; a lock held by any other thread would stay held
+        self._lock = threading.Lock()
+        self._forget_clients(os.getpid())
+
+    def client(self) -> Zep:
+        """The Zep client of the current process."""
+        with self._lock:
+            self._check_process()
+            if self._client is None:
+                self._client = Zep(**self.client_options)
+            return self._client
+
+    def async_client(self) -> AsyncZep:
+        """The AsyncZep client of the running event loop in the current process. Must be called from a coroutine."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._check_process()
+            entry = self._async_clients.get(id(loop))
+            if entry is not None and entry[0]() is loop:
+                return entry[1]
+            # Drop the clients of loops that have closed, whose connections can no longer be used or closed
+            for key, (ref, _) in list(self._async_clients.items()):
+                stale = ref()
+                if stale is None or stale.is_closed():
+                    del self._async_clients[key]
+            client = AsyncZep(**self.client_options)
+            self._async_clients[id(loop)] = (weakref.ref(loop), client)
+            return client
+
+    @property
+    def event_loops(self) -> int:
+        """How many event loops of the current process have an AsyncZep."""
+        with self._lock:
+            self._check_process()
+            return len(self._async_clients)
+
+    async def aclose(self) -> None:
+        """Closes the AsyncZep of the running event loop, if it has one."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._check_process()
+            entry = self._async_clients.pop(id(loop), None)
+        if entry is not None and entry[0]() is loop:
+            await entry[1].aclose()
+
+    def close(self) -> None:
+        """
+        Closes the clients of the current process. An AsyncZep is closed on its event loop when that loop is idle or
+        running in another thread; the clients of loops that have closed, or of the loop calling close, are dropped.
+        """
+        with self._lock:
+            self._check_process()
+            client, self._client = self._client, None
+            async_clients, self._async_clients = self._async_clients, {}
+        if client is not None:
+            client.close()
+        for ref, async_client in async_clients.values():
+            loop = ref()
+            if loop is None or loop.is_closed():
+                continue
+            if not loop.is_running():
+                loop.run_until_complete(async_client.aclose())
+                continue
+            try:
+                if asyncio.get_running_loop() is loop:
+                    continue
+            except RuntimeError:
+                pass
+            future = asyncio.run_coroutine_threadsafe(async_client.aclose(), loop)
+            try:
+                future.result(timeout=_CLOSE_TIMEOUT)
+            except Exception:
+                future.cancel()
+
+
+@atexit.register
+def _close_registries() -> None:
+    for registry in list(_registries):
+        registry.close()
+
+
+def _reset_registries_after_fork() -> None:
+    for registry in list(_registries):
+        registry._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_registries_after_fork)
@@ -0,0 +1,310 @@
+import time
+import typing
+
+from zep_cloud.core.client_wrapper import AsyncClientWrapper, SyncClientWrapper
+from zep_cloud.core.request_options import RequestOptions
+from zep_cloud.external_clients.not_found_cache import NotFoundCacheMixin
+from zep_cloud.external_clients.warmup import AsyncWarmupScheduler, WarmupScheduler
+from zep_cloud.thread.client import AsyncThreadClient as AsyncBaseThreadClient
+from zep_cloud.thread.client import ThreadClient as BaseThreadClient
+from zep_cloud.types import (
+    AddThreadMessagesResponse,
+    Message,
+    MessageListResponse,
+    RoleType,
+    Thread,
+    ThreadContextResponse,
+    ThreadListResponse,
+)
+from zep_cloud.user.client import AsyncUserClient, UserClient
+
+OMIT = typing.cast(typing.Any, ...)
+
+
+def _created_thread_messages(thread: Thread) -> MessageListResponse:
+    return MessageListResponse(
+        messages=[], row_count=0, total_count=0, thread_created_at=thread.created_at, user_id=thread.user_id
+    )
+
+
+def _bind_threads(
+    scheduler: typing.Union[WarmupScheduler, AsyncWarmupScheduler, None],
+    threads: typing.Optional[typing.Sequence[Thread]],
+) -> None:
+    if scheduler is None:
+        return
+    for thread in threads or []:
+        if thread.thread_id is not None and thread.user_id is not None:
+            scheduler.bind_thread(thread.thread_id, thread.user_id)
+
+
+class ThreadClient(NotFoundCacheMixin, BaseThreadClient):
+    def __init__(self, *, client_wrapper: SyncClientWrapper):
+        super().__init__(client_wrapper=client_wrapper)
+        self._client_wrapper = client_wrapper
+        self.warmup: typing.Optional[WarmupScheduler] = None
+
+    def enable_warmup(self, **kwargs: typing.Any) -> WarmupScheduler:
+        """
+        Starts tracking thread traffic to warm users' graphs ahead of their context fetches.
+        Accepts the keyword arguments of WarmupScheduler. Call start on the returned scheduler to also warm users
+        predicted to be active soon.
+        """
+        self.disable_warmup()
+        self.warmup = WarmupScheduler(UserClient(client_wrapper=self._client_wrapper).warm, **kwargs)
+        return self.warmup
+
+    def disable_warmup(self) -> None:
+        if self.warmup is not None:
+            self.warmup.close()
+            self.warmup = None
+
+    def _resolve_user(self, thread_id: str) -> typing.Optional[str]:
+        return None if self.warmup is None else self.warmup.resolve_user(thread_id)
+
+    def list_all(
+        self,
+        *,
+        page_number: typing.Optional[int] = None,
+        page_size: typing.Optional[int] = None,
+        order_by: typing.Optional[str] = None,
+        asc: typing.Optional[bool] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> ThreadListResponse:
+        response = super().list_all(
+            page_number=page_number,
+            page_size=page_size,
+            order_by=order_by,
+            asc=asc,
+            request_options=request_options,
+        )
+        _bind_threads(self.warmup, response.threads)
+        return response
+
+    def create(
+        self, *, thread_id: str, user_id: str, request_options: typing.Optional[RequestOptions] = None
+    ) -> Thread:
+        thread = super().create(thread_id=thread_id, user_id=user_id, request_options=request_options)
+        self._invalidate_not_found(thread_id)
+        if self.warmup is not None:
+            self.warmup.bind_thread(thread_id, user_id)
+        return thread
+
+    def get(
+        self,
+        thread_id: str,
+        *,
+        limit: typing.Optional[int] = None,
+        cursor: typing.Optional[int] = None,
+        lastn: typing.Optional[int] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> MessageListResponse:
+        response = self._cached_get(
+            thread_id,
+            lambda: super(ThreadClient, self).get(
+                thread_id, limit=limit, cursor=cursor, lastn=lastn, request_options=request_options
+            ),
+        )
+        if self.warmup is not None and response.user_id is not None:
+            self.warmup.bind_thread(thread_id, response.user_id)
+        return response
+
+    def get_or_create(
+        self,
+        thread_id: str,
+        *,
+        user_id: str,
+        lastn: typing.Optional[int] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.Tuple[MessageListResponse, bool]:
+        """
+        Returns the messages of a thread, creating the thread for user_id if it does not exist.
+
+        Parameters
+        ----------
+        thread_id : str
+            Thread ID
+
+        user_id : str
+            User the thread is created for. It is not checked against an existing thread.
+
+        lastn : typing.Optional[int]
+            Number of most recent messages to return
+
+        request_options : typing.Optional[RequestOptions]
+            Request-specific configuration.
+
+        Returns
+        -------
+        typing.Tuple[MessageListResponse, bool]
+            The thread's messages, empty for a new thread, and whether the thread was created by this call.
+        """
+        return self._get_or_create(
+            thread_id,
+            lambda: self.get(thread_id, lastn=lastn, request_options=request_options),
+            lambda: _created_thread_messages(
+                self.create(thread_id=thread_id, user_id=user_id, request_options=request_options)
+            ),
+        )
+
+    def get_user_context(
+        self,
+        thread_id: str,
+        *,
+        template_id: typing.Optional[str] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> ThreadContextResponse:
+        # Only observed: warming now could not help this fetch and would count it as a hit.
+        user_id = self._resolve_user(thread_id)
+        if user_id is not None and self.warmup is not None:
+            self.warmup.observe(user_id)
+        start = time.monotonic()
+        response = super().get_user_context(thread_id, template_id=template_id, request_options=request_options)
+        if user_id is not None and self.warmup is not None:
+            self.warmup.record_context_fetch(user_id, time.monotonic() - start)
+        return response
+
+    def add_messages(
+        self,
+        thread_id: str,
+        *,
+        messages: typing.Sequence[Message],
+        ignore_roles: typing.Optional[typing.Sequence[RoleType]] = OMIT,
+        return_context: typing.Optional[bool] = OMIT,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> AddThreadMessagesResponse:
+        user_id = self._resolve_user(thread_id)
+        if user_id is not None and self.warmup is not None:
+            self.warmup.record_activity(user_id)
+        return super().add_messages(
+            thread_id,
+            messages=messages,
+            ignore_roles=ignore_roles,
+            return_context=return_context,
+            request_options=request_options,
+        )
+
+
+class AsyncThreadClient(NotFoundCacheMixin, AsyncBaseThreadClient):
+    def __init__(self, *, client_wrapper: AsyncClientWrapper):
+        super().__init__(client_wrapper=client_wrapper)
+        self._client_wrapper = client_wrapper
+        self.warmup: typing.Optional[AsyncWarmupScheduler] = None
+
+    def enable_warmup(self, **kwargs: typing.Any) -> AsyncWarmupScheduler:
+        """
+        Async counterpart of ThreadClient.enable_warmup. The previous scheduler, if any, is not awaited; use
+        disable_warmup to stop it cleanly.
+        """
+        self.warmup = AsyncWarmupScheduler(AsyncUserClient(client_wrapper=self._client_wrapper).warm, **kwargs)
+        return self.warmup
+
+    async def disable_warmup(self) -> None:
+        if self.warmup is not None:
+            await self.warmup.aclose()
+            self.warmup = None
+
+    def _resolve_user(self, thread_id: str) -> typing.Optional[str]:
+        return None if self.warmup is None else self.warmup.resolve_user(thread_id)
+
+    async def list_all(
+        self,
+        *,
+        page_number: typing.Optional[int] = None,
+        page_size: typing.Optional[int] = None,
+        order_by: typing.Optional[str] = None,
+        asc: typing.Optional[bool] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> ThreadListResponse:
+        response = await super().list_all(
+            page_number=page_number,
+            page_size=page_size,
+            order_by=order_by,
+            asc=asc,
+            request_options=request_options,
+        )
+        _bind_threads(self.warmup, response.threads)
+        return response
+
+    async def create(
+        self, *, thread_id: str, user_id: str, request_options: typing.Optional[RequestOptions] = None
+    ) -> Thread:
+        thread = await super().create(thread_id=thread_id, user_id=user_id, request_options=request_options)
+        self._invalidate_not_found(thread_id)
+        if self.warmup is not None:
+            self.warmup.bind_thread(thread_id, user_id)
+        return thread
+
+    async def get(
+        self,
+        thread_id: str,
+        *,
+        limit: typing.Optional[int] = None,
+        cursor: typing.Optional[int] = None,
+        lastn: typing.Optional[int] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> MessageListResponse:
+        response = await self._acached_get(
+            thread_id,
+            lambda: super(AsyncThreadClient, self).get(
+                thread_id, limit=limit, cursor=cursor, lastn=lastn, request_options=request_options
+            ),
+        )
+        if self.warmup is not None and response.user_id is not None:
+            self.warmup.bind_thread(thread_id, response.user_id)
+        return response
+
+    async def get_or_create(
+        self,
+        thread_id: str,
+        *,
+        user_id: str,
+        lastn: typing.Optional[int] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.Tuple[MessageListResponse, bool]:
+        """Async counterpart of ThreadClient.get_or_create."""
+
+        async def create() -> MessageListResponse:
+            thread = await self.create(thread_id=thread_id, user_id=user_id, request_options=request_options)
+            return _created_thread_messages(thread)
+
+        return await self._aget_or_create(
+            thread_id, lambda: self.get(thread_id, lastn=lastn, request_options=request_options), create
+        )
+
+    async def get_user_context(
+        self,
+        thread_id: str,
+        *,
+        template_id: typing.Optional[str] = None,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> ThreadContextResponse:
+        # Only observed: warming now could not help this fetch and would count it as a hit.
+        user_id = self._resolve_user(thread_id)
+        if user_id is not None and self.warmup is not None:
+            self.warmup.observe(user_id)
+        start = time.monotonic()
+        response = await super().get_user_context(thread_id, template_id=template_id, request_options=request_options)
+        if user_id is not None and self.warmup is not None:
+            self.warmup.record_context_fetch(user_id, time.monotonic() - start)
+        return response
+
+    async def add_messages(
+        self,
+        thread_id: str,
+        *,
+        messages: typing.Sequence[Message],
+        ignore_roles: typing.Optional[typing.Sequence[RoleType]] = OMIT,
+        return_context: typing.Optional[bool] = OMIT,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> AddThreadMessagesResponse:
+        user_id = self._resolve_user(thread_id)
+        if user_id is not None and self.warmup is not None:
+            self.warmup.record_activity(user_id)
+        return await super().add_messages(
+            thread_id,
+            messages=messages,
+            ignore_roles=ignore_roles,
+            return_context=return_context,
+            request_options=request_options,
+        )
@@ -1,13 +1,145 @@
+import typing
+
 from zep_cloud.core.client_wrapper import AsyncClientWrapper, SyncClientWrapper
+from zep_cloud.core.request_options import RequestOptions
+from zep_cloud.external_clients.not_found_cache import NotFoundCacheMixin
+from zep_cloud.types import User
 from zep_cloud.user.client import AsyncUserClient as AsyncBaseUserClient
 from zep_cloud.user.client import UserClient as BaseUserClient
 
+OMIT = typing.cast(typing.Any, ...)
+
 
-class UserClient(BaseUserClient):
+class UserClient(NotFoundCacheMixin, BaseUserClient):
     def __init__(self, *, client_wrapper: SyncClientWrapper):
         super().__init__(client_wrapper=client_wrapper)
 
+    def get(self, user_id: str, *, request_options: typing.Optional[RequestOptions] = None) -> User:
+        return self._cached_get(user_id, lambda: super(UserClient, self).get(user_id, request_options=request_options))
+
+    def add(
+        self,
+        *,
+        user_id: str,
+        disable_default_ontology: typing.Optional[bool] = OMIT,
+        email: typing.Optional[str] = OMIT,
+        first_name: typing.Optional[str] = OMIT,
+        last_name: typing.Optional[str] = OMIT,
+        metadata: typing.Optional[typing.Dict[str, typing.Optional[typing.Any]]] = OMIT,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> User:
+        user = super().add(
+            user_id=user_id,
+            disable_default_ontology=disable_default_ontology,
+            email=email,
+            first_name=first_name,
+            last_name=last_name,
+            metadata=metadata,
+            request_options=request_options,
+        )
+        self._invalidate_not_found(user_id)
+        return user
+
+    def get_or_create(
+        self,
+        user_id: str,
+        *,
+        disable_default_ontology: typing.Optional[bool] = OMIT,
+        email: typing.Optional[str] = OMIT,
+        first_name: typing.Optional[str] = OMIT,
+        last_name: typing.Optional[str] = OMIT,
+        metadata: typing.Optional[typing.Dict[str, typing.Optional[typing.Any]]] = OMIT,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.Tuple[User, bool]:
+        """
+        Returns the user, adding it with the given fields if it does not exist.
+
+        Parameters
+        ----------
+        user_id : str
+            The unique identifier of the user.
+
+        disable_default_ontology, email, first_name, last_name, metadata
+            Passed to add when the user is created. They are not applied to an existing user.
 
-class AsyncUserClient(AsyncBaseUserClient):
+        request_options : typing.Optional[RequestOptions]
+            Request-specific configuration.
+
+        Returns
+        -------
+        typing.Tuple[User, bool]
+            The user and whether it was created by this call. If a concurrent add wins the race, the user it
+            created is returned with False.
+        """
+        return self._get_or_create(
+            user_id,
+            lambda: self.get(user_id, request_options=request_options),
+            lambda: self.add(
+                user_id=user_id,
+                disable_default_ontology=disable_default_ontology,
+                email=email,
+                first_name=first_name,
+                last_name=last_name,
+                metadata=metadata,
+                request_options=request_options,
+            ),
+        )
+
+
+class AsyncUserClient(NotFoundCacheMixin, AsyncBaseUserClient):
     def __init__(self, *, client_wrapper: AsyncClientWrapper):
         super().__init__(client_wrapper=client_wrapper)
+
+    async def get(self, user_id: str, *, request_options: typing.Optional[RequestOptions] = None) -> User:
+        return await self._acached_get(
+            user_id, lambda: super(AsyncUserClient, self).get(user_id, request_options=request_options)
+        )
+
+    async def add(
+        self,
+        *,
+        user_id: str,
+        disable_default_ontology: typing.Optional[bool] = OMIT,
+        email: typing.Optional[str] = OMIT,
+        first_name: typing.Optional[str] = OMIT,
+        last_name: typing.Optional[str] = OMIT,
+        metadata: typing.Optional[typing.Dict[str, typing.Optional[typing.Any]]] = OMIT,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> User:
+        user = await super().add(
+            user_id=user_id,
+            disable_default_ontology=disable_default_ontology,
+            email=email,
+            first_name=first_name,
+            last_name=last_name,
+            metadata=metadata,
+            request_options=request_options,
+        )
+        self._invalidate_not_found(user_id)
+        return user
+
+    async def get_or_create(
+        self,
+        user_id: str,
+        *,
+        disable_default_ontology: typing.Optional[bool] = OMIT,
+        email: typing.Optional[str] = OMIT,
+        first_name: typing.Optional[str] = OMIT,
+        last_name: typing.Optional[str] = OMIT,
+        metadata: typing.Optional[typing.Dict[str, typing.Optional[typing.Any]]] = OMIT,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> typing.Tuple[User, bool]:
+        """Async counterpart of UserClient.get_or_create."""
+        return await self._aget_or_create(
+            user_id,
+            lambda: self.get(user_id, request_options=request_options),
+            lambda: self.add(
+                user_id=user_id,
+                disable_default_ontology=disable_default_ontology,
+                email=email,
+                first_name=first_name,
+                last_name=last_name,
+                metadata=metadata,
+                request_options=request_options,
+            ),
+        )
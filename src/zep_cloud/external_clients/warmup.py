@@ -0,0 +1,448 @@
+import asyncio
+import collections
+import concurrent.futures
+import threading
+import time
+import typing
+from dataclasses import dataclass
+
+DEFAULT_DEDUP_WINDOW = 300.0
+DEFAULT_MAX_WARMS_PER_SECOND = 5.0
+DEFAULT_PREDICTION_LEAD = 60.0
+DEFAULT_IDLE_TIMEOUT = 3600.0
+DEFAULT_MAX_TRACKED_USERS = 10_000
+
+_LATENCY_SAMPLES = 1024
+
+
+@dataclass(frozen=True)
+class WarmupStats:
+    """
+    Counters of a warm-up scheduler.
+
+    A context fetch is counted as a hit when the user was warmed within the dedup window before it, and as a
+    miss otherwise. Only the first context fetch of a user per dedup window is counted, since later fetches hit a
+    warm graph regardless of the scheduler.
+    """
+
+    warms_sent: int
+    warms_failed: int
+    predicted_warms: int
+    skipped_duplicate: int
+    skipped_rate_limited: int
+    tracked_users: int
+    context_fetches: int
+    hits: int
+    misses: int
+    hit_p99_latency: typing.Optional[float]
+    miss_p99_latency: typing.Optional[float]
+
+    @property
+    def hit_rate(self) -> typing.Optional[float]:
+        counted = self.hits + self.misses
+        return self.hits / counted if counted else None
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = now
+
+    def take(self, now: float) -> bool:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class _Activity:
+    __slots__ = ("last_seen", "interval", "warmed_at", "fetched_at")
+
+    def __init__(self, now: float):
+        self.last_seen = now
+        self.interval: typing.Optional[float] = None
+        self.warmed_at: typing.Optional[float] = None
+        self.fetched_at: typing.Optional[float] = None
+
+    def predicted(self) -> typing.Optional[float]:
+        return None if self.interval is None else self.last_seen + self.interval
+
+
+def _p99(samples: typing.Deque[float]) -> typing.Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+class _WarmupPolicy:
+    """
+    Thread-safe bookkeeping shared by the sync and async schedulers. It decides who to warm; the schedulers only
+    perform the calls.
+
+    Activity is modelled per user as an exponentially weighted average of the gaps between observed requests. A
+    user is predicted to come back at last_seen + average gap, and is due for a warm once that moment is within
+    prediction_lead seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        dedup_window: float,
+        max_warms_per_second: float,
+        burst: typing.Optional[float],
+        prediction_lead: float,
+        idle_timeout: float,
+        max_tracked_users: int,
+        smoothing: float,
+        clock: typing.Callable[[], float],
+    ):
+        if dedup_window <= 0 or max_warms_per_second <= 0:
+            raise ValueError("dedup_window and max_warms_per_second must be positive")
+        self.dedup_window = dedup_window
+        self.prediction_lead = prediction_lead
+        self.idle_timeout = idle_timeout
+        self.max_tracked_users = max_tracked_users
+        self.smoothing = smoothing
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._users: "collections.OrderedDict[str, _Activity]" = collections.OrderedDict()
+        self._threads: "collections.OrderedDict[str, str]" = collections.OrderedDict()
+        self._bucket = _TokenBucket(
+            max_warms_per_second, burst if burst is not None else max(1.0, max_warms_per_second), clock()
+        )
+        self._hit_latencies: typing.Deque[float] = collections.deque(maxlen=_LATENCY_SAMPLES)
+        self._miss_latencies: typing.Deque[float] = collections.deque(maxlen=_LATENCY_SAMPLES)
+        self._counters: typing.Counter[str] = collections.Counter()
+
+    def bind_thread(self, thread_id: str, user_id: str) -> None:
+        with self._lock:
+            self._threads[thread_id] = user_id
+            self._threads.move_to_end(thread_id)
+            while len(self._threads) > self.max_tracked_users:
+                self._threads.popitem(last=False)
+
+    def user_for_thread(self, thread_id: str) -> typing.Optional[str]:
+        with self._lock:
+            return self._threads.get(thread_id)
+
+    def _activity(self, user_id: str, now: float) -> _Activity:
+        activity = self._users.get(user_id)
+        if activity is None:
+            activity = self._users[user_id] = _Activity(now)
+            while len(self._users) > self.max_tracked_users:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(user_id)
+        return activity
+
+    def observe(self, user_id: str) -> None:
+        now = self.clock()
+        with self._lock:
+            activity = self._activity(user_id, now)
+            gap = now - activity.last_seen
+            if gap > 0:
+                activity.interval = (
+                    gap
+                    if activity.interval is None
+                    else self.smoothing * gap + (1 - self.smoothing) * activity.interval
+                )
+            activity.last_seen = now
+
+    def _claim(self, user_id: str, now: float, force: bool) -> bool:
+        activity = self._activity(user_id, now)
+        if not force and activity.warmed_at is not None and now - activity.warmed_at < self.dedup_window:
+            self._counters["skipped_duplicate"] += 1
+            return False
+        if not self._bucket.take(now):
+            self._counters["skipped_rate_limited"] += 1
+            return False
+        activity.warmed_at = now
+        return True
+
+    def claim(self, user_id: str, force: bool = False) -> bool:
+        with self._lock:
+            return self._claim(user_id, self.clock(), force)
+
+    def claim_due(self) -> typing.List[str]:
+        now = self.clock()
+        due: typing.List[str] = []
+        with self._lock:
+            for user_id, activity in list(self._users.items()):
+                if now - activity.last_seen > self.idle_timeout:
+                    del self._users[user_id]
+                    continue
+                predicted = activity.predicted()
+                if predicted is None or predicted - now > self.prediction_lead:
+                    continue
+                # A prediction that lapsed without the user showing up is stale until they are observed again.
+                if now - predicted > typing.cast(float, activity.interval):
+                    continue
+                if activity.warmed_at is not None and now - activity.warmed_at < self.dedup_window:
+                    continue
+                if not self._claim(user_id, now, False):
+                    break
+                due.append(user_id)
+            self._counters["predicted_warms"] += len(due)
+        return due
+
+    def record_warm(self, ok: bool) -> None:
+        with self._lock:
+            self._counters["warms_sent" if ok else "warms_failed"] += 1
+
+    def record_context_fetch(self, user_id: str, latency: float) -> None:
+        now = self.clock()
+        with self._lock:
+            self._counters["context_fetches"] += 1
+            activity = self._activity(user_id, now)
+            first = activity.fetched_at is None or now - activity.fetched_at >= self.dedup_window
+            activity.fetched_at = now
+            if not first:
+                return
+            if activity.warmed_at is not None and now - activity.warmed_at < self.dedup_window:
+                self._counters["hits"] += 1
+                self._hit_latencies.append(latency)
+            else:
+                self._counters["misses"] += 1
+                self._miss_latencies.append(latency)
+
+    def stats(self) -> WarmupStats:
+        with self._lock:
+            c = self._counters
+            return WarmupStats(
+                warms_sent=c["warms_sent"],
+                warms_failed=c["warms_failed"],
+                predicted_warms=c["predicted_warms"],
+                skipped_duplicate=c["skipped_duplicate"],
+                skipped_rate_limited=c["skipped_rate_limited"],
+                tracked_users=len(self._users),
+                context_fetches=c["context_fetches"],
+                hits=c["hits"],
+                misses=c["misses"],
+                hit_p99_latency=_p99(self._hit_latencies),
+                miss_p99_latency=_p99(self._miss_latencies),
+            )
+
+
+class _BaseWarmupScheduler:
+    def __init__(
+        self,
+        *,
+        dedup_window: float = DEFAULT_DEDUP_WINDOW,
+        max_warms_per_second: float = DEFAULT_MAX_WARMS_PER_SECOND,
+        burst: typing.Optional[float] = None,
+        prediction_lead: float = DEFAULT_PREDICTION_LEAD,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        max_tracked_users: int = DEFAULT_MAX_TRACKED_USERS,
+        smoothing: float = 0.3,
+        warm_on_activity: bool = True,
+        thread_resolver: typing.Optional[typing.Callable[[str], typing.Optional[str]]] = None,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        self._policy = _WarmupPolicy(
+            dedup_window=dedup_window,
+            max_warms_per_second=max_warms_per_second,
+            burst=burst,
+            prediction_lead=prediction_lead,
+            idle_timeout=idle_timeout,
+            max_tracked_users=max_tracked_users,
+            smoothing=smoothing,
+            clock=clock,
+        )
+        self._warm_on_activity = warm_on_activity
+        self._thread_resolver = thread_resolver
+
+    def bind_thread(self, thread_id: str, user_id: str) -> None:
+        """Records which user a thread belongs to, so that thread traffic can be attributed to the user."""
+        self._policy.bind_thread(thread_id, user_id)
+
+    def resolve_user(self, thread_id: str) -> typing.Optional[str]:
+        user_id = self._policy.user_for_thread(thread_id)
+        if user_id is None and self._thread_resolver is not None:
+            user_id = self._thread_resolver(thread_id)
+            if user_id is not None:
+                self._policy.bind_thread(thread_id, user_id)
+        return user_id
+
+    def observe(self, user_id: str) -> None:
+        """Records a request made on behalf of user_id without warming it."""
+        self._policy.observe(user_id)
+
+    def record_context_fetch(self, user_id: str, latency: float) -> None:
+        """Records a completed context fetch and its latency in seconds, counting it as a hit or a miss."""
+        self._policy.record_context_fetch(user_id, latency)
+
+    def stats(self) -> WarmupStats:
+        return self._policy.stats()
+
+
+class WarmupScheduler(_BaseWarmupScheduler):
+    """
+    Calls user.warm ahead of expected activity.
+
+    Activity is reported by the thread client (add_messages and get_user_context) or with record_activity. The
+    first activity of a user warms it right away, in a background worker; run_pending, or the loop started with
+    start, warms users whose next request is predicted within prediction_lead seconds. A user is warmed at most
+    once per dedup_window and warms are rate limited to max_warms_per_second overall.
+
+    Parameters
+    ----------
+    warm : typing.Callable[[str], typing.Any]
+        Function warming a user, usually client.user.warm.
+
+    dedup_window : float
+        Minimum number of seconds between two warms of the same user.
+
+    max_warms_per_second : float
+        Sustained warm rate, with bursts of up to burst warms.
+
+    prediction_lead : float
+        How many seconds ahead of the predicted activity a user is warmed.
+
+    idle_timeout : float
+        Users not seen for this many seconds are forgotten.
+
+    warm_on_activity : bool
+        Whether observed activity triggers a warm right away.
+
+    thread_resolver : typing.Optional[typing.Callable[[str], typing.Optional[str]]]
+        Maps a thread ID to its user ID for threads not created or listed through this client.
+    """
+
+    def __init__(self, warm: typing.Callable[[str], typing.Any], **kwargs: typing.Any):
+        super().__init__(**kwargs)
+        self._warm = warm
+        self._executor: typing.Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._loop_thread: typing.Optional[threading.Thread] = None
+
+    def _call_warm(self, user_id: str) -> None:
+        try:
+            self._warm(user_id)
+        except Exception:
+            self._policy.record_warm(False)
+        else:
+            self._policy.record_warm(True)
+
+    def _submit(self, user_id: str) -> None:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="zep-warmup")
+            self._executor.submit(self._call_warm, user_id)
+
+    def record_activity(self, user_id: str) -> None:
+        """Records a request made on behalf of user_id, warming the user unless it was warmed recently."""
+        self._policy.observe(user_id)
+        if self._warm_on_activity and self._policy.claim(user_id):
+            self._submit(user_id)
+
+    def warm(self, user_id: str, *, force: bool = False) -> bool:
+        """
+        Warms user_id now, unless it was warmed within the dedup window or the rate limit is exhausted.
+        force bypasses the dedup window but not the rate limit. Returns whether the warm was sent.
+        """
+        if not self._policy.claim(user_id, force):
+            return False
+        self._call_warm(user_id)
+        return True
+
+    def run_pending(self) -> int:
+        """Warms every user predicted to be active soon. Returns the number of users warmed."""
+        due = self._policy.claim_due()
+        for user_id in due:
+            self._call_warm(user_id)
+        return len(due)
+
+    def start(self, interval: float = 1.0) -> None:
+        """Runs run_pending every interval seconds in a daemon thread until close is called."""
+        if self._loop_thread is not None:
+            return
+        self._stop.clear()
+
+        def loop() -> None:
+            while not self._stop.wait(interval):
+                self.run_pending()
+
+        self._loop_thread = threading.Thread(target=loop, name="zep-warmup-scheduler", daemon=True)
+        self._loop_thread.start()
+
+    def close(self) -> None:
+        """Stops the scheduling loop and waits for in-flight warms."""
+        self._stop.set()
+        if self._loop_thread is not None:
+            self._loop_thread.join()
+            self._loop_thread = None
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+class AsyncWarmupScheduler(_BaseWarmupScheduler):
+    """
+    Async counterpart of WarmupScheduler. Warms triggered by activity run as tasks on the running event loop.
+    """
+
+    def __init__(self, warm: typing.Callable[[str], typing.Awaitable[typing.Any]], **kwargs: typing.Any):
+        super().__init__(**kwargs)
+        self._warm = warm
+        self._tasks: typing.Set["asyncio.Task[None]"] = set()
+        self._loop_task: typing.Optional["asyncio.Task[None]"] = None
+
+    async def _call_warm(self, user_id: str) -> None:
+        try:
+            await self._warm(user_id)
+        except Exception:
+            self._policy.record_warm(False)
+        else:
+            self._policy.record_warm(True)
+
+    def record_activity(self, user_id: str) -> None:
+        """Records a request made on behalf of user_id, warming the user unless it was warmed recently."""
+        self._policy.observe(user_id)
+        if self._warm_on_activity and self._policy.claim(user_id):
+            task = asyncio.get_running_loop().create_task(self._call_warm(user_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def warm(self, user_id: str, *, force: bool = False) -> bool:
+        """Async counterpart of WarmupScheduler.warm."""
+        if not self._policy.claim(user_id, force):
+            return False
+        await self._call_warm(user_id)
+        return True
+
+    async def run_pending(self) -> int:
+        """Warms every user predicted to be active soon. Returns the number of users warmed."""
+        due = self._policy.claim_due()
+        await asyncio.gather(*(self._call_warm(user_id) for user_id in due))
+        return len(due)
+
+    def start(self, interval: float = 1.0) -> None:
+        """Runs run_pending every interval seconds on the running event loop until aclose is called."""
+        if self._loop_task is not None:
+            return
+
+        async def loop() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                await self.run_pending()
+
+        self._loop_task = asyncio.get_running_loop().create_task(loop())
+
+    async def aclose(self) -> None:
+        """Stops the scheduling loop and waits for in-flight warms."""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
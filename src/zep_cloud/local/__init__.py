@@ -0,0 +1,108 @@
+from .arrow import ColumnBuilder, export_parquet, iter_record_batches, write_arrow, write_parquet
+from .filters import FilterColumns, FilterPredicate, compile_filters
+from .graph import LocalGraph
+from .ingest import IngestResult, StageStats, ingest
+from .jsonl import ExportResult, ImportResult, export_jsonl, import_jsonl, iter_jsonl
+from .lazy import (
+    LazyList,
+    aiter_lazy_pages,
+    alazy_page,
+    alazy_search,
+    iter_lazy_pages,
+    lazy_page,
+    lazy_search,
+    materialize,
+    parse_lazy,
+)
+from .pagination import (
+    DEFAULT_PAGE_SIZE,
+    aiter_edge_pages,
+    aiter_node_pages,
+    aiter_observation_pages,
+    iter_edge_pages,
+    iter_edges,
+    iter_node_pages,
+    iter_nodes,
+    iter_observation_pages,
+)
+from .patterns import connected_components, detect_patterns
+from .records import (
+    DerivedNodeRecord,
+    EdgeRecord,
+    EpisodeRecord,
+    MessageRecord,
+    NodeRecord,
+    aiter_record_pages,
+    iter_record_pages,
+    iter_records,
+)
+from .store import GraphStore, RefreshStats
+from .streaming import (
+    JsonArrayDecoder,
+    aiter_json_array,
+    astream_items,
+    astream_page,
+    iter_json_array,
+    stream_items,
+    stream_page,
+)
+from .sync import GraphSync, SyncResult
+
+__all__ = [
+    "ColumnBuilder",
+    "DEFAULT_PAGE_SIZE",
+    "DerivedNodeRecord",
+    "EdgeRecord",
+    "EpisodeRecord",
+    "ExportResult",
+    "FilterColumns",
+    "FilterPredicate",
+    "GraphStore",
+    "GraphSync",
+    "ImportResult",
+    "IngestResult",
+    "JsonArrayDecoder",
+    "LazyList",
+    "LocalGraph",
+    "MessageRecord",
+    "NodeRecord",
+    "RefreshStats",
+    "StageStats",
+    "SyncResult",
+    "aiter_edge_pages",
+    "aiter_json_array",
+    "aiter_lazy_pages",
+    "aiter_node_pages",
+    "aiter_observation_pages",
+    "aiter_record_pages",
+    "alazy_page",
+    "alazy_search",
+    "astream_items",
+    "astream_page",
+    "compile_filters",
+    "connected_components",
+    "detect_patterns",
+    "export_jsonl",
+    "export_parquet",
+    "import_jsonl",
+    "ingest",
+    "iter_edge_pages",
+    "iter_edges",
+    "iter_json_array",
+    "iter_jsonl",
+    "iter_lazy_pages",
+    "iter_node_pages",
+    "iter_nodes",
+    "iter_observation_pages",
+    "iter_record_batches",
+    "iter_record_pages",
+    "iter_records",
+    "lazy_page",
+    "lazy_search",
+    "materialize",
+    "parse_lazy",
+    "stream_items",
+    "stream_page",
+    "write_arrow",
+    "write_parquet",
+]
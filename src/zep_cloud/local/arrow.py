@@ -0,0 +1,351 @@
+"""
+Streaming export of graph nodes, edges, episodes and observations to Apache Arrow and Parquet.
+
+Records are pulled one page at a time and converted straight into Arrow columns, so memory use is bounded by the page
+size rather than by the size of the graph. Pages are decoded from the response JSON into the compact records of
+zep_cloud.local.records, skipping pydantic validation, which dominates the cost of exporting through the models.
+Requires the arrow extra.
+
+Attribute dictionaries (node, edge and observation attributes, episode metadata) are exported either as a single
+JSON string column, or flattened into one column per key. Flattened columns get their key set and types from the
+first page, or from attribute_columns, since every batch of a file must share one schema. Values that do not fit
+their column, and keys first seen in later pages, go to a JSON "<field>_extra" column instead of being dropped.
+"""
+
+import json
+import os
+import typing
+
+from ..core.jsonable_encoder import jsonable_encoder
+from ..core.optional import import_optional
+from ..core.request_options import RequestOptions
+from .pagination import DEFAULT_PAGE_SIZE, _raise_for_status, _resolve_owner
+from .records import EpisodeRecord, RecordPageKind, _loads, iter_record_pages
+from .store import DEFAULT_EPISODE_LASTN
+
+if typing.TYPE_CHECKING:
+    import pyarrow
+    from ..client import Zep
+
+ExportKind = typing.Literal["nodes", "edges", "episodes", "observations"]
+AttributeMode = typing.Literal["json", "flatten"]
+
+EXPORT_KINDS: typing.Tuple[ExportKind, ...] = ("nodes", "edges", "episodes", "observations")
+
+# (column, model attribute, column type)
+_Column = typing.Tuple[str, str, str]
+
+_COLUMNS: typing.Dict[str, typing.Tuple[typing.Tuple[_Column, ...], str]] = {
+    "nodes": (
+        (
+            ("uuid", "uuid_", "string"),
+            ("name", "name", "string"),
+            ("summary", "summary", "string"),
+            ("labels", "labels", "list<string>"),
+            ("created_at", "created_at", "string"),
+        ),
+        "attributes",
+    ),
+    "edges": (
+        (
+            ("uuid", "uuid_", "string"),
+            ("name", "name", "string"),
+            ("fact", "fact", "string"),
+            ("source_node_uuid", "source_node_uuid", "string"),
+            ("target_node_uuid", "target_node_uuid", "string"),
+            ("episodes", "episodes", "list<string>"),
+            ("created_at", "created_at", "string"),
+            ("valid_at", "valid_at", "string"),
+            ("invalid_at", "invalid_at", "string"),
+            ("expired_at", "expired_at", "string"),
+        ),
+        "attributes",
+    ),
+    "episodes": (
+        (
+            ("uuid", "uuid_", "string"),
+            ("content", "content", "string"),
+            ("source", "source", "string"),
+            ("source_description", "source_description", "string"),
+            ("role", "role", "string"),
+            ("role_type", "role_type", "string"),
+            ("thread_id", "thread_id", "string"),
+            ("task_id", "task_id", "string"),
+            ("processed", "processed", "bool"),
+            ("created_at", "created_at", "string"),
+        ),
+        "metadata",
+    ),
+    "observations": (
+        (
+            ("uuid", "uuid_", "string"),
+            ("name", "name", "string"),
+            ("summary", "summary", "string"),
+            ("labels", "labels", "list<string>"),
+            ("episode_ids", "episode_ids", "list<string>"),
+            ("created_at", "created_at", "string"),
+        ),
+        "attributes",
+    ),
+}
+
+_PYTHON_TYPES: typing.Dict[str, typing.Tuple[type, ...]] = {
+    "bool": (bool,),
+    "int64": (int,),
+    "float64": (float, int),
+    "string": (str,),
+}
+
+
+def _pyarrow() -> typing.Any:
+    return import_optional("pyarrow", "arrow", "Arrow and Parquet export")
+
+
+def _arrow_type(pa: typing.Any, name: str) -> typing.Any:
+    if name == "list<string>":
+        return pa.list_(pa.string())
+    return {"string": pa.string(), "bool": pa.bool_(), "int64": pa.int64(), "float64": pa.float64()}[name]
+
+
+def _infer_type(values: typing.Iterable[typing.Any]) -> typing.Optional[str]:
+    """Column type for the values of one attribute key, None if they are not scalars."""
+    kinds = {"bool" if isinstance(v, bool) else type(v).__name__ for v in values if v is not None}
+    if kinds == {"bool"}:
+        return "bool"
+    if kinds == {"int"}:
+        return "int64"
+    if kinds and kinds <= {"int", "float"}:
+        return "float64"
+    return "string" if "str" in kinds else None
+
+
+def _to_json(value: typing.Any) -> typing.Optional[str]:
+    if value is None:
+        return None
+    return json.dumps(jsonable_encoder(value), separators=(",", ":"), ensure_ascii=False)
+
+
+def _fits(value: typing.Any, type_name: str) -> bool:
+    # bool is a subclass of int, but only belongs in bool columns
+    if isinstance(value, bool):
+        return type_name == "bool"
+    return isinstance(value, _PYTHON_TYPES[type_name])
+
+
+class ColumnBuilder:
+    """
+    Turns pages of nodes, edges, episodes or observations, as records or models, into Python column lists with a
+    fixed layout.
+
+    The layout, and with it the Arrow schema, is fixed by the first page (or by attribute_columns) and kept for
+    every later page.
+    """
+
+    def __init__(
+        self,
+        kind: ExportKind,
+        *,
+        attributes: AttributeMode = "json",
+        attribute_columns: typing.Optional[typing.Mapping[str, str]] = None,
+    ):
+        if kind not in _COLUMNS:
+            raise ValueError(f"kind must be one of {', '.join(EXPORT_KINDS)}, got {kind!r}")
+        if attributes not in ("json", "flatten"):
+            raise ValueError(f"attributes must be 'json' or 'flatten', got {attributes!r}")
+        self.kind = kind
+        self.mode = attributes
+        self._columns, self._dict_field = _COLUMNS[kind]
+        self._attribute_types: typing.Optional[typing.Dict[str, str]] = (
+            dict(attribute_columns) if attribute_columns is not None else None
+        )
+
+    def _prime(self, models: typing.Sequence[typing.Any]) -> None:
+        if self._attribute_types is not None:
+            return
+        values: typing.Dict[str, typing.List[typing.Any]] = {}
+        for model in models:
+            for key, value in (getattr(model, self._dict_field, None) or {}).items():
+                values.setdefault(key, []).append(value)
+        inferred = {key: _infer_type(values[key]) for key in sorted(values)}
+        self._attribute_types = {key: t for key, t in inferred.items() if t is not None}
+
+    def fields(self) -> typing.List[typing.Tuple[str, str]]:
+        """(column, type) pairs of the layout. Fixed once the first page has been converted in flatten mode."""
+        fields = [(name, type_name) for name, _, type_name in self._columns]
+        if self.mode == "json":
+            return fields + [(self._dict_field, "string")]
+        fields.extend((f"{self._dict_field}.{key}", t) for key, t in (self._attribute_types or {}).items())
+        return fields + [(f"{self._dict_field}_extra", "string")]
+
+    def columns(self, models: typing.Sequence[typing.Any]) -> typing.Dict[str, typing.List[typing.Any]]:
+        columns: typing.Dict[str, typing.List[typing.Any]] = {}
+        for name, attribute, _ in self._columns:
+            columns[name] = [getattr(model, attribute, None) for model in models]
+
+        dicts = [getattr(model, self._dict_field, None) or {} for model in models]
+        if self.mode == "json":
+            columns[self._dict_field] = [_to_json(d) if d else None for d in dicts]
+            return columns
+
+        self._prime(models)
+        types = typing.cast(typing.Dict[str, str], self._attribute_types)
+        flattened: typing.Dict[str, typing.List[typing.Any]] = {key: [None] * len(dicts) for key in types}
+        extras: typing.List[typing.Optional[str]] = [None] * len(dicts)
+        for row, values in enumerate(dicts):
+            extra = {}
+            for key, value in values.items():
+                type_name = types.get(key)
+                if value is None:
+                    continue
+                if type_name is not None and _fits(value, type_name):
+                    flattened[key][row] = float(value) if type_name == "float64" else value
+                else:
+                    extra[key] = value
+            if extra:
+                extras[row] = _to_json(extra)
+        columns.update((f"{self._dict_field}.{key}", column) for key, column in flattened.items())
+        columns[f"{self._dict_field}_extra"] = extras
+        return columns
+
+    def schema(self) -> "pyarrow.Schema":
+        pa = _pyarrow()
+        return pa.schema([pa.field(name, _arrow_type(pa, type_name)) for name, type_name in self.fields()])
+
+    def record_batch(self, models: typing.Sequence[typing.Any]) -> "pyarrow.RecordBatch":
+        pa = _pyarrow()
+        columns = self.columns(models)
+        schema = self.schema()
+        return pa.record_batch([pa.array(columns[field.name], type=field.type) for field in schema], schema=schema)
+
+
+def iter_export_pages(
+    client: "Zep",
+    kind: ExportKind,
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    episode_lastn: int = DEFAULT_EPISODE_LASTN,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.Iterator[typing.List[typing.Any]]:
+    """
+    Yields pages of one kind of record, decoded from the response JSON without validation. Episodes are not cursor
+    paginated, they are fetched as the most recent episode_lastn episodes and yielded in page_size chunks.
+    """
+    if kind == "episodes":
+        owner, identifier = _resolve_owner(graph_id, user_id)
+        response = client._client_wrapper.httpx_client.request(
+            f"graph/episodes/{owner}/{jsonable_encoder(identifier)}",
+            method="GET",
+            params={"lastn": episode_lastn},
+            request_options=request_options,
+        )
+        _raise_for_status(response)
+        episodes = [EpisodeRecord.from_raw(raw) for raw in _loads(response.content).get("episodes") or []]
+        for start in range(0, len(episodes), page_size):
+            yield episodes[start : start + page_size]
+        return
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"kind must be one of {', '.join(EXPORT_KINDS)}, got {kind!r}")
+    yield from iter_record_pages(
+        client,
+        typing.cast(RecordPageKind, kind),
+        graph_id=graph_id,
+        user_id=user_id,
+        page_size=page_size,
+        request_options=request_options,
+    )
+
+
+def iter_record_batches(
+    client: "Zep",
+    kind: ExportKind,
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    attributes: AttributeMode = "json",
+    attribute_columns: typing.Optional[typing.Mapping[str, str]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    episode_lastn: int = DEFAULT_EPISODE_LASTN,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.Iterator["pyarrow.RecordBatch"]:
+    """
+    Yields one Arrow record batch per page of nodes, edges, episodes or observations of a graph or user graph.
+
+    Parameters
+    ----------
+    kind : ExportKind
+        "nodes", "edges", "episodes" or "observations".
+
+    attributes : AttributeMode
+        "json" exports attributes (metadata for episodes) as a JSON string column, "flatten" as one column per key.
+
+    attribute_columns : typing.Optional[typing.Mapping[str, str]]
+        Flattened attribute keys and their types ("string", "int64", "float64" or "bool"). Inferred from the first
+        page when omitted.
+    """
+    builder = ColumnBuilder(kind, attributes=attributes, attribute_columns=attribute_columns)
+    for page in iter_export_pages(
+        client,
+        kind,
+        graph_id=graph_id,
+        user_id=user_id,
+        page_size=page_size,
+        episode_lastn=episode_lastn,
+        request_options=request_options,
+    ):
+        yield builder.record_batch(page)
+
+
+def _write(
+    path: str,
+    batches: typing.Iterator["pyarrow.RecordBatch"],
+    open_writer: typing.Callable[[str, "pyarrow.Schema"], typing.Any],
+) -> int:
+    rows = 0
+    writer = None
+    try:
+        for batch in batches:
+            if writer is None:
+                writer = open_writer(path, batch.schema)
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def write_parquet(
+    client: "Zep", path: str, kind: ExportKind, *, compression: str = "zstd", **kwargs: typing.Any
+) -> int:
+    """
+    Streams one kind of record to a Parquet file and returns the number of rows written. No file is written for an
+    empty graph. Accepts the keyword arguments of iter_record_batches.
+    """
+    _pyarrow()
+    import pyarrow.parquet as pq
+
+    return _write(
+        path,
+        iter_record_batches(client, kind, **kwargs),
+        lambda p, schema: pq.ParquetWriter(p, schema, compression=compression),
+    )
+
+
+def write_arrow(client: "Zep", path: str, kind: ExportKind, **kwargs: typing.Any) -> int:
+    """Streams one kind of record to an Arrow IPC file. Otherwise identical to write_parquet."""
+    pa = _pyarrow()
+    return _write(path, iter_record_batches(client, kind, **kwargs), pa.ipc.new_file)
+
+
+def export_parquet(
+    client: "Zep",
+    directory: str,
+    *,
+    kinds: typing.Sequence[ExportKind] = EXPORT_KINDS,
+    **kwargs: typing.Any,
+) -> typing.Dict[str, int]:
+    """Writes <kind>.parquet files for a graph or user graph into directory. Returns the row count per kind."""
+    os.makedirs(directory, exist_ok=True)
+    return {kind: write_parquet(client, os.path.join(directory, f"{kind}.parquet"), kind, **kwargs) for kind in kinds}
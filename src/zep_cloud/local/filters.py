@@ -0,0 +1,460 @@
+"""
+Client-side evaluation of SearchFilters over cached nodes and edges.
+
+compile_filters turns a SearchFilters into a FilterPredicate that re-slices already fetched records without another
+request. A predicate can be called on a single record, or evaluated over a FilterColumns, a columnar copy of a set of
+records built once and reused across filters: dates become NumPy datetime64 arrays, edge names become integer codes
+and node labels become bitmasks, so each filter clause is a handful of array operations. Without NumPy, installed
+with the numpy extra, FilterPredicate.filter falls back to evaluating record by record.
+
+The semantics follow the server's:
+
+- Date filters are an OR of AND groups per field. A missing date only matches IS NULL; every comparison with it,
+  <> included, is false. Edges are filtered on created_at, valid_at, invalid_at and expired_at, nodes on created_at.
+- edge_types, exclude_edge_types and edge_uuids only restrict edges.
+- node_labels keeps nodes with at least one of the labels, and edges whose source and target nodes both have one.
+  exclude_node_labels drops nodes with any of the labels, and edges with such a node at either end. Filtering edges
+  by label needs the endpoint nodes, passed as nodes= or through a LocalGraph.
+- property_filters are combined with AND and look up attributes first, then the record's own fields. Numbers compare
+  numerically, strings lexically, and comparisons between other types are false. CONTAINS is substring match on
+  strings and membership on lists.
+- Empty lists are treated as absent, as the server does.
+
+episode_metadata_filters refer to episodes that are usually not cached alongside nodes and edges, and are rejected.
+"""
+
+import datetime as dt
+import typing
+
+from ..core.optional import import_optional
+from ..graph.utils import parse_iso_datetime
+from ..types.entity_edge import EntityEdge
+from ..types.entity_node import EntityNode
+from ..types.search_filters import SearchFilters
+
+if typing.TYPE_CHECKING:
+    import numpy
+    from .graph import LocalGraph
+
+Record = typing.Union[EntityNode, EntityEdge]
+NodeSource = typing.Union["LocalGraph", typing.Mapping[str, EntityNode]]
+
+EDGE_DATE_FIELDS = ("created_at", "valid_at", "invalid_at", "expired_at")
+NODE_DATE_FIELDS = ("created_at",)
+
+_ORDERING = {
+    ">": lambda a, b: a > b,
+    "<": lambda a, b: a < b,
+    ">=": lambda a, b: a >= b,
+    "<=": lambda a, b: a <= b,
+}
+_NULL_OPERATORS = ("IS NULL", "IS NOT NULL")
+_VALUE_OPERATORS = ("=", "<>", *_ORDERING)
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc)
+_NAT = -(2**63)
+
+# (operator, microseconds since the epoch or None for the null operators)
+_DateCondition = typing.Tuple[str, typing.Optional[int]]
+
+
+def _numpy() -> typing.Any:
+    return import_optional("numpy", "numpy", "Vectorized filter evaluation")
+
+
+def _has_numpy() -> bool:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _micros(value: typing.Optional[str]) -> typing.Optional[int]:
+    """Microseconds since the epoch of an ISO 8601 timestamp; naive timestamps are taken as UTC."""
+    parsed = parse_iso_datetime(value) if value else None
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt.timezone.utc)
+    delta = parsed - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _is_number(value: typing.Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _property_matches(value: typing.Any, operator: str, target: typing.Any) -> bool:
+    if operator == "IS NULL":
+        return value is None
+    if operator == "IS NOT NULL":
+        return value is not None
+    if value is None:
+        return False
+    if operator == "CONTAINS":
+        if isinstance(value, str):
+            return isinstance(target, str) and target in value
+        return isinstance(value, (list, tuple)) and target in value
+    comparable = (_is_number(value) and _is_number(target)) or type(value) is type(target)
+    if operator == "=":
+        return comparable and value == target
+    if operator == "<>":
+        return not comparable or value != target
+    if not comparable or isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return False
+    return _ORDERING[operator](value, target)
+
+
+def _property_value(record: Record, name: str) -> typing.Any:
+    attributes = record.attributes or {}
+    if name in attributes:
+        return attributes[name]
+    return getattr(record, "uuid_" if name == "uuid" else name, None)
+
+
+def _date_matches(value: typing.Optional[int], groups: typing.Sequence[typing.Sequence[_DateCondition]]) -> bool:
+    for group in groups:
+        for operator, target in group:
+            if operator == "IS NULL":
+                ok = value is None
+            elif operator == "IS NOT NULL":
+                ok = value is not None
+            elif value is None:
+                ok = False
+            elif operator == "=":
+                ok = value == target
+            elif operator == "<>":
+                ok = value != target
+            else:
+                ok = _ORDERING[operator](value, target)
+            if not ok:
+                break
+        else:
+            return True
+    return False
+
+
+def _node_labels_of(
+    nodes: typing.Optional[NodeSource],
+) -> typing.Optional[typing.Callable[[str], typing.Sequence[str]]]:
+    if nodes is None:
+        return None
+    if isinstance(nodes, typing.Mapping):
+        mapping = nodes
+
+        def from_mapping(uuid: str) -> typing.Sequence[str]:
+            node = mapping.get(uuid)
+            return (node.labels or []) if node is not None else []
+
+        return from_mapping
+    graph = nodes
+
+    def from_graph(uuid: str) -> typing.Sequence[str]:
+        node = graph.node(uuid)
+        return (node.labels or []) if node is not None else []
+
+    return from_graph
+
+
+class FilterColumns:
+    """
+    A columnar snapshot of nodes or edges for vectorized filtering. Build it once per set of cached records and
+    evaluate any number of predicates against it; property columns are extracted the first time a filter uses them.
+    """
+
+    def __init__(
+        self,
+        records: typing.Sequence[Record],
+        kind: typing.Literal["nodes", "edges"],
+        *,
+        nodes: typing.Optional[NodeSource] = None,
+    ):
+        np = _numpy()
+        self.records = list(records)
+        self.kind = kind
+        size = len(self.records)
+        fields = EDGE_DATE_FIELDS if kind == "edges" else NODE_DATE_FIELDS
+        self.dates: typing.Dict[str, "numpy.ndarray"] = {
+            field: np.fromiter(
+                (
+                    _NAT if micros is None else micros
+                    for micros in (_micros(getattr(record, field, None)) for record in self.records)
+                ),
+                dtype=np.int64,
+                count=size,
+            ).view("datetime64[us]")
+            for field in fields
+        }
+        self.uuids = [record.uuid_ for record in self.records]
+        self.labels: typing.Dict[str, int] = {}
+        self.names: typing.Dict[str, int] = {}
+        self.name_codes: typing.Optional["numpy.ndarray"] = None
+        self.label_bits: typing.Optional["numpy.ndarray"] = None
+        self.source_bits: typing.Optional["numpy.ndarray"] = None
+        self.target_bits: typing.Optional["numpy.ndarray"] = None
+        if kind == "nodes":
+            entity_nodes = typing.cast(typing.List[EntityNode], self.records)
+            self.label_bits = self._bitmask([node.labels or [] for node in entity_nodes])
+        else:
+            edges = typing.cast(typing.List[EntityEdge], self.records)
+            self.name_codes = np.fromiter(
+                (self.names.setdefault(edge.name, len(self.names)) for edge in edges), dtype=np.int32, count=size
+            )
+            labels_of = _node_labels_of(nodes)
+            if labels_of is not None:
+                self.source_bits = self._bitmask([labels_of(edge.source_node_uuid) for edge in edges])
+                self.target_bits = self._bitmask([labels_of(edge.target_node_uuid) for edge in edges])
+        self._properties: typing.Dict[str, "numpy.ndarray"] = {}
+
+    @classmethod
+    def from_nodes(cls, nodes: typing.Iterable[EntityNode]) -> "FilterColumns":
+        return cls(list(nodes), "nodes")
+
+    @classmethod
+    def from_edges(
+        cls, edges: typing.Iterable[EntityEdge], *, nodes: typing.Optional[NodeSource] = None
+    ) -> "FilterColumns":
+        return cls(list(edges), "edges", nodes=nodes)
+
+    @classmethod
+    def from_graph(cls, graph: "LocalGraph", kind: typing.Literal["nodes", "edges"]) -> "FilterColumns":
+        if kind == "nodes":
+            return cls.from_nodes(typing.cast(EntityNode, graph.node(uuid)) for uuid in graph.node_uuids())
+        return cls.from_edges((typing.cast(EntityEdge, graph.edge(uuid)) for uuid in graph.edge_uuids()), nodes=graph)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _bitmask(self, labels: typing.List[typing.Sequence[str]]) -> "numpy.ndarray":
+        np = _numpy()
+        for record_labels in labels:
+            for label in record_labels:
+                self.labels.setdefault(label, len(self.labels))
+        bits = np.zeros((len(labels), max(1, (len(self.labels) + 63) // 64)), dtype=np.uint64)
+        for row, record_labels in enumerate(labels):
+            for label in record_labels:
+                index = self.labels[label]
+                bits[row, index >> 6] |= np.uint64(1 << (index & 63))
+        return bits
+
+    def label_mask(self, labels: typing.Iterable[str]) -> "numpy.ndarray":
+        """The bitmask of the given labels, with unknown labels ignored."""
+        np = _numpy()
+        words = max(1, (len(self.labels) + 63) // 64)
+        mask = np.zeros(words, dtype=np.uint64)
+        for label in labels:
+            index = self.labels.get(label)
+            if index is not None:
+                mask[index >> 6] |= np.uint64(1 << (index & 63))
+        return mask
+
+    def property(self, name: str) -> "numpy.ndarray":
+        """An object array of a property's values, None where a record does not have it."""
+        column = self._properties.get(name)
+        if column is None:
+            np = _numpy()
+            column = np.empty(len(self.records), dtype=object)
+            column[:] = [_property_value(record, name) for record in self.records]
+            self._properties[name] = column
+        return column
+
+
+class FilterPredicate:
+    """A compiled SearchFilters. See the module docstring for the semantics."""
+
+    def __init__(self, filters: SearchFilters):
+        if filters.episode_metadata_filters is not None:
+            raise ValueError("episode_metadata_filters cannot be evaluated locally")
+        self.filters = filters
+        self.edge_types = frozenset(filters.edge_types or ())
+        self.exclude_edge_types = frozenset(filters.exclude_edge_types or ())
+        self.edge_uuids = frozenset(filters.edge_uuids or ())
+        self.node_labels = frozenset(filters.node_labels or ())
+        self.exclude_node_labels = frozenset(filters.exclude_node_labels or ())
+        self.dates: typing.Dict[str, typing.Tuple[typing.Tuple[_DateCondition, ...], ...]] = {}
+        for field in EDGE_DATE_FIELDS:
+            groups = getattr(filters, field)
+            if groups:
+                self.dates[field] = tuple(tuple(self._date_condition(field, f) for f in group) for group in groups)
+        self.properties: typing.List[typing.Tuple[str, str, typing.Any]] = []
+        for prop in filters.property_filters or ():
+            operator = prop.comparison_operator
+            if operator not in _NULL_OPERATORS + _VALUE_OPERATORS + ("CONTAINS",):
+                raise ValueError(f"Unsupported property filter operator {operator!r}")
+            if operator not in _NULL_OPERATORS and prop.property_value is None:
+                raise ValueError(f"Property filter {prop.property_name!r} {operator} requires a value")
+            self.properties.append((prop.property_name, operator, prop.property_value))
+
+    @staticmethod
+    def _date_condition(field: str, date_filter: typing.Any) -> _DateCondition:
+        operator = date_filter.comparison_operator
+        if operator in _NULL_OPERATORS:
+            return operator, None
+        if operator not in _VALUE_OPERATORS:
+            raise ValueError(f"Unsupported {field} filter operator {operator!r}")
+        micros = _micros(date_filter.date)
+        if micros is None:
+            raise ValueError(f"{field} filter {operator} requires a valid ISO 8601 date, got {date_filter.date!r}")
+        return operator, micros
+
+    @property
+    def filters_labels(self) -> bool:
+        return bool(self.node_labels or self.exclude_node_labels)
+
+    def _labels_match(self, labels: typing.Iterable[str]) -> bool:
+        labels = set(labels)
+        if self.node_labels and not labels & self.node_labels:
+            return False
+        return not labels & self.exclude_node_labels
+
+    def __call__(
+        self,
+        record: Record,
+        *,
+        source_labels: typing.Optional[typing.Sequence[str]] = None,
+        target_labels: typing.Optional[typing.Sequence[str]] = None,
+    ) -> bool:
+        """Evaluates the filters on one record. Label filters on edges need the labels of both endpoints."""
+        if isinstance(record, EntityEdge):
+            if self.edge_types and record.name not in self.edge_types:
+                return False
+            if record.name in self.exclude_edge_types:
+                return False
+            if self.edge_uuids and record.uuid_ not in self.edge_uuids:
+                return False
+            if self.filters_labels:
+                if source_labels is None or target_labels is None:
+                    raise ValueError("Filtering edges by node labels requires the labels of both endpoints")
+                if not (self._labels_match(source_labels) and self._labels_match(target_labels)):
+                    return False
+            fields: typing.Tuple[str, ...] = EDGE_DATE_FIELDS
+        else:
+            if self.filters_labels and not self._labels_match(record.labels or ()):
+                return False
+            fields = NODE_DATE_FIELDS
+        for field, groups in self.dates.items():
+            if field in fields and not _date_matches(_micros(getattr(record, field, None)), groups):
+                return False
+        return all(
+            _property_matches(_property_value(record, name), operator, target)
+            for name, operator, target in self.properties
+        )
+
+    def mask(self, columns: FilterColumns) -> "numpy.ndarray":
+        """A boolean array selecting the records of columns that pass the filters."""
+        np = _numpy()
+        keep = np.ones(len(columns), dtype=bool)
+        if columns.kind == "edges":
+            codes = columns.name_codes
+            if self.edge_types:
+                keep &= np.isin(codes, [columns.names[n] for n in self.edge_types if n in columns.names])
+            if self.exclude_edge_types:
+                keep &= ~np.isin(codes, [columns.names[n] for n in self.exclude_edge_types if n in columns.names])
+            if self.edge_uuids:
+                keep &= np.fromiter((uuid in self.edge_uuids for uuid in columns.uuids), dtype=bool, count=len(columns))
+            if self.filters_labels:
+                if columns.source_bits is None or columns.target_bits is None:
+                    raise ValueError("Filtering edges by node labels requires FilterColumns built with nodes")
+                keep &= self._label_mask(columns, columns.source_bits) & self._label_mask(columns, columns.target_bits)
+        elif self.filters_labels:
+            keep &= self._label_mask(columns, typing.cast("numpy.ndarray", columns.label_bits))
+
+        for field, groups in self.dates.items():
+            column = columns.dates.get(field)
+            if column is not None:
+                keep &= self._date_mask(np, column, groups)
+        for name, operator, target in self.properties:
+            keep &= self._property_mask(np, columns.property(name), operator, target)
+        return keep
+
+    def _label_mask(self, columns: FilterColumns, bits: "numpy.ndarray") -> "numpy.ndarray":
+        if self.node_labels:
+            keep = (bits & columns.label_mask(self.node_labels)).any(axis=1)
+        else:
+            keep = _numpy().ones(len(columns), dtype=bool)
+        if self.exclude_node_labels:
+            keep = keep & ~(bits & columns.label_mask(self.exclude_node_labels)).any(axis=1)
+        return keep
+
+    @staticmethod
+    def _date_mask(np: typing.Any, column: "numpy.ndarray", groups: typing.Sequence[typing.Sequence[_DateCondition]]):
+        null = np.isnat(column)
+        result = np.zeros(len(column), dtype=bool)
+        for group in groups:
+            keep = np.ones(len(column), dtype=bool)
+            for operator, target in group:
+                if operator == "IS NULL":
+                    keep &= null
+                    continue
+                if operator == "IS NOT NULL":
+                    keep &= ~null
+                    continue
+                value = np.datetime64(target, "us")
+                if operator == "=":
+                    keep &= column == value
+                elif operator == "<>":
+                    keep &= ~null & (column != value)
+                else:
+                    keep &= _ORDERING[operator](column, value)
+            result |= keep
+        return result
+
+    @staticmethod
+    def _property_mask(np: typing.Any, column: "numpy.ndarray", operator: str, target: typing.Any):
+        null = np.fromiter((v is None for v in column), dtype=bool, count=len(column))
+        if operator in _NULL_OPERATORS:
+            return null if operator == "IS NULL" else ~null
+        if _is_number(target) and operator != "CONTAINS":
+            numeric = np.fromiter((_is_number(v) for v in column), dtype=bool, count=len(column))
+            values = np.where(numeric, column, np.nan).astype(np.float64)
+            if operator == "<>":
+                return ~null & (~numeric | (values != target))
+            compare = (lambda a, b: a == b) if operator == "=" else _ORDERING[operator]
+            return numeric & compare(values, target)
+        return np.fromiter((_property_matches(v, operator, target) for v in column), dtype=bool, count=len(column))
+
+    def apply(self, columns: FilterColumns) -> typing.List[Record]:
+        """The records of columns that pass the filters, in their original order."""
+        np = _numpy()
+        return [columns.records[i] for i in np.flatnonzero(self.mask(columns))]
+
+    def filter(
+        self, records: typing.Iterable[Record], *, nodes: typing.Optional[NodeSource] = None
+    ) -> typing.List[Record]:
+        """
+        Filters a list of nodes or edges. Uses the vectorized path when NumPy is installed; build a FilterColumns
+        and call apply instead to evaluate several filters over the same records.
+        """
+        records = list(records)
+        if not records:
+            return []
+        kind: typing.Literal["nodes", "edges"] = "edges" if isinstance(records[0], EntityEdge) else "nodes"
+        if _has_numpy():
+            return self.apply(FilterColumns(records, kind, nodes=nodes))
+        labels_of = _node_labels_of(nodes) if kind == "edges" and self.filters_labels else None
+        if labels_of is None:
+            return [record for record in records if self(record)]
+        edges = typing.cast(typing.List[EntityEdge], records)
+        return [
+            edge
+            for edge in edges
+            if self(
+                edge, source_labels=labels_of(edge.source_node_uuid), target_labels=labels_of(edge.target_node_uuid)
+            )
+        ]
+
+
+def compile_filters(filters: SearchFilters) -> FilterPredicate:
+    """
+    Compiles a SearchFilters for local evaluation.
+
+    Examples
+    --------
+    from zep_cloud import DateFilter, SearchFilters
+    from zep_cloud.local import FilterColumns, compile_filters
+
+    current = compile_filters(SearchFilters(invalid_at=[[DateFilter(comparison_operator="IS NULL")]]))
+    columns = FilterColumns.from_graph(graph, "edges")
+    edges = current.apply(columns)
+    """
+    return FilterPredicate(filters)
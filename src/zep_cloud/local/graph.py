@@ -0,0 +1,405 @@
+"""
+An in-memory mirror of a graph for client-side traversal.
+
+Nodes and edges are numbered densely as they are added. Records are kept in the compact binary encoding of the
+on-disk store and decoded on access, while traversal only touches flat integer arrays: edge endpoints, and
+compressed sparse row (CSR) adjacency built from them. Label and edge name indexes map to arrays of the same
+integers. The indexes are rebuilt lazily, on the first query after the graph changed.
+"""
+
+import array
+import sys
+import typing
+from collections import deque
+
+from ..core.request_options import RequestOptions
+from ..types.entity_edge import EntityEdge
+from ..types.entity_node import EntityNode
+from .pagination import (
+    DEFAULT_PAGE_SIZE,
+    aiter_edge_pages,
+    aiter_node_pages,
+    iter_edge_pages,
+    iter_node_pages,
+)
+from .store import EDGE_KIND, NODE_KIND, decode_record, encode_record, model_to_raw
+
+if typing.TYPE_CHECKING:
+    from ..client import AsyncZep, Zep
+    from .store import GraphStore
+
+Direction = typing.Literal["out", "in", "both"]
+
+_EMPTY = array.array("q")
+
+
+class _Indexes:
+    __slots__ = ("out_offsets", "out_edges", "in_offsets", "in_edges", "labels", "names")
+
+    def __init__(
+        self,
+        out_offsets: "array.array[int]",
+        out_edges: "array.array[int]",
+        in_offsets: "array.array[int]",
+        in_edges: "array.array[int]",
+        labels: typing.Dict[str, "array.array[int]"],
+        names: typing.Dict[str, "array.array[int]"],
+    ):
+        self.out_offsets = out_offsets
+        self.out_edges = out_edges
+        self.in_offsets = in_offsets
+        self.in_edges = in_edges
+        self.labels = labels
+        self.names = names
+
+
+def _csr(
+    node_count: int, keys: "array.array[int]", live: typing.List[bool]
+) -> typing.Tuple["array.array[int]", "array.array[int]"]:
+    counts = [0] * (node_count + 1)
+    for edge, key in enumerate(keys):
+        if live[edge]:
+            counts[key + 1] += 1
+    for i in range(node_count):
+        counts[i + 1] += counts[i]
+    offsets = array.array("q", counts)
+    fill = counts[:-1]
+    edges = array.array("q", bytes(8 * counts[-1]))
+    for edge, key in enumerate(keys):
+        if live[edge]:
+            edges[fill[key]] = edge
+            fill[key] += 1
+    return offsets, edges
+
+
+class LocalGraph:
+    """
+    In-memory mirror of a graph or user graph, answering neighborhood, k-hop and degree queries locally.
+
+    Queries take and return uuids; use node() and edge() to materialize models. Adding a record whose uuid is
+    already present replaces it. Edges may reference nodes that were not added (yet); such nodes take part in
+    traversal but node() returns None for them.
+
+    Examples
+    --------
+    from zep_cloud.local import LocalGraph
+
+    graph = LocalGraph.from_client(client, graph_id="graph_id")
+    for uuid, hops in graph.k_hop(node_uuid, 2).items():
+        ...
+    """
+
+    def __init__(self) -> None:
+        self._node_ids: typing.Dict[str, int] = {}
+        self._node_uuids: typing.List[str] = []
+        self._node_records: typing.List[typing.Optional[bytes]] = []
+        self._node_labels: typing.List[typing.Tuple[str, ...]] = []
+        self._labels_interned: typing.Dict[typing.Tuple[str, ...], typing.Tuple[str, ...]] = {(): ()}
+
+        self._edge_ids: typing.Dict[str, int] = {}
+        self._edge_uuids: typing.List[str] = []
+        self._edge_records: typing.List[typing.Optional[bytes]] = []
+        self._edge_names: typing.List[str] = []
+        self._edge_sources: "array.array[int]" = array.array("q")
+        self._edge_targets: "array.array[int]" = array.array("q")
+
+        self._indexes: typing.Optional[_Indexes] = None
+
+    # Construction
+
+    @classmethod
+    def from_client(
+        cls,
+        client: "Zep",
+        *,
+        graph_id: typing.Optional[str] = None,
+        user_id: typing.Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> "LocalGraph":
+        """Pulls every node and edge of a graph or user graph."""
+        graph = cls()
+        owner = {"graph_id": graph_id, "user_id": user_id}
+        for node_page in iter_node_pages(client, page_size=page_size, request_options=request_options, **owner):
+            graph.add_nodes(node_page)
+        for edge_page in iter_edge_pages(client, page_size=page_size, request_options=request_options, **owner):
+            graph.add_edges(edge_page)
+        return graph
+
+    @classmethod
+    async def from_async_client(
+        cls,
+        client: "AsyncZep",
+        *,
+        graph_id: typing.Optional[str] = None,
+        user_id: typing.Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> "LocalGraph":
+        """Async counterpart of from_client."""
+        graph = cls()
+        owner = {"graph_id": graph_id, "user_id": user_id}
+        async for node_page in aiter_node_pages(client, page_size=page_size, request_options=request_options, **owner):
+            graph.add_nodes(node_page)
+        async for edge_page in aiter_edge_pages(client, page_size=page_size, request_options=request_options, **owner):
+            graph.add_edges(edge_page)
+        return graph
+
+    @classmethod
+    def from_store(cls, store: "GraphStore") -> "LocalGraph":
+        """Loads the nodes and edges cached in a GraphStore."""
+        graph = cls()
+        for raw in store.nodes.iter_raw():
+            graph._add_node_raw(raw)
+        for raw in store.edges.iter_raw():
+            graph._add_edge_raw(raw)
+        return graph
+
+    def _node_id(self, uuid: str) -> int:
+        node = self._node_ids.get(uuid)
+        if node is None:
+            node = self._node_ids[uuid] = len(self._node_uuids)
+            self._node_uuids.append(uuid)
+            self._node_records.append(None)
+            self._node_labels.append(())
+        return node
+
+    def _add_node_raw(self, raw: typing.Dict[str, typing.Any]) -> None:
+        node = self._node_id(raw["uuid"])
+        self._node_records[node] = encode_record(NODE_KIND, raw)
+        labels = tuple(raw.get("labels") or ())
+        self._node_labels[node] = self._labels_interned.setdefault(labels, labels)
+        self._indexes = None
+
+    def _add_edge_raw(self, raw: typing.Dict[str, typing.Any]) -> None:
+        source = self._node_id(raw["source_node_uuid"])
+        target = self._node_id(raw["target_node_uuid"])
+        record = encode_record(EDGE_KIND, raw)
+        name = sys.intern(raw.get("name") or "")
+        edge = self._edge_ids.get(raw["uuid"])
+        if edge is None:
+            self._edge_ids[raw["uuid"]] = len(self._edge_uuids)
+            self._edge_uuids.append(raw["uuid"])
+            self._edge_records.append(record)
+            self._edge_names.append(name)
+            self._edge_sources.append(source)
+            self._edge_targets.append(target)
+        else:
+            self._edge_records[edge] = record
+            self._edge_names[edge] = name
+            self._edge_sources[edge] = source
+            self._edge_targets[edge] = target
+        self._indexes = None
+
+    def add_nodes(self, nodes: typing.Iterable[EntityNode]) -> None:
+        for node in nodes:
+            self._add_node_raw(model_to_raw(node))
+
+    def add_edges(self, edges: typing.Iterable[EntityEdge]) -> None:
+        for edge in edges:
+            self._add_edge_raw(model_to_raw(edge))
+
+    def remove_edges(self, uuids: typing.Iterable[str]) -> int:
+        """Removes edges by uuid, ignoring unknown ones. Returns the number of edges removed."""
+        removed = 0
+        for uuid in uuids:
+            edge = self._edge_ids.get(uuid)
+            if edge is not None and self._edge_records[edge] is not None:
+                self._edge_records[edge] = None
+                removed += 1
+        if removed:
+            self._indexes = None
+        return removed
+
+    def remove_nodes(self, uuids: typing.Iterable[str]) -> int:
+        """Removes nodes and their edges by uuid, ignoring unknown ones. Returns the number of nodes removed."""
+        removed: typing.Set[int] = set()
+        for uuid in uuids:
+            node = self._node_ids.get(uuid)
+            if node is not None and self._node_records[node] is not None:
+                self._node_records[node] = None
+                self._node_labels[node] = ()
+                removed.add(node)
+        if removed:
+            for edge, record in enumerate(self._edge_records):
+                if record is not None and (self._edge_sources[edge] in removed or self._edge_targets[edge] in removed):
+                    self._edge_records[edge] = None
+            self._indexes = None
+        return len(removed)
+
+    # Indexes
+
+    def _build_indexes(self) -> _Indexes:
+        node_count = len(self._node_uuids)
+        live = [record is not None for record in self._edge_records]
+        out_offsets, out_edges = _csr(node_count, self._edge_sources, live)
+        in_offsets, in_edges = _csr(node_count, self._edge_targets, live)
+
+        labels: typing.Dict[str, "array.array[int]"] = {}
+        for node, node_labels in enumerate(self._node_labels):
+            for label in node_labels:
+                labels.setdefault(label, array.array("q")).append(node)
+        names: typing.Dict[str, "array.array[int]"] = {}
+        for edge, name in enumerate(self._edge_names):
+            if live[edge]:
+                names.setdefault(name, array.array("q")).append(edge)
+
+        self._indexes = _Indexes(out_offsets, out_edges, in_offsets, in_edges, labels, names)
+        return self._indexes
+
+    def _index(self) -> _Indexes:
+        return self._indexes if self._indexes is not None else self._build_indexes()
+
+    def _edge_ids_of(self, node: int, direction: Direction, indexes: _Indexes) -> typing.List[int]:
+        if direction == "out":
+            return indexes.out_edges[indexes.out_offsets[node] : indexes.out_offsets[node + 1]].tolist()
+        if direction == "in":
+            return indexes.in_edges[indexes.in_offsets[node] : indexes.in_offsets[node + 1]].tolist()
+        if direction != "both":
+            raise ValueError(f"direction must be 'out', 'in' or 'both', got {direction!r}")
+        return (
+            indexes.out_edges[indexes.out_offsets[node] : indexes.out_offsets[node + 1]].tolist()
+            + indexes.in_edges[indexes.in_offsets[node] : indexes.in_offsets[node + 1]].tolist()
+        )
+
+    def _neighbor_ids(
+        self,
+        node: int,
+        direction: Direction,
+        indexes: _Indexes,
+        edge_names: typing.Optional[typing.AbstractSet[str]],
+    ) -> typing.Iterator[int]:
+        sources, targets, names = self._edge_sources, self._edge_targets, self._edge_names
+        for edge in self._edge_ids_of(node, direction, indexes):
+            if edge_names is not None and names[edge] not in edge_names:
+                continue
+            source = sources[edge]
+            yield targets[edge] if source == node else source
+
+    # Queries
+
+    @property
+    def node_count(self) -> int:
+        return sum(1 for record in self._node_records if record is not None)
+
+    @property
+    def edge_count(self) -> int:
+        return sum(1 for record in self._edge_records if record is not None)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the encoded node and edge records."""
+        return sum(len(r) for r in self._node_records if r is not None) + sum(
+            len(r) for r in self._edge_records if r is not None
+        )
+
+    def __contains__(self, uuid: object) -> bool:
+        node = self._node_ids.get(typing.cast(str, uuid))
+        return node is not None and self._node_records[node] is not None
+
+    def node(self, uuid: str) -> typing.Optional[EntityNode]:
+        node = self._node_ids.get(uuid)
+        record = self._node_records[node] if node is not None else None
+        return EntityNode.construct(**decode_record(NODE_KIND, record, 0)) if record is not None else None
+
+    def edge(self, uuid: str) -> typing.Optional[EntityEdge]:
+        edge = self._edge_ids.get(uuid)
+        record = self._edge_records[edge] if edge is not None else None
+        return EntityEdge.construct(**decode_record(EDGE_KIND, record, 0)) if record is not None else None
+
+    def node_uuids(self) -> typing.Iterator[str]:
+        for node, record in enumerate(self._node_records):
+            if record is not None:
+                yield self._node_uuids[node]
+
+    def edge_uuids(self) -> typing.Iterator[str]:
+        for edge, record in enumerate(self._edge_records):
+            if record is not None:
+                yield self._edge_uuids[edge]
+
+    def edge_endpoints(self, uuid: str) -> typing.Optional[typing.Tuple[str, str]]:
+        """Returns the (source, target) node uuids of an edge."""
+        edge = self._edge_ids.get(uuid)
+        if edge is None or self._edge_records[edge] is None:
+            return None
+        return self._node_uuids[self._edge_sources[edge]], self._node_uuids[self._edge_targets[edge]]
+
+    def edges_of(self, uuid: str, direction: Direction = "both") -> typing.List[str]:
+        """Returns the uuids of the edges leaving ("out"), entering ("in") or touching ("both") a node."""
+        node = self._node_ids.get(uuid)
+        if node is None:
+            return []
+        uuids = self._edge_uuids
+        return [uuids[edge] for edge in self._edge_ids_of(node, direction, self._index())]
+
+    def neighbors(
+        self,
+        uuid: str,
+        direction: Direction = "both",
+        *,
+        edge_names: typing.Optional[typing.Collection[str]] = None,
+    ) -> typing.List[str]:
+        """Returns the distinct uuids of the nodes adjacent to a node, optionally through named edges only."""
+        node = self._node_ids.get(uuid)
+        if node is None:
+            return []
+        names = frozenset(edge_names) if edge_names is not None else None
+        seen: typing.Dict[int, None] = dict.fromkeys(self._neighbor_ids(node, direction, self._index(), names))
+        return [self._node_uuids[neighbor] for neighbor in seen]
+
+    def degree(self, uuid: str, direction: Direction = "both") -> int:
+        """Number of edges leaving, entering or touching a node. Self-loops count twice for "both"."""
+        node = self._node_ids.get(uuid)
+        if node is None:
+            return 0
+        indexes = self._index()
+        out_degree = indexes.out_offsets[node + 1] - indexes.out_offsets[node]
+        in_degree = indexes.in_offsets[node + 1] - indexes.in_offsets[node]
+        if direction == "out":
+            return out_degree
+        if direction == "in":
+            return in_degree
+        return out_degree + in_degree
+
+    def k_hop(
+        self,
+        uuid: str,
+        k: int,
+        direction: Direction = "both",
+        *,
+        edge_names: typing.Optional[typing.Collection[str]] = None,
+    ) -> typing.Dict[str, int]:
+        """
+        Breadth-first search from a node up to k hops.
+
+        Returns
+        -------
+        typing.Dict[str, int]
+            Every node reachable within k hops, mapped to its distance, in BFS order. The start node is included at
+            distance 0.
+        """
+        start = self._node_ids.get(uuid)
+        if start is None:
+            return {}
+        indexes = self._index()
+        names = frozenset(edge_names) if edge_names is not None else None
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            distance = distances[node]
+            if distance >= k:
+                continue
+            for neighbor in self._neighbor_ids(node, direction, indexes, names):
+                if neighbor not in distances:
+                    distances[neighbor] = distance + 1
+                    queue.append(neighbor)
+        return {self._node_uuids[node]: distance for node, distance in distances.items()}
+
+    def nodes_with_label(self, label: str) -> typing.List[str]:
+        uuids = self._node_uuids
+        return [uuids[node] for node in self._index().labels.get(label, _EMPTY)]
+
+    def edges_named(self, name: str) -> typing.List[str]:
+        uuids = self._edge_uuids
+        return [uuids[edge] for edge in self._index().names.get(name, _EMPTY)]
@@ -0,0 +1,364 @@
+"""
+Parallel ingestion of documents into a graph, for client-side preprocessing heavy enough to be bound by the GIL.
+
+ingest runs the caller's preprocess function on a process pool and sends the episodes it produces from the parent
+process with AsyncZep, so chunking, metadata computation and JSON encoding use every core while the event loop keeps
+graph.add_batch requests in flight. preprocess turns one document into EpisodeData, the unit of work: workers group
+the episodes of a chunk of documents into batches and encode each batch into the final request body, so neither
+documents nor episode models cross back to the parent, only one bytes object per batch. With shared_memory=True the
+bodies of a chunk are written into one shared memory block instead, which the parent reads without the bodies being
+pickled and piped.
+
+The pipeline has four stages, each reported in IngestResult.stages:
+
+    preprocess  documents turned into episodes, in the workers
+    encode      batches encoded into request bodies, in the workers
+    transfer    bodies received by the parent, including the shared memory read
+    dispatch    batches sent with graph.add_batch
+
+Stage seconds are summed over the workers and over concurrent requests, so they may exceed the wall clock time of
+the run. Backpressure flows from the API to the workers: at most concurrency batches are in flight,
+and no more chunks are handed to the pool while the parent holds results it cannot send yet. Batches are sent
+concurrently, so episodes of different batches may be processed out of order unless concurrency is 1.
+"""
+
+import asyncio
+import functools
+import itertools
+import os
+import time
+import typing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory as _shared_memory
+
+from ..core.json_codec import JsonCodecName, get_json_codec
+from ..core.jsonable_encoder import jsonable_encoder
+from ..core.request_options import RequestOptions
+from ..core.serialization import convert_and_respect_annotation_metadata
+from ..types.episode_data import EpisodeData
+from .jsonl import DEFAULT_CONCURRENCY, DEFAULT_EPISODE_BATCH_SIZE
+from .pagination import _raise_for_status, _resolve_owner
+
+if typing.TYPE_CHECKING:
+    from ..client import AsyncZep
+
+D = typing.TypeVar("D")
+
+DEFAULT_CHUNK_SIZE = 16
+
+STAGES = ("preprocess", "encode", "transfer", "dispatch")
+
+
+@dataclass(frozen=True)
+class StageStats:
+    """Work done by one stage of an ingestion: items handled, seconds spent and bytes produced or moved."""
+
+    items: int
+    seconds: float
+    bytes: int
+
+    @property
+    def items_per_second(self) -> typing.Optional[float]:
+        return self.items / self.seconds if self.seconds > 0 else None
+
+    @property
+    def bytes_per_second(self) -> typing.Optional[float]:
+        return self.bytes / self.seconds if self.seconds > 0 else None
+
+
+@dataclass(frozen=True)
+class IngestResult:
+    """
+    What one ingest call did. preprocess items are documents, encode, transfer and dispatch items are batches, and
+    seconds is the wall clock time of the whole run.
+    """
+
+    documents: int
+    episodes: int
+    batches: int
+    seconds: float
+    stages: typing.Dict[str, StageStats] = field(default_factory=dict)
+
+    @property
+    def episodes_per_second(self) -> typing.Optional[float]:
+        return self.episodes / self.seconds if self.seconds > 0 else None
+
+
+@dataclass(frozen=True)
+class _Prepared:
+    """A chunk prepared by a worker: its request bodies, either as bytes or as slices of a shared memory block."""
+
+    documents: int
+    counts: typing.Tuple[int, ...]
+    bodies: typing.Tuple[bytes, ...] = ()
+    block: typing.Optional[str] = None
+    sizes: typing.Tuple[int, ...] = ()
+    preprocess_seconds: float = 0.0
+    encode_seconds: float = 0.0
+
+
+def _prepare(
+    preprocess: typing.Callable[[typing.Any], typing.Iterable[EpisodeData]],
+    owner: typing.Dict[str, str],
+    batch_size: int,
+    codec_name: JsonCodecName,
+    use_shared_memory: bool,
+    documents: typing.Sequence[typing.Any],
+) -> _Prepared:
+    """Runs in a worker process: turns a chunk of documents into add_batch request bodies."""
+    started = time.perf_counter()
+    episodes = [episode for document in documents for episode in preprocess(document)]
+    preprocessed = time.perf_counter()
+    codec = get_json_codec(codec_name)
+    bodies = []
+    counts = []
+    for start in range(0, len(episodes), batch_size):
+        batch = episodes[start : start + batch_size]
+        serialized = convert_and_respect_annotation_metadata(
+            object_=batch, annotation=typing.Sequence[EpisodeData], direction="write"
+        )
+        bodies.append(codec.dumps(jsonable_encoder({"episodes": serialized, **owner})))
+        counts.append(len(batch))
+    encoded = time.perf_counter()
+    if not use_shared_memory or not bodies:
+        return _Prepared(
+            documents=len(documents),
+            counts=tuple(counts),
+            bodies=tuple(bodies),
+            preprocess_seconds=preprocessed - started,
+            encode_seconds=encoded - preprocessed,
+        )
+
+    sizes = tuple(len(body) for body in bodies)
+    block = _shared_memory.SharedMemory(create=True, size=sum(sizes))
+    offset = 0
+    for body in bodies:
+        block.buf[offset : offset + len(body)] = body
+        offset += len(body)
+    # The parent unlinks the block once it has read it; this process must not clean it up when it exits
+    resource_tracker.unregister(block._name, "shared_memory")  # type: ignore[attr-defined]
+    block.close()
+    return _Prepared(
+        documents=len(documents),
+        counts=tuple(counts),
+        block=block.name,
+        sizes=sizes,
+        preprocess_seconds=preprocessed - started,
+        encode_seconds=time.perf_counter() - preprocessed,
+    )
+
+
+def _receive(prepared: _Prepared) -> typing.List[bytes]:
+    """The request bodies of a prepared chunk, releasing its shared memory block."""
+    if prepared.block is None:
+        return list(prepared.bodies)
+    block = _shared_memory.SharedMemory(name=prepared.block)
+    try:
+        bodies = []
+        offset = 0
+        for size in prepared.sizes:
+            bodies.append(bytes(block.buf[offset : offset + size]))
+            offset += size
+        return bodies
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _chunks(documents: typing.Iterable[D], size: int) -> typing.Iterator[typing.List[D]]:
+    iterator = iter(documents)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _Meter:
+    def __init__(self) -> None:
+        self.items = dict.fromkeys(STAGES, 0)
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.bytes = dict.fromkeys(STAGES, 0)
+
+    def add(self, stage: str, items: int, seconds: float, size: int = 0) -> None:
+        self.items[stage] += items
+        self.seconds[stage] += seconds
+        self.bytes[stage] += size
+
+    def stages(self) -> typing.Dict[str, StageStats]:
+        return {stage: StageStats(self.items[stage], self.seconds[stage], self.bytes[stage]) for stage in STAGES}
+
+
+async def ingest(
+    client: "AsyncZep",
+    documents: typing.Iterable[D],
+    preprocess: typing.Callable[[D], typing.Iterable[EpisodeData]],
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    processes: typing.Optional[int] = None,
+    executor: typing.Optional[Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    batch_size: int = DEFAULT_EPISODE_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    shared_memory: bool = False,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> IngestResult:
+    """
+    Preprocesses documents on a process pool and adds the resulting episodes to a graph.
+
+    Parameters
+    ----------
+    documents : typing.Iterable[D]
+        The documents to ingest, consumed lazily as workers become free. They are pickled to the workers.
+
+    preprocess : typing.Callable[[D], typing.Iterable[EpisodeData]]
+        Turns one document into episodes. Runs in the workers, so it must be picklable, e.g. a module-level
+        function or a functools.partial of one.
+
+    graph_id, user_id : typing.Optional[str]
+        The graph, or the user whose graph, the episodes are added to.
+
+    processes : typing.Optional[int]
+        The size of the process pool, the number of CPUs by default. Ignored when executor is given.
+
+    executor : typing.Optional[Executor]
+        A pool to run preprocessing on, kept open afterwards, such as a ProcessPoolExecutor shared between runs.
+
+    chunk_size : int
+        How many documents a worker preprocesses per task.
+
+    batch_size : int
+        The most episodes sent in one add_batch request. Batches do not span chunks.
+
+    concurrency : int
+        The most add_batch requests in flight at once.
+
+    shared_memory : bool
+        Whether workers return request bodies through shared memory rather than pickling them.
+
+    Returns
+    -------
+    IngestResult
+        Counts, throughput metrics per stage and the duration of the run.
+
+    Examples
+    --------
+    def chunk(document: str) -> typing.List[EpisodeData]:
+        return [EpisodeData(data=part, type="text") for part in document.split("\\n\\n")]
+
+    result = await ingest(client, documents, chunk, graph_id="docs", processes=8)
+    print(result.episodes_per_second, result.stages["preprocess"].items_per_second)
+    """
+    owner_kind, identifier = _resolve_owner(graph_id, user_id)
+    if chunk_size < 1 or batch_size < 1 or concurrency < 1:
+        raise ValueError("chunk_size, batch_size and concurrency must be at least 1")
+    loop = asyncio.get_running_loop()
+    pool = executor if executor is not None else ProcessPoolExecutor(max_workers=processes)
+    workers = processes or getattr(pool, "_max_workers", None) or os.cpu_count() or 1
+    http_client = client._client_wrapper.httpx_client
+    # Workers encode with the client's codec, or the best one installed for a custom codec they cannot rebuild
+    codec_name: JsonCodecName = "auto"
+    if http_client.json_codec.name in typing.get_args(JsonCodecName):
+        codec_name = typing.cast(JsonCodecName, http_client.json_codec.name)
+    prepare = functools.partial(
+        _prepare, preprocess, {f"{owner_kind}_id": identifier}, batch_size, codec_name, shared_memory
+    )
+    meter = _Meter()
+    slots = asyncio.Semaphore(concurrency)
+    sends: typing.Set["asyncio.Task[None]"] = set()
+    failures: typing.List[BaseException] = []
+    totals = {"documents": 0, "episodes": 0}
+    started = time.perf_counter()
+
+    async def send(body: bytes, count: int, chunk: typing.Dict[str, int]) -> None:
+        try:
+            sent = time.perf_counter()
+            response = await http_client.request(
+                "graph-batch",
+                method="POST",
+                content=body,
+                headers={"content-type": "application/json"},
+                request_options=request_options,
+            )
+            _raise_for_status(response)
+            meter.add("dispatch", 1, time.perf_counter() - sent, len(body))
+            totals["episodes"] += count
+            # A chunk's documents count once every batch built from them has been accepted
+            chunk["batches"] -= 1
+            if chunk["batches"] == 0:
+                totals["documents"] += chunk["documents"]
+        except Exception as error:
+            failures.append(error)
+        finally:
+            slots.release()
+
+    async def dispatch(prepared: _Prepared) -> None:
+        meter.add("preprocess", prepared.documents, prepared.preprocess_seconds)
+        received = time.perf_counter()
+        bodies = _receive(prepared)
+        meter.add("encode", len(bodies), prepared.encode_seconds, sum(len(body) for body in bodies))
+        meter.add("transfer", len(bodies), time.perf_counter() - received, sum(len(body) for body in bodies))
+        if not bodies:
+            totals["documents"] += prepared.documents
+        chunk = {"documents": prepared.documents, "batches": len(bodies)}
+        for body, count in zip(bodies, prepared.counts):
+            # Waiting for a free slot here stops more chunks being handed to the pool while requests are backed up
+            await slots.acquire()
+            if failures:
+                slots.release()
+                return
+            task = loop.create_task(send(body, count, chunk))
+            sends.add(task)
+            task.add_done_callback(sends.discard)
+
+    async def dispatch_done(done: typing.Set["asyncio.Future[_Prepared]"]) -> None:
+        ready = list(done)
+        try:
+            while ready:
+                await dispatch(ready.pop().result())
+        finally:
+            # A chunk that failed to prepare stops the run; the other finished chunks still hold shared memory
+            for future in ready:
+                if not future.cancelled() and future.exception() is None:
+                    _receive(future.result())
+
+    pending: typing.Set["asyncio.Future[_Prepared]"] = set()
+    try:
+        for chunk in _chunks(documents, chunk_size):
+            pending.add(asyncio.ensure_future(loop.run_in_executor(pool, prepare, chunk)))
+            while len(pending) >= 2 * workers:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                await dispatch_done(done)
+            if failures:
+                break
+        while pending and not failures:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            await dispatch_done(done)
+        if sends:
+            await asyncio.gather(*sends)
+    finally:
+        # Requests still in flight after a failure are cancelled and waited for, so none outlives the call
+        cancelled = list(sends)
+        for task in cancelled:
+            task.cancel()
+        if cancelled:
+            await asyncio.gather(*cancelled, return_exceptions=True)
+        if pending:
+            # Chunks still being prepared are waited for rather than abandoned, so that their shared memory is freed
+            for prepared in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(prepared, _Prepared):
+                    _receive(prepared)
+        if executor is None:
+            pool.shutdown(wait=True)
+    if failures:
+        raise failures[0]
+    return IngestResult(
+        documents=totals["documents"],
+        episodes=totals["episodes"],
+        batches=meter.items["dispatch"],
+        seconds=time.perf_counter() - started,
+        stages=meter.stages(),
+    )
@@ -0,0 +1,723 @@
+"""
+Streaming JSONL backup and restore of graphs and thread histories.
+
+An export is a single newline-delimited JSON file. The first line is a header naming the exported graph or user and
+the sections it contains, followed by one line per record:
+
+    {"type": "header", "version": 1, "user_id": "...", "sections": ["nodes", "edges", "episodes", "threads"]}
+    {"type": "node", "data": {...}}
+    {"type": "edge", "data": {...}}
+    {"type": "episode", "data": {...}}
+    {"type": "thread", "thread_id": "...", "user_id": "..."}
+    {"type": "message", "thread_id": "...", "data": {...}}
+
+Records are written as each page arrives and read back line by line, so neither side holds more than a page or a
+batch in memory. Episodes are the exception: the API only returns the most recent episode_lastn of them, in one
+response, so that window is fetched whole and a graph with more episodes is exported without the older ones;
+ExportResult.episodes_truncated reports when the window came back full.
+
+Files ending in .gz or .zst are compressed with gzip or zstd, the latter needing the zstd extra. Every checkpoint
+closes the current gzip member or zstd frame, so a file truncated back to its last checkpoint is still a valid stream
+and an interrupted export resumes by appending to it.
+
+Importing replays episodes through graph.add_batch and messages through thread.add_messages_batch. Nodes and edges
+are not written back, the server rebuilds them from the replayed episodes; they are exported for offline use.
+"""
+
+import argparse
+import collections
+import contextvars
+import gzip
+import io
+import json
+import os
+import queue
+import typing
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from ..core.optional import import_zstandard
+from ..core.request_options import RequestOptions
+from ..types.episode import Episode
+from ..types.episode_data import EpisodeData
+from ..types.message import Message
+from .pagination import DEFAULT_PAGE_SIZE, _resolve_owner, iter_edge_pages, iter_node_pages
+from .store import DEFAULT_EPISODE_LASTN, model_to_raw
+
+if typing.TYPE_CHECKING:
+    from ..client import Zep
+    from ..external_clients.graph import GraphClient
+    from ..external_clients.thread import ThreadClient
+    from ..external_clients.user import UserClient
+
+Compression = typing.Literal["gzip", "zstd", "none"]
+Section = typing.Literal["nodes", "edges", "episodes", "threads"]
+
+FORMAT_VERSION = 1
+SECTIONS: typing.Tuple[Section, ...] = ("nodes", "edges", "episodes", "threads")
+
+# Server-side limits of graph.add_batch and thread.add_messages_batch
+DEFAULT_EPISODE_BATCH_SIZE = 20
+DEFAULT_MESSAGE_BATCH_SIZE = 30
+DEFAULT_CONCURRENCY = 4
+
+_EPISODE_TYPES = ("text", "json", "message")
+
+
+def _compression_for(path: str, compression: typing.Optional[Compression]) -> Compression:
+    if compression is not None:
+        if compression not in ("gzip", "zstd", "none"):
+            raise ValueError(f"compression must be one of gzip, zstd or none, got {compression!r}")
+        return compression
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith((".zst", ".zstd")):
+        return "zstd"
+    return "none"
+
+
+def _dumps(record: typing.Dict[str, typing.Any]) -> bytes:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+
+
+def _write_json_atomic(path: str, value: typing.Any) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(value, f)
+    os.replace(tmp, path)
+
+
+def _read_json(path: str) -> typing.Optional[typing.Any]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+class _JsonlWriter:
+    """Appends lines to a possibly compressed file, ending a gzip member or zstd frame at every checkpoint."""
+
+    def __init__(self, path: str, compression: Compression, offset: int = 0, level: typing.Optional[int] = None):
+        self._file = open(path, "r+b" if offset else "wb")
+        self._file.truncate(offset)
+        self._file.seek(offset)
+        self._compression = compression
+        self._level = level
+        self._compressor: typing.Any = None
+
+    def _new_compressor(self) -> typing.Any:
+        if self._compression == "gzip":
+            return zlib.compressobj(6 if self._level is None else self._level, zlib.DEFLATED, 31)
+        return import_zstandard().ZstdCompressor(level=3 if self._level is None else self._level).compressobj()
+
+    def write(self, record: typing.Dict[str, typing.Any]) -> None:
+        data = _dumps(record)
+        if self._compression == "none":
+            self._file.write(data)
+            return
+        if self._compressor is None:
+            self._compressor = self._new_compressor()
+        self._file.write(self._compressor.compress(data))
+
+    def checkpoint(self) -> int:
+        """Makes everything written so far durable and returns the file offset to resume from."""
+        if self._compressor is not None:
+            self._file.write(self._compressor.flush())
+            self._compressor = None
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _open_lines(path: str, compression: Compression) -> typing.BinaryIO:
+    if compression == "gzip":
+        return typing.cast(typing.BinaryIO, gzip.open(path, "rb"))
+    if compression == "zstd":
+        reader = import_zstandard().ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True)
+        return typing.cast(typing.BinaryIO, io.BufferedReader(reader))
+    return open(path, "rb")
+
+
+def iter_jsonl(
+    path: str, *, compression: typing.Optional[Compression] = None
+) -> typing.Iterator[typing.Dict[str, typing.Any]]:
+    """Yields the records of an export one at a time, header included."""
+    with _open_lines(path, _compression_for(path, compression)) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+@dataclass(frozen=True)
+class ExportResult:
+    """Records written by one export_jsonl call; a resumed export only counts what it wrote itself. size is the
+    file size in bytes. episodes_truncated is set when the graph returned episode_lastn episodes, meaning older ones
+    may be missing from the export; raise episode_lastn and export again if it happens."""
+
+    nodes: int
+    edges: int
+    episodes: int
+    threads: int
+    messages: int
+    size: int
+    resumed: bool
+    episodes_truncated: bool = False
+
+
+@dataclass(frozen=True)
+class ImportResult:
+    """Records replayed by one import_jsonl call. skipped counts lines not replayed (nodes, edges, duplicates)."""
+
+    episodes: int
+    threads: int
+    messages: int
+    skipped: int
+    lines: int
+    resumed: bool
+
+
+def _episode_key(episode: Episode) -> typing.List[str]:
+    return [episode.created_at or "", episode.uuid_ or ""]
+
+
+def _thread_ids(
+    client: "Zep", user_id: typing.Optional[str], request_options: typing.Optional[RequestOptions]
+) -> typing.List[str]:
+    if user_id is None:
+        return []
+    threads = client.user.get_threads(user_id, request_options=request_options)
+    threads = sorted(threads, key=lambda thread: (thread.created_at or "", thread.thread_id or ""))
+    return [thread.thread_id for thread in threads if thread.thread_id]
+
+
+class _Export:
+    def __init__(self, writer: _JsonlWriter, state: typing.Dict[str, typing.Any], checkpoint_path: str):
+        self.writer = writer
+        self.state = state
+        self.checkpoint_path = checkpoint_path
+        self.counts: typing.Counter[str] = collections.Counter()
+
+    def write(self, kind: str, record: typing.Dict[str, typing.Any]) -> None:
+        self.writer.write(record)
+        self.counts[kind] += 1
+
+    def checkpoint(self, **progress: typing.Any) -> None:
+        self.state.update(progress)
+        self.state["offset"] = self.writer.checkpoint()
+        _write_json_atomic(self.checkpoint_path, self.state)
+
+    def complete(self, section: str) -> None:
+        self.state["completed"].append(section)
+        self.checkpoint(cursor=None)
+
+
+def export_jsonl(
+    client: "Zep",
+    path: str,
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    sections: typing.Sequence[Section] = SECTIONS,
+    thread_ids: typing.Optional[typing.Sequence[str]] = None,
+    compression: typing.Optional[Compression] = None,
+    level: typing.Optional[int] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    episode_lastn: int = DEFAULT_EPISODE_LASTN,
+    resume: bool = True,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> ExportResult:
+    """
+    Streams a graph and its threads to a JSONL file.
+
+    Parameters
+    ----------
+    graph_id, user_id : typing.Optional[str]
+        The graph to export; exactly one must be provided.
+
+    sections : typing.Sequence[Section]
+        Which record kinds to export, written in the order of SECTIONS.
+
+    thread_ids : typing.Optional[typing.Sequence[str]]
+        Threads to export. Defaults to all threads of user_id; a graph_id export has no threads unless given.
+
+    compression : typing.Optional[Compression]
+        gzip, zstd or none. Defaults to the file extension (.gz, .zst).
+
+    episode_lastn : int
+        How many of the most recent episodes to export. Older ones are left out, see ExportResult.episodes_truncated.
+
+    resume : bool
+        Continue an interrupted export of the same path from its checkpoint file (path + ".checkpoint"). The
+        checkpoint is removed once the export completes.
+
+    Returns
+    -------
+    ExportResult
+    """
+    owner, identifier = _resolve_owner(graph_id, user_id)
+    unknown = [section for section in sections if section not in SECTIONS]
+    if unknown:
+        raise ValueError(f"sections must be drawn from {', '.join(SECTIONS)}, got {unknown!r}")
+    compression = _compression_for(path, compression)
+    checkpoint_path = path + ".checkpoint"
+    owner_key = f"{owner}_id"
+
+    state = _read_json(checkpoint_path) if resume else None
+    if state is not None and (state.get(owner_key) != identifier or state.get("version") != FORMAT_VERSION):
+        raise ValueError(f"{checkpoint_path} belongs to a different export; remove it or pass resume=False")
+    resumed = state is not None and os.path.exists(path)
+    if not resumed:
+        state = {
+            "version": FORMAT_VERSION,
+            owner_key: identifier,
+            "sections": [section for section in SECTIONS if section in sections],
+            "completed": [],
+            "offset": 0,
+            "cursor": None,
+        }
+    state = typing.cast(typing.Dict[str, typing.Any], state)
+
+    writer = _JsonlWriter(path, compression, state["offset"], level)
+    run = _Export(writer, state, checkpoint_path)
+    try:
+        if not resumed:
+            header = {"type": "header", "version": FORMAT_VERSION, owner_key: identifier, "sections": state["sections"]}
+            writer.write(header)
+            run.checkpoint()
+
+        pages: typing.Dict[str, typing.Tuple[str, typing.Callable[..., typing.Iterator[typing.List[typing.Any]]]]] = {
+            "nodes": ("node", iter_node_pages),
+            "edges": ("edge", iter_edge_pages),
+        }
+        for section in state["sections"]:
+            if section in state["completed"]:
+                continue
+            if section in pages:
+                kind, iter_section_pages = pages[section]
+                for page in iter_section_pages(
+                    client,
+                    graph_id=graph_id,
+                    user_id=user_id,
+                    page_size=page_size,
+                    uuid_cursor=state["cursor"],
+                    request_options=request_options,
+                ):
+                    for model in page:
+                        run.write(section, {"type": kind, "data": model_to_raw(model)})
+                    run.checkpoint(cursor=page[-1].uuid_)
+            elif section == "episodes":
+                _export_episodes(client, run, owner, identifier, page_size, episode_lastn, request_options)
+            else:
+                _export_threads(client, run, user_id, thread_ids, page_size, request_options)
+            run.complete(section)
+    finally:
+        writer.close()
+
+    os.remove(checkpoint_path)
+    return ExportResult(
+        nodes=run.counts["nodes"],
+        edges=run.counts["edges"],
+        episodes=run.counts["episodes"],
+        threads=run.counts["threads"],
+        messages=run.counts["messages"],
+        size=state["offset"],
+        resumed=resumed,
+        episodes_truncated=state.get("episodes_truncated", False),
+    )
+
+
+def _export_episodes(
+    client: "Zep",
+    run: _Export,
+    owner: str,
+    identifier: str,
+    page_size: int,
+    episode_lastn: int,
+    request_options: typing.Optional[RequestOptions],
+) -> None:
+    # Episodes are not cursor paginated: the lastn window is ordered oldest first, and the checkpoint keeps the
+    # (created_at, uuid) of the last episode written so a resumed export skips what it already has.
+    episode_client = client.graph.episode
+    fetch = episode_client.get_by_graph_id if owner == "graph" else episode_client.get_by_user_id
+    episodes = sorted(
+        fetch(identifier, lastn=episode_lastn, request_options=request_options).episodes or [], key=_episode_key
+    )
+    if len(episodes) >= episode_lastn:
+        run.state["episodes_truncated"] = True
+    after = run.state["cursor"]
+    if after is not None:
+        episodes = [episode for episode in episodes if _episode_key(episode) > after]
+    for start in range(0, len(episodes), page_size):
+        page = episodes[start : start + page_size]
+        for episode in page:
+            run.write("episodes", {"type": "episode", "data": model_to_raw(episode)})
+        run.checkpoint(cursor=_episode_key(page[-1]))
+
+
+def _export_threads(
+    client: "Zep",
+    run: _Export,
+    user_id: typing.Optional[str],
+    thread_ids: typing.Optional[typing.Sequence[str]],
+    page_size: int,
+    request_options: typing.Optional[RequestOptions],
+) -> None:
+    # The cursor is the number of finished threads and the number of pages written of the current one. The thread
+    # list and page size are stored with the checkpoint so a resumed export walks the same threads and pages.
+    state = run.state
+    if "thread_ids" not in state:
+        state["thread_ids"] = (
+            list(thread_ids) if thread_ids is not None else _thread_ids(client, user_id, request_options)
+        )
+        state["message_page_size"] = page_size
+        run.checkpoint(cursor=[0, 0])
+    page_size = state["message_page_size"]
+    done, pages = state["cursor"] or [0, 0]
+    for index in range(done, len(state["thread_ids"])):
+        thread_id = state["thread_ids"][index]
+        # thread.get's cursor is a page number starting from 1, pages being limit messages long
+        while True:
+            response = client.thread.get(thread_id, limit=page_size, cursor=pages + 1, request_options=request_options)
+            messages = response.messages or []
+            if pages == 0:
+                run.write("threads", {"type": "thread", "thread_id": thread_id, "user_id": response.user_id or user_id})
+            for message in messages:
+                run.write("messages", {"type": "message", "thread_id": thread_id, "data": model_to_raw(message)})
+            written = pages * page_size + len(messages)
+            total = response.total_count
+            if len(messages) < page_size or (total is not None and written >= total):
+                break
+            pages += 1
+            run.checkpoint(cursor=[index, pages])
+        if total is not None and written < total:
+            raise RuntimeError(f"Thread {thread_id} ended after {written} of its {total} messages")
+        pages = 0
+        run.checkpoint(cursor=[index + 1, 0])
+
+
+def _episode_data(raw: typing.Dict[str, typing.Any]) -> EpisodeData:
+    source = raw.get("source")
+    return EpisodeData(
+        data=raw.get("content") or "",
+        type=source if source in _EPISODE_TYPES else "text",
+        created_at=raw.get("created_at"),
+        source_description=raw.get("source_description"),
+        metadata=raw.get("metadata"),
+    )
+
+
+def _message(raw: typing.Dict[str, typing.Any]) -> Message:
+    return Message(
+        content=raw.get("content") or "",
+        role=raw.get("role") or "norole",
+        name=raw.get("name"),
+        created_at=raw.get("created_at"),
+        metadata=raw.get("metadata"),
+    )
+
+
+class _Task:
+    __slots__ = ("lane", "first_line", "call")
+
+    def __init__(self, lane: str, first_line: int, call: typing.Callable[[], typing.Any]):
+        self.lane = lane
+        self.first_line = first_line
+        self.call = call
+
+
+class _Replayer:
+    """
+    Runs replay calls on a thread pool. Calls sharing a lane run one at a time in submission order, calls in
+    different lanes run concurrently, and at most 2 * concurrency calls are queued before the reader blocks.
+
+    The checkpoint is the number of leading lines whose calls have all completed, so a resumed import never replays a
+    line twice and never skips one, whatever order the calls finished in.
+    """
+
+    def __init__(self, concurrency: int):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="zep-import")
+        self._max_pending = 2 * concurrency
+        self._lanes: typing.Dict[str, typing.Deque[_Task]] = collections.defaultdict(collections.deque)
+        self._busy: typing.Set[str] = set()
+        self._completions: "queue.Queue[typing.Tuple[_Task, Future]]" = queue.Queue()
+        self._unfinished: typing.Dict[int, int] = collections.Counter()
+        self._pending = 0
+        self.completed = 0
+        self.error: typing.Optional[BaseException] = None
+
+    def submit(self, task: _Task) -> None:
+        self._unfinished[task.first_line] += 1
+        self._pending += 1
+        self._lanes[task.lane].append(task)
+        self._dispatch(task.lane)
+        while self._pending >= self._max_pending and self.error is None:
+            self._complete_one()
+
+    def _dispatch(self, lane: str) -> None:
+        tasks = self._lanes[lane]
+        if lane in self._busy or not tasks:
+            return
+        task = tasks.popleft()
+        self._busy.add(lane)
+        # Calls run in the submitting context, so a deadline set around the import bounds them too
+        future = self._executor.submit(contextvars.copy_context().run, task.call)
+        future.add_done_callback(lambda done: self._completions.put((task, done)))
+
+    def _complete_one(self) -> None:
+        task, future = self._completions.get()
+        self._busy.discard(task.lane)
+        self._pending -= 1
+        self.completed += 1
+        error = future.exception()
+        if error is not None:
+            if self.error is None:
+                self.error = error
+            # Later calls in a failed lane depend on this one; drop them, and keep their lines unfinished so they
+            # are replayed on resume
+            self._pending -= len(self._lanes.pop(task.lane, ()))
+            return
+        self._unfinished[task.first_line] -= 1
+        if not self._unfinished[task.first_line]:
+            del self._unfinished[task.first_line]
+        self._dispatch(task.lane)
+
+    def poll(self) -> None:
+        while not self._completions.empty():
+            self._complete_one()
+
+    def drain(self) -> None:
+        while self._pending:
+            self._complete_one()
+        self._executor.shutdown()
+
+    def low_water_mark(self, buffered: typing.Iterable[int], lines_read: int) -> int:
+        starts = list(self._unfinished) + list(buffered)
+        return min(starts) - 1 if starts else lines_read
+
+
+def import_jsonl(
+    client: "Zep",
+    path: str,
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    compression: typing.Optional[Compression] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    episode_batch_size: int = DEFAULT_EPISODE_BATCH_SIZE,
+    message_batch_size: int = DEFAULT_MESSAGE_BATCH_SIZE,
+    ordered_episodes: bool = True,
+    replay_message_episodes: typing.Optional[bool] = None,
+    create_missing: bool = True,
+    resume: bool = True,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> ImportResult:
+    """
+    Replays an export into a graph, streaming the file and keeping at most concurrency calls in flight.
+
+    Parameters
+    ----------
+    graph_id, user_id : typing.Optional[str]
+        Where to replay episodes. Defaults to the graph or user named in the header. Threads are created for user_id
+        when given, otherwise for the user recorded with each thread.
+
+    concurrency : int
+        Maximum number of add_batch and add_messages_batch calls in flight. Messages of one thread are always sent in
+        order; episodes are too unless ordered_episodes is False, which lets their batches run concurrently.
+
+    replay_message_episodes : typing.Optional[bool]
+        Whether to replay episodes created from thread messages. Defaults to doing so only when the export has no
+        threads section, since replaying the messages recreates those episodes.
+
+    create_missing : bool
+        Create the target user or graph and missing threads before replaying into them.
+
+    resume : bool
+        Skip the lines a previous, interrupted import of the same path completed (path + ".import-checkpoint").
+
+    Returns
+    -------
+    ImportResult
+    """
+    compression = _compression_for(path, compression)
+    checkpoint_path = path + ".import-checkpoint"
+    checkpoint = _read_json(checkpoint_path) if resume else None
+    skip_lines = checkpoint["lines"] if checkpoint else 0
+
+    replayer = _Replayer(concurrency)
+    counts: typing.Counter[str] = collections.Counter()
+    # lane -> (first line, items) of the batch being filled
+    buffers: typing.Dict[str, typing.Tuple[int, typing.List[typing.Any]]] = {}
+    flushers: typing.Dict[str, typing.Callable[[typing.List[typing.Any]], typing.Any]] = {}
+    target: typing.Dict[str, typing.Any] = {}
+    batches = 0
+    lines = 0
+    saved_at = 0
+
+    def save() -> None:
+        mark = replayer.low_water_mark((first for first, _ in buffers.values()), lines)
+        _write_json_atomic(checkpoint_path, {"lines": max(mark, skip_lines)})
+
+    def add_messages(thread_id: str) -> typing.Callable[[typing.List[Message]], typing.Any]:
+        return lambda items: client.thread.add_messages_batch(
+            thread_id, messages=items, request_options=request_options
+        )
+
+    def add_episodes(
+        owner_kwargs: typing.Dict[str, typing.Any],
+    ) -> typing.Callable[[typing.List[EpisodeData]], typing.Any]:
+        return lambda items: client.graph.add_batch(episodes=items, request_options=request_options, **owner_kwargs)
+
+    def create_thread(thread_id: str, user_id: str) -> typing.Callable[[], typing.Any]:
+        threads = typing.cast("ThreadClient", client.thread)
+        return lambda: threads.get_or_create(thread_id, user_id=user_id, lastn=1, request_options=request_options)
+
+    def flush(lane: str) -> None:
+        nonlocal batches
+        first_line, items = buffers.pop(lane)
+        call = flushers[lane]
+        batches += 1
+        if not ordered_episodes and lane == "episodes":
+            lane = f"episodes#{batches}"
+        replayer.submit(_Task(lane, first_line, lambda: call(items)))
+
+    def buffer(lane: str, line: int, item: typing.Any, limit: int) -> None:
+        first_line, items = buffers.setdefault(lane, (line, []))
+        items.append(item)
+        if len(items) >= limit:
+            flush(lane)
+
+    try:
+        for record in iter_jsonl(path, compression=compression):
+            lines += 1
+            kind = record.get("type")
+            if kind == "header":
+                if record.get("version") != FORMAT_VERSION:
+                    raise ValueError(f"Unsupported export version {record.get('version')!r}")
+                if graph_id is not None or user_id is not None:
+                    owner, identifier = _resolve_owner(graph_id, user_id)
+                else:
+                    owner, identifier = _resolve_owner(record.get("graph_id"), record.get("user_id"))
+                target[f"{owner}_id"] = identifier
+                if replay_message_episodes is None:
+                    replay_message_episodes = "threads" not in record.get("sections", ())
+                if create_missing and owner == "user":
+                    typing.cast("UserClient", client.user).get_or_create(identifier, request_options=request_options)
+                elif create_missing:
+                    typing.cast("GraphClient", client.graph).get_or_create(identifier, request_options=request_options)
+                flushers["episodes"] = add_episodes({f"{owner}_id": identifier})
+                continue
+            if lines <= skip_lines:
+                continue
+            if kind == "episode":
+                data = record["data"]
+                if not replay_message_episodes and (data.get("source") == "message" or data.get("thread_id")):
+                    counts["skipped"] += 1
+                    continue
+                counts["episodes"] += 1
+                buffer("episodes", lines, _episode_data(data), episode_batch_size)
+            elif kind == "thread":
+                thread_id = record["thread_id"]
+                lane = f"thread:{thread_id}"
+                thread_user = target.get("user_id") or record.get("user_id")
+                flushers[lane] = add_messages(thread_id)
+                counts["threads"] += 1
+                if create_missing and thread_user is not None:
+                    replayer.submit(_Task(lane, lines, create_thread(thread_id, thread_user)))
+            elif kind == "message":
+                lane = f"thread:{record['thread_id']}"
+                if lane not in flushers:
+                    flushers[lane] = add_messages(record["thread_id"])
+                counts["messages"] += 1
+                buffer(lane, lines, _message(record["data"]), message_batch_size)
+            else:
+                counts["skipped"] += 1
+                continue
+            replayer.poll()
+            if replayer.error is not None:
+                break
+            if replayer.completed != saved_at:
+                saved_at = replayer.completed
+                save()
+        if replayer.error is None:
+            for lane in list(buffers):
+                flush(lane)
+    finally:
+        replayer.drain()
+        if replayer.error is None and not buffers:
+            if os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
+        else:
+            save()
+    if replayer.error is not None:
+        raise replayer.error
+    return ImportResult(
+        episodes=counts["episodes"],
+        threads=counts["threads"],
+        messages=counts["messages"],
+        skipped=counts["skipped"],
+        lines=lines,
+        resumed=skip_lines > 0,
+    )
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> None:
+    """
+    Command line entry point, reading the API key from ZEP_API_KEY:
+
+        python -m zep_cloud.local.jsonl export --user-id alice alice.jsonl.gz
+        python -m zep_cloud.local.jsonl import --user-id alice-copy alice.jsonl.gz
+    """
+    from ..client import Zep
+
+    parser = argparse.ArgumentParser(prog="python -m zep_cloud.local.jsonl", description=main.__doc__)
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path")
+    owner = parser.add_mutually_exclusive_group()
+    owner.add_argument("--graph-id")
+    owner.add_argument("--user-id")
+    parser.add_argument("--base-url")
+    parser.add_argument("--compression", choices=("gzip", "zstd", "none"))
+    parser.add_argument("--sections", nargs="+", choices=SECTIONS, default=list(SECTIONS))
+    parser.add_argument("--thread-id", action="append", dest="thread_ids")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--restart", action="store_true", help="ignore checkpoints left by an interrupted run")
+    args = parser.parse_args(argv)
+
+    client = Zep(base_url=args.base_url)
+    if args.command == "export":
+        if args.graph_id is None and args.user_id is None:
+            parser.error("export requires --graph-id or --user-id")
+        result: typing.Any = export_jsonl(
+            client,
+            args.path,
+            graph_id=args.graph_id,
+            user_id=args.user_id,
+            sections=args.sections,
+            thread_ids=args.thread_ids,
+            compression=args.compression,
+            page_size=args.page_size,
+            resume=not args.restart,
+        )
+    else:
+        result = import_jsonl(
+            client,
+            args.path,
+            graph_id=args.graph_id,
+            user_id=args.user_id,
+            compression=args.compression,
+            concurrency=args.concurrency,
+            resume=not args.restart,
+        )
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
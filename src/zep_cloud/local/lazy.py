@@ -0,0 +1,404 @@
+"""
+Lazily validated responses for large search and list results.
+
+parse_obj_as validates every element of a response up front, which dominates the cost of a large search or list call
+when the caller only looks at the first few results. lazy_search and lazy_page return the same types as
+graph.search and the node, edge and observation list endpoints, but keep each list of models as a LazyList: a
+read-only sequence of the raw JSON objects that validates an element the first time it is accessed and caches the
+result. Elements come out as the same EntityEdge, EntityNode, Episode, DerivedNode or GraphitiSagaNode instances eager
+parsing would produce, and everything outside those lists is validated eagerly as usual.
+
+A lazy response is a real GraphSearchResults, so isinstance checks and attribute access work unchanged, but pydantic
+cannot serialize a LazyList: call materialize on the response before dict(), json() or model_dump().
+"""
+
+import functools
+import typing
+
+import pydantic
+
+from ..core.pydantic_utilities import (
+    IS_PYDANTIC_V2,
+    UniversalBaseModel,
+    _get_model_fields,
+    get_args,
+    get_origin,
+    parse_obj_as,
+)
+from ..core.request_options import RequestOptions
+from ..core.serialization import convert_and_respect_annotation_metadata
+from ..types.derived_node import DerivedNode
+from ..types.entity_edge import EntityEdge
+from ..types.entity_node import EntityNode
+from ..types.graph_search_results import GraphSearchResults
+from ..types.search_filters import SearchFilters
+from .pagination import DEFAULT_PAGE_SIZE, OMIT, _raise_for_status, _request_kwargs, aiter_pages, iter_pages
+from .records import _page_request
+
+if typing.TYPE_CHECKING:
+    from ..client import AsyncZep, Zep
+
+T = typing.TypeVar("T")
+M = typing.TypeVar("M", bound=UniversalBaseModel)
+LazyPageKind = typing.Literal["nodes", "edges", "observations"]
+
+_PAGE_TYPES: typing.Dict[str, typing.Type[UniversalBaseModel]] = {
+    "nodes": EntityNode,
+    "edges": EntityEdge,
+    "observations": DerivedNode,
+}
+
+_SEARCH_ARGUMENTS = frozenset(
+    {
+        "bfs_origin_node_uuids",
+        "center_node_uuid",
+        "graph_id",
+        "limit",
+        "max_characters",
+        "mmr_lambda",
+        "reranker",
+        "return_raw_results",
+        "scope",
+        "search_filters",
+        "user_id",
+    }
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _validator(type_: typing.Any) -> typing.Callable[[typing.Any], typing.Any]:
+    # parse_obj_as builds a new TypeAdapter on every call, which costs more than validating a single element
+    if not IS_PYDANTIC_V2:
+        return functools.partial(parse_obj_as, type_)
+    adapter: typing.Any = pydantic.TypeAdapter(type_)  # type: ignore[attr-defined]
+
+    def validate(raw: typing.Any) -> typing.Any:
+        return adapter.validate_python(
+            convert_and_respect_annotation_metadata(object_=raw, annotation=type_, direction="read")
+        )
+
+    return validate
+
+
+_UNSET = object()
+
+
+class LazyList(typing.Sequence[T]):
+    """
+    A read-only sequence of raw JSON objects that validates each element into type_ on first access.
+
+    Validated elements are cached, so repeated access returns the same instance. Iteration, indexing, slicing,
+    len and equality behave like a list; materialize returns a plain list with every element validated.
+    """
+
+    __slots__ = ("_type", "_raw", "_items")
+
+    def __init__(self, type_: typing.Type[T], raw: typing.Sequence[typing.Any]):
+        self._type: type = type_
+        self._raw = raw
+        self._items: typing.List[typing.Any] = [_UNSET] * len(raw)
+
+    def _get(self, index: int) -> T:
+        item = self._items[index]
+        if item is _UNSET:
+            item = self._items[index] = _validator(self._type)(self._raw[index])
+        return item
+
+    @typing.overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> typing.List[T]: ...
+
+    def __getitem__(self, index: typing.Union[int, slice]) -> typing.Union[T, typing.List[T]]:
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(len(self._raw))[index]]
+        if index < 0:
+            index += len(self._raw)
+        if not 0 <= index < len(self._raw):
+            raise IndexError("LazyList index out of range")
+        return self._get(index)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __iter__(self) -> typing.Iterator[T]:
+        for index in range(len(self._raw)):
+            yield self._get(index)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (LazyList, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"LazyList[{getattr(self._type, '__name__', self._type)}]({len(self)} items, {self.validated} validated)"
+
+    def __reduce__(self) -> typing.Tuple[typing.Any, ...]:
+        return LazyList, (self._type, self._raw)
+
+    @property
+    def validated(self) -> int:
+        """The number of elements validated so far."""
+        return sum(1 for item in self._items if item is not _UNSET)
+
+    @property
+    def raw(self) -> typing.Sequence[typing.Any]:
+        """The unvalidated JSON objects backing the list."""
+        return self._raw
+
+    def materialize(self) -> typing.List[T]:
+        """Validates any remaining elements and returns them as a list."""
+        return list(self)
+
+
+def _model_list_type(annotation: typing.Any) -> typing.Optional[typing.Type[UniversalBaseModel]]:
+    # Unwraps Optional[List[Model]] to Model, or returns None for any other annotation
+    if get_origin(annotation) is typing.Union:
+        arguments = [argument for argument in get_args(annotation) if argument is not type(None)]
+        if len(arguments) != 1:
+            return None
+        annotation = arguments[0]
+    if get_origin(annotation) is not list:
+        return None
+    (element,) = get_args(annotation) or (None,)
+    if isinstance(element, type) and issubclass(element, UniversalBaseModel):
+        return element
+    return None
+
+
+def _lazy_fields(
+    type_: typing.Type[UniversalBaseModel],
+) -> typing.List[typing.Tuple[str, str, bool, typing.Type[UniversalBaseModel]]]:
+    # FieldInfo on pydantic v2, ModelField on v1
+    fields: typing.Mapping[str, typing.Any] = _get_model_fields(type_)
+    lazy = []
+    for name, field in fields.items():
+        annotation = field.annotation if IS_PYDANTIC_V2 else field.outer_type_
+        required = field.is_required() if IS_PYDANTIC_V2 else field.required
+        element = _model_list_type(annotation)
+        if element is not None:
+            lazy.append((name, field.alias or name, bool(required), element))
+    return lazy
+
+
+def parse_lazy(type_: typing.Type[M], object_: typing.Mapping[str, typing.Any]) -> M:
+    """
+    Parses a JSON object into type_ like parse_obj_as, except that fields holding lists of models become LazyLists.
+
+    Parameters
+    ----------
+    type_ : typing.Type[UniversalBaseModel]
+        The response model, e.g. GraphSearchResults.
+
+    object_ : typing.Mapping[str, typing.Any]
+        The decoded response body.
+
+    Returns
+    -------
+    UniversalBaseModel
+        An instance of type_ whose list-of-model fields are LazyLists.
+    """
+    deferred: typing.Dict[str, LazyList] = {}
+    rest = dict(object_)
+    for name, alias, required, element in _lazy_fields(type_):
+        value = rest.pop(alias, None)
+        if value is not None:
+            deferred[name] = LazyList(element, value)
+        if required:
+            # Validated as an empty list so a missing field still fails, then swapped for the LazyList
+            rest[alias] = [] if value is not None else value
+    model = parse_obj_as(type_, rest)
+    if not deferred:
+        return model
+    if IS_PYDANTIC_V2:
+        return model.model_copy(update=deferred)
+    return model.copy(update=deferred)
+
+
+def materialize(value: T) -> T:
+    """
+    Returns value with every LazyList it holds replaced by a fully validated list.
+
+    Accepts a LazyList, a model returned by parse_lazy or any other value, which is returned unchanged.
+    """
+    if isinstance(value, LazyList):
+        return typing.cast(T, value.materialize())
+    if isinstance(value, UniversalBaseModel):
+        update = {
+            name: getattr(value, name).materialize()
+            for name in _get_model_fields(type(value))
+            if isinstance(getattr(value, name, None), LazyList)
+        }
+        if update:
+            return typing.cast(T, value.model_copy(update=update) if IS_PYDANTIC_V2 else value.copy(update=update))
+    return value
+
+
+def _search_body(query: str, arguments: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+    unknown = set(arguments) - _SEARCH_ARGUMENTS
+    if unknown:
+        raise TypeError(f"unexpected search arguments: {', '.join(sorted(unknown))}")
+    body = {"query": query, **arguments}
+    if "search_filters" in body:
+        body["search_filters"] = convert_and_respect_annotation_metadata(
+            object_=body["search_filters"], annotation=SearchFilters, direction="write"
+        )
+    return body
+
+
+def _search_kwargs(
+    query: str, arguments: typing.Dict[str, typing.Any], request_options: typing.Optional[RequestOptions]
+) -> typing.Dict[str, typing.Any]:
+    return {
+        "method": "POST",
+        "json": _search_body(query, arguments),
+        "headers": {"content-type": "application/json"},
+        "request_options": request_options,
+    }
+
+
+def _parse_response(response: typing.Any, type_: typing.Any) -> typing.Any:
+    _raise_for_status(response)
+    if get_origin(type_) is list:
+        return LazyList(get_args(type_)[0], response.json())
+    return parse_lazy(type_, response.json())
+
+
+def lazy_search(
+    client: "Zep",
+    query: str,
+    *,
+    request_options: typing.Optional[RequestOptions] = None,
+    **arguments: typing.Any,
+) -> GraphSearchResults:
+    """
+    Performs graph.search, returning results whose edges, nodes, episodes, observations and thread summaries are
+    LazyLists.
+
+    Parameters
+    ----------
+    client : Zep
+        The client to search with.
+
+    query : str
+        The string to search for.
+
+    request_options : typing.Optional[RequestOptions]
+        Request-specific configuration.
+
+    **arguments : typing.Any
+        Any other argument accepted by graph.search, such as graph_id, user_id, scope, limit or search_filters.
+
+    Returns
+    -------
+    GraphSearchResults
+
+    Examples
+    --------
+    results = lazy_search(client, "travel plans", user_id="user-1", scope="edges", limit=50)
+    top = results.edges[0]  # only this edge is validated
+    """
+    response = client._client_wrapper.httpx_client.request(
+        "graph/search", **_search_kwargs(query, arguments, request_options)
+    )
+    return _parse_response(response, GraphSearchResults)
+
+
+async def alazy_search(
+    client: "AsyncZep",
+    query: str,
+    *,
+    request_options: typing.Optional[RequestOptions] = None,
+    **arguments: typing.Any,
+) -> GraphSearchResults:
+    """Async counterpart of lazy_search."""
+    response = await client._client_wrapper.httpx_client.request(
+        "graph/search", **_search_kwargs(query, arguments, request_options)
+    )
+    return _parse_response(response, GraphSearchResults)
+
+
+def _page_path(kind: LazyPageKind, graph_id: typing.Optional[str], user_id: typing.Optional[str]) -> str:
+    path, _ = _page_request(kind, graph_id, user_id)
+    return path
+
+
+def lazy_page(
+    client: "Zep",
+    kind: LazyPageKind,
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    limit: typing.Optional[int] = None,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> LazyList[typing.Any]:
+    """
+    Fetches one page of nodes, edges or observations as a LazyList of EntityNode, EntityEdge or DerivedNode.
+    """
+    path = _page_path(kind, graph_id, user_id)
+    response = client._client_wrapper.httpx_client.request(
+        path, **_request_kwargs(limit if limit is not None else OMIT, uuid_cursor, request_options)
+    )
+    return _parse_response(response, typing.List[_PAGE_TYPES[kind]])  # type: ignore[valid-type]
+
+
+async def alazy_page(
+    client: "AsyncZep",
+    kind: LazyPageKind,
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    limit: typing.Optional[int] = None,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> LazyList[typing.Any]:
+    """Async counterpart of lazy_page."""
+    path = _page_path(kind, graph_id, user_id)
+    response = await client._client_wrapper.httpx_client.request(
+        path, **_request_kwargs(limit if limit is not None else OMIT, uuid_cursor, request_options)
+    )
+    return _parse_response(response, typing.List[_PAGE_TYPES[kind]])  # type: ignore[valid-type]
+
+
+def iter_lazy_pages(
+    client: "Zep",
+    kind: LazyPageKind,
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.Iterator[LazyList[typing.Any]]:
+    """Yields successive pages as LazyLists. Only the last element of each page is validated to read the cursor."""
+
+    def fetch(limit: int, cursor: typing.Optional[str], options: typing.Optional[RequestOptions]):
+        return lazy_page(
+            client, kind, graph_id=graph_id, user_id=user_id, limit=limit, uuid_cursor=cursor, request_options=options
+        )
+
+    return iter_pages(fetch, page_size=page_size, uuid_cursor=uuid_cursor, request_options=request_options)
+
+
+def aiter_lazy_pages(
+    client: "AsyncZep",
+    kind: LazyPageKind,
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.AsyncIterator[LazyList[typing.Any]]:
+    """Async counterpart of iter_lazy_pages."""
+
+    async def fetch(limit: int, cursor: typing.Optional[str], options: typing.Optional[RequestOptions]):
+        return await alazy_page(
+            client, kind, graph_id=graph_id, user_id=user_id, limit=limit, uuid_cursor=cursor, request_options=options
+        )
+
+    return aiter_pages(fetch, page_size=page_size, uuid_cursor=uuid_cursor, request_options=request_options)
@@ -0,0 +1,237 @@
+import json
+import typing
+
+from ..core.api_error import ApiError
+from ..core.pydantic_utilities import parse_obj_as
+from ..core.request_options import RequestOptions
+from ..errors.bad_request_error import BadRequestError
+from ..errors.forbidden_error import ForbiddenError
+from ..errors.internal_server_error import InternalServerError
+from ..errors.not_found_error import NotFoundError
+from ..types.api_error import ApiError as types_api_error_ApiError
+from ..types.derived_node import DerivedNode
+from ..types.entity_edge import EntityEdge
+from ..types.entity_node import EntityNode
+
+if typing.TYPE_CHECKING:
+    from ..client import AsyncZep, Zep
+
+T = typing.TypeVar("T", EntityNode, EntityEdge, DerivedNode)
+# A page of any item with a uuid_, e.g. a list of models, of records or a LazyList
+P = typing.TypeVar("P", bound=typing.Sequence[typing.Any])
+
+DEFAULT_PAGE_SIZE = 500
+
+OMIT = typing.cast(typing.Any, ...)
+
+# The status codes the generated raw clients map to exceptions, one entry per class in zep_cloud.errors
+_ERRORS: typing.Dict[int, typing.Callable[..., ApiError]] = {
+    400: BadRequestError,
+    403: ForbiddenError,
+    404: NotFoundError,
+    500: InternalServerError,
+}
+
+
+def _resolve_owner(graph_id: typing.Optional[str], user_id: typing.Optional[str]) -> typing.Tuple[str, str]:
+    if (graph_id is None) == (user_id is None):
+        raise ValueError("Exactly one of graph_id or user_id must be provided")
+    return ("graph", typing.cast(str, graph_id)) if graph_id is not None else ("user", typing.cast(str, user_id))
+
+
+def _request_kwargs(
+    limit: int, uuid_cursor: typing.Optional[str], request_options: typing.Optional[RequestOptions]
+) -> typing.Dict[str, typing.Any]:
+    """The HttpClient.request arguments of one page of a graph node, edge or observation listing."""
+    return {
+        "method": "POST",
+        "json": {"limit": limit, "uuid_cursor": uuid_cursor if uuid_cursor is not None else OMIT},
+        "headers": {"content-type": "application/json"},
+        "request_options": request_options,
+        "omit": OMIT,
+    }
+
+
+def _raise_for_status(response: typing.Any) -> None:
+    """Raises the exception the generated raw clients raise for an error response."""
+    if 200 <= response.status_code < 300:
+        return
+    headers = dict(response.headers)
+    try:
+        body = response.json()
+    except json.JSONDecodeError:
+        raise ApiError(status_code=response.status_code, headers=headers, body=response.text)
+    error = _ERRORS.get(response.status_code)
+    if error is not None:
+        raise error(body=parse_obj_as(types_api_error_ApiError, body), headers=headers)
+    raise ApiError(status_code=response.status_code, headers=headers, body=body)
+
+
+def _fetcher(resource: typing.Any, graph_id: typing.Optional[str], user_id: typing.Optional[str]) -> typing.Callable:
+    kind, identifier = _resolve_owner(graph_id, user_id)
+    method = resource.get_by_graph_id if kind == "graph" else resource.get_by_user_id
+
+    def fetch(limit: int, uuid_cursor: typing.Optional[str], request_options: typing.Optional[RequestOptions]):
+        kwargs: typing.Dict[str, typing.Any] = {"limit": limit, "request_options": request_options}
+        if uuid_cursor is not None:
+            kwargs["uuid_cursor"] = uuid_cursor
+        return method(identifier, **kwargs)
+
+    return fetch
+
+
+def iter_pages(
+    fetch: typing.Callable[..., P],
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.Iterator[P]:
+    """
+    Yields successive pages from a uuid_cursor paginated endpoint, starting after uuid_cursor if given.
+    Iteration stops at the first page shorter than page_size.
+    """
+    while True:
+        page = fetch(page_size, uuid_cursor, request_options)
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        uuid_cursor = page[-1].uuid_
+
+
+async def aiter_pages(
+    fetch: typing.Callable[..., typing.Awaitable[P]],
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.AsyncIterator[P]:
+    """Async counterpart of iter_pages."""
+    while True:
+        page = await fetch(page_size, uuid_cursor, request_options)
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        uuid_cursor = page[-1].uuid_
+
+
+def iter_node_pages(
+    client: "Zep",
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.Iterator[typing.List[EntityNode]]:
+    """Yields pages of nodes of a graph or user graph."""
+    return iter_pages(
+        _fetcher(client.graph.node, graph_id, user_id),
+        page_size=page_size,
+        uuid_cursor=uuid_cursor,
+        request_options=request_options,
+    )
+
+
+def iter_edge_pages(
+    client: "Zep",
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.Iterator[typing.List[EntityEdge]]:
+    """Yields pages of edges of a graph or user graph."""
+    return iter_pages(
+        _fetcher(client.graph.edge, graph_id, user_id),
+        page_size=page_size,
+        uuid_cursor=uuid_cursor,
+        request_options=request_options,
+    )
+
+
+def iter_observation_pages(
+    client: "Zep",
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.Iterator[typing.List[DerivedNode]]:
+    """Yields pages of observations of a graph or user graph."""
+    return iter_pages(
+        _fetcher(client.graph.observation, graph_id, user_id),
+        page_size=page_size,
+        uuid_cursor=uuid_cursor,
+        request_options=request_options,
+    )
+
+
+def iter_nodes(client: "Zep", **kwargs: typing.Any) -> typing.Iterator[EntityNode]:
+    """Yields every node of a graph or user graph. Accepts the same arguments as iter_node_pages."""
+    for page in iter_node_pages(client, **kwargs):
+        yield from page
+
+
+def iter_edges(client: "Zep", **kwargs: typing.Any) -> typing.Iterator[EntityEdge]:
+    """Yields every edge of a graph or user graph. Accepts the same arguments as iter_edge_pages."""
+    for page in iter_edge_pages(client, **kwargs):
+        yield from page
+
+
+def aiter_node_pages(
+    client: "AsyncZep",
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.AsyncIterator[typing.List[EntityNode]]:
+    """Async counterpart of iter_node_pages."""
+    return aiter_pages(
+        _fetcher(client.graph.node, graph_id, user_id),
+        page_size=page_size,
+        uuid_cursor=uuid_cursor,
+        request_options=request_options,
+    )
+
+
+def aiter_edge_pages(
+    client: "AsyncZep",
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.AsyncIterator[typing.List[EntityEdge]]:
+    """Async counterpart of iter_edge_pages."""
+    return aiter_pages(
+        _fetcher(client.graph.edge, graph_id, user_id),
+        page_size=page_size,
+        uuid_cursor=uuid_cursor,
+        request_options=request_options,
+    )
+
+
+def aiter_observation_pages(
+    client: "AsyncZep",
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.AsyncIterator[typing.List[DerivedNode]]:
+    """Async counterpart of iter_observation_pages."""
+    return aiter_pages(
+        _fetcher(client.graph.observation, graph_id, user_id),
+        page_size=page_size,
+        uuid_cursor=uuid_cursor,
+        request_options=request_options,
+    )
@@ -0,0 +1,384 @@
+"""
+Local pattern analytics over a LocalGraph mirror, in the vocabulary of graph.detect_patterns.
+
+detect_patterns takes the same DetectConfig, limit, min_occurrences, recency_weight, search_filters and seeds as the
+server endpoint and returns a DetectPatternsResponse, so local and server results can be compared field by field.
+It runs on NumPy arrays built from the mirror's integer edge endpoints, with no per-graph request and no cap on
+limit, which makes it suitable for sweeping thousands of mirrored user graphs.
+
+Three pattern types are computed locally:
+
+- relationship: (source label, edge type, target label) triple frequencies, counted with one np.unique over
+  packed integer keys. A node's label is its first label other than "Entity", or "Entity" if it has no other.
+- hub: nodes with at least min_degree incident edges, from bincounts over the endpoint arrays.
+- cluster: connected components of three or more nodes, found by label propagation with pointer jumping.
+
+occurrences is the number of edges supporting a pattern (the triple's edges, the hub's incident edges, the
+component's edges) and weighted_score the sum of their recency weights, equal to occurrences when recency_weight is
+"none". Hub and cluster results carry the uuids of their nodes in an extra node_uuids field. Path and co-occurrence
+detection need multi-hop enumeration and are left to the server. Seeds restrict the analysis to edges with an
+endpoint among the seed nodes.
+"""
+
+import datetime as dt
+import time
+import typing
+
+from ..types.detect_config import DetectConfig
+from ..types.detect_patterns_response import DetectPatternsResponse
+from ..types.pattern_metadata import PatternMetadata
+from ..types.pattern_result import PatternResult
+from ..types.pattern_seeds import PatternSeeds
+from ..types.recency_weight import RecencyWeight
+from ..types.search_filters import SearchFilters
+from .filters import FilterColumns, _micros, _numpy, compile_filters
+from .graph import LocalGraph
+from .store import EDGE_KIND, decode_record
+
+if typing.TYPE_CHECKING:
+    import numpy
+
+DEFAULT_LIMIT = 50
+DEFAULT_MIN_OCCURRENCES = 2
+DEFAULT_MIN_DEGREE = 3
+MIN_CLUSTER_SIZE = 3
+
+_HALF_LIFE_DAYS = {"7_days": 7, "30_days": 30, "90_days": 90}
+_BASE_LABEL = "Entity"
+
+
+def _primary_label(labels: typing.Sequence[str]) -> str:
+    for label in labels:
+        if label != _BASE_LABEL:
+            return label
+    return _BASE_LABEL
+
+
+class _EdgeTable:
+    """The analyzed edges of a graph as parallel arrays over the graph's dense node and edge numbering."""
+
+    def __init__(
+        self,
+        graph: LocalGraph,
+        search_filters: typing.Optional[SearchFilters],
+        seeds: typing.Optional[PatternSeeds],
+        recency_weight: RecencyWeight,
+        now: typing.Optional[dt.datetime],
+    ):
+        np = _numpy()
+        live = [edge for edge, record in enumerate(graph._edge_records) if record is not None]
+        if search_filters is not None:
+            mask = compile_filters(search_filters).mask(FilterColumns.from_graph(graph, "edges"))
+            live = [edge for edge, keep in zip(live, mask.tolist()) if keep]
+        edges = np.array(live, dtype=np.int64)
+        self.sources = np.frombuffer(graph._edge_sources, dtype=np.int64)[edges]
+        self.targets = np.frombuffer(graph._edge_targets, dtype=np.int64)[edges]
+
+        self.node_uuids = graph._node_uuids
+        # Label sets are interned by the graph, so the primary label is resolved once per distinct set
+        primary: typing.Dict[typing.Tuple[str, ...], int] = {}
+        label_codes: typing.Dict[str, int] = {}
+        codes = []
+        for node_labels in graph._node_labels:
+            code = primary.get(node_labels)
+            if code is None:
+                code = primary[node_labels] = label_codes.setdefault(_primary_label(node_labels), len(label_codes))
+            codes.append(code)
+        self.labels = list(label_codes)
+        self.node_labels = np.array(codes, dtype=np.int64)
+
+        type_codes: typing.Dict[str, int] = {}
+        names = graph._edge_names
+        self.edge_types = np.fromiter(
+            (type_codes.setdefault(names[edge], len(type_codes)) for edge in live), dtype=np.int64, count=len(live)
+        )
+        self.types = list(type_codes)
+
+        if seeds is not None:
+            keep = self._seed_mask(graph, seeds)
+            self.sources, self.targets, self.edge_types = self.sources[keep], self.targets[keep], self.edge_types[keep]
+            live = [edge for edge, k in zip(live, keep.tolist()) if k]
+
+        if recency_weight in (None, "none"):
+            self.weights = np.ones(len(live), dtype=np.float64)
+        else:
+            half_life = _HALF_LIFE_DAYS.get(recency_weight)
+            if half_life is None:
+                raise ValueError(
+                    f"recency_weight must be one of none, {', '.join(_HALF_LIFE_DAYS)}, got {recency_weight!r}"
+                )
+            reference = _micros((now or dt.datetime.now(dt.timezone.utc)).isoformat())
+            ages = np.fromiter(
+                (self._age_days(graph, edge, reference) for edge in live), dtype=np.float64, count=len(live)
+            )
+            # Edges without a usable created_at are not decayed
+            self.weights = np.where(np.isnan(ages), 1.0, 0.5 ** (np.maximum(ages, 0.0) / half_life))
+
+    @staticmethod
+    def _age_days(graph: LocalGraph, edge: int, reference: typing.Optional[int]) -> float:
+        record = graph._edge_records[edge]
+        created = _micros(decode_record(EDGE_KIND, typing.cast(bytes, record), 0).get("created_at"))
+        if created is None or reference is None:
+            return float("nan")
+        return (reference - created) / 86_400_000_000
+
+    def _seed_mask(self, graph: LocalGraph, seeds: PatternSeeds) -> "numpy.ndarray":
+        np = _numpy()
+        seed_nodes = np.zeros(len(self.node_uuids), dtype=bool)
+        for uuid in seeds.node_uuids or ():
+            node = graph._node_ids.get(uuid)
+            if node is not None:
+                seed_nodes[node] = True
+        if seeds.node_labels:
+            wanted = set(seeds.node_labels)
+            for node, node_labels in enumerate(graph._node_labels):
+                if wanted.intersection(node_labels):
+                    seed_nodes[node] = True
+        if seeds.edge_types:
+            typed = np.isin(self.edge_types, [self.types.index(t) for t in seeds.edge_types if t in self.types])
+            seed_nodes[self.sources[typed]] = True
+            seed_nodes[self.targets[typed]] = True
+        return seed_nodes[self.sources] | seed_nodes[self.targets]
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+
+def _relationships(table: _EdgeTable, min_occurrences: int) -> typing.List[PatternResult]:
+    np = _numpy()
+    if not len(table):
+        return []
+    label_count, type_count = len(table.labels), max(len(table.types), 1)
+    source_labels, target_labels = table.node_labels[table.sources], table.node_labels[table.targets]
+    keys = (source_labels * type_count + table.edge_types) * label_count + target_labels
+    unique, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse)
+    scores = np.bincount(inverse, weights=table.weights)
+    results = []
+    for key, count, score in zip(unique.tolist(), counts.tolist(), scores.tolist()):
+        if count < min_occurrences:
+            continue
+        rest, target = divmod(key, label_count)
+        source, edge_type = divmod(rest, type_count)
+        source_label, target_label, name = table.labels[source], table.labels[target], table.types[edge_type]
+        results.append(
+            PatternResult(
+                type="relationship",
+                description=f"{source_label} -[{name}]-> {target_label}",
+                node_labels=[source_label, target_label],
+                edge_types=[name],
+                occurrences=count,
+                weighted_score=score,
+            )
+        )
+    return results
+
+
+def _incidence(table: _EdgeTable) -> typing.Tuple["numpy.ndarray", "numpy.ndarray"]:
+    """Edge indexes grouped by endpoint node, CSR style: (offsets, edges)."""
+    np = _numpy()
+    nodes = np.concatenate([table.sources, table.targets])
+    edges = np.concatenate([np.arange(len(table)), np.arange(len(table))])
+    order = np.argsort(nodes, kind="stable")
+    offsets = np.searchsorted(nodes[order], np.arange(len(table.node_uuids) + 1))
+    return offsets, edges[order]
+
+
+def _sorted_types(table: _EdgeTable, edges: "numpy.ndarray") -> typing.List[str]:
+    np = _numpy()
+    codes, counts = np.unique(table.edge_types[edges], return_counts=True)
+    ranked = sorted(zip(counts.tolist(), codes.tolist()), key=lambda item: (-item[0], table.types[item[1]]))
+    return [table.types[code] for _, code in ranked]
+
+
+def _top(
+    candidates: "numpy.ndarray", scores: "numpy.ndarray", counts: "numpy.ndarray", limit: typing.Optional[int]
+) -> "numpy.ndarray":
+    """
+    The candidates that can make the overall top limit, so only those are turned into PatternResults. Candidates
+    tied with the last one kept are kept too, since the final order breaks ties by description.
+    """
+    np = _numpy()
+    if limit is None or len(candidates) <= limit:
+        return candidates
+    order = np.lexsort((-counts[candidates], -scores[candidates]))
+    ranked = candidates[order]
+    if limit == 0:
+        return ranked[:0]
+    last = ranked[limit - 1]
+    tied = (scores[ranked] == scores[last]) & (counts[ranked] == counts[last])
+    return ranked[: max(limit, int(np.flatnonzero(tied)[-1]) + 1)]
+
+
+def _hubs(
+    table: _EdgeTable, min_degree: int, min_occurrences: int, limit: typing.Optional[int]
+) -> typing.List[PatternResult]:
+    np = _numpy()
+    if not len(table):
+        return []
+    size = len(table.node_uuids)
+    degree = np.bincount(table.sources, minlength=size) + np.bincount(table.targets, minlength=size)
+    score = np.bincount(table.sources, weights=table.weights, minlength=size) + np.bincount(
+        table.targets, weights=table.weights, minlength=size
+    )
+    hubs = _top(np.flatnonzero(degree >= max(min_degree, min_occurrences)), score, degree, limit)
+    offsets, incident = _incidence(table)
+    results = []
+    for node in hubs.tolist():
+        label = table.labels[table.node_labels[node]]
+        count = int(degree[node])
+        results.append(
+            PatternResult(
+                type="hub",
+                description=f"{label} hub with {count} connections",
+                node_labels=[label],
+                edge_types=_sorted_types(table, incident[offsets[node] : offsets[node + 1]]),
+                occurrences=count,
+                weighted_score=float(score[node]),
+                node_uuids=[table.node_uuids[node]],
+            )
+        )
+    return results
+
+
+def connected_components(sources: "numpy.ndarray", targets: "numpy.ndarray", size: int) -> "numpy.ndarray":
+    """
+    Labels each of size nodes with the smallest node index of its connected component, treating edges as undirected.
+
+    Label propagation with pointer jumping: every round hooks each edge's larger root onto the smaller one, then
+    flattens the resulting trees, so the number of rounds grows with the logarithm of the component diameter.
+    """
+    np = _numpy()
+    parent = np.arange(size, dtype=np.int64)
+    while True:
+        source_roots, target_roots = parent[sources], parent[targets]
+        lowest = np.minimum(source_roots, target_roots)
+        hooked = parent.copy()
+        np.minimum.at(hooked, source_roots, lowest)
+        np.minimum.at(hooked, target_roots, lowest)
+        while True:
+            jumped = hooked[hooked]
+            if np.array_equal(jumped, hooked):
+                break
+            hooked = jumped
+        if np.array_equal(hooked, parent):
+            return parent
+        parent = hooked
+
+
+def _clusters(table: _EdgeTable, min_occurrences: int, limit: typing.Optional[int]) -> typing.List[PatternResult]:
+    np = _numpy()
+    if not len(table):
+        return []
+    size = len(table.node_uuids)
+    component = connected_components(table.sources, table.targets, size)
+    touched = np.zeros(size, dtype=bool)
+    touched[table.sources] = True
+    touched[table.targets] = True
+    nodes_per_component = np.bincount(component[touched], minlength=size)
+    edge_components = component[table.sources]
+    edges_per_component = np.bincount(edge_components, minlength=size)
+    scores = np.bincount(edge_components, weights=table.weights, minlength=size)
+
+    members = np.flatnonzero(touched)
+    members = members[np.argsort(component[members], kind="stable")]
+    member_components = component[members]
+    edge_order = np.argsort(edge_components, kind="stable")
+    sorted_edge_components = edge_components[edge_order]
+
+    candidates = np.flatnonzero((nodes_per_component >= MIN_CLUSTER_SIZE) & (edges_per_component >= min_occurrences))
+    results = []
+    for root in _top(candidates, scores, edges_per_component, limit).tolist():
+        start, stop = np.searchsorted(member_components, [root, root + 1])
+        nodes = members[start:stop]
+        edge_start, edge_stop = np.searchsorted(sorted_edge_components, [root, root + 1])
+        labels = sorted({table.labels[code] for code in table.node_labels[nodes].tolist()})
+        results.append(
+            PatternResult(
+                type="cluster",
+                description=f"Cluster of {len(nodes)} nodes ({', '.join(labels)})",
+                node_labels=labels,
+                edge_types=_sorted_types(table, edge_order[edge_start:edge_stop]),
+                occurrences=int(edges_per_component[root]),
+                weighted_score=float(scores[root]),
+                node_uuids=[table.node_uuids[node] for node in nodes.tolist()],
+            )
+        )
+    return results
+
+
+def detect_patterns(
+    graph: LocalGraph,
+    *,
+    detect: typing.Optional[DetectConfig] = None,
+    limit: typing.Optional[int] = DEFAULT_LIMIT,
+    min_occurrences: int = DEFAULT_MIN_OCCURRENCES,
+    recency_weight: RecencyWeight = "none",
+    search_filters: typing.Optional[SearchFilters] = None,
+    seeds: typing.Optional[PatternSeeds] = None,
+    now: typing.Optional[dt.datetime] = None,
+) -> DetectPatternsResponse:
+    """
+    Detects relationship, hub and cluster patterns in a mirrored graph.
+
+    Parameters
+    ----------
+    detect : typing.Optional[DetectConfig]
+        Which pattern types to detect. Omit to detect relationships, hubs and clusters. paths and co_occurrences are
+        not supported locally and raise ValueError.
+
+    limit : typing.Optional[int]
+        Max patterns to return, across types. None returns every pattern.
+
+    now : typing.Optional[dt.datetime]
+        Reference time for recency_weight. Defaults to the current time.
+
+    Returns
+    -------
+    DetectPatternsResponse
+        Patterns sorted by weighted_score descending, then occurrences and description.
+
+    Examples
+    --------
+    from zep_cloud import DetectConfig, HubDetectConfig
+    from zep_cloud.local import LocalGraph, detect_patterns
+
+    graph = LocalGraph.from_client(client, user_id="user_id")
+    response = detect_patterns(graph, detect=DetectConfig(hubs=HubDetectConfig(min_degree=5)))
+    """
+    started = time.perf_counter()
+    if detect is None:
+        relationships, hubs, clusters = True, True, True
+        min_degree = DEFAULT_MIN_DEGREE
+    else:
+        if detect.paths is not None or detect.co_occurrences is not None:
+            raise ValueError("Path and co-occurrence detection are not supported locally")
+        relationships, hubs, clusters = (
+            detect.relationships is not None,
+            detect.hubs is not None,
+            detect.clusters is not None,
+        )
+        min_degree = (detect.hubs.min_degree if detect.hubs is not None else None) or DEFAULT_MIN_DEGREE
+
+    table = _EdgeTable(graph, search_filters, seeds, recency_weight, now)
+    patterns: typing.List[PatternResult] = []
+    if relationships:
+        patterns.extend(_relationships(table, min_occurrences))
+    if hubs:
+        patterns.extend(_hubs(table, min_degree, min_occurrences, limit))
+    if clusters:
+        patterns.extend(_clusters(table, min_occurrences, limit))
+    patterns.sort(key=lambda p: (-(p.weighted_score or 0.0), -(p.occurrences or 0), p.description or ""))
+    if limit is not None:
+        patterns = patterns[:limit]
+
+    np = _numpy()
+    nodes_analyzed = len(np.union1d(table.sources, table.targets))
+    return DetectPatternsResponse(
+        patterns=patterns,
+        metadata=PatternMetadata(
+            edges_analyzed=len(table),
+            nodes_analyzed=nodes_analyzed,
+            elapsed_ms=int((time.perf_counter() - started) * 1000),
+        ),
+    )
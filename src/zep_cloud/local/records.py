@@ -0,0 +1,290 @@
+"""
+Compact, immutable record types for bulk graph reads.
+
+EdgeRecord, NodeRecord, EpisodeRecord, DerivedNodeRecord and MessageRecord hold the same fields as EntityEdge,
+EntityNode, Episode, DerivedNode and Message in __slots__, without pydantic's per-instance validation state, and
+intern the values that repeat across records (names, labels, timestamps, endpoint uuids), so a million edges take a
+fraction of the memory of the equivalent models. Label and episode lists are stored as tuples; keys the models do not
+declare are kept in a separate mapping, as extra="allow" does.
+
+Records decode straight from the API's JSON, with orjson when it is installed, and convert to and from the full
+models on demand. iter_record_pages and iter_records are the record-returning counterparts of the page iterators in
+zep_cloud.local.pagination: they request the same endpoints but skip model validation entirely.
+"""
+
+import functools
+import json
+import sys
+import typing
+
+from ..core.jsonable_encoder import jsonable_encoder
+from ..core.pydantic_utilities import UniversalBaseModel, _get_model_fields, parse_obj_as
+from ..core.request_options import RequestOptions
+from ..types.derived_node import DerivedNode
+from ..types.entity_edge import EntityEdge
+from ..types.entity_node import EntityNode
+from ..types.episode import Episode
+from ..types.message import Message
+from .pagination import DEFAULT_PAGE_SIZE, _raise_for_status, _request_kwargs, _resolve_owner, aiter_pages, iter_pages
+from .store import model_to_raw
+
+if typing.TYPE_CHECKING:
+    from ..client import AsyncZep, Zep
+
+R = typing.TypeVar("R", bound="_Record")
+RecordPageKind = typing.Literal["nodes", "edges", "observations"]
+
+# Fields whose values repeat across records and are worth sharing
+_INTERNED = frozenset(
+    {
+        "created_at",
+        "valid_at",
+        "invalid_at",
+        "expired_at",
+        "name",
+        "role",
+        "role_type",
+        "scope",
+        "source",
+        "source_description",
+        "source_node_uuid",
+        "target_node_uuid",
+        "thread_id",
+    }
+)
+_TUPLES = frozenset({"labels", "episodes", "episode_ids"})
+
+# Label combinations are few in practice; the bound keeps arbitrary ones from growing the cache for good
+_LABEL_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=_LABEL_CACHE_SIZE)
+def _label_tuple(labels: typing.Tuple[str, ...]) -> typing.Tuple[str, ...]:
+    return tuple(sys.intern(label) for label in labels)
+
+
+def _intern_labels(labels: typing.List[str]) -> typing.Tuple[str, ...]:
+    return _label_tuple(tuple(labels))
+
+
+def _decoder(field: str) -> typing.Optional[typing.Callable[[typing.Any], typing.Any]]:
+    if field == "labels":
+        return _intern_labels
+    if field in _TUPLES:
+        return tuple
+    if field in _INTERNED:
+        return lambda value: sys.intern(value) if isinstance(value, str) else value
+    return None
+
+
+def _slots(model: typing.Type[UniversalBaseModel]) -> typing.Tuple[str, ...]:
+    return tuple(_get_model_fields(model)) + ("_extra",)
+
+
+def _restore(cls: typing.Type[R], values: typing.Tuple[typing.Any, ...], extra: typing.Any) -> R:
+    record = object.__new__(cls)
+    for field, value in zip(cls._fields, values):
+        object.__setattr__(record, field, value)
+    object.__setattr__(record, "_extra", extra)
+    return record
+
+
+try:
+    import orjson
+
+    _loads: typing.Callable[[typing.Union[bytes, str]], typing.Any] = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+
+class _Record:
+    __slots__ = ()
+
+    # Declared in the __slots__ of every concrete record type
+    _extra: typing.Optional[typing.Dict[str, typing.Any]]
+
+    _model: typing.ClassVar[typing.Type[UniversalBaseModel]]
+    _fields: typing.ClassVar[typing.Tuple[str, ...]]
+    _keys: typing.ClassVar[typing.FrozenSet[str]]
+    _decoders: typing.ClassVar[typing.Tuple[typing.Tuple[str, str, typing.Optional[typing.Callable]], ...]]
+
+    def __init_subclass__(cls, model: typing.Type[UniversalBaseModel], **kwargs: typing.Any):
+        super().__init_subclass__(**kwargs)
+        cls._model = model
+        cls._fields = tuple(field for field in typing.cast(typing.Tuple[str, ...], cls.__slots__) if field != "_extra")
+        decoders = tuple((field, "uuid" if field == "uuid_" else field, _decoder(field)) for field in cls._fields)
+        cls._decoders = decoders
+        cls._keys = frozenset(key for _, key, _ in decoders)
+
+    def __init__(self, **values: typing.Any):
+        raw = {("uuid" if key == "uuid_" else key): value for key, value in values.items()}
+        self._set_from_raw(raw)
+
+    def _set_from_raw(self, raw: typing.Mapping[str, typing.Any]) -> None:
+        setter = object.__setattr__
+        for field, key, decode in self._decoders:
+            value = raw.get(key)
+            setter(self, field, decode(value) if decode is not None and value is not None else value)
+        extra = None
+        if not self._keys.issuperset(raw):
+            extra = {key: value for key, value in raw.items() if key not in self._keys}
+        setter(self, "_extra", extra)
+
+    @classmethod
+    def from_raw(cls: typing.Type[R], raw: typing.Mapping[str, typing.Any]) -> R:
+        """Builds a record from the API's JSON representation, without validation."""
+        record = object.__new__(cls)
+        record._set_from_raw(raw)
+        return record
+
+    @classmethod
+    def from_model(cls: typing.Type[R], model: UniversalBaseModel) -> R:
+        return cls.from_raw(model_to_raw(model))
+
+    @classmethod
+    def decode(cls: typing.Type[R], data: typing.Union[bytes, str]) -> typing.List[R]:
+        """Decodes a JSON array of records, as returned by the list endpoints."""
+        from_raw = cls.from_raw
+        return [from_raw(raw) for raw in _loads(data)]
+
+    @property
+    def extra(self) -> typing.Mapping[str, typing.Any]:
+        """Keys of the record that the model does not declare."""
+        return self._extra or {}
+
+    def to_raw(self) -> typing.Dict[str, typing.Any]:
+        """The API representation of the record, dropping unset values like model_to_raw."""
+        raw: typing.Dict[str, typing.Any] = {}
+        for field, key, _ in self._decoders:
+            value = getattr(self, field)
+            if value is not None:
+                raw[key] = list(value) if field in _TUPLES else value
+        if self._extra:
+            raw.update((key, value) for key, value in self._extra.items() if value is not None)
+        return raw
+
+    def to_model(self, *, validate: bool = False) -> typing.Any:
+        """Converts the record to its pydantic model; validate=True runs full validation instead of construct."""
+        raw = self.to_raw()
+        if validate:
+            return parse_obj_as(self._model, raw)
+        return self._model.construct(**raw)
+
+    def _values(self) -> typing.Tuple[typing.Any, ...]:
+        return tuple(getattr(self, field) for field in self._fields)
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self) -> typing.Tuple[typing.Any, ...]:
+        return _restore, (type(self), self._values(), self._extra)
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        other_record = typing.cast(_Record, other)
+        return self._values() == other_record._values() and self._extra == other_record._extra
+
+    def __hash__(self) -> int:
+        return hash((type(self), getattr(self, "uuid_", None)))
+
+    def __repr__(self) -> str:
+        values = ", ".join(
+            f"{field}={getattr(self, field)!r}" for field in self._fields if getattr(self, field) is not None
+        )
+        return f"{type(self).__name__}({values})"
+
+
+class EdgeRecord(_Record, model=EntityEdge):
+    __slots__ = _slots(EntityEdge)
+
+
+class NodeRecord(_Record, model=EntityNode):
+    __slots__ = _slots(EntityNode)
+
+
+class EpisodeRecord(_Record, model=Episode):
+    __slots__ = _slots(Episode)
+
+
+class DerivedNodeRecord(_Record, model=DerivedNode):
+    __slots__ = _slots(DerivedNode)
+
+
+class MessageRecord(_Record, model=Message):
+    __slots__ = _slots(Message)
+
+
+_PAGE_KINDS: typing.Dict[str, typing.Tuple[str, typing.Type[_Record]]] = {
+    "nodes": ("node", NodeRecord),
+    "edges": ("edge", EdgeRecord),
+    "observations": ("observation", DerivedNodeRecord),
+}
+
+
+def _page_request(
+    kind: RecordPageKind, graph_id: typing.Optional[str], user_id: typing.Optional[str]
+) -> typing.Tuple[str, typing.Type[_Record]]:
+    if kind not in _PAGE_KINDS:
+        raise ValueError(f"kind must be one of {', '.join(_PAGE_KINDS)}, got {kind!r}")
+    resource, record_type = _PAGE_KINDS[kind]
+    owner, identifier = _resolve_owner(graph_id, user_id)
+    return f"graph/{resource}/{owner}/{jsonable_encoder(identifier)}", record_type
+
+
+def _decode_page(response: typing.Any, record_type: typing.Type[R]) -> typing.List[R]:
+    _raise_for_status(response)
+    return record_type.decode(response.content)
+
+
+def iter_record_pages(
+    client: "Zep",
+    kind: RecordPageKind,
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.Iterator[typing.List[typing.Any]]:
+    """
+    Yields pages of NodeRecord, EdgeRecord or DerivedNodeRecord for kind "nodes", "edges" or "observations",
+    decoding the response body directly instead of validating it into models.
+    """
+    path, record_type = _page_request(kind, graph_id, user_id)
+    httpx_client = client._client_wrapper.httpx_client
+
+    def fetch(limit: int, cursor: typing.Optional[str], options: typing.Optional[RequestOptions]):
+        return _decode_page(httpx_client.request(path, **_request_kwargs(limit, cursor, options)), record_type)
+
+    return iter_pages(fetch, page_size=page_size, uuid_cursor=uuid_cursor, request_options=request_options)
+
+
+def iter_records(client: "Zep", kind: RecordPageKind, **kwargs: typing.Any) -> typing.Iterator[typing.Any]:
+    """Yields every record of one kind. Accepts the same arguments as iter_record_pages."""
+    for page in iter_record_pages(client, kind, **kwargs):
+        yield from page
+
+
+def aiter_record_pages(
+    client: "AsyncZep",
+    kind: RecordPageKind,
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.AsyncIterator[typing.List[typing.Any]]:
+    """Async counterpart of iter_record_pages."""
+    path, record_type = _page_request(kind, graph_id, user_id)
+    httpx_client = client._client_wrapper.httpx_client
+
+    async def fetch(limit: int, cursor: typing.Optional[str], options: typing.Optional[RequestOptions]):
+        response = await httpx_client.request(path, **_request_kwargs(limit, cursor, options))
+        return _decode_page(response, record_type)
+
+    return aiter_pages(fetch, page_size=page_size, uuid_cursor=uuid_cursor, request_options=request_options)
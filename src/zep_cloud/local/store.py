@@ -0,0 +1,580 @@
+"""
+A persistent, memory-mapped cache of graph nodes, edges and episodes.
+
+Each record kind is stored in an append-only data file next to a sorted hash index. Both files are memory-mapped on
+open, so opening a cached graph costs a couple of system calls regardless of its size, and individual records are
+decoded on access. Identity and text fields are stored as length-prefixed UTF-8 and never go through a JSON parser;
+only free-form dictionaries such as attributes and metadata are kept as JSON and decoded when a record is read.
+
+Data file layout (little endian)::
+
+    file header    magic "ZEPG" | version u16 | kind u8 | reserved u8
+    record         payload length u32 | kind u8 | flags u8 | field count u16 | fields...
+    field          tag u8 | length u32 | bytes
+
+Records that have been deleted or replaced by a newer version of the same uuid are flagged as superseded in place, which keeps
+full scans linear. The index file is a sorted array of (blake2b-64 uuid hash u64, record offset u64) entries.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import typing
+import urllib.parse
+from dataclasses import dataclass
+
+from ..core.jsonable_encoder import jsonable_encoder
+from ..core.pydantic_utilities import IS_PYDANTIC_V2
+from ..types.entity_edge import EntityEdge
+from ..types.entity_node import EntityNode
+from ..types.episode import Episode
+from .pagination import (
+    DEFAULT_PAGE_SIZE,
+    _resolve_owner,
+    aiter_edge_pages,
+    aiter_node_pages,
+    iter_edge_pages,
+    iter_node_pages,
+)
+
+if typing.TYPE_CHECKING:
+    from ..client import AsyncZep, Zep
+
+MAGIC = b"ZEPG"
+FORMAT_VERSION = 1
+
+_FILE_HEADER = struct.Struct("<4sHBx")
+_RECORD_HEADER = struct.Struct("<IBBH")
+_FIELD_HEADER = struct.Struct("<BI")
+_INDEX_ENTRY = struct.Struct("<QQ")
+
+_TAG_NONE = 0
+_TAG_STR = 1
+_TAG_STRLIST = 2
+_TAG_JSON = 3
+
+_FLAG_SUPERSEDED = 1
+_LIST_SEPARATOR = "\x00"
+
+DEFAULT_EPISODE_LASTN = 1000
+
+RawRecord = typing.Dict[str, typing.Any]
+T = typing.TypeVar("T", EntityNode, EntityEdge)
+
+
+@dataclass(frozen=True)
+class RecordKind:
+    code: int
+    name: str
+    fields: typing.Tuple[str, ...]
+    model: typing.Type[typing.Any]
+
+
+NODE_KIND = RecordKind(
+    code=1,
+    name="nodes",
+    fields=("uuid", "name", "summary", "created_at", "labels", "attributes"),
+    model=EntityNode,
+)
+EDGE_KIND = RecordKind(
+    code=2,
+    name="edges",
+    fields=(
+        "uuid",
+        "name",
+        "fact",
+        "source_node_uuid",
+        "target_node_uuid",
+        "created_at",
+        "valid_at",
+        "invalid_at",
+        "expired_at",
+        "episodes",
+        "attributes",
+    ),
+    model=EntityEdge,
+)
+EPISODE_KIND = RecordKind(
+    code=3,
+    name="episodes",
+    fields=(
+        "uuid",
+        "content",
+        "created_at",
+        "source",
+        "source_description",
+        "role",
+        "role_type",
+        "thread_id",
+        "task_id",
+        "processed",
+        "metadata",
+    ),
+    model=Episode,
+)
+
+
+def uuid_hash(uuid: str) -> int:
+    return int.from_bytes(hashlib.blake2b(uuid.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def model_to_raw(model: typing.Any) -> RawRecord:
+    """Converts a node, edge or episode model to its API representation, dropping unset values."""
+    if not IS_PYDANTIC_V2:
+        return {k: v for k, v in model.dict().items() if v is not None}
+    raw = {("uuid" if k == "uuid_" else k): v for k, v in model.__dict__.items() if v is not None}
+    raw.update({k: v for k, v in (model.model_extra or {}).items() if v is not None})
+    return raw
+
+
+def _encode_field(value: typing.Any) -> bytes:
+    if value is None:
+        return _FIELD_HEADER.pack(_TAG_NONE, 0)
+    if isinstance(value, str):
+        data = value.encode("utf-8")
+        return _FIELD_HEADER.pack(_TAG_STR, len(data)) + data
+    if (
+        isinstance(value, list)
+        and all(isinstance(item, str) and _LIST_SEPARATOR not in item for item in value)
+        and value != [""]
+    ):
+        data = _LIST_SEPARATOR.join(value).encode("utf-8")
+        return _FIELD_HEADER.pack(_TAG_STRLIST, len(data)) + data
+    data = json.dumps(jsonable_encoder(value), separators=(",", ":")).encode("utf-8")
+    return _FIELD_HEADER.pack(_TAG_JSON, len(data)) + data
+
+
+def encode_record(kind: RecordKind, raw: RawRecord) -> bytes:
+    fields = [_encode_field(raw.get(key)) for key in kind.fields]
+    extra = {k: v for k, v in raw.items() if k not in kind.fields and v is not None}
+    fields.append(_encode_field(extra or None))
+    payload = b"".join(fields)
+    return _RECORD_HEADER.pack(len(payload), kind.code, 0, len(fields)) + payload
+
+
+def _decode_field(buf: typing.Any, offset: int) -> typing.Tuple[typing.Any, int]:
+    tag, length = _FIELD_HEADER.unpack_from(buf, offset)
+    start = offset + _FIELD_HEADER.size
+    end = start + length
+    if tag == _TAG_NONE:
+        return None, end
+    text = bytes(buf[start:end]).decode("utf-8")
+    if tag == _TAG_STR:
+        return text, end
+    if tag == _TAG_STRLIST:
+        return (text.split(_LIST_SEPARATOR) if text else []), end
+    return json.loads(text), end
+
+
+def decode_record(kind: RecordKind, buf: typing.Any, offset: int) -> RawRecord:
+    _, _, _, field_count = _RECORD_HEADER.unpack_from(buf, offset)
+    position = offset + _RECORD_HEADER.size
+    raw: RawRecord = {}
+    for i in range(field_count):
+        value, position = _decode_field(buf, position)
+        if value is None:
+            continue
+        if i < len(kind.fields):
+            raw[kind.fields[i]] = value
+        else:
+            raw.update(value)
+    return raw
+
+
+def _decode_uuid(buf: typing.Any, offset: int) -> typing.Optional[str]:
+    # The uuid is always the first field of a record
+    value, _ = _decode_field(buf, offset + _RECORD_HEADER.size)
+    return value
+
+
+class RecordFile:
+    """An append-only data file and its hash index, holding the records of a single kind."""
+
+    def __init__(self, directory: str, kind: RecordKind):
+        self.kind = kind
+        self._data_path = os.path.join(directory, f"{kind.name}.dat")
+        self._index_path = os.path.join(directory, f"{kind.name}.idx")
+
+        if not os.path.exists(self._data_path):
+            with open(self._data_path, "wb") as f:
+                f.write(_FILE_HEADER.pack(MAGIC, FORMAT_VERSION, kind.code))
+        self._file = open(self._data_path, "r+b")
+        magic, version, code = _FILE_HEADER.unpack(self._file.read(_FILE_HEADER.size))
+        if magic != MAGIC or version != FORMAT_VERSION or code != kind.code:
+            self._file.close()
+            raise ValueError(f"{self._data_path} is not a version {FORMAT_VERSION} {kind.name} cache file")
+
+        self._data: typing.Optional[mmap.mmap] = None
+        self._data_size = 0
+        self._index: typing.Union[mmap.mmap, bytes] = b""
+        self._index_count = 0
+        # Records appended since the index was last written: uuid -> offset
+        self._pending: typing.Dict[str, int] = {}
+        # Index entries replaced by pending records: uuid -> (hash, offset)
+        self._replaced: typing.Dict[str, typing.Tuple[int, int]] = {}
+        self._load_index()
+
+    def _load_index(self) -> None:
+        if isinstance(self._index, mmap.mmap):
+            self._index.close()
+        self._index, self._index_count = b"", 0
+        if os.path.exists(self._index_path) and os.path.getsize(self._index_path) > 0:
+            with open(self._index_path, "rb") as f:
+                self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index_count = len(self._index) // _INDEX_ENTRY.size
+
+    def _buffer(self, required_size: int) -> mmap.mmap:
+        if self._data is None or self._data_size < required_size:
+            if self._data is not None:
+                self._data.close()
+            self._file.flush()
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._data_size = len(self._data)
+        return self._data
+
+    def _record_buffer(self, offset: int) -> mmap.mmap:
+        buf = self._buffer(offset + _RECORD_HEADER.size)
+        length = _RECORD_HEADER.unpack_from(buf, offset)[0]
+        return self._buffer(offset + _RECORD_HEADER.size + length)
+
+    def _entry(self, position: int) -> typing.Tuple[int, int]:
+        return _INDEX_ENTRY.unpack_from(self._index, position * _INDEX_ENTRY.size)
+
+    def _lower_bound(self, key: int) -> int:
+        low, high = 0, self._index_count
+        while low < high:
+            mid = (low + high) // 2
+            if self._entry(mid)[0] < key:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def _indexed_offset(self, uuid: str, key: int) -> typing.Optional[int]:
+        position = self._lower_bound(key)
+        while position < self._index_count:
+            entry_key, offset = self._entry(position)
+            if entry_key != key:
+                break
+            if _decode_uuid(self._record_buffer(offset), offset) == uuid:
+                return offset
+            position += 1
+        return None
+
+    def offset_of(self, uuid: str) -> typing.Optional[int]:
+        offset = self._pending.get(uuid)
+        if offset is not None:
+            return offset
+        if uuid in self._replaced:
+            # Replaced without a pending record: deleted since the index was written
+            return None
+        return self._indexed_offset(uuid, uuid_hash(uuid))
+
+    def __contains__(self, uuid: object) -> bool:
+        return isinstance(uuid, str) and self.offset_of(uuid) is not None
+
+    def __len__(self) -> int:
+        return self._index_count - len(self._replaced) + len(self._pending)
+
+    def get_raw(self, uuid: str) -> typing.Optional[RawRecord]:
+        offset = self.offset_of(uuid)
+        if offset is None:
+            return None
+        return decode_record(self.kind, self._record_buffer(offset), offset)
+
+    def get(self, uuid: str) -> typing.Optional[typing.Any]:
+        raw = self.get_raw(uuid)
+        return self.kind.model.construct(**raw) if raw is not None else None
+
+    def append_raw(self, raw: RawRecord) -> None:
+        uuid = raw["uuid"]
+        previous = self._pending.get(uuid)
+        if previous is None:
+            key = uuid_hash(uuid)
+            previous = self._indexed_offset(uuid, key)
+            if previous is not None:
+                self._replaced[uuid] = (key, previous)
+        if previous is not None:
+            # Flag the superseded record so scans can skip it without consulting the index
+            self._file.seek(previous + 5)
+            self._file.write(bytes([_FLAG_SUPERSEDED]))
+
+        self._file.seek(0, os.SEEK_END)
+        self._pending[uuid] = self._file.tell()
+        self._file.write(encode_record(self.kind, raw))
+
+    def append(self, model: typing.Any) -> None:
+        self.append_raw(model_to_raw(model))
+
+    def delete(self, uuid: str) -> bool:
+        """Removes a record. Returns False if it is not cached."""
+        offset = self._pending.pop(uuid, None)
+        if offset is None:
+            if uuid in self._replaced:
+                return False
+            key = uuid_hash(uuid)
+            offset = self._indexed_offset(uuid, key)
+            if offset is None:
+                return False
+            self._replaced[uuid] = (key, offset)
+        self._file.seek(offset + 5)
+        self._file.write(bytes([_FLAG_SUPERSEDED]))
+        return True
+
+    def iter_raw(self) -> typing.Iterator[RawRecord]:
+        """Yields live records in the order they were first written."""
+        self._file.flush()
+        end = os.path.getsize(self._data_path)
+        buf = self._buffer(end)
+        position = _FILE_HEADER.size
+        while position < end:
+            length, _, flags, _ = _RECORD_HEADER.unpack_from(buf, position)
+            if not flags & _FLAG_SUPERSEDED:
+                yield decode_record(self.kind, buf, position)
+            position += _RECORD_HEADER.size + length
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        construct = self.kind.model.construct
+        for raw in self.iter_raw():
+            yield construct(**raw)
+
+    def flush(self) -> None:
+        """Writes pending appends to disk and merges them into the index."""
+        self._file.flush()
+        if not self._pending and not self._replaced:
+            return
+
+        inserts = sorted((uuid_hash(uuid), offset) for uuid, offset in self._pending.items())
+        drops = []
+        for key, offset in self._replaced.values():
+            position = self._lower_bound(key)
+            while self._entry(position) != (key, offset):
+                position += 1
+            drops.append(position)
+
+        # Pending offsets are larger than any indexed offset, so each insert goes after all entries of its hash
+        events: typing.List[typing.Tuple[int, int, typing.Optional[typing.Tuple[int, int]]]] = []
+        for key, offset in inserts:
+            events.append((self._lower_bound(key + 1) if key < 2**64 - 1 else self._index_count, 0, (key, offset)))
+        events.extend((position, 1, None) for position in drops)
+        events.sort(key=lambda event: (event[0], event[1], event[2] or (0, 0)))
+
+        entry_size = _INDEX_ENTRY.size
+        tmp_path = f"{self._index_path}.tmp"
+        with open(tmp_path, "wb") as out:
+            cursor = 0
+            for position, event_type, entry in events:
+                if position > cursor:
+                    out.write(self._index[cursor * entry_size : position * entry_size])
+                    cursor = position
+                if event_type == 0:
+                    out.write(_INDEX_ENTRY.pack(*typing.cast(typing.Tuple[int, int], entry)))
+                else:
+                    cursor = position + 1
+            out.write(self._index[cursor * entry_size : self._index_count * entry_size])
+            out.flush()
+            os.fsync(out.fileno())
+        # The old index has to be unmapped before it can be replaced on Windows
+        if isinstance(self._index, mmap.mmap):
+            self._index.close()
+            self._index = b""
+        os.replace(tmp_path, self._index_path)
+
+        self._pending.clear()
+        self._replaced.clear()
+        self._load_index()
+
+    def close(self) -> None:
+        self.flush()
+        if isinstance(self._index, mmap.mmap):
+            self._index.close()
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        self._file.close()
+
+
+@dataclass
+class RefreshStats:
+    nodes: int = 0
+    edges: int = 0
+    episodes: int = 0
+
+
+class GraphStore:
+    """
+    On-disk cache of a single graph or user graph.
+
+    Records are keyed by uuid; adding a record whose uuid is already cached replaces it. The store is meant to be
+    used by a single writer at a time, call flush() or close() to persist the index and sync state.
+
+    Examples
+    --------
+    from zep_cloud.local.store import GraphStore
+
+    with GraphStore("/var/cache/zep", graph_id="graph_id") as store:
+        store.refresh(client)
+        for edge in store.iter_edges():
+            ...
+    """
+
+    def __init__(self, directory: str, *, graph_id: typing.Optional[str] = None, user_id: typing.Optional[str] = None):
+        owner, identifier = _resolve_owner(graph_id, user_id)
+        self.graph_id = graph_id
+        self.user_id = user_id
+        self.path = os.path.join(directory, f"{owner}-{urllib.parse.quote(identifier, safe='')}")
+        os.makedirs(self.path, exist_ok=True)
+
+        self.nodes = RecordFile(self.path, NODE_KIND)
+        self.edges = RecordFile(self.path, EDGE_KIND)
+        self.episodes = RecordFile(self.path, EPISODE_KIND)
+
+        self._state_path = os.path.join(self.path, "state.json")
+        self.state: typing.Dict[str, typing.Any] = {}
+        if os.path.exists(self._state_path):
+            with open(self._state_path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+
+    def __enter__(self) -> "GraphStore":
+        return self
+
+    def __exit__(self, *exc: typing.Any) -> None:
+        self.close()
+
+    def get_node(self, uuid: str) -> typing.Optional[EntityNode]:
+        return self.nodes.get(uuid)
+
+    def get_edge(self, uuid: str) -> typing.Optional[EntityEdge]:
+        return self.edges.get(uuid)
+
+    def get_episode(self, uuid: str) -> typing.Optional[Episode]:
+        return self.episodes.get(uuid)
+
+    def iter_nodes(self) -> typing.Iterator[EntityNode]:
+        return iter(self.nodes)
+
+    def iter_edges(self) -> typing.Iterator[EntityEdge]:
+        return iter(self.edges)
+
+    def iter_episodes(self) -> typing.Iterator[Episode]:
+        return iter(self.episodes)
+
+    def add_nodes(self, nodes: typing.Iterable[EntityNode]) -> int:
+        return self._add(self.nodes, "node", nodes)
+
+    def add_edges(self, edges: typing.Iterable[EntityEdge]) -> int:
+        return self._add(self.edges, "edge", edges)
+
+    def add_episodes(self, episodes: typing.Iterable[Episode]) -> int:
+        return self._add(self.episodes, "episode", episodes)
+
+    def delete_nodes(self, uuids: typing.Iterable[str]) -> int:
+        return sum(1 for uuid in uuids if self.nodes.delete(uuid))
+
+    def delete_edges(self, uuids: typing.Iterable[str]) -> int:
+        return sum(1 for uuid in uuids if self.edges.delete(uuid))
+
+    def _add(self, records: RecordFile, kind: str, models: typing.Iterable[typing.Any]) -> int:
+        newest = self.state.setdefault("newest_created_at", {})
+        count = 0
+        for model in models:
+            records.append(model)
+            if model.created_at and model.created_at > newest.get(kind, ""):
+                newest[kind] = model.created_at
+            count += 1
+        return count
+
+    def _owner_kwargs(self) -> typing.Dict[str, typing.Optional[str]]:
+        return {"graph_id": self.graph_id, "user_id": self.user_id}
+
+    def _new_records(self, records: RecordFile, kind: str, page: typing.List[T]) -> typing.List[T]:
+        """
+        The records of page that are not cached. Anything created after the newest cached record is new; older
+        records are looked up in the index.
+        """
+        newest = self.state.get("newest_created_at", {}).get(kind, "")
+        return [model for model in page if (model.created_at or "") > newest or model.uuid_ not in records]
+
+    def _new_episodes(self, episodes: typing.Optional[typing.List[Episode]]) -> typing.List[Episode]:
+        return sorted(
+            (episode for episode in episodes or [] if episode.uuid_ not in self.episodes),
+            key=lambda episode: episode.created_at,
+        )
+
+    def refresh(
+        self,
+        client: "Zep",
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        episode_lastn: int = DEFAULT_EPISODE_LASTN,
+        request_options: typing.Optional[typing.Any] = None,
+    ) -> RefreshStats:
+        """
+        Fetches the nodes and edges created since the last refresh, and the most recent episodes that are not cached
+        yet.
+
+        Listings are paginated in uuid order and uuids are random, so records created since the last refresh can sort
+        anywhere in the listing and no cursor can skip past the records already seen. Every page is fetched, and only
+        the records that are not cached are added to the store.
+        """
+        stats = RefreshStats()
+        owner = self._owner_kwargs()
+        for node_page in iter_node_pages(client, **owner, page_size=page_size, request_options=request_options):
+            stats.nodes += self.add_nodes(self._new_records(self.nodes, "node", node_page))
+        for edge_page in iter_edge_pages(client, **owner, page_size=page_size, request_options=request_options):
+            stats.edges += self.add_edges(self._new_records(self.edges, "edge", edge_page))
+
+        episodes = (
+            client.graph.episode.get_by_graph_id(self.graph_id, lastn=episode_lastn, request_options=request_options)
+            if self.graph_id is not None
+            else client.graph.episode.get_by_user_id(
+                typing.cast(str, self.user_id), lastn=episode_lastn, request_options=request_options
+            )
+        )
+        stats.episodes = self.add_episodes(self._new_episodes(episodes.episodes))
+        self.flush()
+        return stats
+
+    async def refresh_async(
+        self,
+        client: "AsyncZep",
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        episode_lastn: int = DEFAULT_EPISODE_LASTN,
+        request_options: typing.Optional[typing.Any] = None,
+    ) -> RefreshStats:
+        """Async counterpart of refresh."""
+        stats = RefreshStats()
+        owner = self._owner_kwargs()
+        async for node_page in aiter_node_pages(client, **owner, page_size=page_size, request_options=request_options):
+            stats.nodes += self.add_nodes(self._new_records(self.nodes, "node", node_page))
+        async for edge_page in aiter_edge_pages(client, **owner, page_size=page_size, request_options=request_options):
+            stats.edges += self.add_edges(self._new_records(self.edges, "edge", edge_page))
+
+        episodes = (
+            await client.graph.episode.get_by_graph_id(
+                self.graph_id, lastn=episode_lastn, request_options=request_options
+            )
+            if self.graph_id is not None
+            else await client.graph.episode.get_by_user_id(
+                typing.cast(str, self.user_id), lastn=episode_lastn, request_options=request_options
+            )
+        )
+        stats.episodes = self.add_episodes(self._new_episodes(episodes.episodes))
+        self.flush()
+        return stats
+
+    def flush(self) -> None:
+        for records in (self.nodes, self.edges, self.episodes):
+            records.flush()
+        tmp_path = f"{self._state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self._state_path)
+
+    def close(self) -> None:
+        self.flush()
+        for records in (self.nodes, self.edges, self.episodes):
+            records.close()
@@ -0,0 +1,297 @@
+"""
+Incremental decoding of large list responses.
+
+The generated clients read a list response fully into memory, decode it and then validate it as a whole, so a page of
+10,000 edges costs the raw bytes, the decoded JSON and the models all at once before the first edge is available.
+stream_page requests the same endpoints through HttpClient.stream and feeds the body to a JsonArrayDecoder, which
+cuts the top-level JSON array into its elements as bytes arrive. Each element is decoded and validated on its own and
+yielded immediately, so memory is bounded by the element being read plus one network chunk, and the first item is
+available as soon as its bytes are.
+
+The decoder only tracks strings and nesting to find element boundaries; each element is then parsed by orjson, when
+installed, or the json module, so malformed elements raise the usual JSON errors.
+"""
+
+import re
+import typing
+
+from ..core.request_options import RequestOptions
+from ..types.derived_node import DerivedNode
+from ..types.entity_edge import EntityEdge
+from ..types.entity_node import EntityNode
+from .lazy import _validator
+from .pagination import DEFAULT_PAGE_SIZE, OMIT, _raise_for_status, _request_kwargs
+from .records import _loads, _page_request
+
+if typing.TYPE_CHECKING:
+    from ..client import AsyncZep, Zep
+
+StreamKind = typing.Literal["nodes", "edges", "observations"]
+
+_ITEM_TYPES: typing.Dict[str, type] = {
+    "nodes": EntityNode,
+    "edges": EntityEdge,
+    "observations": DerivedNode,
+}
+
+_STRUCTURAL = re.compile(rb'[\[\]{},"\\]')
+_BACKSLASH, _QUOTE, _COMMA, _OPEN_ARRAY = ord("\\"), ord('"'), ord(","), ord("[")
+_OPEN, _CLOSE = frozenset(b"[{"), frozenset(b"]}")
+
+
+class JsonArrayDecoder:
+    """
+    Splits a JSON array that arrives in chunks into the encoded bytes of its elements.
+
+    feed returns the elements completed by each chunk, and close checks that the array was terminated. Only the
+    current, incomplete element is buffered between calls.
+
+    Examples
+    --------
+    decoder = JsonArrayDecoder()
+    decoder.feed(b'[{"a": 1}, {"b"')  # [b'{"a": 1}']
+    decoder.feed(b": 2}]")  # [b' {"b": 2}']
+    decoder.close()
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._scan = 0
+        self._start = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._closed = False
+
+    @property
+    def buffered(self) -> int:
+        """The number of bytes held for the element being read."""
+        return len(self._buffer)
+
+    def feed(self, chunk: bytes) -> typing.List[bytes]:
+        if self._closed:
+            if chunk.strip():
+                raise ValueError("Unexpected data after the end of the JSON array")
+            return []
+        buffer = self._buffer
+        buffer += chunk
+        position = self._scan
+        if self._escaped and position < len(buffer):
+            # The previous chunk ended with a backslash inside a string, so this byte is escaped
+            position += 1
+            self._escaped = False
+        items: typing.List[bytes] = []
+        skip = position
+        for match in _STRUCTURAL.finditer(buffer, position):
+            index = match.start()
+            if index < skip:
+                continue
+            char = buffer[index]
+            if self._in_string:
+                if char == _BACKSLASH:
+                    skip = index + 2
+                    self._escaped = skip > len(buffer)
+                elif char == _QUOTE:
+                    self._in_string = False
+                continue
+            if self._depth == 0:
+                if char != _OPEN_ARRAY or buffer[:index].strip():
+                    raise ValueError("Expected a JSON array")
+                self._start = index + 1
+            if char == _QUOTE:
+                self._in_string = True
+            elif char in _OPEN:
+                self._depth += 1
+            elif char in _CLOSE:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(items, index)
+                    self._closed = True
+                    if buffer[index + 1 :].strip():
+                        raise ValueError("Unexpected data after the end of the JSON array")
+                    break
+            elif char == _COMMA and self._depth == 1:
+                self._emit(items, index)
+                self._start = index + 1
+        if self._closed:
+            buffer.clear()
+            self._scan = self._start = 0
+        else:
+            del buffer[: self._start]
+            self._scan, self._start = len(buffer), 0
+        return items
+
+    def _emit(self, items: typing.List[bytes], end: int) -> None:
+        item = bytes(self._buffer[self._start : end])
+        if item.strip():
+            items.append(item)
+
+    def close(self) -> None:
+        if not self._closed:
+            raise ValueError("The JSON array ended before it was closed")
+
+
+def iter_json_array(chunks: typing.Iterable[bytes]) -> typing.Iterator[typing.Any]:
+    """Decodes the elements of a JSON array from an iterable of byte chunks, yielding each as it completes."""
+    decoder = JsonArrayDecoder()
+    for chunk in chunks:
+        for item in decoder.feed(chunk):
+            yield _loads(item)
+    decoder.close()
+
+
+async def aiter_json_array(chunks: typing.AsyncIterable[bytes]) -> typing.AsyncIterator[typing.Any]:
+    """Async counterpart of iter_json_array."""
+    decoder = JsonArrayDecoder()
+    async for chunk in chunks:
+        for item in decoder.feed(chunk):
+            yield _loads(item)
+    decoder.close()
+
+
+def _stream_kwargs(
+    kind: StreamKind,
+    graph_id: typing.Optional[str],
+    user_id: typing.Optional[str],
+    limit: typing.Optional[int],
+    uuid_cursor: typing.Optional[str],
+    request_options: typing.Optional[RequestOptions],
+) -> typing.Tuple[str, typing.Dict[str, typing.Any], typing.Callable[[typing.Any], typing.Any]]:
+    path, _ = _page_request(kind, graph_id, user_id)
+    kwargs = _request_kwargs(limit if limit is not None else OMIT, uuid_cursor, request_options)
+    return path, kwargs, _validator(_ITEM_TYPES[kind])
+
+
+def stream_page(
+    client: "Zep",
+    kind: StreamKind,
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    limit: typing.Optional[int] = None,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.Iterator[typing.Any]:
+    """
+    Requests one page of nodes, edges or observations and yields validated EntityNode, EntityEdge or DerivedNode
+    items as their bytes arrive.
+
+    The response stays open until the generator is exhausted or closed. Error responses raise the same exceptions
+    as the generated clients before anything is yielded.
+
+    Parameters
+    ----------
+    client : Zep
+        The client to request with.
+
+    kind : typing.Literal["nodes", "edges", "observations"]
+        The kind of item to list.
+
+    graph_id : typing.Optional[str]
+        The graph to list. Exactly one of graph_id or user_id must be provided.
+
+    user_id : typing.Optional[str]
+        The user whose graph to list.
+
+    limit : typing.Optional[int]
+        Maximum number of items to return.
+
+    uuid_cursor : typing.Optional[str]
+        The uuid of the last item of the previous page.
+
+    request_options : typing.Optional[RequestOptions]
+        Request-specific configuration.
+
+    Examples
+    --------
+    for edge in stream_page(client, "edges", user_id="user-1", limit=10_000):
+        print(edge.fact)
+    """
+    path, kwargs, validate = _stream_kwargs(kind, graph_id, user_id, limit, uuid_cursor, request_options)
+    with client._client_wrapper.httpx_client.stream(path, **kwargs) as response:
+        if not 200 <= response.status_code < 300:
+            response.read()
+            _raise_for_status(response)
+        for raw in iter_json_array(response.iter_bytes()):
+            yield validate(raw)
+
+
+async def astream_page(
+    client: "AsyncZep",
+    kind: StreamKind,
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    limit: typing.Optional[int] = None,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.AsyncIterator[typing.Any]:
+    """Async counterpart of stream_page."""
+    path, kwargs, validate = _stream_kwargs(kind, graph_id, user_id, limit, uuid_cursor, request_options)
+    async with client._client_wrapper.httpx_client.stream(path, **kwargs) as response:
+        if not 200 <= response.status_code < 300:
+            await response.aread()
+            _raise_for_status(response)
+        async for raw in aiter_json_array(response.aiter_bytes()):
+            yield validate(raw)
+
+
+def stream_items(
+    client: "Zep",
+    kind: StreamKind,
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.Iterator[typing.Any]:
+    """
+    Yields every item of one kind, streaming each page with stream_page. Iteration stops at the first page shorter
+    than page_size, as with iter_pages.
+    """
+    while True:
+        count = 0
+        for item in stream_page(
+            client,
+            kind,
+            graph_id=graph_id,
+            user_id=user_id,
+            limit=page_size,
+            uuid_cursor=uuid_cursor,
+            request_options=request_options,
+        ):
+            count += 1
+            uuid_cursor = item.uuid_
+            yield item
+        if count < page_size:
+            return
+
+
+async def astream_items(
+    client: "AsyncZep",
+    kind: StreamKind,
+    *,
+    graph_id: typing.Optional[str] = None,
+    user_id: typing.Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    uuid_cursor: typing.Optional[str] = None,
+    request_options: typing.Optional[RequestOptions] = None,
+) -> typing.AsyncIterator[typing.Any]:
+    """Async counterpart of stream_items."""
+    while True:
+        count = 0
+        async for item in astream_page(
+            client,
+            kind,
+            graph_id=graph_id,
+            user_id=user_id,
+            limit=page_size,
+            uuid_cursor=uuid_cursor,
+            request_options=request_options,
+        ):
+            count += 1
+            uuid_cursor = item.uuid_
+            yield item
+        if count < page_size:
+            return
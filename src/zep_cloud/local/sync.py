@@ -0,0 +1,246 @@
+import typing
+from dataclasses import dataclass
+
+from ..core.request_options import RequestOptions
+from ..errors.not_found_error import NotFoundError
+from ..types.entity_edge import EntityEdge
+from ..types.entity_node import EntityNode
+from ..types.episode import Episode
+from .graph import LocalGraph
+from .pagination import DEFAULT_PAGE_SIZE, aiter_edge_pages, aiter_node_pages, iter_edge_pages, iter_node_pages
+from .store import DEFAULT_EPISODE_LASTN, GraphStore
+
+if typing.TYPE_CHECKING:
+    from ..client import AsyncZep, Zep
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    """
+    Outcome of a GraphSync run.
+
+    invalidated lists cached edges the server has since expired or invalidated, removed lists cached edges that no
+    longer exist; nodes found deleted are dropped along with their edges. episodes_truncated is set when every
+    episode returned by the lastn window was new, meaning older new episodes may have been missed; raise
+    episode_lastn or sync more often if it happens.
+    """
+
+    nodes_added: int
+    edges_added: int
+    episodes_added: int
+    invalidated: typing.Tuple[str, ...]
+    removed: typing.Tuple[str, ...]
+    episodes_truncated: bool
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.nodes_added or self.edges_added or self.episodes_added or self.invalidated or self.removed)
+
+
+class _SyncRun:
+    """Accumulates the changes of one sync run and applies them to the store and the mirror."""
+
+    def __init__(self, sync: "GraphSync"):
+        self.sync = sync
+        self.nodes_added = 0
+        self.edges_added = 0
+        self.episodes_added = 0
+        self.invalidated: typing.Dict[str, None] = {}
+        self.removed: typing.Dict[str, None] = {}
+        self.removed_nodes: typing.List[str] = []
+        self.episodes_truncated = False
+        # Previously synced nodes that received new edges; their older edges may have been invalidated
+        self.touched: typing.Dict[str, None] = {}
+
+    def add_nodes(self, page: typing.List[EntityNode]) -> None:
+        store = self.sync.store
+        new = store._new_records(store.nodes, "node", page)
+        self.nodes_added += store.add_nodes(new)
+        self.sync.graph.add_nodes(new)
+
+    def add_edges(self, page: typing.List[EntityEdge]) -> None:
+        store, graph = self.sync.store, self.sync.graph
+        new = store._new_records(store.edges, "edge", page)
+        for edge in new:
+            for node_uuid in (edge.source_node_uuid, edge.target_node_uuid):
+                if graph.degree(node_uuid):
+                    self.touched[node_uuid] = None
+        self.edges_added += store.add_edges(new)
+        graph.add_edges(new)
+
+    def apply_node_edges(self, node_uuid: str, remote: typing.Optional[typing.List[EntityEdge]]) -> None:
+        """Reconciles the cached edges of a node with the server's. remote is None if the node is gone."""
+        store, graph = self.sync.store, self.sync.graph
+        if remote is None:
+            self.removed_nodes.append(node_uuid)
+        remote_by_uuid = {edge.uuid_: edge for edge in remote or []}
+        updated: typing.List[EntityEdge] = []
+        for edge_uuid in graph.edges_of(node_uuid):
+            if edge_uuid in self.invalidated or edge_uuid in self.removed:
+                continue
+            current = remote_by_uuid.get(edge_uuid)
+            if current is None:
+                self.removed[edge_uuid] = None
+                continue
+            cached = graph.edge(edge_uuid)
+            if cached is not None and (
+                (current.expired_at, current.invalid_at) != (cached.expired_at, cached.invalid_at)
+            ):
+                if current.expired_at is not None or current.invalid_at is not None:
+                    self.invalidated[edge_uuid] = None
+                updated.append(current)
+        store.add_edges(updated)
+        graph.add_edges(updated)
+
+    def add_episodes(self, episodes: typing.Optional[typing.List[Episode]], lastn: int) -> None:
+        store = self.sync.store
+        high_water = store.state.get("newest_created_at", {}).get("episode")
+        new = [
+            episode
+            for episode in episodes or []
+            if episode.uuid_ not in store.episodes and (high_water is None or episode.created_at >= high_water)
+        ]
+        returned = len(episodes or [])
+        self.episodes_truncated = high_water is not None and returned >= lastn and len(new) == returned
+        new.sort(key=lambda episode: episode.created_at)
+        self.episodes_added = store.add_episodes(new)
+
+    def finish(self) -> SyncResult:
+        sync = self.sync
+        sync.store.delete_edges(self.removed)
+        sync.graph.remove_edges(self.removed)
+        sync.store.delete_nodes(self.removed_nodes)
+        sync.graph.remove_nodes(self.removed_nodes)
+        if sync.drop_invalidated:
+            sync.graph.remove_edges(self.invalidated)
+        sync.store.flush()
+        return SyncResult(
+            nodes_added=self.nodes_added,
+            edges_added=self.edges_added,
+            episodes_added=self.episodes_added,
+            invalidated=tuple(self.invalidated),
+            removed=tuple(self.removed),
+            episodes_truncated=self.episodes_truncated,
+        )
+
+
+class GraphSync:
+    """
+    Keeps a LocalGraph mirror and its GraphStore up to date incrementally.
+
+    Each run pages through the graph's nodes and edges and adds the ones that are not synced yet: records created
+    after the newest synced created_at, and older records missing from the store's index. Listings are in uuid
+    order and uuids are random, so new records can sort anywhere and every page has to be fetched, but only new
+    records are written to the store and the mirror. Episodes come from the most recent lastn window, keeping those
+    newer than the newest synced episode. The created_at high-water marks live in the store's state file, so a sync
+    picks up where the previous process left off.
+
+    New edges can invalidate older facts: when a new edge touches a node that already had edges, the node's edges
+    are fetched once and compared with the cached ones to detect edges whose expired_at or invalid_at was set, or
+    that were deleted. Deleted edges are removed from the mirror; invalidated edges are updated and kept unless
+    drop_invalidated is set.
+
+    Examples
+    --------
+    from zep_cloud.local import GraphStore, GraphSync
+
+    sync = GraphSync(GraphStore("/var/cache/zep", graph_id="graph_id"))
+    result = sync.sync(client)
+    neighbors = sync.graph.neighbors(node_uuid)
+    """
+
+    def __init__(
+        self,
+        store: GraphStore,
+        graph: typing.Optional[LocalGraph] = None,
+        *,
+        check_invalidations: bool = True,
+        drop_invalidated: bool = False,
+    ):
+        self.store = store
+        self.graph = graph if graph is not None else LocalGraph.from_store(store)
+        self.check_invalidations = check_invalidations
+        self.drop_invalidated = drop_invalidated
+
+    @property
+    def high_water_marks(self) -> typing.Dict[str, str]:
+        """The newest synced created_at, per record kind."""
+        return dict(self.store.state.get("newest_created_at", {}))
+
+    def _owner_kwargs(self) -> typing.Dict[str, typing.Optional[str]]:
+        return {"graph_id": self.store.graph_id, "user_id": self.store.user_id}
+
+    def sync(
+        self,
+        client: "Zep",
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        episode_lastn: int = DEFAULT_EPISODE_LASTN,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> SyncResult:
+        run = _SyncRun(self)
+        owner = self._owner_kwargs()
+        for node_page in iter_node_pages(client, **owner, page_size=page_size, request_options=request_options):
+            run.add_nodes(node_page)
+        for edge_page in iter_edge_pages(client, **owner, page_size=page_size, request_options=request_options):
+            run.add_edges(edge_page)
+
+        if self.check_invalidations:
+            for node_uuid in run.touched:
+                try:
+                    remote: typing.Optional[typing.List[EntityEdge]] = client.graph.node.get_edges(
+                        node_uuid, request_options=request_options
+                    )
+                except NotFoundError:
+                    remote = None
+                run.apply_node_edges(node_uuid, remote)
+
+        episodes = (
+            client.graph.episode.get_by_graph_id(
+                self.store.graph_id, lastn=episode_lastn, request_options=request_options
+            )
+            if self.store.graph_id is not None
+            else client.graph.episode.get_by_user_id(
+                typing.cast(str, self.store.user_id), lastn=episode_lastn, request_options=request_options
+            )
+        )
+        run.add_episodes(episodes.episodes, episode_lastn)
+        return run.finish()
+
+    async def sync_async(
+        self,
+        client: "AsyncZep",
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        episode_lastn: int = DEFAULT_EPISODE_LASTN,
+        request_options: typing.Optional[RequestOptions] = None,
+    ) -> SyncResult:
+        """Async counterpart of sync."""
+        run = _SyncRun(self)
+        owner = self._owner_kwargs()
+        async for node_page in aiter_node_pages(client, **owner, page_size=page_size, request_options=request_options):
+            run.add_nodes(node_page)
+        async for edge_page in aiter_edge_pages(client, **owner, page_size=page_size, request_options=request_options):
+            run.add_edges(edge_page)
+
+        if self.check_invalidations:
+            for node_uuid in run.touched:
+                try:
+                    remote: typing.Optional[typing.List[EntityEdge]] = await client.graph.node.get_edges(
+                        node_uuid, request_options=request_options
+                    )
+                except NotFoundError:
+                    remote = None
+                run.apply_node_edges(node_uuid, remote)
+
+        episodes = (
+            await client.graph.episode.get_by_graph_id(
+                self.store.graph_id, lastn=episode_lastn, request_options=request_options
+            )
+            if self.store.graph_id is not None
+            else await client.graph.episode.get_by_user_id(
+                typing.cast(str, self.store.user_id), lastn=episode_lastn, request_options=request_options
+            )
+        )
+        run.add_episodes(episodes.episodes, episode_lastn)
+        return run.finish()
@@ -0,0 +1,40 @@
+import typing
+
+import httpx
+import pytest
+
+from zep_cloud.client import AsyncZep, Zep
+
+BASE_URL = "https://api.test/api/v2"
+
+Handler = typing.Callable[[httpx.Request], typing.Any]
+
+
+@pytest.fixture
+def make_zep() -> typing.Callable[..., Zep]:
+    """Builds a Zep whose requests are answered in process by handler; keyword arguments go to Zep."""
+
+    def make(handler: Handler, **kwargs: typing.Any) -> Zep:
+        return Zep(
+            api_key="test",
+            base_url=BASE_URL,
+            httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+            **kwargs,
+        )
+
+    return make
+
+
+@pytest.fixture
+def make_async_zep() -> typing.Callable[..., AsyncZep]:
+    """Builds an AsyncZep whose requests are answered in process by handler, a function or a coroutine function."""
+
+    def make(handler: Handler, **kwargs: typing.Any) -> AsyncZep:
+        return AsyncZep(
+            api_key="test",
+            base_url=BASE_URL,
+            httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            **kwargs,
+        )
+
+    return make
@@ -0,0 +1,198 @@
+import gzip
+import json
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pytest
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore[assignment]
+
+from zep_cloud import EpisodeData, Message
+from zep_cloud.core.compression import RequestCompression, accept_encoding_header, resolve_compression
+
+EPISODE = {"uuid": "ep", "content": "c", "created_at": "2024-01-01T00:00:00Z"}
+LARGE = "The quick brown fox jumps over the lazy dog. " * 1000
+
+requires_zstd = pytest.mark.skipif(zstandard is None, reason="zstandard is not installed")
+
+
+class Server:
+    """Records each request with its decoded body and answers with the queued status codes, then 200."""
+
+    def __init__(self, statuses: Optional[List[int]] = None, reject_compressed: bool = False) -> None:
+        self.statuses = list(statuses or [])
+        self.reject_compressed = reject_compressed
+        self.requests: List[httpx.Request] = []
+        self.bodies: List[Any] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        body = request.content
+        encoding = request.headers.get("content-encoding")
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding == "zstd":
+            body = zstandard.ZstdDecompressor().decompress(body)
+        self.bodies.append(json.loads(body) if body else None)
+        if encoding and self.reject_compressed:
+            return httpx.Response(415, json={"message": "unsupported content encoding"})
+        if self.statuses:
+            return httpx.Response(self.statuses.pop(0), json={"message": "unavailable"})
+        if request.url.path.endswith("graph-batch"):
+            return httpx.Response(200, json=[EPISODE])
+        if "/threads/" in request.url.path:
+            return httpx.Response(200, json={"message_uuids": ["m"]})
+        return httpx.Response(200, json=EPISODE)
+
+
+class TestRequestCompression:
+    def test_resolution(self):
+        assert resolve_compression(None) is None and resolve_compression(False) is None
+        assert resolve_compression(True) == RequestCompression()
+        assert resolve_compression("gzip") == RequestCompression(algorithm="gzip")
+        with pytest.raises(ValueError):
+            RequestCompression(algorithm="br")  # type: ignore[arg-type]
+
+    def test_endpoint_patterns(self):
+        compression = RequestCompression()
+        assert compression.applies("post", "graph")
+        assert compression.applies("POST", "threads/t1/messages-batch")
+        assert not compression.applies("GET", "graph")
+        assert not compression.applies("POST", "graph/search")
+        assert RequestCompression(endpoints=("graph/*",)).applies("PATCH", "graph/g1")
+        assert compression.endpoint("POST", "threads/t1/messages") == "POST threads/*/messages"
+        assert compression.endpoint("GET", "threads/t1/messages") is None
+
+    def test_gzip_is_deterministic(self):
+        compression = RequestCompression(threshold=0)
+        assert compression.compress(LARGE.encode()) == compression.compress(LARGE.encode())
+
+
+class TestHttpClientCompression:
+    @pytest.mark.parametrize("algorithm", ["gzip", pytest.param("zstd", marks=requires_zstd)])
+    def test_compresses_large_bodies(self, algorithm: str, make_zep):
+        server = Server()
+        client = make_zep(server, compression=algorithm)
+
+        episode = client.graph.add(data=LARGE, type="text", user_id="u1")
+
+        assert episode.uuid_ == "ep"
+        request = server.requests[0]
+        assert request.headers["content-encoding"] == algorithm
+        assert request.headers["content-type"] == "application/json"
+        assert int(request.headers["content-length"]) < len(LARGE) // 10
+        assert server.bodies[0] == {"data": LARGE, "type": "text", "user_id": "u1"}
+
+    def test_threshold_and_endpoints(self, make_zep):
+        server = Server()
+        client = make_zep(server, compression=True)
+
+        client.graph.add(data="small", type="text", user_id="u1")
+        client.thread.add_messages("t1", messages=[Message(content=LARGE, role="user")])
+        client.graph.add_batch(episodes=[EpisodeData(data=LARGE, type="text")], graph_id="g1")
+        client.graph.search(query=LARGE, user_id="u1")
+
+        encodings = [request.headers.get("content-encoding") for request in server.requests]
+        assert encodings == [None, "gzip", "gzip", None]
+        assert server.bodies[1]["messages"][0]["content"] == LARGE
+
+    def test_disabled_by_default_and_caller_encoding_wins(self, make_zep):
+        server = Server()
+        make_zep(server).graph.add(data=LARGE, type="text", user_id="u1")
+        assert "content-encoding" not in server.requests[0].headers
+
+        compressed = make_zep(server, compression=True)
+        # An explicit Content-Encoding is the caller's responsibility, so the body is sent as given
+        compressed.graph.add(
+            data=LARGE,
+            type="text",
+            user_id="u1",
+            request_options={"additional_headers": {"Content-Encoding": "identity"}},
+        )
+        assert server.requests[1].headers["content-encoding"] == "identity"
+
+    @requires_zstd
+    def test_retries_resend_identical_bytes(self, make_zep):
+        server = Server(statuses=[503, 503])
+        client = make_zep(server, compression="zstd")
+
+        client.graph.add(data=LARGE, type="text", user_id="u1", request_options={"max_retries": 5})
+
+        assert len(server.requests) == 3
+        assert len({request.content for request in server.requests}) == 1
+        assert all(request.headers["content-encoding"] == "zstd" for request in server.requests)
+
+    def test_unsupported_media_type_falls_back(self, make_zep):
+        server = Server(reject_compressed=True)
+        client = make_zep(server, compression=True)
+
+        client.graph.add(data=LARGE, type="text", user_id="u1")
+        client.graph.add(data=LARGE, type="text", user_id="u1")
+        client.graph.add_batch(episodes=[EpisodeData(data=LARGE, type="text")], graph_id="g1")
+
+        encodings = [request.headers.get("content-encoding") for request in server.requests]
+        # Only the endpoint that rejected compression is sent uncompressed afterwards
+        assert encodings == ["gzip", None, None, "gzip", None]
+        assert server.bodies[1] == server.bodies[0]
+
+    def test_rejection_covers_the_endpoint_pattern(self, make_zep):
+        server = Server(reject_compressed=True)
+        client = make_zep(server, compression=True)
+
+        for thread_id in ("t1", "t2", "t3"):
+            client.thread.add_messages(thread_id, messages=[Message(content=LARGE, role="user")])
+
+        encodings = [request.headers.get("content-encoding") for request in server.requests]
+        # One 415 turns compression off for every thread's messages endpoint
+        assert encodings == ["gzip", None, None, None]
+        assert client._client_wrapper.httpx_client.compressor._rejected == {"POST threads/*/messages"}
+
+    def test_accept_encoding(self, make_zep):
+        server = Server()
+        make_zep(server, accept_encoding=["zstd", "gzip;q=0.5"]).graph.add(data="d", type="text", user_id="u1")
+        make_zep(server, accept_encoding="identity").graph.add(data="d", type="text", user_id="u1")
+        make_zep(server).graph.add(data="d", type="text", user_id="u1")
+
+        assert [request.headers["accept-encoding"] for request in server.requests] == [
+            "zstd, gzip;q=0.5",
+            "identity",
+            "gzip, deflate, zstd",
+        ]
+        with pytest.raises(ValueError, match="'compress'"):
+            accept_encoding_header("gzip, compress")
+
+    @requires_zstd
+    def test_decodes_compressed_responses(self, make_zep):
+        body = json.dumps(EPISODE).encode()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200,
+                headers={"content-encoding": "zstd"},
+                content=zstandard.ZstdCompressor().compress(body),
+            )
+
+        client = make_zep(handler, accept_encoding="zstd")
+        assert client.graph.add(data="d", type="text", user_id="u1").uuid_ == "ep"
+
+    @requires_zstd
+    async def test_async_client(self, make_async_zep):
+        server = Server(reject_compressed=True)
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await request.aread()
+            return server(request)
+
+        client = make_async_zep(
+            handler, compression=RequestCompression(algorithm="zstd", threshold=1024), accept_encoding="gzip"
+        )
+        response = await client.thread.add_messages_batch("t1", messages=[Message(content=LARGE, role="user")])
+
+        assert response.message_uuids == ["m"]
+        headers: List[Dict[str, Any]] = [dict(request.headers) for request in server.requests]
+        assert [h.get("content-encoding") for h in headers] == ["zstd", None]
+        assert all(h["accept-encoding"] == "gzip" for h in headers)
+        assert server.bodies[0] == server.bodies[1]
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pytest
+
+from zep_cloud.client import Zep
+from zep_cloud.core.api_error import ApiError
+from zep_cloud.core.deadline import DeadlineExceeded, attempt_timeout, deadline, remaining, retry_allowed
+from zep_cloud.local.jsonl import _Replayer, _Task
+from zep_cloud.local.pagination import iter_node_pages
+
+NODES = [{"uuid": f"node-{i:02d}", "name": f"Node {i}", "summary": "", "created_at": "c"} for i in range(20)]
+
+
+class Server:
+    """Answers node pages and searches after delay seconds, failing with the queued status codes first."""
+
+    def __init__(self, statuses: Optional[List[int]] = None, delay: float = 0.0, retry_after: str = "0") -> None:
+        self.statuses = list(statuses or [])
+        self.delay = delay
+        self.retry_after = retry_after
+        self.timeouts: List[Dict[str, Any]] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.timeouts.append(request.extensions["timeout"])
+        time.sleep(self.delay)
+        if self.statuses:
+            return httpx.Response(self.statuses.pop(0), headers={"retry-after": self.retry_after}, json={})
+        if "/graph/node/" in request.url.path:
+            body = json.loads(request.content)
+            cursor = body.get("uuid_cursor") or ""
+            return httpx.Response(200, json=[node for node in NODES if node["uuid"] > cursor][: body["limit"]])
+        return httpx.Response(200, json={"edges": []})
+
+
+class TestDeadline:
+    def test_scoping_and_nesting(self):
+        assert remaining() is None
+        with deadline(10):
+            assert 9 < remaining() <= 10
+            with deadline(1):
+                assert remaining() <= 1
+            with deadline(60):
+                assert remaining() <= 10
+        assert remaining() is None
+
+    def test_attempt_timeout(self):
+        assert attempt_timeout(30.0) == 30.0 and attempt_timeout(None) is None
+        with deadline(2):
+            assert attempt_timeout(1.0) == 1.0
+            assert 1.9 < attempt_timeout(30.0) <= 2
+            assert 1.9 < attempt_timeout(None) <= 2
+            timeout = attempt_timeout(httpx.Timeout(60.0, connect=1.0))
+            assert timeout.connect == 1.0 and 1.9 < timeout.read <= 2 and timeout.pool <= 2
+            assert retry_allowed(1.0) and not retry_allowed(5.0)
+        with deadline(-1), pytest.raises(DeadlineExceeded):
+            attempt_timeout(30.0)
+
+
+class TestHttpClientDeadline:
+    def test_caps_per_attempt_timeouts(self):
+        server = Server()
+        client = Zep(api_key="test", base_url="https://api.test/api/v2", timeout=30, read_timeout=5)
+        client._client_wrapper.httpx_client.httpx_client._transport = httpx.MockTransport(server)
+
+        client.graph.search(query="q", user_id="u1")
+        with deadline(1):
+            client.graph.search(query="q", user_id="u1", request_options={"timeout_in_seconds": 20})
+
+        assert server.timeouts[0] == {"connect": 10, "read": 5, "write": 30, "pool": 30}
+        assert all(0.9 < value <= 1 for value in server.timeouts[1].values())
+
+    def test_skips_retries_that_cannot_finish(self, make_zep):
+        server = Server(statuses=[503, 503, 503], retry_after="2")
+        client = make_zep(server)
+
+        start = time.monotonic()
+        with deadline(1), pytest.raises(ApiError) as error:
+            client.graph.search(query="q", user_id="u1", request_options={"max_retries": 5})
+
+        assert error.value.status_code == 503
+        assert len(server.timeouts) == 1
+        assert time.monotonic() - start < 0.5
+
+    def test_retries_within_budget(self, make_zep):
+        server = Server(statuses=[503, 429])
+        client = make_zep(server)
+
+        with deadline(5):
+            client.graph.search(query="q", user_id="u1", request_options={"max_retries": 5})
+
+        assert len(server.timeouts) == 3
+
+    def test_expired_deadline_sends_nothing(self, make_zep):
+        server = Server()
+        client = make_zep(server)
+
+        with deadline(0), pytest.raises(DeadlineExceeded):
+            client.graph.search(query="q", user_id="u1")
+        assert isinstance(DeadlineExceeded(), httpx.TimeoutException)
+        assert server.timeouts == []
+
+    def test_bounds_pagination(self, make_zep):
+        server = Server(delay=0.1)
+        client = make_zep(server)
+
+        pages: List[Any] = []
+        with deadline(0.25), pytest.raises(DeadlineExceeded):
+            for page in iter_node_pages(client, graph_id="g1", page_size=2):
+                pages.append(page)
+
+        assert 2 <= len(pages) <= 3 < len(NODES) // 2
+        budgets = [timeout["read"] for timeout in server.timeouts]
+        assert budgets == sorted(budgets, reverse=True) and budgets[0] <= 0.25
+
+    def test_propagates_to_bulk_helper_threads(self):
+        seen: List[Optional[float]] = []
+        replayer = _Replayer(concurrency=2)
+        with deadline(5):
+            for i in range(4):
+                replayer.submit(_Task(f"lane-{i}", i + 1, lambda: seen.append(remaining())))
+        replayer.drain()
+
+        assert len(seen) == 4 and all(left is not None and 4 < left <= 5 for left in seen)
+
+    async def test_async_client_and_tasks(self, make_async_zep):
+        server = Server(statuses=[503], retry_after="2")
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return server(request)
+
+        client = make_async_zep(handler)
+        with deadline(1):
+            with pytest.raises(ApiError):
+                await client.graph.search(query="q", user_id="u1", request_options={"max_retries": 3})
+            await asyncio.gather(*(client.graph.search(query="q", user_id=f"u{i}") for i in range(3)))
+
+        assert len(server.timeouts) == 4
+        assert all(timeout["read"] <= 1 for timeout in server.timeouts)
@@ -0,0 +1,200 @@
+import asyncio
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pytest
+
+from zep_cloud.core.hedging import Hedger, HedgingPolicy
+
+SEARCH: Dict[str, Any] = {"edges": []}
+CONTEXT = {"context": "ctx"}
+EPISODE = {"uuid": "ep", "content": "c", "created_at": "c"}
+
+
+class Backend:
+    """
+    Answers searches and context reads, taking the next of delays seconds for each request. The first request can
+    fail with a connection error, and the second can answer with an error status.
+    """
+
+    def __init__(self, *delays: float, fail_first: bool = False, second_status: Optional[int] = None) -> None:
+        self.delays = itertools.chain(delays, itertools.repeat(0.0))
+        self.fail_first = fail_first
+        self.second_status = second_status
+        self.lock = threading.Lock()
+        self.calls: List[str] = []
+
+    def next(self, request: httpx.Request) -> float:
+        with self.lock:
+            self.calls.append(f"{request.method} {request.url.path}")
+            return next(self.delays)
+
+    def respond(self, request: httpx.Request, index: int) -> httpx.Response:
+        if self.fail_first and index == 1:
+            raise httpx.ConnectError("connection reset", request=request)
+        if self.second_status is not None and index == 2:
+            return httpx.Response(self.second_status, json={"message": "unavailable"})
+        if request.url.path.endswith("/graph"):
+            return httpx.Response(200, json=EPISODE)
+        return httpx.Response(200, json=CONTEXT if request.url.path.endswith("/context") else SEARCH)
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        delay = self.next(request)
+        index = len(self.calls)
+        time.sleep(delay)
+        return self.respond(request, index)
+
+
+class TestHedgingPolicy:
+    def test_endpoints_and_validation(self):
+        policy = HedgingPolicy()
+        assert policy.endpoint("POST", "graph/search") == "POST graph/search"
+        assert policy.endpoint("GET", "threads/t1/context") == "GET threads/*/context"
+        assert policy.endpoint("POST", "graph") is None
+        assert policy.endpoint("GET", "threads/t1/messages") is None
+        with pytest.raises(ValueError):
+            HedgingPolicy(max_extra_load=2)
+
+    def test_delay_follows_percentile(self):
+        now = [0.0]
+        hedger = Hedger(HedgingPolicy(min_samples=16, percentile=90), clock=lambda: now[0])
+        for latency in range(1, 17):
+
+            def send(latency: float = latency) -> Any:
+                now[0] += latency / 100
+                return None
+
+            hedger.send("POST", "graph/search", send)
+
+        assert hedger.stats().delays == {"POST graph/search": pytest.approx(0.15)}
+        assert hedger.stats().requests == 16 and hedger.stats().hedges == 0
+
+
+class TestSyncHedging:
+    def test_slow_primary_is_hedged(self, make_zep):
+        backend = Backend(1.0)
+        client = make_zep(backend, hedging=HedgingPolicy(initial_delay=0.05))
+
+        start = time.monotonic()
+        assert client.graph.search(query="q", user_id="u1").edges == []
+
+        assert time.monotonic() - start < 0.5
+        assert backend.calls == ["POST /api/v2/graph/search"] * 2
+        stats = client.hedging_stats()
+        assert (stats.requests, stats.hedges, stats.hedge_wins, stats.win_rate) == (1, 1, 1, 1.0)
+
+    def test_fast_primary_and_other_endpoints_are_sent_once(self, make_zep):
+        backend = Backend()
+        client = make_zep(backend, hedging=HedgingPolicy(initial_delay=0.5))
+
+        client.graph.search(query="q", user_id="u1")
+        assert client.thread.get_user_context("t1").context == "ctx"
+        client.graph.add(data="d", type="text", user_id="u1")
+
+        assert len(backend.calls) == 3
+        stats = client.hedging_stats()
+        assert (stats.requests, stats.hedges) == (2, 0)
+        assert set(stats.delays) == {"POST graph/search", "GET threads/*/context"}
+
+    def test_no_hedging_before_enough_samples(self, make_zep):
+        backend = Backend(0.2)
+        client = make_zep(backend, hedging=HedgingPolicy(min_samples=5))
+
+        client.graph.search(query="q", user_id="u1")
+        assert len(backend.calls) == 1 and client.hedging_stats().hedges == 0
+
+    def test_budget_caps_extra_load(self, make_zep):
+        backend = Backend(0.3, 0.0, 0.3, 0.3)
+        client = make_zep(backend, hedging=HedgingPolicy(initial_delay=0.05, max_extra_load=0.5, burst=1))
+
+        client.graph.search(query="q", user_id="u1")
+        client.graph.search(query="q", user_id="u1")
+
+        stats = client.hedging_stats()
+        # The burst pays for the first hedge; the second request only refills the budget to 0.5
+        assert (stats.requests, stats.hedges, stats.skipped_budget) == (2, 1, 1)
+        assert stats.extra_load == 0.5
+
+    def test_failed_attempt_waits_for_the_other(self, make_zep):
+        backend = Backend(0.2, fail_first=True)
+        client = make_zep(backend, hedging=HedgingPolicy(initial_delay=0.05))
+
+        assert client.graph.search(query="q", user_id="u1").edges == []
+        assert client.hedging_stats().hedge_wins == 1
+
+    @pytest.mark.parametrize("status", [503, 429])
+    def test_error_response_does_not_win(self, status: int, make_zep):
+        # The hedge reaches an unhealthy backend that answers at once, while the primary is slow but healthy
+        backend = Backend(0.2, second_status=status)
+        client = make_zep(backend, hedging=HedgingPolicy(initial_delay=0.05))
+
+        assert client.graph.search(query="q", user_id="u1").edges == []
+        assert len(backend.calls) == 2
+        stats = client.hedging_stats()
+        assert (stats.hedges, stats.hedge_wins) == (1, 0)
+
+    def test_all_attempts_failing_raises(self, make_zep):
+        def handler(request: httpx.Request) -> httpx.Response:
+            time.sleep(0.1)
+            raise httpx.ConnectError("down", request=request)
+
+        client = make_zep(handler, hedging=HedgingPolicy(initial_delay=0.01))
+        with pytest.raises(httpx.ConnectError):
+            client.graph.search(query="q", user_id="u1")
+        assert client.hedging_stats().hedges == 1
+
+
+class TestAsyncHedging:
+    async def test_loser_is_cancelled(self, make_async_zep):
+        backend = Backend(1.0)
+        cancelled: List[int] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            delay = backend.next(request)
+            index = len(backend.calls)
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                cancelled.append(index)
+                raise
+            return backend.respond(request, index)
+
+        client = make_async_zep(handler, hedging=HedgingPolicy(initial_delay=0.05))
+        start = time.monotonic()
+        response = await client.thread.get_user_context("t1")
+        await asyncio.sleep(0)
+
+        assert response.context == "ctx" and time.monotonic() - start < 0.5
+        assert cancelled == [1]
+        stats = client.hedging_stats()
+        assert (stats.hedges, stats.hedge_wins) == (1, 1)
+
+    async def test_error_response_does_not_win(self, make_async_zep):
+        backend = Backend(0.2, second_status=503)
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            delay = backend.next(request)
+            index = len(backend.calls)
+            await asyncio.sleep(delay)
+            return backend.respond(request, index)
+
+        client = make_async_zep(handler, hedging=HedgingPolicy(initial_delay=0.05))
+
+        assert (await client.thread.get_user_context("t1")).context == "ctx"
+        assert len(backend.calls) == 2
+        assert client.hedging_stats().hedge_wins == 0
+
+    async def test_unhedged_requests(self, make_async_zep):
+        backend = Backend()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return backend(request)
+
+        client = make_async_zep(handler, hedging=True)
+        await asyncio.gather(*(client.graph.search(query="q", user_id="u1") for _ in range(3)))
+
+        assert len(backend.calls) == 3
+        assert client.hedging_stats().requests == 3 and client.hedging_stats().hedges == 0
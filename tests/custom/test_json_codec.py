@@ -0,0 +1,145 @@
+import datetime as dt
+import enum
+import json
+from typing import Any, List
+
+import httpx
+import pytest
+
+from zep_cloud import EntityEdge, GraphSearchResults
+from zep_cloud.core.api_error import ApiError
+from zep_cloud.core.json_codec import JsonCodec, MsgspecCodec, OrjsonCodec, get_json_codec
+from zep_cloud.core.jsonable_encoder import jsonable_encoder
+
+
+class Color(str, enum.Enum):
+    RED = "red"
+
+
+class Level(enum.IntEnum):
+    HIGH = 3
+
+
+PAYLOAD = {
+    "utc": dt.datetime(2024, 1, 2, 3, 4, 5, 600000, tzinfo=dt.timezone.utc),
+    "offset": dt.datetime(2024, 1, 2, 3, 4, 5, tzinfo=dt.timezone(dt.timedelta(hours=5))),
+    "date": dt.date(2024, 1, 2),
+    "enums": [Color.RED, Level.HIGH],
+    "edge": EntityEdge(uuid_="e", name="n", fact="f", source_node_uuid="s", target_node_uuid="t", created_at="c"),
+    "text": "ünïcode ✓",
+    "numbers": [0.1, -2, 2**70],
+    "keys": {1: "int key"},
+}
+
+
+def available_codecs() -> List[JsonCodec]:
+    codecs: List[JsonCodec] = [JsonCodec()]
+    for codec in (OrjsonCodec, MsgspecCodec):
+        try:
+            codecs.append(codec())
+        except ImportError:
+            pass
+    return codecs
+
+
+class CountingCodec(JsonCodec):
+    def __init__(self) -> None:
+        self.dumped: List[Any] = []
+        self.loaded = 0
+
+    def dumps(self, obj: Any) -> bytes:
+        self.dumped.append(obj)
+        return super().dumps(obj)
+
+    def loads(self, data: Any) -> Any:
+        self.loaded += 1
+        return super().loads(data)
+
+
+class TestJsonCodec:
+    @pytest.mark.parametrize("codec", available_codecs(), ids=lambda codec: codec.name)
+    def test_matches_jsonable_encoder(self, codec):
+        expected = json.loads(json.dumps(jsonable_encoder(PAYLOAD)))
+
+        assert codec.loads(codec.dumps(jsonable_encoder(PAYLOAD))) == expected
+        assert codec.loads(codec.dumps({key: PAYLOAD[key] for key in ("utc", "offset", "date", "enums")})) == {
+            key: expected[key] for key in ("utc", "offset", "date", "enums")
+        }
+
+    @pytest.mark.parametrize("codec", available_codecs(), ids=lambda codec: codec.name)
+    def test_compact_utf8_and_errors(self, codec):
+        assert codec.dumps({"a": [1, "✓"]}) == '{"a":[1,"✓"]}'.encode()
+        with pytest.raises(json.JSONDecodeError):
+            codec.loads(b'{"a": ')
+
+    def test_resolution(self):
+        assert isinstance(get_json_codec("json"), JsonCodec)
+        assert get_json_codec("auto").name in ("orjson", "msgspec", "json")
+        codec = CountingCodec()
+        assert get_json_codec(codec) is codec
+        with pytest.raises(ValueError):
+            get_json_codec("yaml")  # type: ignore[arg-type]
+
+    def test_missing_package(self):
+        try:
+            import msgspec  # noqa: F401
+        except ImportError:
+            with pytest.raises(ImportError, match=r"pip install zep-cloud\[fast-json\]"):
+                get_json_codec("msgspec")
+        else:
+            pytest.skip("msgspec is installed")
+
+
+def search_handler(requests: List[httpx.Request]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith("/graph/search"):
+            return httpx.Response(
+                200,
+                content=b'{"edges": [{"uuid": "e", "name": "n", "fact": "f", "source_node_uuid": "s", "target_node_uuid": "t", "created_at": "c"}]}',
+            )
+        return httpx.Response(500, content=b"not json")
+
+    return handler
+
+
+class TestHttpClientCodec:
+    def test_encodes_requests_and_decodes_responses(self, make_zep):
+        requests: List[httpx.Request] = []
+        codec = CountingCodec()
+        client = make_zep(search_handler(requests), json_codec=codec)
+
+        results = client.graph.search(query="q", user_id="u1", limit=5)
+
+        assert isinstance(results, GraphSearchResults) and results.edges[0].uuid_ == "e"
+        assert codec.dumped == [{"query": "q", "user_id": "u1", "limit": 5}]
+        assert codec.loaded == 1
+        assert json.loads(requests[0].content) == {"query": "q", "user_id": "u1", "limit": 5}
+        assert requests[0].headers["content-type"] == "application/json"
+
+    def test_invalid_json_still_raises_api_error(self, make_zep):
+        client = make_zep(search_handler([]))
+        with pytest.raises(ApiError) as error:
+            client.graph.get("g1")
+        assert error.value.body == "not json"
+
+    def test_bodyless_requests_are_unchanged(self, make_zep):
+        requests: List[httpx.Request] = []
+        client = make_zep(search_handler(requests), json_codec="json")
+        with pytest.raises(ApiError):
+            client.graph.get("g1")
+        assert requests[0].content == b"" and "content-type" not in requests[0].headers
+
+    async def test_async_client(self, make_async_zep):
+        requests: List[httpx.Request] = []
+        handler = search_handler(requests)
+        codec = CountingCodec()
+
+        async def async_handler(request: httpx.Request) -> httpx.Response:
+            return handler(request)
+
+        client = make_async_zep(async_handler, json_codec=codec)
+        results = await client.graph.search(query="q", graph_id="g1")
+
+        assert results.edges[0].fact == "f"
+        assert codec.dumped == [{"query": "q", "graph_id": "g1"}] and codec.loaded == 1
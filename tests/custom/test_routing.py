@@ -0,0 +1,242 @@
+import time
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from zep_cloud.client import AsyncZep, Zep
+from zep_cloud.core.api_error import ApiError
+from zep_cloud.core.routing import EndpointRouter, routing_key
+
+EU = "https://eu.test/api/v2"
+US = "https://us.test/api/v2"
+
+
+class Region:
+    """A mock regional endpoint that answers after delay seconds, with the queued failures first."""
+
+    def __init__(self, name: str, delay: float = 0.0) -> None:
+        self.name = name
+        self.delay = delay
+        self.failures: List[Any] = []
+        self.paths: List[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path.replace("/api/v2/", ""))
+        time.sleep(self.delay)
+        if self.failures:
+            failure = self.failures.pop(0)
+            if isinstance(failure, int):
+                return httpx.Response(failure, headers={"retry-after": "20"}, json={"message": self.name})
+            raise failure("unreachable", request=request)
+        if request.url.path.endswith("/graph/list-all"):
+            return httpx.Response(200, json={"graphs": [], "row_count": 0, "total_count": 0})
+        return httpx.Response(200, json={"edges": []})
+
+
+def mounts(*regions: Region) -> Dict[str, httpx.MockTransport]:
+    return {f"https://{region.name}.test": httpx.MockTransport(region) for region in regions}
+
+
+def make_client(eu: Region, us: Region, **kwargs: Any) -> Zep:
+    return Zep(
+        api_key="test",
+        base_urls=kwargs.pop("base_urls", [EU, US]),
+        httpx_client=httpx.Client(mounts=mounts(eu, us)),
+        **kwargs,
+    )
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRoutingKey:
+    def test_keys(self):
+        assert routing_key("graph/search", {"query": "q", "user_id": "u1"}) == "user:u1"
+        assert routing_key("graph-batch", {"graph_id": "g1", "episodes": []}) == "graph:g1"
+        assert routing_key("users/u1/threads", None) == "user:u1"
+        assert routing_key("threads/t1/messages", {"messages": []}) == "thread:t1"
+        assert routing_key("graph/node/user/u1", {"limit": 1}) == "user:u1"
+        assert routing_key("graph/edge/graph/g1", None) == "graph:g1"
+        assert routing_key("graph/g1", None) == "graph:g1"
+        assert routing_key("graph/search", {"query": "q"}) is None
+        assert routing_key("graph/node/n1", None) is None
+        assert routing_key("projects/info", None) is None
+
+
+class TestEndpointRouter:
+    def test_prefers_lower_latency_weighted_by_errors(self):
+        router = EndpointRouter([EU, US], sticky=False, clock=Clock())
+        assert router.choose() == EU
+        router.record(EU, 0.1, ok=True)
+        assert router.choose() == US
+        router.record(US, 0.05, ok=True)
+        assert router.choose() == US
+        router.record(US, 0.05, ok=False)
+        # US is faster but a 20% error rate triples its score
+        assert router.choose() == EU
+
+    def test_ejection_cooldown_and_recovery(self):
+        clock = Clock()
+        router = EndpointRouter([EU, US], sticky=False, eject_after=2, cooldown=10, clock=clock)
+        router.record(EU, 0.01, ok=True)
+        router.record(US, 0.5, ok=True)
+        router.record(EU, 0.01, ok=False)
+        assert router.choose() == EU
+        router.record(EU, 0.01, ok=False)
+
+        assert [health.healthy for health in router.health()] == [False, True]
+        assert router.choose() == US and not router.has_alternative({US})
+
+        clock.now = 11
+        assert router.choose() == EU  # one recovery check
+        assert router.choose() == US  # while it is in flight
+        router.record(EU, 0.01, ok=False)
+        clock.now = 25
+        assert router.choose() == US  # the cooldown doubled to 20
+        clock.now = 32
+        assert router.choose() == EU
+        router.record(EU, 0.01, ok=True)
+        assert router.health()[0].healthy and router.health()[0].consecutive_failures == 0
+
+    def test_all_ejected_still_routes(self):
+        clock = Clock()
+        router = EndpointRouter([EU, US], sticky=False, eject_after=1, cooldown=10, clock=clock)
+        router.record(EU, 0.1, ok=False)
+        clock.now = 1
+        router.record(US, 0.1, ok=False)
+        assert router.choose() == EU
+
+    def test_stale_endpoints_are_probed(self):
+        clock = Clock()
+        router = EndpointRouter([EU, US], sticky=False, probe_after=30, clock=clock)
+        router.record(EU, 0.5, ok=True)
+        router.record(US, 0.1, ok=True)
+        clock.now = 20
+        assert router.choose() == US
+        router.record(US, 0.1, ok=True)
+        clock.now = 40
+        assert router.choose() == EU  # its latency is 40s old
+        assert router.choose() == US
+
+    def test_sticky_keys(self):
+        router = EndpointRouter([EU, US], clock=Clock())
+        assert router.choose("user:u1") == EU
+        router.record(EU, 0.5, ok=True)
+        router.record(US, 0.1, ok=True)
+        assert router.choose("user:u1") == EU
+        assert router.choose("user:u2") == US
+        assert router.choose("user:u1", exclude={EU}) == US
+        assert router.choose("user:u1") == US
+
+
+class TestClientFailover:
+    def test_connection_errors_fail_over_without_retries(self):
+        eu, us = Region("eu"), Region("us")
+        eu.failures = [httpx.ConnectError]
+        client = make_client(eu, us)
+
+        client.graph.list_all()
+
+        assert eu.paths == ["graph/list-all"] and us.paths == ["graph/list-all"]
+        health = {health.base_url: health for health in client.endpoint_health()}
+        assert health[EU].failures == 1 and health[US].requests == 1
+
+    def test_other_transport_errors_are_not_resent(self):
+        eu, us = Region("eu"), Region("us")
+        eu.failures = [httpx.ReadTimeout]
+        client = make_client(eu, us)
+
+        with pytest.raises(httpx.ReadTimeout):
+            client.graph.list_all()
+        assert us.paths == []
+
+    def test_retryable_responses_fail_over_without_backoff(self):
+        eu, us = Region("eu"), Region("us")
+        eu.failures = [503]
+        client = make_client(eu, us)
+
+        start = time.monotonic()
+        client.graph.search(query="q", user_id="u1", request_options={"max_retries": 3})
+
+        assert time.monotonic() - start < 1
+        assert eu.paths == us.paths == ["graph/search"]
+        # Without retries the 503 is returned as before
+        us.failures = [503]
+        with pytest.raises(ApiError):
+            client.graph.search(query="q", graph_id="g1")
+
+    def test_routes_to_the_faster_region(self):
+        eu, us = Region("eu", delay=0.05), Region("us", delay=0.0)
+        client = make_client(eu, us)
+
+        for _ in range(6):
+            client.graph.list_all()
+
+        assert len(eu.paths) == 1 and len(us.paths) == 5
+
+    def test_sticky_users(self):
+        eu, us = Region("eu", delay=0.05), Region("us")
+        client = make_client(eu, us)
+
+        client.graph.search(query="q", user_id="u1")
+        client.graph.list_all()
+        client.graph.search(query="q", user_id="u1")
+        client.graph.search(query="q", user_id="u2")
+
+        assert eu.paths == ["graph/search", "graph/search"]
+        assert us.paths == ["graph/list-all", "graph/search"]
+
+    def test_single_base_url_and_environment(self, monkeypatch):
+        eu, us = Region("eu"), Region("us")
+        monkeypatch.setenv("ZEP_API_URL", "https://eu.test, https://us.test")
+        client = Zep(api_key="test", httpx_client=httpx.Client(mounts=mounts(eu, us)))
+        assert [health.base_url for health in client.endpoint_health()] == [EU, US]
+
+        monkeypatch.delenv("ZEP_API_URL")
+        plain = Zep(api_key="test", base_url=US, httpx_client=httpx.Client(mounts=mounts(eu, us)))
+        plain.graph.list_all()
+        assert plain.endpoint_health() == [] and us.paths == ["graph/list-all"]
+
+    def test_streamed_requests_are_recorded(self):
+        eu, us = Region("eu"), Region("us")
+        eu.failures = [httpx.ConnectError, 503]
+        client = make_client(eu, us, base_urls=[EU])
+        http_client = client._client_wrapper.httpx_client
+
+        with pytest.raises(httpx.ConnectError):
+            with http_client.stream("graph/list-all", method="GET"):
+                pass
+        with http_client.stream("graph/list-all", method="GET") as response:
+            assert response.status_code == 503
+        with http_client.stream("graph/list-all", method="GET") as response:
+            response.read()
+
+        (health,) = client.endpoint_health()
+        assert health.requests == 3 and health.failures == 2 and health.consecutive_failures == 0
+
+    async def test_async_failover(self):
+        eu, us = Region("eu"), Region("us")
+        eu.failures = [502]
+
+        def transport(region: Region) -> httpx.MockTransport:
+            async def handler(request: httpx.Request) -> httpx.Response:
+                return region(request)
+
+            return httpx.MockTransport(handler)
+
+        client = AsyncZep(
+            api_key="test",
+            base_urls=EndpointRouter([EU, US], sticky=False),
+            httpx_client=httpx.AsyncClient(mounts={"https://eu.test": transport(eu), "https://us.test": transport(us)}),
+        )
+        await client.graph.list_all(request_options={"max_retries": 5})
+        # An endpoint that has only failed is ranked last
+        await client.graph.list_all()
+
+        assert len(eu.paths) == 1 and len(us.paths) == 2
@@ -0,0 +1,193 @@
+import asyncio
+import http.server
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from zep_cloud.client import AsyncZep, Zep
+from zep_cloud.core.api_error import ApiError
+from zep_cloud.external_clients.connection import (
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    ConnectionOptions,
+)
+
+
+def pool(client):
+    return client._client_wrapper.httpx_client.httpx_client._transport._pool
+
+
+class TestConnectionOptions:
+    def test_tuned_defaults(self):
+        client = Zep(api_key="test")
+
+        assert pool(client)._max_connections == DEFAULT_MAX_CONNECTIONS
+        assert pool(client)._max_keepalive_connections == DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+        assert pool(client)._keepalive_expiry == DEFAULT_KEEPALIVE_EXPIRY
+        assert pool(client)._http2 is False
+        assert client._client_wrapper.httpx_client.default_timeout() == httpx.Timeout(connect=10.0, read=60.0, write=60.0, pool=60.0)
+
+    def test_explicit_options(self):
+        client = AsyncZep(
+            api_key="test",
+            timeout=5,
+            max_connections=50,
+            max_keepalive_connections=10,
+            keepalive_expiry=2.5,
+            read_timeout=30,
+            pool_timeout=1,
+        )
+
+        assert (pool(client)._max_connections, pool(client)._max_keepalive_connections) == (50, 10)
+        assert pool(client)._keepalive_expiry == 2.5
+        assert client._client_wrapper.httpx_client.default_timeout() == httpx.Timeout(connect=5.0, read=30.0, write=5.0, pool=1.0)
+
+    def test_http2_requires_h2(self):
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            with pytest.raises(ImportError, match=r"pip install zep-cloud\[http2\]"):
+                Zep(api_key="test", http2=True)
+        else:
+            assert pool(Zep(api_key="test", http2=True))._http2 is True
+
+    def test_rejected_with_custom_client(self):
+        with pytest.raises(ValueError):
+            Zep(api_key="test", httpx_client=httpx.Client(), max_connections=10)
+        client = Zep(api_key="test", httpx_client=httpx.Client(timeout=7))
+        assert client._client_wrapper.httpx_client.default_timeout() == 7
+
+    def test_requests_carry_separate_timeouts(self):
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.extensions["timeout"])
+            return httpx.Response(200, json={"uuid": "g1", "graph_id": "g1"})
+
+        client = Zep(api_key="test", base_url="https://api.test/api/v2", connect_timeout=2, write_timeout=3)
+        client._client_wrapper.httpx_client.httpx_client._transport = httpx.MockTransport(handler)
+
+        client.graph.get("g1")
+        client.graph.get("g2", request_options={"timeout_in_seconds": 9})
+
+        assert seen == [
+            {"connect": 2.0, "read": 60.0, "write": 3.0, "pool": 60.0},
+            {"connect": 9.0, "read": 9.0, "write": 9.0, "pool": 9.0},
+        ]
+
+    def test_is_default(self):
+        assert ConnectionOptions().is_default
+        assert not ConnectionOptions(http2=False).is_default
+
+
+class TestClose:
+    def test_close_releases_pools_and_connections(self):
+        with Zep(api_key="test", hedging=True) as client:
+            client.parallel([lambda: 1])
+            hedger = client._client_wrapper.httpx_client.hedger
+            hedger._pool()
+
+        assert client._fanout._executor is None and hedger._executor is None
+        assert client._client_wrapper.httpx_client.httpx_client.is_closed
+
+    async def test_aclose(self):
+        async with AsyncZep(api_key="test") as client:
+            pass
+
+        assert client._client_wrapper.httpx_client.httpx_client.is_closed
+
+
+class KeepAliveServer(http.server.ThreadingHTTPServer):
+    """A local HTTP/1.1 server answering project info after delay seconds, counting the connections it accepts."""
+
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.05) -> None:
+        super().__init__(("127.0.0.1", 0), _ProjectHandler)
+        self.delay = delay
+        self.accepted = 0
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/api/v2"
+
+    def get_request(self):
+        self.accepted += 1
+        return super().get_request()
+
+
+class _ProjectHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: KeepAliveServer
+
+    def do_GET(self) -> None:
+        time.sleep(self.server.delay)
+        status = 200 if self.headers.get("authorization") == "Api-Key good" else 401
+        body = json.dumps({"project": {"name": "p"}} if status == 200 else {"message": "unauthorized"}).encode()
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def closed_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}/api/v2"
+
+
+class TestWarmup:
+    def test_opens_reusable_connections(self):
+        server = KeepAliveServer()
+        client = Zep(api_key="good", base_url=server.base_url)
+
+        report = client.warmup(4)
+
+        assert server.accepted == 4
+        assert (report.connections, report.failures) == (4, 0)
+        assert report.validation_seconds is not None and report.seconds >= report.slowest
+        assert len(report.latencies[server.base_url]) == 4
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(lambda _: client.project.get(), range(4)))
+        assert server.accepted == 4
+
+    def test_rejected_credentials(self):
+        server = KeepAliveServer(delay=0)
+        client = Zep(api_key="bad", base_url=server.base_url)
+
+        with pytest.raises(ApiError) as error:
+            client.warmup(4)
+        assert error.value.status_code == 401 and server.accepted == 1
+        assert client.warmup(2, validate=False).connections == 2
+
+    def test_unreachable_endpoints_are_counted(self):
+        server = KeepAliveServer(delay=0)
+        down = closed_port_url()
+        client = Zep(api_key="good", base_urls=[server.base_url, down])
+
+        report = client.warmup(2, validate=False)
+
+        assert (report.connections, report.failures) == (2, 2)
+        assert report.latencies[down] == () and report.validation_seconds is None
+        with pytest.raises(ValueError):
+            client.warmup(0)
+
+    async def test_async_warmup(self):
+        server = KeepAliveServer()
+        client = AsyncZep(api_key="good", base_url=server.base_url)
+
+        report = await client.warmup(3)
+        await asyncio.gather(*(client.project.get() for _ in range(3)))
+
+        assert report.connections == 3 and server.accepted == 3
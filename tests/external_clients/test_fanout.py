@@ -0,0 +1,214 @@
+import asyncio
+import functools
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import httpx
+import pytest
+
+from zep_cloud.client import AsyncZep
+from zep_cloud.core.api_error import ApiError
+from zep_cloud.core.deadline import DeadlineExceeded, deadline
+from zep_cloud.errors import NotFoundError
+from zep_cloud.external_clients.fanout import DEFAULT_GATHER_CONCURRENCY, resolve_concurrency
+
+
+class Backend:
+    """Answers node lookups after delay seconds; nodes named missing-* are not found, and bad-* are unauthorized."""
+
+    def __init__(self, delay: float = 0.0, statuses: Sequence[int] = (), retry_after: str = "1") -> None:
+        self.delay = delay
+        self.statuses = list(statuses)
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.sent: List[str] = []
+        self.in_flight = 0
+        self.peak = 0
+        self.cancelled = 0
+
+    def start(self, request: httpx.Request) -> Tuple[str, Optional[int]]:
+        uuid = request.url.path.rsplit("/", 1)[-1]
+        with self.lock:
+            self.sent.append(uuid)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            return uuid, self.statuses.pop(0) if self.statuses else None
+
+    def finish(self, uuid: str, status: Optional[int]) -> httpx.Response:
+        with self.lock:
+            self.in_flight -= 1
+        if status is not None:
+            return httpx.Response(status, headers={"retry-after": self.retry_after}, json={"message": "slow down"})
+        if uuid.startswith("missing"):
+            return httpx.Response(404, json={"message": "not found"})
+        if uuid.startswith("bad"):
+            return httpx.Response(401, json={"message": "unauthorized"})
+        return httpx.Response(200, json={"uuid": uuid, "name": uuid, "summary": "", "created_at": "c"})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        uuid, status = self.start(request)
+        time.sleep(self.delay)
+        return self.finish(uuid, status)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        uuid, status = self.start(request)
+        try:
+            # Nodes named slow-<seconds> take that long
+            await asyncio.sleep(float(uuid.split("-", 1)[1]) if uuid.startswith("slow-") else self.delay)
+        except asyncio.CancelledError:
+            with self.lock:
+                self.in_flight -= 1
+                self.cancelled += 1
+            raise
+        return self.finish(uuid, status)
+
+
+class TestParallel:
+    def test_runs_concurrently_in_order(self, make_zep):
+        backend = Backend(delay=0.1)
+        client = make_zep(backend)
+        uuids = [f"n{i}" for i in range(10)]
+
+        start = time.monotonic()
+        results = client.parallel(functools.partial(client.graph.node.get, uuid) for uuid in uuids)
+
+        assert time.monotonic() - start < 0.5
+        assert [result.unwrap().uuid_ for result in results] == uuids
+        assert backend.peak > 1
+
+    def test_per_call_errors(self, make_zep):
+        client = make_zep(Backend())
+
+        results = client.map(client.graph.node.get, ["n1", "missing-1", "n2"])
+
+        assert [result.ok for result in results] == [True, False, True]
+        assert isinstance(results[1].error, NotFoundError)
+        with pytest.raises(NotFoundError):
+            results[1].unwrap()
+        assert results[2].value.uuid_ == "n2"
+
+    def test_concurrency_limits(self, make_zep):
+        backend = Backend(delay=0.02)
+        client = make_zep(backend, fanout_workers=4)
+
+        client.map(client.graph.node.get, [f"n{i}" for i in range(8)], concurrency=2)
+        assert backend.peak <= 2
+        backend.peak = 0
+        client.map(client.graph.node.get, [f"n{i}" for i in range(8)], concurrency=50)
+        assert backend.peak <= 4
+
+    def test_deadline(self, make_zep):
+        backend = Backend(delay=0.1)
+        client = make_zep(backend)
+
+        with deadline(0.15):
+            results = client.map(client.graph.node.get, ["n1", "n2", "n3"], concurrency=1)
+
+        assert [result.ok for result in results] == [True, True, False]
+        assert isinstance(results[2].error, DeadlineExceeded)
+        assert backend.sent == ["n1", "n2"]
+
+    def test_rate_limited_calls_hold_back_the_rest(self, make_zep):
+        backend = Backend(statuses=[429])
+        client = make_zep(backend)
+        get = functools.partial(client.graph.node.get, request_options={"max_retries": 0})
+
+        start = time.monotonic()
+        results = client.map(get, ["n1", "n2"], concurrency=1)
+
+        assert isinstance(results[0].error, ApiError) and results[0].error.status_code == 429
+        assert results[1].ok and time.monotonic() - start >= 1
+
+    def test_nested_fan_out_runs_inline(self, make_zep):
+        client = make_zep(Backend(), fanout_workers=1)
+
+        def both(uuid: str) -> List[str]:
+            nested = client.map(client.graph.node.get, [uuid, f"{uuid}-b"])
+            return [result.unwrap().uuid_ for result in nested]
+
+        results = client.map(both, ["a", "b"])
+
+        assert [result.unwrap() for result in results] == [["a", "a-b"], ["b", "b-b"]]
+
+
+class TestAsyncFanOut:
+    async def test_gather_in_order_with_bounded_concurrency(self, make_async_zep):
+        backend = Backend(delay=0.01)
+        client = make_async_zep(backend.handle)
+        uuids = [f"n{i}" for i in range(50)] + ["missing-1"]
+
+        results = await client.gather((functools.partial(client.graph.node.get, uuid) for uuid in uuids), concurrency=5)
+
+        assert [result.index for result in results] == list(range(51))
+        assert [result.value.uuid_ for result in results[:-1]] == uuids[:-1]
+        assert isinstance(results[-1].error, NotFoundError)
+        assert backend.peak == 5
+
+    def test_concurrency_follows_pool_limits(self):
+        pooled = AsyncZep(api_key="test", max_connections=3)._client_wrapper.httpx_client.httpx_client
+        custom = httpx.AsyncClient(transport=httpx.MockTransport(Backend().handle))
+
+        assert resolve_concurrency(None, pooled) == 3 and resolve_concurrency(100, pooled) == 3
+        assert resolve_concurrency(2, pooled) == 2
+        assert resolve_concurrency(None, custom) == DEFAULT_GATHER_CONCURRENCY
+        with pytest.raises(ValueError):
+            resolve_concurrency(0, pooled)
+
+    async def test_unordered_streaming(self, make_async_zep):
+        client = make_async_zep(Backend().handle)
+
+        ordered = [result.index async for result in client.map(client.graph.node.get, ["slow-0.2", "n1", "n2"])]
+        unordered = [
+            result.index async for result in client.map(client.graph.node.get, ["slow-0.2", "n1", "n2"], ordered=False)
+        ]
+
+        assert ordered == [0, 1, 2]
+        assert unordered == [1, 2, 0]
+
+    async def test_per_call_retries(self, make_async_zep):
+        backend = Backend(statuses=[503, 503], retry_after="0")
+        client = make_async_zep(backend.handle)
+        get = functools.partial(client.graph.node.get, request_options={"max_retries": 0})
+
+        results = await client.gather([functools.partial(get, "n1")], retries=2)
+        assert results[0].ok and backend.sent == ["n1"] * 3
+
+        backend.statuses = [503, 503]
+        results = await client.gather([functools.partial(get, "n1")], retries=1)
+        assert results[0].error.status_code == 503
+
+    async def test_fatal_error_cancels_the_rest(self, make_async_zep):
+        backend = Backend()
+        client = make_async_zep(backend.handle)
+
+        with pytest.raises(ApiError) as error:
+            await client.gather(
+                functools.partial(client.graph.node.get, uuid) for uuid in ["slow-5", "slow-5", "bad-1"]
+            )
+
+        assert error.value.status_code == 401
+        assert backend.cancelled == 2 and backend.in_flight == 0
+        results = await client.gather([functools.partial(client.graph.node.get, "bad-1")], cancel_on=None)
+        assert results[0].error.status_code == 401
+
+    async def test_stopping_iteration_cancels_calls(self, make_async_zep):
+        backend = Backend()
+        client = make_async_zep(backend.handle)
+
+        stream = client.map(client.graph.node.get, ["n1", "slow-5", "slow-5"], ordered=False)
+        async for result in stream:
+            assert result.index == 0
+            break
+        await stream.aclose()
+
+        assert backend.cancelled == 2 and backend.in_flight == 0
+
+    async def test_deadline(self, make_async_zep):
+        backend = Backend(delay=0.1)
+        client = make_async_zep(backend.handle)
+
+        with deadline(0.15), pytest.raises(DeadlineExceeded):
+            await client.gather((functools.partial(client.graph.node.get, f"n{i}") for i in range(4)), concurrency=1)
+
+        assert backend.sent == ["n0", "n1"]
@@ -0,0 +1,93 @@
+import json
+from typing import Dict, List
+
+import httpx
+import pytest
+
+from zep_cloud.errors import NotFoundError
+from zep_cloud.external_clients.not_found_cache import NotFoundCache
+
+
+def user_server(users: Dict[str, dict], calls: List[str], create_conflicts: bool = False):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(f"{request.method} {request.url.path}")
+        if request.method == "POST":
+            user = json.loads(request.content)
+            if create_conflicts:
+                # Another worker created the user between our get and add
+                users[user["user_id"]] = user
+                return httpx.Response(400, json={"message": "user already exists"})
+            users[user["user_id"]] = user
+            return httpx.Response(201, json=user)
+        user_id = request.url.path.rsplit("/", 1)[-1]
+        if user_id not in users:
+            return httpx.Response(404, json={"message": "not found"})
+        return httpx.Response(200, json=users[user_id])
+
+    return handler
+
+
+class TestNotFoundCache:
+    def test_expires_and_evicts(self):
+        now = [0.0]
+        cache = NotFoundCache(ttl=5, max_size=2, clock=lambda: now[0])
+        error = NotFoundError(body={"message": "not found"})
+        for key in ("a", "b", "c"):
+            cache.record(key, error)
+
+        cache.check("a")  # evicted
+        with pytest.raises(NotFoundError):
+            cache.check("c")
+        now[0] = 5
+        cache.check("c")
+        assert len(cache) == 1 and cache.hits == 1
+
+
+class TestGetOrCreate:
+    def test_repeated_misses_use_cache_until_created(self, make_zep):
+        calls: List[str] = []
+        client = make_zep(user_server({}, calls))
+        client.user.enable_not_found_cache(ttl=60)
+
+        for _ in range(3):
+            with pytest.raises(NotFoundError):
+                client.user.get("u1")
+        assert calls == ["GET /api/v2/users/u1"]
+
+        user, created = client.user.get_or_create("u1", first_name="Ada")
+        assert created and user.first_name == "Ada"
+        assert client.user.get("u1").user_id == "u1"
+        assert calls[1:] == ["POST /api/v2/users", "GET /api/v2/users/u1"]
+
+    def test_existing_user_is_not_created(self, make_zep):
+        calls: List[str] = []
+        client = make_zep(user_server({"u1": {"user_id": "u1"}}, calls))
+
+        user, created = client.user.get_or_create("u1")
+        assert not created and user.user_id == "u1"
+        assert calls == ["GET /api/v2/users/u1"]
+
+    def test_lost_create_race_returns_winner(self, make_zep):
+        calls: List[str] = []
+        client = make_zep(user_server({}, calls, create_conflicts=True))
+        client.user.enable_not_found_cache()
+
+        user, created = client.user.get_or_create("u1")
+        assert not created and user.user_id == "u1"
+        assert calls == ["GET /api/v2/users/u1", "POST /api/v2/users", "GET /api/v2/users/u1"]
+
+    async def test_async_thread_get_or_create(self, make_async_zep):
+        calls: List[str] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.method)
+            if request.method == "POST":
+                return httpx.Response(201, json={"thread_id": "t1", "user_id": "u1", "created_at": "2025-01-01"})
+            return httpx.Response(404, json={"message": "not found"})
+
+        client = make_async_zep(handler)
+        client.thread.enable_not_found_cache()
+
+        messages, created = await client.thread.get_or_create("t1", user_id="u1")
+        assert created and messages.messages == [] and messages.user_id == "u1"
+        assert calls == ["GET", "POST"]
@@ -0,0 +1,190 @@
+import json
+from typing import Any, Dict, List
+
+import httpx
+from pydantic import Field
+
+from zep_cloud import EdgeType, EntityEdgeSourceTarget, EntityType
+from zep_cloud.external_clients.ontology import (
+    EdgeModel,
+    EntityModel,
+    EntityText,
+    clear_schema_cache,
+    entity_model_to_api_schema,
+    ontology_fingerprint,
+)
+
+
+class Destination(EntityModel):
+    """A destination is a place that travelers visit."""
+
+    destination_name: EntityText = Field(description="The name of the destination", default=None)
+    country: EntityText = Field(description="The country of the destination", default=None)
+
+
+class TravelingTo(EdgeModel):
+    """An edge representing a traveler going to a destination."""
+
+    purpose: EntityText = Field(description="The purpose of travel", default=None)
+
+
+class TestSchemaCache:
+    def test_schema_compiled_once_per_class(self, monkeypatch):
+        clear_schema_cache()
+        calls: List[int] = []
+        original = Destination.model_json_schema.__func__  # type: ignore[attr-defined]
+
+        def counting(cls, *args, **kwargs):
+            calls.append(1)
+            return original(cls, *args, **kwargs)
+
+        monkeypatch.setattr(Destination, "model_json_schema", classmethod(counting))
+
+        first = entity_model_to_api_schema(Destination, "Destination")
+        second = entity_model_to_api_schema(Destination, "Place")
+
+        assert len(calls) == 1
+        assert first["properties"] == second["properties"]
+        assert second["name"] == "Place"
+
+    def test_results_are_independent_copies(self):
+        first = entity_model_to_api_schema(Destination, "Destination")
+        first["properties"].append({"name": "bogus"})
+        second = entity_model_to_api_schema(Destination, "Destination")
+        assert {"name": "bogus"} not in second["properties"]
+
+
+class TestOntologyFingerprint:
+    def test_order_independent(self):
+        a = EntityType(
+            name="A",
+            description="a",
+            properties=[
+                {"name": "x", "type": "Text", "description": "x"},
+                {"name": "y", "type": "Int", "description": "y"},
+            ],
+        )
+        a_reordered = EntityType(
+            name="A",
+            description="a",
+            properties=[
+                {"name": "y", "type": "Int", "description": "y"},
+                {"name": "x", "type": "Text", "description": "x"},
+            ],
+        )
+        b = EntityType(name="B", description="b")
+
+        assert ontology_fingerprint([a, b], []) == ontology_fingerprint([b, a_reordered], [])
+
+    def test_detects_changes(self):
+        edge = EdgeType(name="E", description="e", source_targets=[EntityEdgeSourceTarget(source="A", target="B")])
+        changed = EdgeType(name="E", description="e", source_targets=[EntityEdgeSourceTarget(source="A", target="C")])
+
+        assert ontology_fingerprint([], [edge]) != ontology_fingerprint([], [changed])
+
+
+class TestSetEntityTypesSkip:
+    def test_skips_when_listing_matches(self, make_zep):
+        requests: List[httpx.Request] = []
+        ontology: Dict[str, Any] = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.method == "PUT":
+                ontology.update(json.loads(request.content))
+                return httpx.Response(200, json={"message": "ok"})
+            return httpx.Response(200, json=ontology)
+
+        client = make_zep(handler)
+        entities = {"Destination": Destination}
+        edges = {"TRAVELING_TO": (TravelingTo, [EntityEdgeSourceTarget(source="User", target="Destination")])}
+
+        client.graph.set_entity_types(entities=entities, edges=edges, graph_ids=["g1"])
+        client.graph.list_entity_types(graph_id="g1")
+        res = client.graph.set_entity_types(entities=entities, edges=edges, graph_ids=["g1"], skip_if_unchanged=True)
+
+        assert [r.method for r in requests] == ["PUT", "GET"]
+        assert res.message == "Ontology unchanged, skipped"
+
+    def test_sends_when_target_unknown(self, make_zep):
+        methods: List[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            methods.append(request.method)
+            return httpx.Response(200, json={"message": "ok"})
+
+        client = make_zep(handler)
+        client.graph.set_entity_types(entities={"Destination": Destination}, user_ids=["u1"])
+        client.graph.set_entity_types(
+            entities={"Destination": Destination}, user_ids=["u1", "u2"], skip_if_unchanged=True
+        )
+
+        assert methods == ["PUT", "PUT"]
+
+
+def ontology_server(stored: Dict[str, Dict[str, Any]], calls: List[httpx.Request]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.method == "PUT":
+            body = json.loads(request.content)
+            for key in [f"user:{u}" for u in body.get("user_ids") or []] + [
+                f"graph:{g}" for g in body.get("graph_ids") or []
+            ]:
+                stored[key] = {"entity_types": body["entity_types"], "edge_types": body["edge_types"]}
+            return httpx.Response(200, json={"message": "ok"})
+        params = request.url.params
+        key = f"user:{params['user_id']}" if "user_id" in params else f"graph:{params['graph_id']}"
+        return httpx.Response(200, json=stored.get(key, {}))
+
+    return handler
+
+
+class TestApplyOntology:
+    def test_applies_only_to_changed_targets(self, make_zep):
+        current = entity_model_to_api_schema(Destination, "Destination")
+        stored = {"user:u1": {"entity_types": [current], "edge_types": []}}
+        calls: List[httpx.Request] = []
+        client = make_zep(ontology_server(stored, calls))
+
+        result = client.graph.apply_ontology(
+            entities={"Destination": Destination}, user_ids=["u1", "u2", "u3"], batch_size=1
+        )
+
+        assert result.unchanged == [("user", "u1")]
+        assert result.changed == [("user", "u2"), ("user", "u3")]
+        assert result.diffs[("user", "u2")].added_entity_types == ("Destination",)
+        assert result.applied == (("user", "u2"), ("user", "u3"))
+        assert [r.method for r in calls].count("PUT") == 2
+
+        calls.clear()
+        again = client.graph.apply_ontology(entities={"Destination": Destination}, user_ids=["u1", "u2", "u3"])
+        assert again.changed == [] and calls == []
+
+    def test_reports_changed_and_removed_types(self, make_zep):
+        stale = dict(entity_model_to_api_schema(Destination, "Destination"), description="old")
+        stored = {"graph:g1": {"entity_types": [stale, {"name": "Old", "description": ""}], "edge_types": []}}
+        client = make_zep(ontology_server(stored, []))
+
+        result = client.graph.apply_ontology(entities={"Destination": Destination}, graph_ids=["g1"], dry_run=True)
+
+        diff = result.diffs[("graph", "g1")]
+        assert diff.changed_entity_types == ("Destination",)
+        assert diff.removed_entity_types == ("Old",)
+        assert result.applied == ()
+
+    async def test_async_batches_changed_targets(self, make_async_zep):
+        calls: List[httpx.Request] = []
+        handler = ontology_server({}, calls)
+
+        async def async_handler(request: httpx.Request) -> httpx.Response:
+            return handler(request)
+
+        client = make_async_zep(async_handler)
+        result = await client.graph.apply_ontology(
+            entities={"Destination": Destination}, user_ids=["u1", "u2"], graph_ids=["g1"]
+        )
+
+        puts = [json.loads(r.content) for r in calls if r.method == "PUT"]
+        assert len(puts) == 1
+        assert puts[0]["user_ids"] == ["u1", "u2"] and puts[0]["graph_ids"] == ["g1"]
+        assert set(result.applied) == {("user", "u1"), ("user", "u2"), ("graph", "g1")}
@@ -0,0 +1,136 @@
+import asyncio
+import multiprocessing
+import sys
+import threading
+
+import httpx
+import pytest
+
+from zep_cloud.external_clients.registry import ClientRegistry
+
+
+def transport(client):
+    return client._client_wrapper.httpx_client.httpx_client
+
+
+def report_child_clients(registry, inherited, queue):
+    client = registry.client()
+
+    async def main():
+        return registry.async_client()
+
+    async_client = asyncio.run(main())
+    queue.put((id(client) != inherited, not transport(client).is_closed, id(async_client) != inherited))
+
+
+class TestClientRegistry:
+    def test_one_client_per_loop(self):
+        registry = ClientRegistry(api_key="test", max_connections=10)
+
+        async def clients():
+            first = registry.async_client()
+            others = await asyncio.gather(*(asyncio.sleep(0, result=registry.async_client()) for _ in range(3)))
+            return [first, *others]
+
+        first_loop = asyncio.run(clients())
+        second_loop = asyncio.run(clients())
+
+        assert all(client is first_loop[0] for client in first_loop)
+        assert all(client is second_loop[0] for client in second_loop)
+        assert first_loop[0] is not second_loop[0]
+        assert registry.event_loops == 1  # the first loop's client was dropped once the loop closed
+        assert transport(second_loop[0])._transport._pool._max_connections == 10
+
+    def test_loops_in_threads(self):
+        registry = ClientRegistry(api_key="test")
+        seen = []
+
+        def run():
+            async def main():
+                seen.append(registry.async_client())
+                await asyncio.sleep(0.05)
+
+            asyncio.run(main())
+
+        threads = [threading.Thread(target=run) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(client) for client in seen}) == 3
+        assert registry.client() is registry.client()
+
+    def test_close(self):
+        registry = ClientRegistry(api_key="test")
+        client = registry.client()
+        loop = asyncio.new_event_loop()
+
+        async def get():
+            return registry.async_client()
+
+        async_client = loop.run_until_complete(get())
+        registry.close()
+
+        assert transport(client).is_closed and transport(async_client).is_closed
+        assert registry.client() is not client
+        loop.close()
+
+    async def test_aclose(self):
+        registry = ClientRegistry(api_key="test")
+        client = registry.async_client()
+
+        await registry.aclose()
+
+        assert transport(client).is_closed and registry.event_loops == 0
+        assert registry.async_client() is not client
+
+    def test_rejects_httpx_client(self):
+        with pytest.raises(ValueError):
+            ClientRegistry(api_key="test", httpx_client=httpx.Client())
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="requires fork")
+    def test_rebuilt_after_fork(self):
+        registry = ClientRegistry(api_key="test")
+        parent = registry.client()
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+
+        child = context.Process(target=report_child_clients, args=(registry, id(parent), queue))
+        child.start()
+        result = queue.get(timeout=10)
+        child.join()
+
+        assert result == (True, True, True)
+        assert registry.client() is parent and not transport(parent).is_closed
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="requires fork")
+    def test_fork_while_another_thread_holds_the_lock(self):
+        registry = ClientRegistry(api_key="test")
+        parent = registry.client()
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        holding, release = threading.Event(), threading.Event()
+
+        def hold_lock():
+            with registry._lock:
+                holding.set()
+                release.wait()
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        holding.wait()
+        try:
+            child = context.Process(target=report_child_clients, args=(registry, id(parent), queue))
+            child.start()
+        finally:
+            release.set()
+            holder.join()
+        try:
+            result = queue.get(timeout=10)
+        finally:
+            child.join(timeout=5)
+            if child.is_alive():
+                child.kill()
+
+        assert result == (True, True, True)
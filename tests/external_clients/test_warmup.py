@@ -0,0 +1,124 @@
+from typing import List
+
+import httpx
+
+from zep_cloud import Message
+from zep_cloud.external_clients.warmup import WarmupScheduler
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def thread_server(warmed: List[str]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/warm"):
+            warmed.append(path.split("/")[-2])
+            return httpx.Response(200, json={"message": "ok"})
+        if path.endswith("/threads") and request.method == "POST":
+            return httpx.Response(201, json={"thread_id": "t1", "user_id": "u1"})
+        if path.endswith("/context"):
+            return httpx.Response(200, json={"context": "ctx"})
+        return httpx.Response(200, json={"message_uuids": ["m1"]})
+
+    return handler
+
+
+class TestWarmupScheduler:
+    def test_dedup_window(self):
+        clock = FakeClock()
+        warmed: List[str] = []
+        scheduler = WarmupScheduler(warmed.append, dedup_window=60, clock=clock)
+
+        assert scheduler.warm("u1")
+        assert not scheduler.warm("u1")
+        clock.now += 61
+        assert scheduler.warm("u1")
+
+        assert warmed == ["u1", "u1"]
+        assert scheduler.stats().skipped_duplicate == 1
+
+    def test_rate_limit(self):
+        clock = FakeClock()
+        warmed: List[str] = []
+        scheduler = WarmupScheduler(warmed.append, max_warms_per_second=1, burst=2, clock=clock)
+
+        assert [scheduler.warm(u) for u in ("a", "b", "c")] == [True, True, False]
+        clock.now += 1
+        assert scheduler.warm("c")
+        assert scheduler.stats().skipped_rate_limited == 1
+
+    def test_warms_users_predicted_to_return(self):
+        clock = FakeClock()
+        warmed: List[str] = []
+        scheduler = WarmupScheduler(
+            warmed.append, dedup_window=30, prediction_lead=20, warm_on_activity=False, clock=clock
+        )
+
+        for _ in range(3):
+            scheduler.record_activity("u1")
+            clock.now += 100
+        scheduler.record_activity("u2")
+
+        # u1 comes back every 100s and was last seen 100s ago; u2 has no history yet.
+        clock.now -= 100 - 85
+        assert scheduler.run_pending() == 1
+        assert warmed == ["u1"]
+        assert scheduler.run_pending() == 0
+        assert scheduler.stats().predicted_warms == 1
+
+    def test_hit_rate_counts_first_fetch_per_window(self):
+        clock = FakeClock()
+        scheduler = WarmupScheduler(lambda user_id: None, dedup_window=60, clock=clock)
+
+        scheduler.warm("u1")
+        scheduler.record_context_fetch("u1", 0.1)
+        scheduler.record_context_fetch("u1", 0.1)
+        scheduler.record_context_fetch("u2", 0.5)
+
+        stats = scheduler.stats()
+        assert (stats.context_fetches, stats.hits, stats.misses) == (3, 1, 1)
+        assert stats.hit_rate == 0.5
+        assert stats.hit_p99_latency == 0.1 and stats.miss_p99_latency == 0.5
+
+
+class TestThreadClientWarmup:
+    def test_add_messages_warms_thread_user(self, make_zep):
+        warmed: List[str] = []
+        client = make_zep(thread_server(warmed))
+        scheduler = client.thread.enable_warmup(dedup_window=60)
+
+        client.thread.create(thread_id="t1", user_id="u1")
+        client.thread.add_messages("t1", messages=[Message(content="hi", role="user")])
+        client.thread.add_messages("t1", messages=[Message(content="hi", role="user")])
+        client.thread.add_messages("unknown", messages=[Message(content="hi", role="user")])
+        client.thread.disable_warmup()
+
+        assert warmed == ["u1"]
+        assert scheduler.stats().warms_sent == 1
+
+    async def test_async_context_fetch_after_warm_is_a_hit(self, make_async_zep):
+        warmed: List[str] = []
+        handler = thread_server(warmed)
+
+        async def async_handler(request: httpx.Request) -> httpx.Response:
+            return handler(request)
+
+        client = make_async_zep(async_handler)
+        clock = FakeClock()
+        scheduler = client.thread.enable_warmup(dedup_window=60, thread_resolver=lambda thread_id: "u1", clock=clock)
+
+        await client.thread.get_user_context("t1")
+        clock.now += 61
+        await client.thread.add_messages("t1", messages=[Message(content="hi", role="user")])
+        await scheduler.aclose()  # waits for the warm triggered by add_messages
+        await client.thread.get_user_context("t1")
+
+        stats = scheduler.stats()
+        assert warmed == ["u1"] and stats.warms_sent == 1
+        assert (stats.hits, stats.misses) == (1, 1)
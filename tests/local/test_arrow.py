@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from zep_cloud import EntityNode, Episode
+from zep_cloud.client import Zep
+from zep_cloud.local import ColumnBuilder, export_parquet, iter_record_batches
+
+from .test_store import graph_server, make_edge, make_node
+
+
+def node(i: int, attributes: dict) -> EntityNode:
+    return EntityNode(uuid_=f"node-{i}", name=f"Node {i}", summary="", created_at="", attributes=attributes)
+
+
+@pytest.fixture
+def client(make_zep) -> Zep:
+    nodes = [make_node(i).dict() for i in range(5)]
+    edges = [make_edge(i).dict() for i in range(3)]
+    episodes = [Episode(uuid_="ep-1", content="hi", created_at="", metadata={"k": 1}).dict()]
+    return make_zep(graph_server(nodes, edges, episodes, []))
+
+
+class TestColumnBuilder:
+    def test_json_attributes(self):
+        builder = ColumnBuilder("nodes")
+        columns = builder.columns([node(1, {"age": 3}), node(2, {})])
+
+        assert columns["uuid"] == ["node-1", "node-2"]
+        assert [json.loads(v) if v else v for v in columns["attributes"]] == [{"age": 3}, None]
+        assert builder.fields()[-1] == ("attributes", "string")
+
+    def test_flattened_layout_is_fixed_by_first_page(self):
+        builder = ColumnBuilder("nodes", attributes="flatten")
+        builder.columns([node(1, {"age": 3, "city": "Oslo", "ok": True, "tags": ["a"]}), node(2, {"age": 2.5})])
+        assert builder.fields()[-4:] == [
+            ("attributes.age", "float64"),
+            ("attributes.city", "string"),
+            ("attributes.ok", "bool"),
+            ("attributes_extra", "string"),
+        ]
+
+        columns = builder.columns([node(3, {"age": 4, "city": 7, "new": "x"}), node(4, {"ok": 1})])
+        assert columns["attributes.age"] == [4.0, None]
+        assert columns["attributes.city"] == [None, None]
+        assert [json.loads(v) if v else v for v in columns["attributes_extra"]] == [{"city": 7, "new": "x"}, {"ok": 1}]
+
+    def test_declared_attribute_columns(self):
+        builder = ColumnBuilder("edges", attributes="flatten", attribute_columns={"since": "int64"})
+        columns = builder.columns([make_edge(1, attributes={"since": 2020, "note": "x"})])
+
+        assert columns["attributes.since"] == [2020]
+        assert json.loads(columns["attributes_extra"][0]) == {"note": "x"}
+
+    def test_rejects_unknown_kind(self):
+        with pytest.raises(ValueError):
+            ColumnBuilder("threads")  # type: ignore[arg-type]
+
+
+class TestArrowExport:
+    def test_record_batches_follow_pages(self, client):
+        pytest.importorskip("pyarrow")
+        batches = list(iter_record_batches(client, "nodes", graph_id="g1", page_size=2, attributes="flatten"))
+
+        assert [batch.num_rows for batch in batches] == [2, 2, 1]
+        assert batches[0].schema == batches[-1].schema
+        assert batches[0].column("attributes.age").to_pylist() == [0, 1]
+
+    def test_export_parquet(self, tmp_path, client):
+        pytest.importorskip("pyarrow")
+        import pyarrow.parquet as pq
+
+        rows = export_parquet(client, str(tmp_path), graph_id="g1", page_size=2)
+
+        assert rows == {"nodes": 5, "edges": 3, "episodes": 1, "observations": 0}
+        table = pq.read_table(str(tmp_path / "edges.parquet"))
+        assert table.column("uuid").to_pylist() == ["edge-0", "edge-1", "edge-2"]
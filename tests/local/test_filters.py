@@ -0,0 +1,160 @@
+import pytest
+
+from zep_cloud import DateFilter, EntityEdge, EntityNode, PropertyFilter, SearchFilters
+from zep_cloud.local import FilterColumns, LocalGraph, compile_filters
+
+
+def node(uuid: str, labels, **attributes) -> EntityNode:
+    return EntityNode(
+        uuid_=uuid, name=uuid, summary="", created_at="2024-01-01T00:00:00Z", labels=labels, attributes=attributes
+    )
+
+
+def edge(uuid: str, name: str, source: str, target: str, **kwargs) -> EntityEdge:
+    return EntityEdge(
+        uuid_=uuid,
+        name=name,
+        fact="",
+        source_node_uuid=source,
+        target_node_uuid=target,
+        created_at="2024-01-01T00:00:00Z",
+        **kwargs,
+    )
+
+
+NODES = {
+    "alice": node("alice", ["Entity", "Person"], age=31, city="Oslo"),
+    "bob": node("bob", ["Entity", "Person"], age=25.5, tags=["vip"]),
+    "acme": node("acme", ["Entity", "Company"], age="old"),
+}
+EDGES = [
+    edge("e1", "WORKS_AT", "alice", "acme", valid_at="2023-01-01T00:00:00Z", attributes={"since": 2023}),
+    edge("e2", "KNOWS", "alice", "bob", valid_at="2024-06-01T12:00:00+02:00"),
+    edge("e3", "KNOWS", "bob", "alice", valid_at="2024-06-01T12:00:00Z", invalid_at="2024-07-01T00:00:00Z"),
+    edge("e4", "WORKS_AT", "bob", "acme", expired_at="2024-08-01T00:00:00Z", attributes={"since": "2020"}),
+]
+
+
+def dates(*groups):
+    return [[DateFilter(comparison_operator=op, date=date) for op, date in group] for group in groups]
+
+
+CASES = [
+    (SearchFilters(edge_types=["KNOWS"]), ["e2", "e3"]),
+    (SearchFilters(edge_types=[], exclude_edge_types=["KNOWS", "MISSING"]), ["e1", "e4"]),
+    (SearchFilters(edge_uuids=["e1", "e3"]), ["e1", "e3"]),
+    (SearchFilters(invalid_at=dates([("IS NULL", None)])), ["e1", "e2", "e4"]),
+    # e2 is 10:00 UTC, so only e3 matches; missing valid_at never compares, not even with <>
+    (SearchFilters(valid_at=dates([(">", "2024-06-01T11:00:00Z")])), ["e3"]),
+    (SearchFilters(valid_at=dates([("<>", "2023-01-01T00:00:00Z")])), ["e2", "e3"]),
+    (
+        SearchFilters(
+            valid_at=dates(
+                [(">=", "2024-01-01T00:00:00Z"), ("<", "2024-06-01T11:00:00Z")], [("=", "2023-01-01T00:00:00Z")]
+            )
+        ),
+        ["e1", "e2"],
+    ),
+    (SearchFilters(node_labels=["Person"]), ["e2", "e3"]),
+    (SearchFilters(exclude_node_labels=["Company"]), ["e2", "e3"]),
+    (
+        SearchFilters(
+            property_filters=[PropertyFilter(comparison_operator=">=", property_name="since", property_value=2021)]
+        ),
+        ["e1"],
+    ),
+    (
+        SearchFilters(
+            property_filters=[PropertyFilter(comparison_operator="<>", property_name="since", property_value=2023)]
+        ),
+        ["e4"],
+    ),
+    (
+        SearchFilters(property_filters=[PropertyFilter(comparison_operator="IS NULL", property_name="since")]),
+        ["e2", "e3"],
+    ),
+    (
+        SearchFilters(
+            property_filters=[PropertyFilter(comparison_operator="=", property_name="name", property_value="KNOWS")]
+        ),
+        ["e2", "e3"],
+    ),
+]
+
+
+def labels_of(uuid: str):
+    return NODES[uuid].labels
+
+
+class TestFilterPredicate:
+    @pytest.mark.parametrize("filters, expected", CASES)
+    def test_edges(self, filters, expected):
+        predicate = compile_filters(filters)
+        selected = [
+            e.uuid_
+            for e in EDGES
+            if predicate(e, source_labels=labels_of(e.source_node_uuid), target_labels=labels_of(e.target_node_uuid))
+        ]
+        assert selected == expected
+
+    def test_nodes(self):
+        people = compile_filters(SearchFilters(node_labels=["Person"], edge_types=["IGNORED"]))
+        assert [n.uuid_ for n in NODES.values() if people(n)] == ["alice", "bob"]
+
+        older = compile_filters(
+            SearchFilters(
+                property_filters=[PropertyFilter(comparison_operator=">", property_name="age", property_value=30)]
+            )
+        )
+        assert [n.uuid_ for n in NODES.values() if older(n)] == ["alice"]
+
+        vip = compile_filters(
+            SearchFilters(
+                property_filters=[
+                    PropertyFilter(comparison_operator="CONTAINS", property_name="tags", property_value="vip")
+                ]
+            )
+        )
+        assert [n.uuid_ for n in NODES.values() if vip(n)] == ["bob"]
+
+        # Date filters on fields nodes do not have are not applied to them
+        assert compile_filters(SearchFilters(valid_at=dates([("IS NOT NULL", None)])))(NODES["acme"])
+
+    def test_label_filters_on_edges_need_endpoints(self):
+        predicate = compile_filters(SearchFilters(node_labels=["Person"]))
+        with pytest.raises(ValueError):
+            predicate(EDGES[0])
+        assert [e.uuid_ for e in predicate.filter(EDGES, nodes=NODES)] == ["e2", "e3"]
+
+    def test_rejects_invalid_filters(self):
+        with pytest.raises(ValueError):
+            compile_filters(SearchFilters(created_at=dates([(">", "yesterday")])))
+        with pytest.raises(ValueError):
+            compile_filters(SearchFilters(created_at=dates([("CONTAINS", "2024-01-01")])))
+        with pytest.raises(ValueError):
+            compile_filters(
+                SearchFilters(property_filters=[PropertyFilter(comparison_operator="=", property_name="x")])
+            )
+
+
+class TestVectorizedFilters:
+    @pytest.mark.parametrize("filters, expected", CASES)
+    def test_mask_agrees_with_predicate(self, filters, expected):
+        pytest.importorskip("numpy")
+        columns = FilterColumns.from_edges(EDGES, nodes=NODES)
+        assert [e.uuid_ for e in compile_filters(filters).apply(columns)] == expected
+
+    def test_columns_from_graph(self):
+        pytest.importorskip("numpy")
+        graph = LocalGraph()
+        graph.add_nodes(NODES.values())
+        graph.add_edges(EDGES)
+
+        nodes = FilterColumns.from_graph(graph, "nodes")
+        assert [n.uuid_ for n in compile_filters(SearchFilters(exclude_node_labels=["Company"])).apply(nodes)] == [
+            "alice",
+            "bob",
+        ]
+        edges = FilterColumns.from_graph(graph, "edges")
+        mask = compile_filters(SearchFilters(node_labels=["Company"])).mask(edges)
+        assert not mask.any()
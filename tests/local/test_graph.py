@@ -0,0 +1,95 @@
+from typing import Any, Dict, List
+
+
+from zep_cloud import EntityEdge
+from zep_cloud.local import GraphStore, LocalGraph
+
+from .test_store import graph_server, make_edge, make_node
+
+
+def edge(uuid: str, source: str, target: str, name: str = "KNOWS") -> EntityEdge:
+    return EntityEdge(
+        uuid_=uuid,
+        name=name,
+        fact=f"{source} {name} {target}",
+        source_node_uuid=source,
+        target_node_uuid=target,
+        created_at="",
+    )
+
+
+def sample_graph() -> LocalGraph:
+    graph = LocalGraph()
+    graph.add_nodes([make_node(i) for i in range(1, 5)])
+    graph.add_edges(
+        [
+            edge("e1", "node-1", "node-2"),
+            edge("e2", "node-2", "node-3"),
+            edge("e3", "node-3", "node-4", name="WORKS_AT"),
+            edge("e4", "node-1", "node-3", name="WORKS_AT"),
+        ]
+    )
+    return graph
+
+
+class TestLocalGraph:
+    def test_neighborhood_and_degree(self):
+        graph = sample_graph()
+
+        assert graph.edges_of("node-1", "out") == ["e1", "e4"]
+        assert graph.edges_of("node-3", "in") == ["e2", "e4"]
+        assert sorted(graph.neighbors("node-3")) == ["node-1", "node-2", "node-4"]
+        assert graph.neighbors("node-1", edge_names=["WORKS_AT"]) == ["node-3"]
+        assert (graph.degree("node-3", "in"), graph.degree("node-3", "out"), graph.degree("node-3")) == (2, 1, 3)
+        assert graph.degree("missing") == 0
+
+    def test_k_hop(self):
+        graph = sample_graph()
+
+        assert graph.k_hop("node-1", 1, "out") == {"node-1": 0, "node-2": 1, "node-3": 1}
+        assert graph.k_hop("node-1", 5, "out") == {"node-1": 0, "node-2": 1, "node-3": 1, "node-4": 2}
+        assert graph.k_hop("node-4", 2, "in", edge_names={"WORKS_AT"}) == {"node-4": 0, "node-3": 1, "node-1": 2}
+
+    def test_label_and_name_indexes(self):
+        graph = sample_graph()
+
+        assert graph.nodes_with_label("Person") == ["node-1", "node-2", "node-3", "node-4"]
+        assert graph.edges_named("WORKS_AT") == ["e3", "e4"]
+        assert graph.nodes_with_label("Missing") == []
+
+    def test_updates_and_removals_rebuild_indexes(self):
+        graph = sample_graph()
+        assert graph.degree("node-2") == 2
+
+        graph.add_edges([edge("e1", "node-1", "node-4")])
+        assert graph.degree("node-2") == 1
+        assert graph.edge_endpoints("e1") == ("node-1", "node-4")
+
+        graph.remove_nodes(["node-3"])
+        assert "node-3" not in graph
+        assert graph.edge_count == 1
+        assert graph.neighbors("node-1") == ["node-4"]
+
+    def test_materializes_models(self):
+        graph = sample_graph()
+
+        node = graph.node("node-2")
+        assert node is not None and node.uuid_ == "node-2" and node.attributes == {"age": 2}
+        edge_model = graph.edge("e3")
+        assert edge_model is not None and edge_model.name == "WORKS_AT"
+        assert graph.node("missing") is None
+
+    def test_from_client_and_store(self, tmp_path, make_zep):
+        nodes: List[Dict[str, Any]] = [make_node(i).dict() for i in range(1, 6)]
+        edges: List[Dict[str, Any]] = [make_edge(i).dict() for i in range(1, 5)]
+        client = make_zep(graph_server(nodes, edges, [], []))
+
+        graph = LocalGraph.from_client(client, graph_id="g1", page_size=2)
+        assert (graph.node_count, graph.edge_count) == (5, 4)
+        assert graph.k_hop("node-1", 10, "out")["node-5"] == 4
+
+        with GraphStore(str(tmp_path), graph_id="g1") as store:
+            store.refresh(client, page_size=2)
+            cached = LocalGraph.from_store(store)
+        assert sorted(cached.edge_uuids()) == sorted(graph.edge_uuids())
+        assert cached.nbytes == graph.nbytes
@@ -0,0 +1,226 @@
+import asyncio
+import functools
+import json
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List
+
+import httpx
+import pytest
+
+from zep_cloud import EpisodeData
+from zep_cloud.errors import BadRequestError
+from zep_cloud.local.ingest import STAGES, ingest
+
+
+def paragraphs(document: str, *, source: str = "docs") -> List[EpisodeData]:
+    """A stand-in for CPU-heavy preprocessing: one episode per paragraph, with computed metadata."""
+    return [
+        EpisodeData(data=part, type="text", source_description=source, metadata={"length": len(part)})
+        for part in document.split("\n\n")
+    ]
+
+
+def broken(document: str) -> List[EpisodeData]:
+    raise RuntimeError(f"cannot parse {document}")
+
+
+def broken_if_marked(document: str) -> List[EpisodeData]:
+    if document.startswith("broken"):
+        broken(document)
+    return paragraphs(document)
+
+
+def documents(count: int) -> List[str]:
+    return [f"doc {i} part 1\n\ndoc {i} part 2\n\ndoc {i} part 3" for i in range(count)]
+
+
+class Server:
+    """Records add_batch bodies, failing with status after the given number of batches."""
+
+    def __init__(self, fail_after: int = -1, status: int = 400) -> None:
+        self.bodies: List[Dict[str, Any]] = []
+        self.fail_after = fail_after
+        self.status = status
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/api/v2/graph-batch"
+        if len(self.bodies) == self.fail_after:
+            return httpx.Response(self.status, json={"message": "rejected"})
+        body = json.loads(request.content)
+        self.bodies.append(body)
+        await asyncio.sleep(0.001)
+        return httpx.Response(
+            200, json=[{"uuid": "ep", "content": e["data"], "created_at": "c"} for e in body["episodes"]]
+        )
+
+    @property
+    def episodes(self) -> List[Dict[str, Any]]:
+        return [episode for body in self.bodies for episode in body["episodes"]]
+
+
+class Together(Executor):
+    """Runs tasks on a process pool, but completes none until all count of them have finished."""
+
+    def __init__(self, pool: ProcessPoolExecutor, count: int) -> None:
+        self._max_workers = count
+        self.pool = pool
+        self.count = count
+        self.submitted: List[Any] = []
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> "Future[Any]":
+        future: "Future[Any]" = Future()
+        self.submitted.append((self.pool.submit(fn, *args, **kwargs), future))
+        if len(self.submitted) == self.count:
+            threading.Thread(target=self.complete).start()
+        return future
+
+    def complete(self) -> None:
+        wait([inner for inner, _ in self.submitted])
+        for inner, outer in self.submitted:
+            error = inner.exception()
+            if error is not None:
+                outer.set_exception(error)
+            else:
+                outer.set_result(inner.result())
+
+
+def shared_memory_blocks() -> List[str]:
+    return (
+        sorted(name for name in os.listdir("/dev/shm") if name.startswith("psm_")) if os.path.isdir("/dev/shm") else []
+    )
+
+
+class TestIngest:
+    async def test_process_pool(self, make_async_zep):
+        server = Server()
+
+        result = await ingest(
+            make_async_zep(server.handler),
+            documents(30),
+            paragraphs,
+            graph_id="docs",
+            processes=2,
+            chunk_size=4,
+            batch_size=10,
+        )
+
+        assert (result.documents, result.episodes) == (30, 90)
+        # 4 documents make 12 episodes per chunk, sent as batches of 10 and 2; the last chunk has 2 documents
+        assert result.batches == len(server.bodies) == 7 * 2 + 1
+        assert sorted(episode["data"] for episode in server.episodes) == sorted(
+            part for document in documents(30) for part in document.split("\n\n")
+        )
+        assert all(body["graph_id"] == "docs" and "user_id" not in body for body in server.bodies)
+        assert server.episodes[0]["metadata"] == {"length": len("doc 0 part 1")}
+        assert set(result.stages) == set(STAGES)
+        assert result.stages["preprocess"].items == 30 and result.stages["dispatch"].items == result.batches
+        assert result.stages["encode"].bytes == result.stages["dispatch"].bytes > 0
+        assert result.episodes_per_second > 0
+
+    async def test_shared_memory(self, make_async_zep):
+        server = Server()
+        before = shared_memory_blocks()
+
+        result = await ingest(
+            make_async_zep(server.handler),
+            iter(documents(12)),
+            functools.partial(paragraphs, source="wiki"),
+            user_id="u1",
+            processes=2,
+            chunk_size=3,
+            shared_memory=True,
+        )
+
+        assert result.episodes == len(server.episodes) == 36
+        assert all(body["user_id"] == "u1" for body in server.bodies)
+        assert {episode["source_description"] for episode in server.episodes} == {"wiki"}
+        assert shared_memory_blocks() == before
+
+    async def test_shared_executor_and_ordering(self, make_async_zep):
+        server = Server()
+        with ThreadPoolExecutor(2) as executor:
+            await ingest(
+                make_async_zep(server.handler), documents(6), paragraphs, graph_id="g", executor=executor, concurrency=1
+            )
+            await ingest(make_async_zep(server.handler), documents(2), paragraphs, graph_id="g", executor=executor)
+
+        assert len(server.episodes) == 24
+        assert [episode["data"] for episode in server.episodes[:3]] == documents(1)[0].split("\n\n")
+
+    async def test_request_errors_stop_ingestion(self, make_async_zep):
+        server = Server(fail_after=2)
+        before = shared_memory_blocks()
+
+        with pytest.raises(BadRequestError) as error:
+            await ingest(
+                make_async_zep(server.handler),
+                documents(100),
+                paragraphs,
+                graph_id="g",
+                processes=2,
+                chunk_size=2,
+                concurrency=1,
+                shared_memory=True,
+            )
+
+        assert error.value.status_code == 400
+        assert len(server.bodies) == 2
+        assert shared_memory_blocks() == before
+
+    async def test_preprocess_errors_release_finished_chunks(self, make_async_zep):
+        server = Server()
+        before = shared_memory_blocks()
+
+        with ProcessPoolExecutor(2) as pool:
+            with pytest.raises(RuntimeError, match="cannot parse"):
+                await ingest(
+                    make_async_zep(server.handler),
+                    ["broken"] + documents(7),
+                    broken_if_marked,
+                    graph_id="g",
+                    executor=Together(pool, 8),
+                    chunk_size=1,
+                    shared_memory=True,
+                )
+
+        assert shared_memory_blocks() == before
+
+    async def test_failures_wait_for_cancelled_requests(self, make_async_zep):
+        in_flight: List[httpx.Request] = []
+        cancelled: List[httpx.Request] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            in_flight.append(request)
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(request)
+                raise
+            finally:
+                in_flight.remove(request)
+            return httpx.Response(200, json=[])
+
+        with ThreadPoolExecutor(1) as executor:
+            with pytest.raises(RuntimeError, match="cannot parse"):
+                await ingest(
+                    make_async_zep(handler),
+                    documents(1) + ["broken"],
+                    broken_if_marked,
+                    graph_id="g",
+                    executor=executor,
+                    chunk_size=1,
+                )
+
+        assert len(cancelled) == 1 and in_flight == []
+
+    async def test_preprocess_errors_and_arguments(self, make_async_zep):
+        client = make_async_zep(Server().handler)
+
+        with pytest.raises(RuntimeError, match="cannot parse"):
+            await ingest(client, documents(3), broken, graph_id="g", processes=1)
+        with pytest.raises(ValueError):
+            await ingest(client, documents(3), paragraphs, graph_id="g", user_id="u")
+        with pytest.raises(ValueError):
+            await ingest(client, documents(3), paragraphs, graph_id="g", batch_size=0)
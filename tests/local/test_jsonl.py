@@ -0,0 +1,190 @@
+import json
+import threading
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from zep_cloud import Episode, Message
+from zep_cloud.local import export_jsonl, import_jsonl, iter_jsonl
+
+from .test_store import graph_server, make_edge, make_node
+
+
+def episode(i: int, **kwargs: Any) -> Dict[str, Any]:
+    return Episode(uuid_=f"ep-{i}", content=f"episode {i}", created_at=f"2024-01-01T00:00:{i:02d}Z", **kwargs).dict()
+
+
+def message(i: int) -> Dict[str, Any]:
+    created_at = f"2024-01-02T00:00:{i:02d}Z"
+    return Message(uuid_=f"msg-{i}", content=f"message {i}", role="user", created_at=created_at).dict()
+
+
+class Server:
+    """Serves a user graph with threads, and records replayed writes."""
+
+    def __init__(self, threads: Dict[str, List[Dict[str, Any]]], fail_after: int = -1, total_extra: int = 0):
+        self.nodes = [make_node(i).dict() for i in range(1, 4)]
+        self.edges = [make_edge(i).dict() for i in range(1, 3)]
+        self.episodes = [episode(2), episode(1), episode(3, source="message", thread_id="t1")]
+        self.threads = threads
+        self.graph = graph_server(self.nodes, self.edges, self.episodes, [])
+        self.added_episodes: List[Dict[str, Any]] = []
+        self.added_messages: Dict[str, List[str]] = {}
+        self.created: List[str] = []
+        self.fail_after = fail_after
+        # Reported on top of the real message count, as when a thread's messages cannot all be paged through
+        self.total_extra = total_extra
+        self.lock = threading.Lock()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/users/u1/threads"):
+            return httpx.Response(200, json=[{"thread_id": t, "user_id": "u1"} for t in self.threads])
+        if "/threads/" in path and path.endswith("/messages") and request.method == "GET":
+            thread_id = path.split("/")[-2]
+            if thread_id not in self.threads:
+                return httpx.Response(404, json={"message": "not found"})
+            # cursor is a page number starting from 1
+            page, limit = int(request.url.params.get("cursor", 1)), int(request.url.params["limit"])
+            messages = self.threads[thread_id]
+            offset = (page - 1) * limit
+            return httpx.Response(
+                200,
+                json={
+                    "messages": messages[offset : offset + limit],
+                    "total_count": len(messages) + self.total_extra,
+                    "user_id": "u1",
+                },
+            )
+        if path.endswith("/messages-batch"):
+            with self.lock:
+                if self.fail_after == 0:
+                    return httpx.Response(500, json={"message": "boom"})
+                self.fail_after -= 1
+                contents = [m["content"] for m in json.loads(request.content)["messages"]]
+                self.added_messages.setdefault(path.split("/")[-2], []).extend(contents)
+            return httpx.Response(200, json={})
+        if path.endswith("/threads") and request.method == "POST":
+            body = json.loads(request.content)
+            self.created.append(body["thread_id"])
+            self.threads.setdefault(body["thread_id"], [])
+            return httpx.Response(201, json=body)
+        if path.endswith("/graph-batch"):
+            body = json.loads(request.content)
+            with self.lock:
+                self.added_episodes.extend(body["episodes"])
+            return httpx.Response(200, json=[])
+        if path.endswith("/users/u2"):
+            return httpx.Response(200, json={"user_id": "u2"})
+        return self.graph(request)
+
+
+class TestJsonlExport:
+    def test_round_trip(self, tmp_path, make_zep):
+        server = Server({"t1": [message(i) for i in range(5)], "t2": [message(9)]})
+        path = str(tmp_path / "u1.jsonl.gz")
+
+        result = export_jsonl(make_zep(server.handler), path, user_id="u1", page_size=2)
+        assert (result.nodes, result.edges, result.episodes, result.threads, result.messages) == (3, 2, 3, 2, 6)
+        assert not (tmp_path / "u1.jsonl.gz.checkpoint").exists()
+
+        records = list(iter_jsonl(path))
+        assert records[0] == {
+            "type": "header",
+            "version": 1,
+            "user_id": "u1",
+            "sections": ["nodes", "edges", "episodes", "threads"],
+        }
+        assert [r["data"]["uuid"] for r in records if r["type"] == "episode"] == ["ep-1", "ep-2", "ep-3"]
+        assert [r["data"]["content"] for r in records if r["type"] == "message"][:2] == ["message 0", "message 1"]
+
+        target = Server({})
+        imported = import_jsonl(make_zep(target.handler), path, user_id="u2", concurrency=3, message_batch_size=2)
+        assert (imported.episodes, imported.threads, imported.messages, imported.skipped) == (2, 2, 6, 6)
+        # Messages are replayed in order per thread; the message-derived episode is recreated by them
+        assert target.added_messages == {"t1": [f"message {i}" for i in range(5)], "t2": ["message 9"]}
+        assert [e["data"] for e in target.added_episodes] == ["episode 1", "episode 2"]
+        assert sorted(target.created) == ["t1", "t2"]
+
+    def test_export_resumes_from_checkpoint(self, tmp_path, monkeypatch, make_zep):
+        server = Server({"t1": [message(i) for i in range(5)]})
+        path = str(tmp_path / "u1.jsonl")
+        from zep_cloud.local import jsonl
+
+        real = jsonl._Export.checkpoint
+        checkpoints = []
+
+        def interrupt(self, **progress):
+            real(self, **progress)
+            checkpoints.append(progress)
+            if len(checkpoints) == 4:
+                # Simulate a crash once the nodes are written, leaving bytes past the checkpoint behind
+                self.writer.write({"type": "edge", "data": {"uuid": "torn"}})
+                self.writer.checkpoint()
+                raise KeyboardInterrupt
+
+        monkeypatch.setattr(jsonl._Export, "checkpoint", interrupt)
+        with pytest.raises(KeyboardInterrupt):
+            export_jsonl(make_zep(server.handler), path, user_id="u1", page_size=2)
+        monkeypatch.setattr(jsonl._Export, "checkpoint", real)
+
+        result = export_jsonl(make_zep(server.handler), path, user_id="u1", page_size=2)
+        assert result.resumed and (result.nodes, result.edges, result.messages) == (0, 2, 5)
+        uuids = [r["data"].get("uuid") for r in iter_jsonl(path) if r["type"] in ("node", "edge", "message")]
+        assert uuids == ["node-1", "node-2", "node-3", "edge-1", "edge-2"] + [f"msg-{i}" for i in range(5)]
+
+    def test_truncated_thread_raises(self, tmp_path, make_zep):
+        server = Server({"t1": [message(i) for i in range(4)]}, total_extra=1)
+        path = str(tmp_path / "u1.jsonl")
+
+        with pytest.raises(RuntimeError, match="after 4 of its 5 messages"):
+            export_jsonl(make_zep(server.handler), path, user_id="u1", sections=["threads"], page_size=2)
+
+    def test_full_episode_window_is_reported(self, tmp_path, make_zep):
+        server = Server({})
+        path = str(tmp_path / "u1.jsonl")
+
+        assert not export_jsonl(make_zep(server.handler), path, user_id="u1", sections=["episodes"]).episodes_truncated
+        result = export_jsonl(make_zep(server.handler), path, user_id="u1", sections=["episodes"], episode_lastn=3)
+        assert result.episodes == 3 and result.episodes_truncated
+
+    def test_zstd_round_trip(self, tmp_path, make_zep):
+        pytest.importorskip("zstandard")
+        server = Server({"t1": [message(1)]})
+        path = str(tmp_path / "u1.jsonl.zst")
+
+        export_jsonl(make_zep(server.handler), path, user_id="u1", page_size=1)
+        assert sum(1 for r in iter_jsonl(path) if r["type"] == "node") == 3
+
+
+class TestJsonlImport:
+    def test_resumes_after_failure_without_replaying_twice(self, tmp_path, make_zep):
+        server = Server({"t1": [message(i) for i in range(6)]})
+        path = str(tmp_path / "u1.jsonl")
+        export_jsonl(make_zep(server.handler), path, user_id="u1", sections=["threads"])
+
+        target = Server({}, fail_after=1)
+        with pytest.raises(Exception):
+            import_jsonl(make_zep(target.handler), path, user_id="u2", message_batch_size=2)
+        assert target.added_messages == {"t1": ["message 0", "message 1"]}
+        assert json.loads((tmp_path / "u1.jsonl.import-checkpoint").read_text()) == {"lines": 4}
+
+        target.fail_after = -1
+        result = import_jsonl(make_zep(target.handler), path, user_id="u2", message_batch_size=2)
+        assert result.resumed and result.messages == 4
+        assert target.added_messages == {"t1": [f"message {i}" for i in range(6)]}
+        assert not (tmp_path / "u1.jsonl.import-checkpoint").exists()
+
+    def test_unordered_episode_batches(self, tmp_path, make_zep):
+        server = Server({})
+        server.episodes[:] = [episode(i) for i in range(1, 10)]
+        path = str(tmp_path / "g.jsonl")
+        export_jsonl(make_zep(server.handler), path, user_id="u1", sections=["episodes"])
+
+        target = Server({})
+        result = import_jsonl(
+            make_zep(target.handler), path, user_id="u2", episode_batch_size=2, ordered_episodes=False, concurrency=4
+        )
+        assert result.episodes == 9
+        assert sorted(e["data"] for e in target.added_episodes) == sorted(f"episode {i}" for i in range(1, 10))
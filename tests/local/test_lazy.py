@@ -0,0 +1,148 @@
+import json
+import pickle
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from zep_cloud import BadRequestError, EntityEdge, EntityNode, Episode, GraphitiSagaNode, GraphSearchResults
+from zep_cloud.core.pydantic_utilities import parse_obj_as
+from zep_cloud.local import (
+    LazyList,
+    aiter_lazy_pages,
+    alazy_search,
+    iter_lazy_pages,
+    lazy_page,
+    lazy_search,
+    materialize,
+    parse_lazy,
+)
+
+from .test_store import graph_server, make_edge, make_node
+
+
+def search_body() -> Dict[str, Any]:
+    return {
+        "context": "ctx",
+        "edges": [make_edge(i, attributes={"since": i}).dict() for i in range(5)],
+        "nodes": [make_node(i).dict() for i in range(3)],
+        "episodes": [Episode(uuid_="ep-1", content="hi", created_at="2024-01-01").dict()],
+        "thread_summaries": [GraphitiSagaNode(uuid_="s-1", name="saga", created_at="2024-01-01").dict()],
+    }
+
+
+def search_server(calls: List[Dict[str, Any]]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        calls.append(body)
+        if not body["query"]:
+            return httpx.Response(400, json={"message": "query is required"})
+        return httpx.Response(200, json=search_body())
+
+    return handler
+
+
+class TestLazyList:
+    def test_validates_on_access(self):
+        raw = [make_edge(i).dict() for i in range(4)]
+        edges = LazyList(EntityEdge, raw)
+
+        assert len(edges) == 4 and edges.validated == 0
+        first = edges[0]
+        assert isinstance(first, EntityEdge) and first == make_edge(0)
+        assert edges[0] is first and edges.validated == 1
+        assert edges[-1].uuid_ == "edge-3" and edges.validated == 2
+        assert [edge.uuid_ for edge in edges[1:3]] == ["edge-1", "edge-2"]
+        with pytest.raises(IndexError):
+            edges[4]
+
+    def test_materialize_matches_eager_parsing(self):
+        raw = [make_edge(i, episodes=["ep-1"]).dict() for i in range(3)]
+        edges = LazyList(EntityEdge, raw)
+
+        assert edges.materialize() == parse_obj_as(List[EntityEdge], raw)
+        assert edges == parse_obj_as(List[EntityEdge], raw)
+        assert pickle.loads(pickle.dumps(edges)) == edges
+
+    def test_invalid_element_fails_only_when_accessed(self):
+        edges = LazyList(EntityEdge, [make_edge(0).dict(), {"uuid": "broken"}])
+
+        assert edges[0].uuid_ == "edge-0"
+        with pytest.raises(Exception):
+            edges[1]
+
+
+class TestParseLazy:
+    def test_search_results_match_eager_parsing(self):
+        body = search_body()
+        lazy = parse_lazy(GraphSearchResults, body)
+        eager = parse_obj_as(GraphSearchResults, body)
+
+        assert isinstance(lazy, GraphSearchResults) and lazy.context == "ctx"
+        assert isinstance(lazy.edges, LazyList) and lazy.edges.validated == 0
+        assert lazy.observations is None
+        assert isinstance(lazy.thread_summaries[0], GraphitiSagaNode)
+        assert materialize(lazy) == eager
+        assert materialize(lazy).dict() == eager.dict()
+
+    def test_other_fields_are_still_validated(self):
+        with pytest.raises(Exception):
+            parse_lazy(GraphSearchResults, {"context": ["not", "a", "string"], "edges": []})
+
+
+class TestLazySearch:
+    def test_search(self, make_zep):
+        calls: List[Dict[str, Any]] = []
+        client = make_zep(search_server(calls))
+
+        results = lazy_search(client, "travel", user_id="u1", scope="edges", search_filters={"node_labels": ["Person"]})
+
+        assert calls == [
+            {"query": "travel", "user_id": "u1", "scope": "edges", "search_filters": {"node_labels": ["Person"]}}
+        ]
+        assert results.edges[2].attributes == {"since": 2}
+        assert isinstance(results.nodes[0], EntityNode)
+        assert results.edges.validated == 1
+
+    def test_errors_and_unknown_arguments(self, make_zep):
+        client = make_zep(search_server([]))
+        with pytest.raises(BadRequestError):
+            lazy_search(client, "")
+        with pytest.raises(TypeError):
+            lazy_search(client, "travel", graph="g1")
+
+    async def test_async_search(self, make_async_zep):
+        handler = search_server([])
+
+        async def async_handler(request: httpx.Request) -> httpx.Response:
+            return handler(request)
+
+        client = make_async_zep(async_handler)
+        results = await alazy_search(client, "travel", graph_id="g1")
+        assert results.episodes[0].content == "hi"
+
+
+class TestLazyPages:
+    def test_pages(self, make_zep):
+        nodes = [make_node(i).dict() for i in range(5)]
+        calls: List[Dict[str, Any]] = []
+        client = make_zep(graph_server(nodes, [], [], calls))
+
+        page = lazy_page(client, "nodes", graph_id="g1", limit=10)
+        assert isinstance(page, LazyList) and len(page) == 5 and calls[0]["path"].endswith("/graph/node/graph/g1")
+
+        pages = list(iter_lazy_pages(client, "nodes", graph_id="g1", page_size=2))
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert pages[0].validated == 1
+        assert [node.uuid_ for page in pages for node in page] == [f"node-{i}" for i in range(5)]
+
+    async def test_async_pages(self, make_async_zep):
+        edges = [make_edge(i).dict() for i in range(3)]
+        handler = graph_server([], edges, [], [])
+
+        async def async_handler(request: httpx.Request) -> httpx.Response:
+            return handler(request)
+
+        client = make_async_zep(async_handler)
+        pages = [page async for page in aiter_lazy_pages(client, "edges", user_id="u1", page_size=2)]
+        assert [edge for page in pages for edge in page] == [make_edge(i) for i in range(3)]
@@ -0,0 +1,135 @@
+import datetime as dt
+
+import pytest
+
+from zep_cloud import (
+    DateFilter,
+    DetectConfig,
+    EntityEdge,
+    EntityNode,
+    HubDetectConfig,
+    PathDetectConfig,
+    PatternSeeds,
+    SearchFilters,
+)
+from zep_cloud.local import LocalGraph, connected_components, detect_patterns
+
+np = pytest.importorskip("numpy")
+
+
+def node(uuid: str, label: str) -> EntityNode:
+    return EntityNode(uuid_=uuid, name=uuid, summary="", created_at="", labels=["Entity", label])
+
+
+def edge(uuid: str, name: str, source: str, target: str, created_at: str = "2024-01-01T00:00:00Z") -> EntityEdge:
+    return EntityEdge(
+        uuid_=uuid, name=name, fact="", source_node_uuid=source, target_node_uuid=target, created_at=created_at
+    )
+
+
+def sample_graph() -> LocalGraph:
+    graph = LocalGraph()
+    graph.add_nodes(
+        [node("alice", "Person"), node("bob", "Person"), node("carol", "Person"), node("acme", "Company")]
+        + [node("x", "Place"), node("y", "Place")]
+    )
+    graph.add_edges(
+        [
+            edge("e1", "WORKS_AT", "alice", "acme"),
+            edge("e2", "WORKS_AT", "bob", "acme"),
+            edge("e3", "WORKS_AT", "carol", "acme", created_at="2024-03-01T00:00:00Z"),
+            edge("e4", "KNOWS", "alice", "bob"),
+            edge("e5", "NEAR", "x", "y"),
+        ]
+    )
+    return graph
+
+
+def by_type(response, pattern_type):
+    return [p for p in response.patterns if p.type == pattern_type]
+
+
+class TestDetectPatterns:
+    def test_relationship_hub_and_cluster_patterns(self):
+        response = detect_patterns(sample_graph(), min_occurrences=1)
+
+        relationships = by_type(response, "relationship")
+        assert [(p.description, p.occurrences) for p in relationships] == [
+            ("Person -[WORKS_AT]-> Company", 3),
+            ("Person -[KNOWS]-> Person", 1),
+            ("Place -[NEAR]-> Place", 1),
+        ]
+        assert relationships[0].node_labels == ["Person", "Company"] and relationships[0].weighted_score == 3
+
+        (hub,) = by_type(response, "hub")
+        assert (hub.description, hub.occurrences, hub.edge_types) == ("Company hub with 3 connections", 3, ["WORKS_AT"])
+        assert hub.node_uuids == ["acme"]
+
+        (cluster,) = by_type(response, "cluster")
+        assert cluster.occurrences == 4 and cluster.node_labels == ["Company", "Person"]
+        assert sorted(cluster.node_uuids) == ["acme", "alice", "bob", "carol"]
+        assert cluster.edge_types == ["WORKS_AT", "KNOWS"]
+
+        assert response.patterns[0].occurrences == 4
+        assert (response.metadata.edges_analyzed, response.metadata.nodes_analyzed) == (5, 6)
+
+    def test_min_occurrences_limit_and_config(self):
+        graph = sample_graph()
+
+        response = detect_patterns(graph)
+        assert all(p.occurrences >= 2 for p in response.patterns)
+        assert len(detect_patterns(graph, limit=1).patterns) == 1
+
+        only = detect_patterns(graph, detect=DetectConfig(relationships={}))
+        assert {p.type for p in only.patterns} == {"relationship"}
+        hubs = detect_patterns(graph, detect=DetectConfig(hubs=HubDetectConfig(min_degree=2)))
+        assert [p.node_uuids for p in hubs.patterns] == [["acme"], ["alice"], ["bob"]]
+
+        with pytest.raises(ValueError):
+            detect_patterns(graph, detect=DetectConfig(paths=PathDetectConfig()))
+
+    def test_recency_weight(self):
+        now = dt.datetime(2024, 3, 1, tzinfo=dt.timezone.utc)
+        response = detect_patterns(sample_graph(), recency_weight="30_days", now=now)
+
+        works_at = by_type(response, "relationship")[0]
+        # Two edges are 60 days old (two half-lives), one is new
+        assert works_at.occurrences == 3
+        assert works_at.weighted_score == pytest.approx(1 + 2 * 0.5 ** (60 / 30))
+
+    def test_filters_and_seeds(self):
+        graph = sample_graph()
+
+        recent = SearchFilters(created_at=[[DateFilter(comparison_operator=">", date="2024-02-01T00:00:00Z")]])
+        response = detect_patterns(graph, search_filters=recent, min_occurrences=1)
+        assert response.metadata.edges_analyzed == 1
+
+        seeded = detect_patterns(graph, seeds=PatternSeeds(node_uuids=["x"]), min_occurrences=1)
+        assert [p.description for p in seeded.patterns] == ["Place -[NEAR]-> Place"]
+
+        seeded = detect_patterns(graph, seeds=PatternSeeds(node_labels=["Company"]), min_occurrences=1)
+        assert seeded.metadata.edges_analyzed == 3
+
+
+class TestConnectedComponents:
+    def test_matches_union_find(self):
+        rng = np.random.default_rng(7)
+        size = 2000
+        sources = rng.integers(0, size, 1500)
+        targets = rng.integers(0, size, 1500)
+
+        parent = list(range(size))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for s, t in zip(sources.tolist(), targets.tolist()):
+            a, b = find(s), find(t)
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+
+        # Merging onto the smaller root keeps every root the smallest index of its component
+        assert connected_components(sources, targets, size).tolist() == [find(i) for i in range(size)]
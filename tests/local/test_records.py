@@ -0,0 +1,96 @@
+import json
+import pickle
+
+import httpx
+import pytest
+
+from zep_cloud import DerivedNode, Episode, ForbiddenError, Message, NotFoundError
+from zep_cloud.local import (
+    DerivedNodeRecord,
+    EdgeRecord,
+    EpisodeRecord,
+    MessageRecord,
+    NodeRecord,
+    aiter_record_pages,
+    iter_record_pages,
+    iter_records,
+)
+
+from .test_store import graph_server, make_edge, make_node
+
+
+class TestRecords:
+    @pytest.mark.parametrize(
+        "record_type, model",
+        [
+            (
+                EdgeRecord,
+                make_edge(1, attributes={"since": 2020}, episodes=["ep-1"], invalid_at="2024-02-01T00:00:00Z"),
+            ),
+            (NodeRecord, make_node(1)),
+            (EpisodeRecord, Episode(uuid_="ep-1", content="hi", created_at="2024-01-01", metadata={"k": 1})),
+            (DerivedNodeRecord, DerivedNode(uuid_="obs-1", name="n", created_at="2024-01-01", episode_ids=["ep-1"])),
+            (MessageRecord, Message(uuid_="m-1", content="hi", role="user")),
+        ],
+    )
+    def test_model_round_trip(self, record_type, model):
+        record = record_type.from_model(model)
+
+        assert record.uuid_ == model.uuid_
+        assert record.to_model() == model
+        assert record.to_model(validate=True) == model
+        assert pickle.loads(pickle.dumps(record)) == record
+
+    def test_decode_interns_repeated_values(self):
+        data = json.dumps([make_node(1).dict(), make_node(2).dict()]).encode()
+        first, second = NodeRecord.decode(data)
+        again = NodeRecord.decode(json.dumps([make_node(1).dict()]))[0]
+
+        assert first.labels == ("Entity", "Person")
+        assert first.labels is second.labels is again.labels
+        assert first.created_at is again.created_at
+        assert first == again and hash(first) == hash(again)
+        assert first.attributes == {"age": 1}
+
+    def test_immutable_and_keeps_extra_keys(self):
+        record = EdgeRecord.from_raw(dict(make_edge(1).dict(), server_only="x"))
+
+        assert record.extra == {"server_only": "x"}
+        assert record.to_raw()["server_only"] == "x"
+        assert record.to_model().server_only == "x"
+        with pytest.raises(AttributeError):
+            record.name = "other"  # type: ignore[misc]
+        with pytest.raises(AttributeError):
+            record.unknown = 1  # type: ignore[attr-defined]
+
+
+class TestRecordPages:
+    def test_pages_decode_to_records(self, make_zep):
+        client = make_zep(
+            graph_server([make_node(i).dict() for i in range(5)], [make_edge(i).dict() for i in range(3)], [], [])
+        )
+
+        pages = list(iter_record_pages(client, "nodes", graph_id="g1", page_size=2))
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert all(isinstance(node, NodeRecord) for page in pages for node in page)
+        edges = list(iter_records(client, "edges", user_id="u1", uuid_cursor="edge-0"))
+        assert [edge.to_model() for edge in edges] == [make_edge(1), make_edge(2)]
+
+    @pytest.mark.parametrize("status, error", [(403, ForbiddenError), (404, NotFoundError)])
+    def test_errors_map_to_api_errors(self, status, error, make_zep):
+        client = make_zep(lambda request: httpx.Response(status, json={"message": "no graph"}))
+        with pytest.raises(error) as raised:
+            list(iter_records(client, "edges", graph_id="missing"))
+        assert raised.value.body.message == "no graph"
+        with pytest.raises(ValueError):
+            iter_record_pages(client, "episodes", graph_id="g1")  # type: ignore[arg-type]
+
+    async def test_async_pages(self, make_async_zep):
+        handler = graph_server([make_node(i).dict() for i in range(3)], [], [], [])
+
+        async def async_handler(request: httpx.Request) -> httpx.Response:
+            return handler(request)
+
+        client = make_async_zep(async_handler)
+        pages = [page async for page in aiter_record_pages(client, "nodes", graph_id="g1", page_size=2)]
+        assert [[node.uuid_ for node in page] for page in pages] == [["node-0", "node-1"], ["node-2"]]
@@ -0,0 +1,122 @@
+import json
+import uuid
+from typing import Any, Dict, List
+
+import httpx
+
+from zep_cloud import EntityEdge, EntityNode, Episode
+from zep_cloud.local.store import GraphStore
+
+
+def make_edge(i: int, **kwargs: Any) -> EntityEdge:
+    return EntityEdge(
+        uuid_=f"edge-{i}",
+        name="LIKES",
+        fact=f"fact {i}",
+        source_node_uuid=f"node-{i}",
+        target_node_uuid=f"node-{i + 1}",
+        created_at=f"2024-01-01T00:00:{i:02d}Z",
+        **kwargs,
+    )
+
+
+def make_node(i: int) -> EntityNode:
+    return EntityNode(
+        uuid_=f"node-{i}",
+        name=f"Node {i}",
+        summary="",
+        created_at=f"2024-01-01T00:00:{i:02d}Z",
+        labels=["Entity", "Person"],
+        attributes={"age": i},
+    )
+
+
+def graph_server(
+    nodes: List[Dict[str, Any]],
+    edges: List[Dict[str, Any]],
+    episodes: List[Dict[str, Any]],
+    calls: List[Dict[str, Any]],
+):
+    def page(items: List[Dict[str, Any]], body: Dict[str, Any]) -> List[Dict[str, Any]]:
+        start = 0
+        if body.get("uuid_cursor"):
+            start = [item["uuid"] for item in items].index(body["uuid_cursor"]) + 1
+        return items[start : start + body["limit"]]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if "/graph/episodes/" in path:
+            return httpx.Response(200, json={"episodes": episodes})
+        body = json.loads(request.content)
+        calls.append({"path": path, **body})
+        items = nodes if "/graph/node/" in path else edges if "/graph/edge/" in path else []
+        return httpx.Response(200, json=page(items, body))
+
+    return handler
+
+
+class TestGraphStore:
+    def test_round_trip_and_reopen(self, tmp_path):
+        with GraphStore(str(tmp_path), graph_id="g/1") as store:
+            store.add_nodes([make_node(1), make_node(2)])
+            store.add_edges([make_edge(1, attributes={"since": "2020"}, episodes=["ep-1"])])
+
+        with GraphStore(str(tmp_path), graph_id="g/1") as store:
+            assert len(store.nodes) == 2
+            node = store.get_node("node-1")
+            assert node is not None and node.labels == ["Entity", "Person"] and node.attributes == {"age": 1}
+            edge = store.get_edge("edge-1")
+            assert edge == make_edge(1, attributes={"since": "2020"}, episodes=["ep-1"])
+            assert store.get_edge("missing") is None
+
+    def test_updates_replace_records(self, tmp_path):
+        with GraphStore(str(tmp_path), user_id="u1") as store:
+            store.add_edges([make_edge(i) for i in range(10)])
+            store.flush()
+            store.add_edges([make_edge(3, expired_at="2024-02-01T00:00:00Z")])
+            # Unflushed updates are visible immediately
+            assert store.get_edge("edge-3").expired_at == "2024-02-01T00:00:00Z"
+
+        with GraphStore(str(tmp_path), user_id="u1") as store:
+            edges = list(store.iter_edges())
+            assert len(store.edges) == 10
+            assert sorted(edge.uuid_ for edge in edges) == sorted(f"edge-{i}" for i in range(10))
+            assert store.get_edge("edge-3").expired_at == "2024-02-01T00:00:00Z"
+            assert all(store.get_edge(f"edge-{i}") is not None for i in range(10))
+
+    def test_refresh_picks_up_records_sorting_before_the_last_page(self, tmp_path, make_zep):
+        # Listings are in uuid order
+        nodes = sorted((make_node(i).dict() for i in range(20)), key=lambda node: node["uuid"])
+        edges = [make_edge(i).dict() for i in range(3)]
+        episodes = [Episode(uuid_="ep-1", content="hi", created_at="2024-01-01T00:00:00Z").dict()]
+        calls: List[Dict[str, Any]] = []
+        client = make_zep(graph_server(nodes, edges, episodes, calls))
+
+        with GraphStore(str(tmp_path), graph_id="g1") as store:
+            stats = store.refresh(client, page_size=6)
+            assert (stats.nodes, stats.edges, stats.episodes) == (20, 3, 1)
+
+        # New records get random uuids, so most of them sort before the last uuid of the previous refresh
+        added = [dict(make_node(20 + i).dict(), uuid=str(uuid.uuid4())) for i in range(10)]
+        nodes.extend(added)
+        nodes.sort(key=lambda node: node["uuid"])
+        edges.append(dict(make_edge(30).dict(), uuid=str(uuid.uuid4())))
+        edges.sort(key=lambda edge: edge["uuid"])
+        calls.clear()
+        with GraphStore(str(tmp_path), graph_id="g1") as store:
+            stats = store.refresh(client, page_size=6)
+            assert (stats.nodes, stats.edges, stats.episodes) == (10, 1, 0)
+            assert len(store.nodes) == 30 and len(store.edges) == 4
+            assert all(store.get_node(node["uuid"]) is not None for node in added)
+        assert "uuid_cursor" not in calls[0]
+
+    async def test_refresh_async(self, tmp_path, make_async_zep):
+        handler = graph_server([make_node(1).dict()], [make_edge(1).dict()], [], [])
+
+        async def async_handler(request: httpx.Request) -> httpx.Response:
+            return handler(request)
+
+        client = make_async_zep(async_handler)
+        with GraphStore(str(tmp_path), graph_id="g1") as store:
+            stats = await store.refresh_async(client)
+            assert (stats.nodes, stats.edges) == (1, 1)
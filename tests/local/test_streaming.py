@@ -0,0 +1,93 @@
+import json
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from zep_cloud import EntityEdge, EntityNode, NotFoundError
+from zep_cloud.local import JsonArrayDecoder, astream_items, iter_json_array, stream_items, stream_page
+
+from .test_store import graph_server, make_edge, make_node
+
+TRICKY = [
+    {"s": "brackets ] [ } { and , commas", "q": 'quote " and backslash \\', "u": "é ✓"},
+    [1, [2, {"x": []}], "]"],
+    "\\",
+    -1.5e3,
+    None,
+    {},
+]
+
+
+def chunked(data: bytes, size: int) -> List[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestJsonArrayDecoder:
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 4096])
+    def test_any_chunking(self, size):
+        data = (" \n" + json.dumps(TRICKY, indent=1) + "\n").encode()
+        assert list(iter_json_array(chunked(data, size))) == TRICKY
+
+    def test_only_buffers_current_element(self):
+        decoder = JsonArrayDecoder()
+        assert decoder.feed(b'[{"a": 1}, {"b"') == [b'{"a": 1}']
+        assert decoder.buffered == len(b' {"b"')
+        assert decoder.feed(b": 2}]") == [b' {"b": 2}']
+        assert decoder.buffered == 0
+        decoder.close()
+
+    def test_empty_array(self):
+        assert list(iter_json_array([b"[", b" ]"])) == []
+
+    @pytest.mark.parametrize("chunks", [[b'{"a": []}'], [b"[1, 2"], [b"[1] 2"], [b"x[1]"]])
+    def test_rejects_non_arrays(self, chunks):
+        with pytest.raises(ValueError):
+            list(iter_json_array(chunks))
+
+
+class TestStreamPage:
+    def test_yields_models_as_bytes_arrive(self, make_zep):
+        edges = [make_edge(i, attributes={"note": "a, ] b"}).dict() for i in range(4)]
+        handler = graph_server([], edges, [], [])
+        received: List[int] = []
+
+        def chunked_handler(request: httpx.Request) -> httpx.Response:
+            body = handler(request).content
+
+            def stream():
+                for chunk in chunked(body, 50):
+                    received.append(len(chunk))
+                    yield chunk
+
+            return httpx.Response(200, content=stream())
+
+        first = next(stream_page(make_zep(chunked_handler), "edges", graph_id="g1", limit=10))
+        assert isinstance(first, EntityEdge) and first == make_edge(0, attributes={"note": "a, ] b"})
+        assert sum(received) < len(json.dumps(edges))
+
+    def test_errors(self, make_zep):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(404, json={"message": "not found"})
+
+        with pytest.raises(NotFoundError):
+            list(stream_page(make_zep(handler), "nodes", user_id="u1"))
+
+    def test_stream_items_pages_with_cursor(self, make_zep):
+        calls: List[Dict[str, Any]] = []
+        nodes = [make_node(i).dict() for i in range(5)]
+        items = list(stream_items(make_zep(graph_server(nodes, [], [], calls)), "nodes", graph_id="g1", page_size=2))
+
+        assert [node.uuid_ for node in items] == [f"node-{i}" for i in range(5)]
+        assert all(isinstance(node, EntityNode) for node in items)
+        assert [call.get("uuid_cursor") for call in calls] == [None, "node-1", "node-3"]
+
+    async def test_async_stream_items(self, make_async_zep):
+        handler = graph_server([], [make_edge(i).dict() for i in range(3)], [], [])
+
+        async def async_handler(request: httpx.Request) -> httpx.Response:
+            return handler(request)
+
+        client = make_async_zep(async_handler)
+        items = [edge async for edge in astream_items(client, "edges", user_id="u1", page_size=2)]
+        assert items == [make_edge(i) for i in range(3)]
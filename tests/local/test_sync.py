@@ -0,0 +1,141 @@
+import uuid
+from typing import Any, Dict, List
+
+import httpx
+
+from zep_cloud import Episode
+from zep_cloud.local import GraphStore, GraphSync
+
+from .test_store import graph_server, make_edge, make_node
+
+
+def sync_server(nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]], episodes: List[Dict[str, Any]]):
+    paged = graph_server(nodes, edges, episodes, [])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/entity-edges"):
+            node_uuid = path.split("/")[-2]
+            if node_uuid not in {node["uuid"] for node in nodes}:
+                return httpx.Response(404, json={"message": "not found"})
+            incident = [e for e in edges if node_uuid in (e["source_node_uuid"], e["target_node_uuid"])]
+            return httpx.Response(200, json=incident)
+        return paged(request)
+
+    return handler
+
+
+def episode(i: int) -> Dict[str, Any]:
+    return Episode(uuid_=f"ep-{i}", content="hi", created_at=f"2024-01-01T00:00:{i:02d}Z").dict()
+
+
+class TestGraphSync:
+    def test_fetches_only_new_records_across_runs(self, tmp_path, make_zep):
+        nodes = [make_node(i).dict() for i in range(1, 4)]
+        edges = [make_edge(1).dict()]
+        episodes = [episode(2), episode(1)]
+        client = make_zep(sync_server(nodes, edges, episodes))
+
+        with GraphStore(str(tmp_path), graph_id="g1") as store:
+            result = GraphSync(store).sync(client, page_size=2)
+            assert (result.nodes_added, result.edges_added, result.episodes_added) == (3, 1, 2)
+
+        nodes.append(make_node(4).dict())
+        edges.append(make_edge(3).dict())
+        episodes.insert(0, episode(3))
+        with GraphStore(str(tmp_path), graph_id="g1") as store:
+            sync = GraphSync(store)
+            assert sync.graph.edge_count == 1
+            result = sync.sync(client, page_size=2, episode_lastn=3)
+            assert (result.nodes_added, result.edges_added, result.episodes_added) == (1, 1, 1)
+            assert not result.episodes_truncated
+            assert sync.high_water_marks == {
+                "node": "2024-01-01T00:00:04Z",
+                "edge": "2024-01-01T00:00:03Z",
+                "episode": "2024-01-01T00:00:03Z",
+            }
+            assert sync.graph.neighbors("node-3", "out") == ["node-4"]
+
+            assert not sync.sync(client, page_size=2).has_changes
+
+    def test_picks_up_records_with_random_uuids(self, tmp_path, make_zep):
+        nodes = [make_node(i).dict() for i in range(1, 9)]
+        edges = [make_edge(i).dict() for i in range(1, 8)]
+        client = make_zep(sync_server(nodes, edges, []))
+
+        with GraphStore(str(tmp_path), graph_id="g1") as store:
+            sync = GraphSync(store)
+            sync.sync(client, page_size=3)
+
+            # Listings are in uuid order, so records with random uuids land anywhere in them, mostly before the last
+            # page of the previous run
+            added = [dict(make_node(10 + i).dict(), uuid=str(uuid.uuid4())) for i in range(10)]
+            nodes.extend(added)
+            nodes.sort(key=lambda node: node["uuid"])
+            new_edges = [
+                dict(
+                    make_edge(20 + i).dict(),
+                    uuid=str(uuid.uuid4()),
+                    source_node_uuid=added[i]["uuid"],
+                    target_node_uuid=added[i + 1]["uuid"],
+                )
+                for i in range(9)
+            ]
+            edges.extend(new_edges)
+            edges.sort(key=lambda edge: edge["uuid"])
+
+            result = sync.sync(client, page_size=3)
+
+            assert (result.nodes_added, result.edges_added) == (10, 9)
+            assert all(sync.graph.node(node["uuid"]) is not None for node in added)
+            assert all(sync.graph.edge(edge["uuid"]) is not None for edge in new_edges)
+            assert sync.graph.neighbors(added[0]["uuid"], "out") == [added[1]["uuid"]]
+            assert not sync.sync(client, page_size=3).has_changes
+
+    def test_detects_invalidated_and_deleted_edges(self, tmp_path, make_zep):
+        nodes = [make_node(i).dict() for i in range(1, 4)]
+        edges = [make_edge(1).dict(), make_edge(2).dict()]
+        client = make_zep(sync_server(nodes, edges, []))
+
+        with GraphStore(str(tmp_path), graph_id="g1") as store:
+            sync = GraphSync(store)
+            sync.sync(client)
+
+            # A new fact about node-2 expires edge-1, and edge-2 gets deleted
+            edges[0] = make_edge(1, expired_at="2024-02-01T00:00:00Z", invalid_at="2024-02-01T00:00:00Z").dict()
+            del edges[1]
+            edges.append(dict(make_edge(3).dict(), uuid="edge-9", source_node_uuid="node-2"))
+
+            result = sync.sync(client)
+            assert result.edges_added == 1
+            assert result.invalidated == ("edge-1",)
+            assert result.removed == ("edge-2",)
+            assert sync.graph.edge("edge-1").expired_at == "2024-02-01T00:00:00Z"
+            assert "edge-2" not in store.edges
+
+        with GraphStore(str(tmp_path), graph_id="g1") as store:
+            reloaded = GraphSync(store, drop_invalidated=True)
+            assert sorted(reloaded.graph.edge_uuids()) == ["edge-1", "edge-9"]
+            assert store.get_edge("edge-1").invalid_at == "2024-02-01T00:00:00Z"
+
+    def test_reports_truncated_episode_window(self, tmp_path, make_zep):
+        episodes = [episode(1)]
+        client = make_zep(sync_server([], [], episodes))
+
+        with GraphStore(str(tmp_path), user_id="u1") as store:
+            sync = GraphSync(store)
+            sync.sync(client, episode_lastn=2)
+            episodes[:] = [episode(5), episode(4)]
+            result = sync.sync(client, episode_lastn=2)
+            assert result.episodes_added == 2 and result.episodes_truncated
+
+    async def test_sync_async(self, tmp_path, make_async_zep):
+        handler = sync_server([make_node(1).dict(), make_node(2).dict()], [make_edge(1).dict()], [episode(1)])
+
+        async def async_handler(request: httpx.Request) -> httpx.Response:
+            return handler(request)
+
+        client = make_async_zep(async_handler)
+        with GraphStore(str(tmp_path), graph_id="g1") as store:
+            result = await GraphSync(store).sync_async(client)
+            assert (result.nodes_added, result.edges_added, result.episodes_added) == (2, 1, 1)